@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from airline.models import (
+    ApiToken,
     Flight,
     FlightStatus,
     Passenger,
@@ -10,11 +11,25 @@ from airline.models import (
     Ticket,
     User,
 )
+from airline.repositories.deleted_row import DeletedRowRepository
+
+
+class TrackedDeleteAdmin(admin.ModelAdmin):
+    """
+    Admin de modelos cuyas bajas (propias o en cascada) registra la
+    exportación incremental: elimina a través de DeletedRowRepository.
+    """
+
+    def delete_model(self, request, obj):
+        DeletedRowRepository.delete(obj)
+
+    def delete_queryset(self, request, queryset):
+        DeletedRowRepository.delete(queryset)
 
 
 # Registro del modelo Plane en el panel de administración de Django
 @admin.register(Plane)
-class PlaneAdmin(admin.ModelAdmin):
+class PlaneAdmin(TrackedDeleteAdmin):
     # Columnas que se mostrarán en la lista de aviones en el admin
     list_display = (
         "id",
@@ -29,7 +44,7 @@ class PlaneAdmin(admin.ModelAdmin):
 
 # Registro del modelo User en el panel de administración
 @admin.register(User)
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(TrackedDeleteAdmin):
     # Columnas visibles en la lista de usuarios
     list_display = ("username", "email", "role")
     # Filtros disponibles en la barra lateral del admin
@@ -40,14 +55,14 @@ class UserAdmin(admin.ModelAdmin):
 
 # Registro del modelo FlightStatus en el panel de administración
 @admin.register(FlightStatus)
-class FlightStatusAdmin(admin.ModelAdmin):
+class FlightStatusAdmin(TrackedDeleteAdmin):
     # Columnas visibles en la lista de estados de vuelo
     list_display = ("id", "status")
 
 
 # Registro del modelo Flight en el panel de administración de Django
 @admin.register(Flight)
-class FlightAdmin(admin.ModelAdmin):
+class FlightAdmin(TrackedDeleteAdmin):
     # Columnas que se mostrarán en la lista de vuelos en el admin
     list_display = (
         "id",
@@ -65,7 +80,7 @@ class FlightAdmin(admin.ModelAdmin):
 
 # Registro del modelo Passenger en el panel de administración
 @admin.register(Passenger)
-class PassengerAdmin(admin.ModelAdmin):
+class PassengerAdmin(TrackedDeleteAdmin):
     # Columnas visibles en la lista de pasajeros
     list_display = (
         "id",
@@ -82,7 +97,7 @@ class PassengerAdmin(admin.ModelAdmin):
 
 # Registro del modelo Seat en el panel de administración de Django
 @admin.register(Seat)
-class SeatAdmin(admin.ModelAdmin):
+class SeatAdmin(TrackedDeleteAdmin):
     # Columnas que se mostrarán en la lista de asientos en el admin
     list_display = ("id", "number", "row", "column", "seat_type", "status", "plane_id")
     # Filtros disponibles en la barra lateral del admin
@@ -93,7 +108,7 @@ class SeatAdmin(admin.ModelAdmin):
 
 # Registro del modelo Reservation en el panel de administración de Django
 @admin.register(Reservation)
-class ReservationAdmin(admin.ModelAdmin):
+class ReservationAdmin(TrackedDeleteAdmin):
     # Columnas visibles en la lista de reservas
     list_display = (
         "id",
@@ -120,7 +135,7 @@ class ReservationAdmin(admin.ModelAdmin):
 
 # Registro del modelo Ticket en el panel de administración de Django
 @admin.register(Ticket)
-class TicketAdmin(admin.ModelAdmin):
+class TicketAdmin(TrackedDeleteAdmin):
     # Columnas que se mostrarán en la lista de tickets en el admin
     list_display = ("id", "barcode", "reservation", "issue_date", "status")
     # Filtros disponibles en la barra lateral del admin
@@ -130,3 +145,28 @@ class TicketAdmin(admin.ModelAdmin):
         "barcode",  # Búsqueda por código de barras del ticket
         "reservation__reservation_code",  # Búsqueda por código de reserva relacionado
     )
+
+
+# Registro del modelo ApiToken: los tokens se crean con el comando
+# create_api_token (el admin no puede ver ni generar el token en claro)
+@admin.register(ApiToken)
+class ApiTokenAdmin(admin.ModelAdmin):
+    # Columnas que se mostrarán en la lista de tokens en el admin
+    list_display = (
+        "id",
+        "name",
+        "prefix",
+        "user",
+        "scopes",
+        "created_at",
+        "expires_at",
+    )
+    # Filtros disponibles en la barra lateral del admin
+    list_filter = ("expires_at",)
+    # Campos que podrán ser buscados mediante la barra de búsqueda
+    search_fields = ("name", "prefix", "user__username")
+    # Solo se pueden revocar (eliminar) o cambiar nombre, permisos y vencimiento
+    readonly_fields = ("user", "prefix", "key_hash", "created_at")
+
+    def has_add_permission(self, request):
+        return False
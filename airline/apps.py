@@ -12,3 +12,10 @@ class AirlineConfig(AppConfig):
 
     name = "airline"
     # Nombre de la aplicación. Django lo usa para registrar la app y asociarla con sus modelos, vistas y demás componentes.
+
+    def ready(self):
+        # Registra las señales que mantienen el índice de agendas de los aviones
+        from airline import signals  # noqa: F401
+
+        # Chequeo de despliegue: cache compartido entre procesos
+        from airline import checks  # noqa: F401
@@ -0,0 +1,15 @@
+from django.contrib.auth.backends import ModelBackend
+
+from airline.services.user import UserService
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend que resuelve el usuario de la sesión desde la memoria del
+    proceso (ver UserService.get_cached) en lugar de consultarlo en cada
+    pedido. La versión de credenciales sube al guardar o eliminar el usuario
+    (ver airline/signals.py).
+    """
+
+    def get_user(self, user_id):
+        return UserService.get_cached(user_id, load=super().get_user)
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from efi.cache import is_shared_cache
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Avisa en `check --deploy` si el cache es de cada proceso: con varios
+    workers los sellos de versión no se ven entre ellos (fragmentos, precios
+    y agendas quedan viejos, el límite de pedidos se multiplica).
+    """
+    if is_shared_cache(settings.CACHES):
+        return []
+    return [
+        Warning(
+            "El cache 'default' es de cada proceso.",
+            hint=(
+                "Con más de un proceso usar un cache compartido: "
+                "CACHE_BACKEND=redis o memcached (ver efi/cache.py)."
+            ),
+            id="airline.W001",
+        )
+    ]
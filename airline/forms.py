@@ -4,8 +4,10 @@ from django import forms
 from django.core.exceptions import ValidationError
 from django.forms.widgets import DateTimeInput
 
-from airline.models import Flight, FlightStatus, Passenger, Plane, Reservation
+from airline.models import FlightStatus, Passenger, Plane, Reservation
+from airline.services.choices import ChoicesService
 from airline.services.flight import FlightService
+from airline.services.plane_schedule import PlaneScheduleService
 
 
 class PassengerForm(forms.Form):
@@ -67,6 +69,15 @@ class PassengerForm(forms.Form):
         self.flight_id = flight_id
 
 
+def use_cached_choices(form):
+    """
+    Reemplaza las opciones de los desplegables de estado y avión por las del
+    cache compartido, así construir el formulario no consulta la base.
+    """
+    form.fields["status_id"].choices = ChoicesService.flight_statuses()
+    form.fields["plane_id"].choices = ChoicesService.planes()
+
+
 class CreateFlightForm(forms.Form):
     # Campo para el aeropuerto o ciudad de origen
     origin = forms.CharField(
@@ -133,6 +144,10 @@ class CreateFlightForm(forms.Form):
             raise forms.ValidationError("El precio base no puede ser 0 o menos.")
         return price
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        use_cached_choices(self)
+
     # Validaciones globales del formulario
     def clean(self):
         cleaned_data = super().clean()
@@ -149,10 +164,7 @@ class CreateFlightForm(forms.Form):
 
         # Validar que el avión no tenga otro vuelo en ese rango horario
         if plane and departure and arrival:
-            overlapping_flights = Flight.objects.filter(
-                plane_id=plane, departure_date__lt=arrival, arrival_date__gt=departure
-            )
-            if overlapping_flights.exists():
+            if PlaneScheduleService.has_overlap(plane.id, departure, arrival):
                 raise ValidationError(
                     "El avión seleccionado ya tiene otro vuelo asignado en ese rango horario."
                 )
@@ -251,6 +263,7 @@ class UpdateFlightForm(forms.Form):
     def __init__(self, *args, flight_id=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.flight_id = flight_id  # Guardamos el id del vuelo actual si es update.
+        use_cached_choices(self)
 
     # Validación general de los datos del formulario.
     def clean(self):
@@ -268,14 +281,10 @@ class UpdateFlightForm(forms.Form):
 
         # Validar que el avión no tenga vuelos que se solapen.
         if plane and departure and arrival:
-            overlapping_flights = Flight.objects.filter(
-                plane_id=plane, departure_date__lt=arrival, arrival_date__gt=departure
-            )
             # Si es update, excluir el vuelo actual
-            if self.flight_id:
-                overlapping_flights = overlapping_flights.exclude(id=self.flight_id)
-
-            if overlapping_flights.exists():
+            if PlaneScheduleService.has_overlap(
+                plane.id, departure, arrival, exclude_id=self.flight_id
+            ):
                 raise ValidationError(
                     "El avión seleccionado ya tiene otro vuelo asignado en ese rango horario."
                 )
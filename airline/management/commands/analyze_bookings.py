@@ -0,0 +1,117 @@
+import json
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from airline.services.analytics import (
+    DAY,
+    DEFAULT_CURVE_DAYS,
+    DEFAULT_TOP_ROUTES,
+    FLAG_CONFIRMED,
+    FLAG_TICKET,
+    FLAG_TICKET_USED,
+    AnalyticsService,
+    BookingColumns,
+    analyze,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Analiza el historial de reservas (curva de reservas, anticipación, rutas "
+        "más populares y no-shows) y opcionalmente guarda una foto .npy."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--snapshot", help="Lee las reservas de esta foto .npy")
+        parser.add_argument(
+            "--save-snapshot",
+            nargs="?",
+            const=settings.ANALYTICS_SNAPSHOT_DIR,
+            metavar="DIR",
+            help="Carga las reservas de la base y guarda una foto .npy en DIR "
+            "(por defecto ANALYTICS_SNAPSHOT_DIR, la que lee la API)",
+        )
+        parser.add_argument("--start", help="Solo vuelos que salen desde (YYYY-MM-DD)")
+        parser.add_argument("--end", help="Solo vuelos que salen antes de (YYYY-MM-DD)")
+        parser.add_argument("--curve-days", type=int, default=DEFAULT_CURVE_DAYS)
+        parser.add_argument("--top", type=int, default=DEFAULT_TOP_ROUTES)
+        parser.add_argument(
+            "--benchmark",
+            type=int,
+            metavar="N",
+            help="Mide la carga y el análisis con N reservas sintéticas (no usa la base)",
+        )
+
+    def handle(self, *args, **options):
+        if options["benchmark"]:
+            return self._benchmark(options["benchmark"])
+
+        if options["save_snapshot"]:
+            data = BookingColumns.from_db()
+            data.save(options["save_snapshot"])
+            self.stderr.write(
+                f"Foto guardada en {options['save_snapshot']} ({len(data)} reservas)"
+            )
+        else:
+            data = AnalyticsService.load(options["snapshot"])
+
+        report = analyze(
+            data,
+            start=self._parse(options["start"], "--start"),
+            end=self._parse(options["end"], "--end"),
+            curve_days=options["curve_days"],
+            top=options["top"],
+        )
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+
+    def _parse(self, value, option):
+        if not value:
+            return None
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f"{option} debe tener formato YYYY-MM-DD")
+        return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+    def _benchmark(self, size):
+        rng = np.random.default_rng(0)
+        now = int(time.time())
+        routes = [(f"Origen {i}", f"Destino {i}") for i in range(200)]
+        departure = now + rng.integers(-365, 181, size) * DAY
+        flags = np.where(rng.random(size) < 0.9, FLAG_CONFIRMED, 0)
+        ticket = rng.random(size) < 0.8
+        flags |= np.where(ticket, FLAG_TICKET, 0)
+        flags |= np.where(ticket & (rng.random(size) < 0.93), FLAG_TICKET_USED, 0)
+        columns = {
+            "booked": departure - (rng.exponential(30, size) * DAY).astype(np.int64),
+            "departure": departure,
+            "route": (rng.pareto(1.2, size) + 1).astype(np.int64) % len(routes),
+            "price": rng.uniform(50, 1500, size),
+            "flags": flags,
+        }
+        data = BookingColumns(columns, routes)
+
+        started = time.perf_counter()
+        analyze(data)
+        in_memory = time.perf_counter() - started
+
+        with tempfile.TemporaryDirectory() as directory:
+            started = time.perf_counter()
+            data.save(directory)
+            saved = time.perf_counter() - started
+
+            started = time.perf_counter()
+            analyze(BookingColumns.load(directory))
+            mapped = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{size} reservas: análisis en memoria {in_memory:.2f}s "
+            f"({size / in_memory:,.0f} filas/s), guardar foto {saved:.2f}s, "
+            f"análisis desde foto mapeada {mapped:.2f}s"
+        )
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from airline.services.archive import ArchiveService, archive_config
+
+
+class Command(BaseCommand):
+    help = (
+        "Mueve al archivo los vuelos que llegaron hace más del horizonte "
+        "configurado (settings.ARCHIVE), con sus reservas y tickets, en tandas "
+        "de una transacción cada una."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Horizonte en días (por defecto ARCHIVE['HORIZON_DAYS'])",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Vuelos por transacción (por defecto ARCHIVE['BATCH_SIZE'])",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Solo informa cuántos vuelos se archivarían",
+        )
+
+    def handle(self, *args, **options):
+        days = options["days"]
+        if days is None:
+            days = archive_config()["HORIZON_DAYS"]
+        if options["dry_run"]:
+            pending = ArchiveService.pending(horizon_days=days)
+            self.stdout.write(f"{pending} vuelos anteriores a {days} días")
+            return
+
+        archived = ArchiveService.archive(
+            horizon_days=days, batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"{archived} vuelos archivados"))
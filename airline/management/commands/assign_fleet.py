@@ -0,0 +1,120 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from airline.services.fleet_assignment import (
+    DEFAULT_TURNAROUND,
+    FleetAssignmentService,
+    assign_fleet,
+)
+
+# Cambios que se listan en pantalla en el modo --dry-run
+DIFF_LIMIT = 50
+
+
+class Command(BaseCommand):
+    help = (
+        "Asigna automáticamente los aviones de la flota a los vuelos de un rango "
+        "de fechas respetando capacidad y tiempo de escala."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", help="Inicio del rango (YYYY-MM-DD[THH:MM])")
+        parser.add_argument("--end", help="Fin del rango, no incluido")
+        parser.add_argument(
+            "--turnaround",
+            type=int,
+            default=int(DEFAULT_TURNAROUND.total_seconds() // 60),
+            help="Minutos mínimos en tierra entre dos vuelos del mismo avión",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Muestra los cambios sin guardarlos",
+        )
+        parser.add_argument(
+            "--benchmark",
+            type=int,
+            metavar="N",
+            help="Mide el algoritmo con N vuelos sintéticos (no usa la base)",
+        )
+
+    def handle(self, *args, **options):
+        turnaround = timedelta(minutes=options["turnaround"])
+        if options["benchmark"]:
+            return self._benchmark(options["benchmark"], turnaround)
+
+        start = self._parse(options["start"], "--start")
+        end = self._parse(options["end"], "--end")
+        if end <= start:
+            raise CommandError("--end debe ser posterior a --start")
+
+        plan = FleetAssignmentService.plan(start, end, turnaround)
+        changes = plan["changes"]
+
+        for flight_id, (old, new) in list(changes.items())[:DIFF_LIMIT]:
+            self.stdout.write(f"Vuelo {flight_id}: avión {old} -> {new}")
+        if len(changes) > DIFF_LIMIT:
+            self.stdout.write(f"... y {len(changes) - DIFF_LIMIT} cambios más")
+        self.stdout.write(
+            f"{plan['flights']} vuelos analizados, {len(changes)} cambios de avión"
+        )
+
+        if plan["unassigned"]:
+            raise CommandError(
+                f"{len(plan['unassigned'])} vuelos sin avión disponible "
+                f"(ej: {plan['unassigned'][:10]}); no se guardó ningún cambio"
+            )
+        if options["dry_run"]:
+            self.stdout.write(self.style.WARNING("Modo dry-run: no se guardó nada"))
+            return
+
+        try:
+            updated = FleetAssignmentService.apply(changes, turnaround)
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"{updated} vuelos actualizados"))
+
+    def _parse(self, value, option):
+        if not value:
+            raise CommandError(f"Falta {option}")
+        parsed = parse_datetime(value) or parse_datetime(f"{value}T00:00")
+        if parsed is None:
+            raise CommandError(f"{option} inválido: {value}")
+        return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+    def _benchmark(self, count, turnaround):
+        """
+        Genera una temporada sintética (vuelos de 1 a 6 horas durante 30 días,
+        con un avión cada 8 vuelos) y mide solo el algoritmo de asignación.
+        """
+        rng = random.Random(42)
+        capacities = [120, 150, 180, 220, 300]
+        planes = {i: rng.choice(capacities) for i in range(max(1, count // 8))}
+        origin = datetime(2025, 1, 1)
+        flights = []
+        for i in range(count):
+            departure = origin + timedelta(minutes=rng.randrange(30 * 24 * 60))
+            flights.append(
+                {
+                    "id": i,
+                    "departure_date": departure,
+                    "arrival_date": departure + timedelta(minutes=rng.randint(60, 360)),
+                    "capacity": rng.choice(capacities),
+                    "pinned_plane": None,
+                }
+            )
+
+        started = time.perf_counter()
+        assignment, unassigned = assign_fleet(flights, planes, turnaround)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{count} vuelos, {len(planes)} aviones: {len(assignment)} asignados, "
+            f"{len(unassigned)} sin avión en {elapsed:.3f}s "
+            f"({count / elapsed:,.0f} vuelos/s)"
+        )
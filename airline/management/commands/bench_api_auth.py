@@ -0,0 +1,87 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from airline.models import User
+from airline.services.api_token import ApiTokenService, get_token_cache
+from airline.services.signed_token import SignedTokenService
+from api.authentication import ApiTokenAuthentication, SignedTokenAuthentication
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el costo de autenticar un pedido con un token de la API (con el "
+        "cache en memoria vacío y con el token ya verificado) y con un token de "
+        "acceso firmado. "
+        "El usuario y el token de prueba se crean en una transacción que se deshace."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._bench(options["iterations"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _bench(self, iterations):
+        user = User.objects.create_user(
+            username="bench-api-auth", email="bench-api-auth@example.com"
+        )
+        _, raw = ApiTokenService.issue(user, "bench", scopes=["read"])
+        access = SignedTokenService.issue_pair(user)["access"]
+        auth = ApiTokenAuthentication()
+        cache = get_token_cache()
+
+        results = [
+            (
+                "token, cache frío",
+                self._measure(
+                    auth, self._request(raw), max(1, iterations // 10), cache.discard
+                ),
+            ),
+            (
+                "token, cache caliente",
+                self._measure(auth, self._request(raw), iterations),
+            ),
+            (
+                "firmado",
+                self._measure(
+                    SignedTokenAuthentication(), self._request(access), iterations
+                ),
+            ),
+        ]
+        self.stdout.write(
+            f"{'verificación':22} {'por pedido':>14} {'consultas/pedido':>17}"
+        )
+        for name, (us, queries) in results:
+            self.stdout.write(f"{name:22} {us:11.2f} µs {queries:17.2f}")
+
+    def _request(self, raw):
+        return Request(APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {raw}"))
+
+    def _measure(self, auth, request, iterations, before=None):
+        """
+        Devuelve (microsegundos y consultas promedio por autenticación).
+        """
+        auth.authenticate(request)
+        elapsed = 0.0
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(iterations):
+                if before:
+                    before()
+                started = time.perf_counter()
+                auth.authenticate(request)
+                elapsed += time.perf_counter() - started
+        return elapsed * 1_000_000 / iterations, len(queries) / iterations
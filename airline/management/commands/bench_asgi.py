@@ -0,0 +1,256 @@
+import asyncio
+import io
+import secrets
+import sys
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.urls import reverse
+from django.utils import timezone
+
+from airline.models import (
+    Flight,
+    FlightStatus,
+    Passenger,
+    Plane,
+    Reservation,
+    Seat,
+    User,
+)
+from airline.services.signed_token import SignedTokenService
+
+COLUMNS = "ABCDEF"
+
+
+def _percentile(latencies, fraction):
+    return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara cuántas descargas del manifiesto de un vuelo atienden a la vez "
+        "un servidor WSGI con N hilos y uno ASGI (con la vista síncrona y con "
+        "la asíncrona) cuando los clientes reciben lento: cada bloque de la "
+        "respuesta demora --delay segundos en enviarse. Los handlers de Django "
+        "se llaman en el mismo proceso, sin red. Los datos de prueba se borran "
+        "al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clients", type=int, default=100, help="Pedidos simultáneos"
+        )
+        parser.add_argument(
+            "--threads", type=int, default=8, help="Hilos del servidor WSGI"
+        )
+        parser.add_argument(
+            "--rows", type=int, default=100, help="Pasajeros del manifiesto"
+        )
+        parser.add_argument(
+            "--delay",
+            type=float,
+            default=0.01,
+            help="Segundos que tarda el cliente en recibir cada bloque",
+        )
+
+    def handle(self, *args, **options):
+        if min(options["clients"], options["threads"], options["rows"]) < 1:
+            raise CommandError("--clients, --threads y --rows deben ser mayores que 0")
+
+        # Las vistas síncronas bajo ASGI avisan que sus respuestas en
+        # streaming se consumen desde un hilo: es justamente lo que se mide
+        warnings.filterwarnings("ignore", message="StreamingHttpResponse must consume")
+
+        flight, plane, user = self._setup(options["rows"])
+        token = SignedTokenService.issue_pair(user)["access"]
+        sync_path = reverse("passenger-manifest", args=[flight.id])
+        async_path = reverse("passenger-manifest-async", args=[flight.id])
+        clients, delay = options["clients"], options["delay"]
+        connections.close_all()
+        try:
+            results = [
+                (
+                    f"WSGI, {options['threads']} hilos",
+                    self._wsgi(sync_path, token, clients, options["threads"], delay),
+                ),
+                ("ASGI, vista síncrona", self._asgi(sync_path, token, clients, delay)),
+                (
+                    "ASGI, vista asíncrona",
+                    self._asgi(async_path, token, clients, delay),
+                ),
+            ]
+        finally:
+            connections.close_all()
+            flight.delete()
+            plane.delete()
+            Passenger.objects.filter(document__startswith=f"{plane.model}-").delete()
+            user.delete()
+
+        self.stdout.write(
+            f"{clients} clientes, {options['rows']} filas, "
+            f"{delay * 1000:.1f}ms por bloque"
+        )
+        self.stdout.write(
+            f"{'servidor':24} {'pedidos/s':>10} {'p50':>9} {'p99':>9} {'errores':>8}"
+        )
+        for name, (elapsed, latencies, errors) in results:
+            self.stdout.write(
+                f"{name:24} {len(latencies) / elapsed:10.1f} "
+                f"{_percentile(latencies, 0.5) * 1000:7.0f}ms "
+                f"{_percentile(latencies, 0.99) * 1000:7.0f}ms {errors:8}"
+            )
+
+    # -------------------- WSGI --------------------
+    def _wsgi(self, path, token, clients, threads, delay):
+        handler = WSGIHandler()
+
+        def request():
+            statuses = []
+            environ = {
+                "REQUEST_METHOD": "GET",
+                "PATH_INFO": path,
+                "QUERY_STRING": "",
+                "SERVER_NAME": "localhost",
+                "SERVER_PORT": "80",
+                "SERVER_PROTOCOL": "HTTP/1.1",
+                "HTTP_AUTHORIZATION": f"Bearer {token}",
+                "wsgi.input": io.BytesIO(),
+                "wsgi.errors": sys.stderr,
+                "wsgi.url_scheme": "http",
+            }
+            body = handler(environ, lambda status, headers: statuses.append(status))
+            try:
+                for _ in body:
+                    time.sleep(delay)  # el hilo queda ocupado enviando
+            finally:
+                body.close()
+            return time.perf_counter() - started, statuses[0].startswith("200")
+
+        # Todos los clientes se conectan al mismo tiempo: la latencia incluye
+        # la espera hasta que un hilo queda libre
+        started = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            responses = list(pool.map(lambda _: request(), range(clients)))
+        return self._summary(started, responses)
+
+    # -------------------- ASGI --------------------
+    def _asgi(self, path, token, clients, delay):
+        handler = ASGIHandler()
+
+        async def request():
+            done = asyncio.Event()
+            messages = [{"type": "http.request", "body": b"", "more_body": False}]
+            statuses = []
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                await done.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    statuses.append(message["status"])
+                elif message["type"] == "http.response.body":
+                    await asyncio.sleep(delay)  # espera sin ocupar un hilo
+                    if not message.get("more_body"):
+                        done.set()
+
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": path,
+                "raw_path": path.encode(),
+                "root_path": "",
+                "query_string": b"",
+                "headers": [
+                    (b"host", b"localhost"),
+                    (b"authorization", f"Bearer {token}".encode()),
+                ],
+                "client": ("127.0.0.1", 0),
+                "server": ("localhost", 80),
+            }
+            await handler(scope, receive, send)
+            return time.perf_counter() - started, statuses == [200]
+
+        async def run():
+            return await asyncio.gather(*(request() for _ in range(clients)))
+
+        started = time.perf_counter()
+        responses = asyncio.run(run())
+        return self._summary(started, responses)
+
+    def _summary(self, started, responses):
+        elapsed = time.perf_counter() - started
+        latencies = sorted(latency for latency, _ in responses)
+        errors = sum(1 for _, ok in responses if not ok)
+        return elapsed, latencies, errors
+
+    def _setup(self, rows):
+        tag = secrets.token_hex(4).upper()
+        plane_rows = -(-rows // len(COLUMNS))
+        plane = Plane.objects.create(
+            model=f"Bench {tag}",
+            capacity=rows,
+            rows=plane_rows,
+            columns=len(COLUMNS),
+        )
+        seats = Seat.objects.bulk_create(
+            Seat(
+                number=f"{row}{column}",
+                row=row,
+                column=column,
+                seat_type="economico",
+                status="taken",
+                plane=plane,
+            )
+            for row in range(1, plane_rows + 1)
+            for column in COLUMNS
+        )[:rows]
+        departure = timezone.now() + timedelta(days=30)
+        flight = Flight.objects.create(
+            origin="Bench",
+            destination=tag,
+            departure_date=departure,
+            arrival_date=departure + timedelta(hours=2),
+            duration=timedelta(hours=2),
+            base_price=100,
+            status=FlightStatus.objects.get_or_create(status="Scheduled")[0],
+            plane=plane,
+        )
+        passengers = Passenger.objects.bulk_create(
+            Passenger(
+                name=f"Pasajero {number}",
+                document=f"{plane.model}-{number}",
+                document_type=Passenger.DNI,
+                email="bench@example.com",
+                phone="0",
+                birth_date=date(1990, 1, 1),
+            )
+            for number in range(rows)
+        )
+        user = User.objects.create_user(
+            username=f"bench-{tag}", email=f"bench-{tag}@example.com"
+        )
+        Reservation.objects.bulk_create(
+            Reservation(
+                status="confirmed",
+                price=100,
+                reservation_code=f"{tag}{number:06}",
+                flight=flight,
+                passenger=passenger,
+                seat=seat,
+                user=user,
+            )
+            for number, (seat, passenger) in enumerate(zip(seats, passengers))
+        )
+        return flight, plane, user
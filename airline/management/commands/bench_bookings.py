@@ -0,0 +1,171 @@
+import math
+import multiprocessing
+import secrets
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections
+from django.utils import timezone
+
+from airline.models import Flight, FlightStatus, Passenger, Plane, Seat, User
+from airline.services.reservation import ReservationService
+from airline.utils.db_retry import is_lock_error
+
+COLUMNS = "ABCDEF"
+
+
+def _code(size):
+    return secrets.token_hex(size).upper()[:size]
+
+
+def _book(flight_id, passenger_id, seat_id, user_id, baseline=False):
+    # La línea de base usa la misma transacción pero sin los reintentos
+    book = ReservationService.book.__wrapped__ if baseline else ReservationService.book
+    book(
+        flight_id=flight_id,
+        passenger_id=passenger_id,
+        seat_id=seat_id,
+        user_id=user_id,
+        price=100,
+        reservation_code=_code(12),
+        barcode=_code(16),
+    )
+
+
+def _worker(seat_ids, flight_id, passenger_id, user_id, baseline):
+    """
+    Reserva los asientos indicados uno por uno. Devuelve (reservas hechas,
+    errores de lock, latencias en segundos).
+    """
+    done, lock_errors, latencies = 0, 0, []
+    for seat_id in seat_ids:
+        started = time.perf_counter()
+        try:
+            _book(flight_id, passenger_id, seat_id, user_id, baseline)
+            done += 1
+        except OperationalError as exc:
+            if not is_lock_error(exc):
+                raise
+            lock_errors += 1
+        latencies.append(time.perf_counter() - started)
+    connections.close_all()
+    return done, lock_errors, latencies
+
+
+class Command(BaseCommand):
+    help = (
+        "Prueba de carga de reservas concurrentes: varios procesos reservan "
+        "asientos distintos de un mismo vuelo a la vez y se cuentan los errores "
+        "'database is locked'. Los datos de prueba se borran al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=8)
+        parser.add_argument(
+            "--bookings", type=int, default=100, help="Reservas por proceso"
+        )
+        parser.add_argument(
+            "--baseline",
+            action="store_true",
+            help="Línea de base: transacciones diferidas (BEGIN) y sin reintentos",
+        )
+
+    def handle(self, *args, **options):
+        processes, bookings = options["processes"], options["bookings"]
+        if processes < 1 or bookings < 1:
+            raise CommandError("--processes y --bookings deben ser mayores que 0")
+
+        database = connections["default"]
+        if options["baseline"] and database.vendor == "sqlite":
+            database.settings_dict["OPTIONS"]["transaction_mode"] = "DEFERRED"
+
+        flight, plane, passenger, user = self._setup(processes * bookings)
+        seat_ids = list(
+            Seat.objects.filter(plane=plane).order_by("id").values_list("id", flat=True)
+        )[: processes * bookings]
+        # Cada proceso abre su propia conexión
+        connections.close_all()
+        try:
+            started = time.perf_counter()
+            with multiprocessing.get_context("fork").Pool(processes) as pool:
+                results = pool.starmap(
+                    _worker,
+                    [
+                        (
+                            seat_ids[i::processes],
+                            flight.id,
+                            passenger.id,
+                            user.id,
+                            options["baseline"],
+                        )
+                        for i in range(processes)
+                    ],
+                )
+            elapsed = time.perf_counter() - started
+        finally:
+            connections.close_all()
+            flight.delete()
+            plane.delete()
+            passenger.delete()
+            user.delete()
+
+        done = sum(result[0] for result in results)
+        lock_errors = sum(result[1] for result in results)
+        latencies = sorted(latency for result in results for latency in result[2])
+
+        def percentile(fraction):
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+        self.stdout.write(
+            f"{processes} procesos, {done} reservas en {elapsed:.2f}s "
+            f"({done / elapsed:.0f} reservas/s), errores de lock: {lock_errors}"
+        )
+        self.stdout.write(
+            f"latencia p50 {percentile(0.5) * 1000:.1f}ms, "
+            f"p99 {percentile(0.99) * 1000:.1f}ms, máx {latencies[-1] * 1000:.1f}ms"
+        )
+        if lock_errors and not options["baseline"]:
+            raise CommandError(f"{lock_errors} reservas fallaron por lock")
+
+    def _setup(self, seats):
+        tag = _code(8)
+        rows = math.ceil(seats / len(COLUMNS))
+        plane = Plane.objects.create(
+            model=f"Bench {tag}", capacity=seats, rows=rows, columns=len(COLUMNS)
+        )
+        Seat.objects.bulk_create(
+            Seat(
+                number=f"{row}{column}",
+                row=row,
+                column=column,
+                seat_type="economico",
+                status="available",
+                plane=plane,
+            )
+            for row in range(1, rows + 1)
+            for column in COLUMNS
+        )
+        departure = timezone.now() + timedelta(days=30)
+        flight = Flight.objects.create(
+            origin="Bench",
+            destination=tag,
+            departure_date=departure,
+            arrival_date=departure + timedelta(hours=2),
+            duration=timedelta(hours=2),
+            base_price=100,
+            status=FlightStatus.objects.get_or_create(status="Scheduled")[0],
+            plane=plane,
+        )
+        passenger = Passenger.objects.create(
+            name=f"Bench {tag}",
+            document=tag,
+            document_type=Passenger.DNI,
+            email="bench@example.com",
+            phone="0",
+            birth_date=date(1990, 1, 1),
+        )
+        user = User.objects.create_user(
+            username=f"bench-{tag}", email=f"bench-{tag}@example.com"
+        )
+        return flight, plane, passenger, user
@@ -0,0 +1,99 @@
+import copy
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from airline.models import Flight
+from airline.utils.cache_versions import bump_version
+from airline.views import (
+    flight_list,
+    plane_detail,
+    select_seat,
+    upcoming_flight_list,
+)
+
+
+def _uncached_templates():
+    # Misma configuración de TEMPLATES pero sin el loader cacheado
+    templates = copy.deepcopy(settings.TEMPLATES)
+    for engine in templates:
+        engine["OPTIONS"].pop("loaders", None)
+        engine["APP_DIRS"] = True
+    return templates
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el tiempo de render y las consultas de las páginas con fragmentos "
+        "cacheados: sin cache, con el cache invalidado y con el cache caliente."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument(
+            "--flight", type=int, help="Vuelo a usar (por defecto el primero)"
+        )
+
+    def handle(self, *args, **options):
+        flight = (
+            Flight.objects.filter(pk=options["flight"]).first()
+            if options["flight"]
+            else Flight.objects.order_by("id").first()
+        )
+        if flight is None:
+            raise CommandError("No hay vuelos para medir")
+
+        pages = [
+            ("flights/list.html", flight_list, ()),
+            ("flights/flight_available.html", upcoming_flight_list, ()),
+            ("seat/select_seat.html", select_seat, (flight.id, 0)),
+            ("plane/details.html", plane_detail, (flight.plane_id,)),
+        ]
+
+        def invalidate():
+            bump_version("flights")
+            bump_version(f"plane:{flight.plane_id}")
+
+        self.factory = RequestFactory()
+        iterations = options["iterations"]
+        self.stdout.write(
+            f"{'plantilla':32} {'sin cache':>18} {'cache frío':>18} {'cache caliente':>18}"
+        )
+        for name, view, view_args in pages:
+            with override_settings(TEMPLATES=_uncached_templates()):
+                uncached = self._measure(view, view_args, iterations, invalidate)
+            cold = self._measure(view, view_args, iterations, invalidate)
+            warm = self._measure(view, view_args, iterations, None)
+            self.stdout.write(
+                f"{name:32} "
+                + " ".join(f"{ms:9.2f}ms {q:3d} q" for ms, q in (uncached, cold, warm))
+            )
+
+    def _measure(self, view, view_args, iterations, invalidate):
+        """
+        Devuelve (milisegundos promedio por render, consultas por render).
+        Con invalidate se suben las versiones antes de cada render (fragmentos fríos).
+        """
+        # Una primera pasada carga plantillas y fragmentos
+        self._render(view, view_args)
+        elapsed = 0.0
+        for _ in range(iterations):
+            if invalidate:
+                invalidate()
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                self._render(view, view_args)
+                elapsed += time.perf_counter() - started
+        return elapsed * 1000 / iterations, len(queries)
+
+    def _render(self, view, view_args):
+        request = self.factory.get("/")
+        request.user = AnonymousUser()
+        response = view(request, *view_args)
+        response.content  # fuerza el render completo
+        return response
@@ -0,0 +1,42 @@
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.throttling import GCRAThrottle
+from api.views import FlightFilterAPIView
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el costo por pedido del límite de pedidos (GCRAThrottle) con el "
+        "almacén en memoria del proceso y con el cache de Django."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=100_000)
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        request = Request(APIRequestFactory().get("/"))
+        request.user = AnonymousUser()
+        view = FlightFilterAPIView()
+        # Cupo suficiente para que todos los pedidos pasen por el camino completo
+        rates = {"flight_filter": f"{iterations * 2}/d"}
+
+        self.stdout.write(f"{'almacén':10} {'por pedido':>14}")
+        for store in ("local", "default"):
+            with override_settings(
+                THROTTLE_STORE=store,
+                REST_FRAMEWORK={"DEFAULT_THROTTLE_RATES": rates},
+            ):
+                throttle = GCRAThrottle()
+                throttle.allow_request(request, view)
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    throttle.allow_request(request, view)
+                elapsed = time.perf_counter() - started
+            self.stdout.write(f"{store:10} {elapsed * 1_000_000 / iterations:11.2f} µs")
@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from airline.models import User
+from airline.services.api_token import SCOPES, ApiTokenService
+
+
+class Command(BaseCommand):
+    help = (
+        "Crea un token de la API para un usuario y lo muestra una única vez "
+        "(solo se guarda su hash)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("--name", default="api", help="Descripción del token")
+        parser.add_argument(
+            "--scopes",
+            nargs="+",
+            default=["read"],
+            choices=SCOPES,
+            help="Permisos del token",
+        )
+        parser.add_argument(
+            "--days", type=int, help="Días de validez (por defecto no vence)"
+        )
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options["username"]).first()
+        if user is None:
+            raise CommandError(f"No existe el usuario {options['username']}")
+        if options["days"] is not None and options["days"] <= 0:
+            raise CommandError("--days debe ser mayor que 0")
+
+        token, raw = ApiTokenService.issue(
+            user,
+            options["name"],
+            scopes=options["scopes"],
+            expires_in=timedelta(days=options["days"]) if options["days"] else None,
+        )
+        self.stdout.write(
+            f"Token {token.name} ({token.scopes}) para {user.username}; "
+            "guardalo ahora, no se puede volver a mostrar:"
+        )
+        self.stdout.write(raw)
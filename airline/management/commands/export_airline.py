@@ -0,0 +1,122 @@
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from airline.repositories.deleted_row import DeletedRowRepository
+from airline.utils.table_export import EXPORT_TABLES, export_table
+from airline.utils.workers import database_names, setup_worker
+
+# Archivo (dentro de la carpeta de salida) con la última exportación de cada tabla
+WATERMARK_FILE = "watermarks.json"
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta las tablas de la aerolínea (vuelos, reservas, tickets, pasajeros "
+        "y asientos) a CSV/NDJSON comprimido, opcionalmente con columnas .npy."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output", default="exports", help="Carpeta donde se guardan los archivos"
+        )
+        parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+        parser.add_argument(
+            "--tables",
+            nargs="+",
+            choices=list(EXPORT_TABLES),
+            default=list(EXPORT_TABLES),
+            help="Tablas a exportar (por defecto todas)",
+        )
+        parser.add_argument(
+            "--npy",
+            action="store_true",
+            help="Escribe además una columna .npy por cada campo numérico",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help=(
+                "Exporta solo filas modificadas desde la última exportación y "
+                "los ids de las eliminadas (<tabla>.deleted.*); después borra "
+                "las marcas de eliminación ya exportadas"
+            ),
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=len(EXPORT_TABLES),
+            help="Procesos en paralelo (uno por tabla); 1 exporta en este proceso",
+        )
+
+    def handle(self, *args, **options):
+        output = Path(options["output"])
+        watermark_path = output / WATERMARK_FILE
+        watermarks = {}
+        if options["incremental"] and watermark_path.exists():
+            watermarks = json.loads(watermark_path.read_text())
+
+        # Cada ejecución va a su propia carpeta para no pisar exportaciones anteriores.
+        # La marca de agua es el inicio de la exportación: lo que cambie mientras
+        # corre se vuelve a exportar la próxima vez (al menos una vez, nunca se pierde).
+        started_at = timezone.now()
+        run_dir = output / started_at.strftime("%Y%m%dT%H%M%S%f")
+        try:
+            run_dir.mkdir(parents=True)
+        except FileExistsError:
+            raise CommandError(f"La carpeta {run_dir} ya existe")
+
+        jobs = []
+        for table in options["tables"]:
+            since = None
+            if options["incremental"] and table in watermarks:
+                since = datetime.fromisoformat(watermarks[table])
+            jobs.append(
+                (
+                    table,
+                    run_dir,
+                    options["format"],
+                    since,
+                    options["chunk_size"],
+                    options["npy"],
+                )
+            )
+
+        for table, count, files in self._run(jobs, options["workers"]):
+            watermarks[table] = started_at.isoformat()
+            self.stdout.write(f"{table}: {count} filas -> {', '.join(files)}")
+
+        watermark_path.write_text(json.dumps(watermarks, indent=2))
+        if options["incremental"]:
+            # Las bajas hasta el inicio ya quedaron en esta exportación (o en la
+            # completa, si era la primera); las posteriores se informan la próxima vez
+            for table in options["tables"]:
+                DeletedRowRepository.purge(table, started_at)
+        self.stdout.write(self.style.SUCCESS(f"Exportación completa en {run_dir}"))
+
+    def _run(self, jobs, workers):
+        if workers <= 1 or len(jobs) <= 1:
+            for job in jobs:
+                yield export_table(*job)
+            return
+
+        # Los procesos hijos abren sus propias conexiones a la base
+        names = database_names()
+        connections.close_all()
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(jobs)),
+            mp_context=context,
+            initializer=setup_worker,
+            initargs=(names,),
+        ) as executor:
+            futures = [executor.submit(export_table, *job) for job in jobs]
+            for future in futures:
+                yield future.result()
@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from airline.services.bulk_import import (
+    DEFAULT_BATCH_SIZE,
+    IMPORTERS,
+    is_utf8,
+    iter_records,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa vuelos (temporadas completas) o listas de pasajeros desde un "
+        "archivo CSV/NDJSON, validando y guardando por bloques."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Archivo CSV o NDJSON a importar")
+        parser.add_argument("--kind", choices=list(IMPORTERS), default="flights")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            help="Formato del archivo (por defecto según la extensión)",
+        )
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            "--report", help="Archivo JSON donde guardar el detalle de rechazos"
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Solo valida, no guarda nada"
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"El archivo {path} no existe")
+
+        fmt = options["format"] or (
+            "ndjson" if path.suffix in (".ndjson", ".jsonl") else "csv"
+        )
+        importer = IMPORTERS[options["kind"]]
+        with path.open("rb") as binary:
+            if not is_utf8(binary):
+                raise CommandError(f"El archivo {path} debe estar codificado en UTF-8")
+
+        with path.open(encoding="utf-8-sig", newline="") as stream:
+            report = importer.import_records(
+                iter_records(stream, fmt),
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+            )
+
+        if options["report"]:
+            Path(options["report"]).write_text(
+                json.dumps(report, indent=2, ensure_ascii=False, default=str)
+            )
+
+        for rejected in report["rejected"][:20]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Línea {rejected['line']}: {' '.join(rejected['errors'])}"
+                )
+            )
+
+        action = "validadas" if options["dry_run"] else "creadas"
+        count = report["valid"] if options["dry_run"] else report["created"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{count} filas {action}, {len(report['rejected'])} rechazadas"
+            )
+        )
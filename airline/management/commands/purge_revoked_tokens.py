@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from airline.services.signed_token import SignedTokenService
+
+
+class Command(BaseCommand):
+    help = (
+        "Borra de la lista de revocados los tokens firmados que ya vencieron "
+        "(no hace falta recordarlos: la firma ya no los acepta)."
+    )
+
+    def handle(self, *args, **options):
+        deleted = SignedTokenService.purge_expired()
+        self.stdout.write(f"{deleted} revocaciones vencidas borradas")
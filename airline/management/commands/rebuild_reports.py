@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from airline.services.report import ReportService
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye el resumen de ventas (FlightSales) que usan los reportes "
+        "a partir de las reservas confirmadas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--flight",
+            type=int,
+            nargs="+",
+            dest="flights",
+            help="Reconstruye solo estos vuelos (por defecto todos)",
+        )
+
+    def handle(self, *args, **options):
+        rows = ReportService.rebuild(flight_ids=options["flights"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Resumen de ventas reconstruido: {rows} filas")
+        )
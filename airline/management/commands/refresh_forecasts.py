@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from airline.services.forecasting import ForecastService
+
+
+class Command(BaseCommand):
+    help = (
+        "Ajusta los modelos de demanda y no-show por ruta y guarda en la base "
+        "el pronóstico y el límite de reservas de cada vuelo futuro. Pensado "
+        "para correr periódicamente (cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--snapshot", help="Lee el historial de esta foto .npy en lugar de la base"
+        )
+        parser.add_argument(
+            "--risk",
+            type=float,
+            help="Probabilidad máxima de que se presenten más pasajeros que asientos",
+        )
+        parser.add_argument(
+            "--max-overbooking",
+            type=float,
+            dest="max_ratio",
+            help="Sobreventa máxima como fracción de la capacidad (ej. 0.1)",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        forecasts = ForecastService.refresh(
+            snapshot=options["snapshot"],
+            risk=options["risk"],
+            max_ratio=options["max_ratio"],
+        )
+        overbooked = sum(1 for f in forecasts if f["booking_limit"] > f["capacity"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(forecasts)} vuelos pronosticados ({overbooked} con sobreventa "
+                f"autorizada) en {time.perf_counter() - started:.2f}s"
+            )
+        )
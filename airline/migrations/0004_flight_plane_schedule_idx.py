@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-19 12:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airline", "0003_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["plane", "departure_date", "arrival_date"],
+                name="flight_plane_schedule_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.4 on 2026-10-19 13:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_flight_sales(apps, schema_editor):
+    # Resumen inicial a partir de las reservas confirmadas existentes
+    Reservation = apps.get_model("airline", "Reservation")
+    FlightSales = apps.get_model("airline", "FlightSales")
+    rows = (
+        Reservation.objects.filter(status__iexact="confirmed")
+        .values("flight_id", "seat__seat_type")
+        .annotate(reservations=Count("id"), revenue=Sum("price"))
+        .order_by()
+    )
+    FlightSales.objects.bulk_create(
+        [
+            FlightSales(
+                flight_id=row["flight_id"],
+                seat_type=row["seat__seat_type"],
+                reservations=row["reservations"],
+                revenue=row["revenue"],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airline", "0004_flight_plane_schedule_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FlightSales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("seat_type", models.CharField(max_length=50)),
+                ("reservations", models.IntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "flight",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="airline.flight"
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("flight", "seat_type"), name="flight_sales_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_flight_sales, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.4 on 2026-10-19 13:44
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airline", "0007_revoked_token"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedFlight",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("origin", models.CharField(max_length=100)),
+                ("destination", models.CharField(max_length=100)),
+                ("departure_date", models.DateTimeField(db_index=True)),
+                ("arrival_date", models.DateTimeField()),
+                ("duration", models.DurationField()),
+                ("base_price", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("status", models.CharField(max_length=100)),
+                ("plane_id", models.IntegerField()),
+                ("plane_name", models.CharField(max_length=150)),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ArchivedReservation",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("status", models.CharField(max_length=50)),
+                ("reservation_date", models.DateTimeField()),
+                ("price", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("reservation_code", models.CharField(db_index=True, max_length=20)),
+                ("passenger_id", models.IntegerField(db_index=True)),
+                ("passenger_name", models.CharField(max_length=320)),
+                ("seat_number", models.CharField(max_length=10)),
+                ("seat_type", models.CharField(max_length=50)),
+                ("seat_name", models.CharField(max_length=100)),
+                ("user_id", models.IntegerField()),
+                ("username", models.CharField(max_length=150)),
+                (
+                    "ticket_barcode",
+                    models.CharField(blank=True, max_length=100, null=True),
+                ),
+                (
+                    "ticket_status",
+                    models.CharField(blank=True, max_length=50, null=True),
+                ),
+                ("ticket_issue_date", models.DateTimeField(blank=True, null=True)),
+                (
+                    "flight",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reservations",
+                        to="airline.archivedflight",
+                    ),
+                ),
+            ],
+        ),
+    ]
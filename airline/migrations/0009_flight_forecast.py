@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-19 14:08
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airline", "0008_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FlightForecast",
+            fields=[
+                (
+                    "flight",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        serialize=False,
+                        to="airline.flight",
+                    ),
+                ),
+                ("capacity", models.IntegerField()),
+                ("sold", models.IntegerField()),
+                ("show_rate", models.FloatField()),
+                ("expected_bookings", models.FloatField(null=True)),
+                ("booking_limit", models.IntegerField()),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-19 14:16
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airline", "0009_flight_forecast"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeletedRow",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("table", models.CharField(max_length=50)),
+                ("row_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["table", "deleted_at"], name="deleted_row_table_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -5,10 +5,68 @@ from django.contrib.auth.models import (
     BaseUserManager,
 )
 
+from django.utils import timezone
+
 # Create your models here.
 from django.db import models
 
 
+class TrackedQuerySet(models.QuerySet):
+    """
+    QuerySet de los modelos con updated_at: update() (y bulk_update, que lo
+    usa) también lo actualiza, como save(), salvo que se indique otro valor.
+    """
+
+    def update(self, **kwargs):
+        kwargs.setdefault("updated_at", timezone.now())
+        return super().update(**kwargs)
+
+
+class TrackedModel(models.Model):
+    """
+    Modelo base que registra la fecha de la última modificación de cada fila.
+    Se usa un default en lugar de auto_now para que las cargas crudas
+    (loaddata) también completen el campo; save() y QuerySet.update() lo
+    actualizan. Las filas eliminadas quedan registradas en DeletedRow (ver
+    airline/signals.py).
+    """
+
+    updated_at = models.DateTimeField(
+        default=timezone.now, db_index=True
+    )  # ultima modificacion, usada para exportaciones incrementales
+
+    objects = TrackedQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        self.updated_at = timezone.now()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "updated_at"}
+        super().save(*args, **kwargs)
+
+
+class DeletedRow(models.Model):
+    """
+    Marca de una fila eliminada de un TrackedModel, para que la exportación
+    incremental informe también las bajas.
+    """
+
+    table = models.CharField(max_length=50)  # model_name (clave de EXPORT_TABLES)
+    row_id = models.BigIntegerField()  # id de la fila eliminada
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["table", "deleted_at"], name="deleted_row_table_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.table} {self.row_id} ({self.deleted_at})"
+
+
 class Plane(models.Model):  # clase avion
     model = models.CharField(max_length=100)  # modelo
     capacity = (
@@ -62,7 +120,7 @@ class FlightStatus(models.Model):
         return f"{self.status}"
 
 
-class Flight(models.Model):  # clase vuelo
+class Flight(TrackedModel):  # clase vuelo
     origin = models.CharField(max_length=100)  # origen
     destination = models.CharField(max_length=100)
     departure_date = models.DateTimeField()  # fecha salida
@@ -76,11 +134,20 @@ class Flight(models.Model):  # clase vuelo
     plane = models.ForeignKey(Plane, on_delete=models.CASCADE)  # avion id
     user = models.ManyToManyField(User)
 
+    class Meta:
+        indexes = [
+            # Agenda de cada avión: se recorre ordenada por salida (ver PlaneScheduleService)
+            models.Index(
+                fields=["plane", "departure_date", "arrival_date"],
+                name="flight_plane_schedule_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.origin} → {self.destination} ({self.departure_date.date()})"
 
 
-class Passenger(models.Model):
+class Passenger(TrackedModel):
     PASSPORT = "passport"
     DNI = "dni"
     ID_CARD = "id_card"
@@ -100,7 +167,7 @@ class Passenger(models.Model):
         return f"{self.name} ({self.document})"
 
 
-class Seat(models.Model):
+class Seat(TrackedModel):
     number = models.CharField(max_length=10)  # numero de butakera
     row = models.PositiveIntegerField()  # fila
     column = models.CharField(max_length=1)  # columna, ej: A, B, etc
@@ -115,7 +182,7 @@ class Seat(models.Model):
         return f"{self.row}{self.column} (Plane ID: {self.plane.id})"
 
 
-class Reservation(models.Model):
+class Reservation(TrackedModel):
     status = models.CharField(max_length=50)  # estado
     reservation_date = models.DateTimeField(auto_now_add=True)  # fecha de reserva
     price = models.DecimalField(max_digits=10, decimal_places=2)  # precio
@@ -132,7 +199,7 @@ class Reservation(models.Model):
         return f"Reservation {self.reservation_code} for {self.passenger.name}"
 
 
-class Ticket(models.Model):
+class Ticket(TrackedModel):
     barcode = models.CharField(
         max_length=100, unique=True
     )  # codigo de barra, muy ferretera eso
@@ -147,3 +214,166 @@ class Ticket(models.Model):
 
     def __str__(self):
         return f"Ticket {self.barcode} - {self.status}"
+
+
+class FlightSales(models.Model):
+    """
+    Resumen de las reservas confirmadas de un vuelo por tipo de asiento
+    (cantidad e ingresos). Lo mantienen las señales de Reservation y se
+    reconstruye con el comando rebuild_reports; los reportes se leen de acá
+    en lugar de agregar la tabla de reservas en cada pedido.
+    """
+
+    flight = models.ForeignKey(Flight, on_delete=models.CASCADE)  # vuelo id
+    seat_type = models.CharField(max_length=50)  # tipo de asiento
+    reservations = models.IntegerField(default=0)  # reservas confirmadas
+    revenue = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0
+    )  # suma de Reservation.price
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["flight", "seat_type"], name="flight_sales_unique"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Flight {self.flight_id} / {self.seat_type}: {self.reservations}"
+
+
+class FlightForecast(models.Model):
+    """
+    Último pronóstico de demanda y límite de reservas de un vuelo futuro. Lo
+    escribe el comando refresh_forecasts (ver ForecastService) y lo leen las
+    reservas de cualquier proceso.
+    """
+
+    flight = models.OneToOneField(
+        Flight, on_delete=models.CASCADE, primary_key=True
+    )  # vuelo id
+    capacity = models.IntegerField()  # capacidad del avión al pronosticar
+    sold = models.IntegerField()  # reservas confirmadas al pronosticar
+    show_rate = models.FloatField()  # tasa de presentación de la ruta
+    expected_bookings = models.FloatField(null=True)  # demanda final estimada
+    booking_limit = models.IntegerField()  # reservas autorizadas (con sobreventa)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Flight {self.flight_id}: {self.booking_limit}/{self.capacity}"
+
+
+class ApiToken(models.Model):
+    """
+    Token de acceso a la API. Del token solo se guarda el prefijo (para
+    buscarlo) y el hash SHA-256 del token completo; el token en claro se
+    muestra una única vez al crearlo (ver ApiTokenService.issue).
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)  # usuario id
+    name = models.CharField(max_length=100)  # descripción del token
+    prefix = models.CharField(max_length=16, unique=True)  # parte pública del token
+    key_hash = models.CharField(max_length=64)  # sha256 hex del token completo
+    scopes = models.CharField(
+        max_length=200, default="read"
+    )  # permisos separados por espacios
+    created_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(null=True, blank=True)  # sin fecha: no vence
+
+    def __str__(self):
+        return f"{self.name} ({self.prefix}…) - {self.user}"
+
+    @property
+    def scope_set(self) -> frozenset:
+        return frozenset(self.scopes.split())
+
+
+class RevokedToken(models.Model):
+    """
+    Tokens firmados revocados antes de vencer (ver SignedTokenService). Con
+    jti "user:<id>" se revocan todos los tokens del usuario emitidos hasta
+    revoked_at. Las filas se pueden borrar cuando pasa expires_at.
+    """
+
+    jti = models.CharField(max_length=64, unique=True)  # id del token revocado
+    user = models.ForeignKey(User, on_delete=models.CASCADE)  # usuario id
+    revoked_at = models.DateTimeField(default=timezone.now, db_index=True)
+    expires_at = models.DateTimeField(db_index=True)  # vencimiento del token
+
+    def __str__(self):
+        return f"{self.jti} - {self.user_id}"
+
+
+class ArchivedFlight(models.Model):
+    """
+    Vuelo ya realizado que se sacó de las tablas de uso diario (ver
+    ArchiveService). Conserva el id original y, en lugar de relaciones, el
+    texto del estado y del avión: el archivo puede estar en otra base.
+    """
+
+    id = models.IntegerField(primary_key=True)  # id del vuelo original
+    origin = models.CharField(max_length=100)
+    destination = models.CharField(max_length=100)
+    departure_date = models.DateTimeField(db_index=True)
+    arrival_date = models.DateTimeField()
+    duration = models.DurationField()
+    base_price = models.DecimalField(max_digits=10, decimal_places=2)
+    status = models.CharField(max_length=100)  # texto del FlightStatus
+    plane_id = models.IntegerField()  # id del avión
+    plane_name = models.CharField(max_length=150)  # str(Plane) al archivar
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.origin} → {self.destination} ({self.departure_date.date()})"
+
+    # Mismos atributos de salida que Flight (ver FlightSerializer)
+    @property
+    def plane(self):
+        return self.plane_name
+
+    @property
+    def user(self):
+        return []
+
+
+class ArchivedReservation(models.Model):
+    """
+    Reserva (con los datos de su ticket) de un vuelo archivado.
+    """
+
+    id = models.IntegerField(primary_key=True)  # id de la reserva original
+    status = models.CharField(max_length=50)
+    reservation_date = models.DateTimeField()
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    reservation_code = models.CharField(max_length=20, db_index=True)
+
+    flight = models.ForeignKey(
+        ArchivedFlight, on_delete=models.CASCADE, related_name="reservations"
+    )
+    passenger_id = models.IntegerField(db_index=True)  # id del pasajero
+    passenger_name = models.CharField(max_length=320)  # str(Passenger) al archivar
+    seat_number = models.CharField(max_length=10)
+    seat_type = models.CharField(max_length=50)
+    seat_name = models.CharField(max_length=100)  # str(Seat) al archivar
+    user_id = models.IntegerField()  # id del usuario que reservó
+    username = models.CharField(max_length=150)
+
+    ticket_barcode = models.CharField(max_length=100, null=True, blank=True)
+    ticket_status = models.CharField(max_length=50, null=True, blank=True)
+    ticket_issue_date = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Reservation {self.reservation_code} for {self.passenger_name}"
+
+    # Mismos atributos de salida que Reservation (ver ReservationSerializer)
+    @property
+    def passenger(self):
+        return self.passenger_name
+
+    @property
+    def seat(self):
+        return self.seat_name
+
+    @property
+    def user(self):
+        return self.username
@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from airline.models import ApiToken, User
+
+
+class ApiTokenRepository:
+    """
+    Repositorio para manipular los tokens de la API en la base de datos.
+    """
+
+    @staticmethod
+    def create(
+        user: User,
+        name: str,
+        prefix: str,
+        key_hash: str,
+        scopes: str,
+        expires_at: datetime = None,
+    ) -> ApiToken:
+        return ApiToken.objects.create(
+            user=user,
+            name=name,
+            prefix=prefix,
+            key_hash=key_hash,
+            scopes=scopes,
+            expires_at=expires_at,
+        )
+
+    @staticmethod
+    def get_by_prefix(prefix: str) -> ApiToken:
+        """
+        Token con su usuario cargado en la misma consulta (None si no existe).
+        """
+        try:
+            return ApiToken.objects.select_related("user").get(prefix=prefix)
+        except ApiToken.DoesNotExist:
+            return None
+
+    @staticmethod
+    def get_by_user(user_id: int):
+        return ApiToken.objects.filter(user_id=user_id).order_by("id")
+
+    @staticmethod
+    def delete(token: ApiToken) -> bool:
+        token.delete()
+        return True
@@ -0,0 +1,115 @@
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from airline.models import ArchivedFlight, ArchivedReservation, Flight, Reservation
+from airline.repositories.deleted_row import DeletedRowRepository
+from airline.utils.db_routing import archive_alias
+
+
+def with_archived(current, archived, key=None, reverse=False):
+    """
+    Une resultados de las tablas de uso diario con los del archivo. Descarta
+    las copias archivadas de filas que siguen en las tablas de uso diario
+    (una tanda copiada cuyo borrado falló se vuelve a archivar en la próxima
+    corrida).
+    """
+    rows = list(current)
+    ids = {row.id for row in rows}
+    rows.extend(row for row in archived if row.id not in ids)
+    if key:
+        rows.sort(key=key, reverse=reverse)
+    return rows
+
+
+class ArchiveRepository:
+    """
+    Repositorio del archivo de vuelos realizados (ArchivedFlight y
+    ArchivedReservation, en settings.ARCHIVE_DATABASE).
+    """
+
+    @staticmethod
+    def get_flight_ids_before(cutoff, limit: int) -> list[int]:
+        """
+        Hasta limit ids de vuelos que llegaron antes de cutoff.
+        """
+        return list(
+            Flight.objects.filter(arrival_date__lt=cutoff)
+            .order_by("id")
+            .values_list("id", flat=True)[:limit]
+        )
+
+    @staticmethod
+    def count_flights_before(cutoff) -> int:
+        return Flight.objects.filter(arrival_date__lt=cutoff).count()
+
+    @staticmethod
+    def archive_flights(flight_ids) -> int:
+        """
+        Copia los vuelos al archivo (con sus reservas y tickets) y los borra
+        de las tablas de uso diario. La copia se confirma antes que el
+        borrado: si este falla, los vuelos quedan en ambos lados y la
+        próxima corrida los vuelve a copiar (las filas ya archivadas se
+        ignoran). Devuelve la cantidad de vuelos archivados.
+        """
+        flights = [
+            ArchivedFlight(
+                id=flight.id,
+                origin=flight.origin,
+                destination=flight.destination,
+                departure_date=flight.departure_date,
+                arrival_date=flight.arrival_date,
+                duration=flight.duration,
+                base_price=flight.base_price,
+                status=str(flight.status),
+                plane_id=flight.plane_id,
+                plane_name=str(flight.plane),
+            )
+            for flight in Flight.objects.filter(id__in=flight_ids).select_related(
+                "status", "plane"
+            )
+        ]
+        reservations = [
+            ArchivedReservation(
+                id=reservation.id,
+                status=reservation.status,
+                reservation_date=reservation.reservation_date,
+                price=reservation.price,
+                reservation_code=reservation.reservation_code,
+                flight_id=reservation.flight_id,
+                passenger_id=reservation.passenger_id,
+                passenger_name=str(reservation.passenger),
+                seat_number=reservation.seat.number,
+                seat_type=reservation.seat.seat_type,
+                seat_name=str(reservation.seat),
+                user_id=reservation.user_id,
+                username=reservation.user.username,
+                **ArchiveRepository._ticket_fields(reservation),
+            )
+            for reservation in Reservation.objects.filter(
+                flight_id__in=flight_ids
+            ).select_related("passenger", "seat__plane", "user", "ticket")
+        ]
+
+        archive = archive_alias()
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            with transaction.atomic(using=archive):
+                ArchivedFlight.objects.using(archive).bulk_create(
+                    flights, ignore_conflicts=True
+                )
+                ArchivedReservation.objects.using(archive).bulk_create(
+                    reservations, batch_size=1000, ignore_conflicts=True
+                )
+            DeletedRowRepository.delete(
+                Flight.objects.filter(id__in=[flight.id for flight in flights])
+            )
+        return len(flights)
+
+    @staticmethod
+    def _ticket_fields(reservation) -> dict:
+        ticket = getattr(reservation, "ticket", None)
+        if ticket is None:
+            return {}
+        return {
+            "ticket_barcode": ticket.barcode,
+            "ticket_status": ticket.status,
+            "ticket_issue_date": ticket.issue_date,
+        }
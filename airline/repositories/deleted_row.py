@@ -0,0 +1,68 @@
+from datetime import datetime
+
+from django.db import models, router, transaction
+from django.db.models.deletion import Collector
+
+from airline.models import DeletedRow, TrackedModel
+
+
+class DeletedRowRepository:
+    """
+    Repositorio de las marcas de filas eliminadas (DeletedRow).
+    """
+
+    @staticmethod
+    def delete(objs):
+        """
+        Elimina una instancia o un QuerySet con sus cascadas (igual que
+        delete()) y registra con un solo INSERT por lote las filas eliminadas
+        de los TrackedModel, también las borradas en cascada (ver
+        export_airline --incremental). Devuelve lo mismo que delete().
+        """
+        if isinstance(objs, models.Model):
+            if objs.pk is None:
+                raise ValueError(
+                    f"{objs._meta.object_name} no se puede eliminar: no tiene id."
+                )
+            using = router.db_for_write(type(objs), instance=objs)
+            collector = Collector(using=using, origin=objs)
+            collector.collect([objs])
+        else:
+            using = objs.db
+            collector = Collector(using=using, origin=objs)
+            collector.collect(objs)
+        rows = [
+            DeletedRow(table=model._meta.model_name, row_id=instance.pk)
+            for model, instances in collector.data.items()
+            if issubclass(model, TrackedModel)
+            for instance in instances
+        ]
+        # Las eliminadas sin cargarlas (sin señales) se leen solo por id
+        rows.extend(
+            DeletedRow(table=qs.model._meta.model_name, row_id=pk)
+            for qs in collector.fast_deletes
+            if issubclass(qs.model, TrackedModel)
+            for pk in qs.values_list("pk", flat=True)
+        )
+        with transaction.atomic(using=using, savepoint=False):
+            result = collector.delete()
+            DeletedRow.objects.using(using).bulk_create(rows, batch_size=1000)
+        return result
+
+    @staticmethod
+    def get_since(table: str, since: datetime):
+        """
+        (id, deleted_at) de las filas de la tabla eliminadas después de `since`.
+        """
+        return (
+            DeletedRow.objects.filter(table=table, deleted_at__gt=since)
+            .order_by("deleted_at")
+            .values("row_id", "deleted_at")
+        )
+
+    @staticmethod
+    def purge(table: str, until: datetime) -> int:
+        """
+        Borra las marcas de la tabla hasta `until` (ya exportadas).
+        """
+        return DeletedRow.objects.filter(table=table, deleted_at__lte=until).delete()[0]
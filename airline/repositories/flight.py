@@ -1,5 +1,19 @@
 from datetime import datetime, timedelta
-from airline.models import Flight, FlightStatus, Plane, User
+
+from django.db.models import Exists, F, OuterRef, Q
+from django.utils import timezone
+
+from airline.models import (
+    ArchivedFlight,
+    Flight,
+    FlightStatus,
+    Plane,
+    Reservation,
+    User,
+)
+from airline.repositories.archive import with_archived
+from airline.repositories.deleted_row import DeletedRowRepository
+from airline.utils.db_routing import read_alias
 
 
 class FlightRepository:
@@ -74,29 +88,107 @@ class FlightRepository:
     @staticmethod
     def delete(flight: Flight) -> bool:
         try:
-            flight.delete()
+            DeletedRowRepository.delete(flight)
             return True
         except Flight.DoesNotExist:
             raise ValueError("El vuelo no existe")
 
     @staticmethod
     def get_all() -> list[Flight]:
-        return Flight.objects.all()
+        return Flight.objects.select_related("status", "plane").order_by("id")
+
+    @staticmethod
+    def get_upcoming(today):
+        """
+        Vuelos que salen hoy o después, con estado y avión en la misma consulta.
+        """
+        return (
+            Flight.objects.filter(departure_date__date__gte=today)
+            .select_related("status", "plane")
+            .order_by("id")
+        )
 
     @staticmethod
     def get_by_id(flight_id: int) -> Flight:
+        # El avión se usa casi siempre junto con el vuelo (asientos, precios)
         try:
-            return Flight.objects.get(id=flight_id)
+            return Flight.objects.select_related("plane").get(id=flight_id)
         except Flight.DoesNotExist:
             return None
 
+    @staticmethod
+    async def aget_by_id(flight_id: int) -> Flight:
+        try:
+            return await Flight.objects.select_related("plane").aget(id=flight_id)
+        except Flight.DoesNotExist:
+            return None
+
+    @staticmethod
+    def get_admin_list(query=None, status_id=None, plane_id=None, date=None):
+        """
+        Vuelos para el listado de administración, filtrados en la base y con
+        estado y avión cargados en la misma consulta.
+        - query: texto a buscar en origen o destino
+        """
+        qs = Flight.objects.select_related("status", "plane").order_by("id")
+        if query:
+            qs = qs.filter(Q(origin__icontains=query) | Q(destination__icontains=query))
+        if status_id:
+            qs = qs.filter(status_id=status_id)
+        if plane_id:
+            qs = qs.filter(plane_id=plane_id)
+        if date:
+            qs = qs.filter(departure_date__date=date)
+        return qs
+
     @staticmethod
     def search_by_origin(origin: str) -> list[Flight]:
-        return Flight.objects.filter(origin__icontains=origin)
+        return Flight.objects.using(read_alias()).filter(origin__icontains=origin)
 
     @staticmethod
-    def filter_flights(origin=None, destination=None, date=None):
-        qs = Flight.objects.all()
+    def filter_flights(
+        origin=None, destination=None, date=None, include_archived=False
+    ):
+        """
+        Vuelos por origen, destino y fecha de salida. Con include_archived
+        se suman los del archivo (en una lista en lugar de un queryset).
+        """
+        qs = FlightRepository._search(
+            Flight.objects.using(read_alias()), origin, destination, date
+        )
+        if not include_archived:
+            return qs
+        archived = FlightRepository._search(
+            ArchivedFlight.objects.all(), origin, destination, date
+        )
+        return with_archived(qs, archived)
+
+    @staticmethod
+    async def afilter_flights(
+        origin=None, destination=None, date=None, include_archived=False
+    ) -> list:
+        """
+        Versión asíncrona de filter_flights. Devuelve una lista con estado,
+        avión y usuarios ya cargados, listos para FlightSerializer.
+        """
+        qs = FlightRepository._search(
+            Flight.objects.using(read_alias())
+            .select_related("status", "plane")
+            .prefetch_related("user"),
+            origin,
+            destination,
+            date,
+        )
+        flights = [flight async for flight in qs]
+        if not include_archived:
+            return flights
+        archived = FlightRepository._search(
+            ArchivedFlight.objects.all(), origin, destination, date
+        )
+        return with_archived(flights, [flight async for flight in archived])
+
+    @staticmethod
+    def _search(qs, origin, destination, date):
         if origin:
             qs = qs.filter(origin__icontains=origin)
         if destination:
@@ -104,3 +196,130 @@ class FlightRepository:
         if date:
             qs = qs.filter(departure_date__date=date)
         return qs
+
+    @staticmethod
+    def get_schedules_by_planes(plane_ids, start=None, end=None):
+        """
+        Devuelve (plane_id, id, departure_date, arrival_date) de los vuelos de
+        los aviones indicados, ordenados por avión y salida, en una sola consulta
+        (la resuelve el índice (plane, departure_date, arrival_date)).
+        Con start y end, solo los que se solapan con el rango [start, end).
+        """
+        qs = Flight.objects.filter(plane_id__in=plane_ids)
+        if start is not None and end is not None:
+            qs = qs.filter(departure_date__lt=end, arrival_date__gt=start)
+        return qs.order_by("plane_id", "departure_date").values_list(
+            "plane_id", "id", "departure_date", "arrival_date"
+        )
+
+    @staticmethod
+    def find_plane_overlap(plane_id, departure, arrival, exclude_id=None):
+        """
+        Devuelve el id de un vuelo del avión que se solapa con [departure,
+        arrival), o None (índice (plane, departure_date, arrival_date)).
+        """
+        return (
+            Flight.objects.filter(
+                plane_id=plane_id,
+                departure_date__lt=arrival,
+                arrival_date__gt=departure,
+            )
+            .exclude(id=exclude_id)
+            .values_list("id", flat=True)
+            .first()
+        )
+
+    @staticmethod
+    def bulk_create(flights: list[Flight], user_ids: list[list[int]]) -> list[Flight]:
+        """
+        Crea varios vuelos con un solo INSERT y luego sus relaciones ManyToMany
+        con usuarios con otro INSERT masivo sobre la tabla intermedia.
+        user_ids[i] contiene los usuarios del vuelo flights[i].
+        """
+        created = Flight.objects.bulk_create(flights)
+        through = Flight.user.through
+        through.objects.bulk_create(
+            [
+                through(flight_id=flight.id, user_id=user_id)
+                for flight, ids in zip(created, user_ids)
+                for user_id in ids
+            ]
+        )
+        return created
+
+    @staticmethod
+    def get_fleet_rows(start: datetime, end: datetime, turnaround: timedelta):
+        """
+        Devuelve los vuelos que salen en [start, end) y los que los rodean y
+        pueden chocar con ellos (los que siguen en tierra o en el aire al
+        comenzar el rango y los que salen antes de que termine el último
+        vuelo del rango más el tiempo de escala).
+        Cada fila trae id, horarios, avión, su capacidad, si tiene reservas
+        (sus asientos pertenecen al avión actual) y si está dentro del rango.
+        """
+        columns = (
+            "id",
+            "departure_date",
+            "arrival_date",
+            "plane_id",
+            "capacity",
+            "has_reservations",
+        )
+        base = Flight.objects.annotate(
+            capacity=F("plane__capacity"),
+            has_reservations=Exists(Reservation.objects.filter(flight=OuterRef("pk"))),
+        ).order_by("departure_date")
+
+        in_range = list(
+            base.filter(departure_date__gte=start, departure_date__lt=end).values(
+                *columns
+            )
+        )
+        if not in_range:
+            return [], []
+
+        bound = max(row["arrival_date"] for row in in_range) + turnaround
+        context = list(
+            base.filter(
+                Q(departure_date__lt=start, arrival_date__gt=start - turnaround)
+                | Q(departure_date__gte=end, departure_date__lt=bound)
+            ).values(*columns)
+        )
+        return in_range, context
+
+    @staticmethod
+    def lock_fleet_rows(flight_ids) -> dict[int, dict]:
+        """
+        Bloquea los vuelos (SELECT ... FOR UPDATE) hasta el fin de la transacción
+        y devuelve {id: {id, plane_id, departure_date, arrival_date}}. Mientras
+        tanto no se les pueden agregar reservas: la clave foránea de la reserva
+        necesita la fila del vuelo.
+        """
+        return {
+            row["id"]: row
+            for row in Flight.objects.select_for_update()
+            .filter(id__in=flight_ids)
+            .values("id", "plane_id", "departure_date", "arrival_date")
+        }
+
+    @staticmethod
+    def get_ids_with_reservations(flight_ids) -> set[int]:
+        return set(
+            Reservation.objects.filter(flight_id__in=flight_ids).values_list(
+                "flight_id", flat=True
+            )
+        )
+
+    @staticmethod
+    def bulk_update_planes(assignments: dict[int, int], batch_size: int = 1000):
+        """
+        Cambia el avión de varios vuelos ({flight_id: plane_id}) con UPDATE por lotes.
+        """
+        now = timezone.now()
+        flights = [
+            Flight(id=flight_id, plane_id=plane_id, updated_at=now)
+            for flight_id, plane_id in assignments.items()
+        ]
+        return Flight.objects.bulk_update(
+            flights, ["plane", "updated_at"], batch_size=batch_size
+        )
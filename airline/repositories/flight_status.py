@@ -1,4 +1,5 @@
 from airline.models import FlightStatus
+from airline.repositories.deleted_row import DeletedRowRepository
 
 
 class FlightStatusRepository:
@@ -26,7 +27,7 @@ class FlightStatusRepository:
         """
         elimina una instancia de flightstatus
         """
-        flight_status.delete()
+        DeletedRowRepository.delete(flight_status)
         return True
 
     @staticmethod
@@ -76,3 +77,10 @@ class FlightStatusRepository:
             list[FlightStatus]: Lista de coincidencias.
         """
         return FlightStatus.objects.filter(status__icontains=status)
+
+    @staticmethod
+    def get_existing_ids(ids) -> set[int]:
+        """
+        Devuelve cuáles de los IDs indicados corresponden a estados de vuelo existentes.
+        """
+        return set(FlightStatus.objects.filter(id__in=ids).values_list("id", flat=True))
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from airline.models import FlightForecast
+
+# Columnas del pronóstico que se reemplazan en cada refresco
+FORECAST_FIELDS = [
+    "capacity",
+    "sold",
+    "show_rate",
+    "expected_bookings",
+    "booking_limit",
+    "updated_at",
+]
+
+
+class ForecastRepository:
+    """
+    Repositorio de los pronósticos por vuelo (FlightForecast).
+    """
+
+    @staticmethod
+    def save_all(forecasts: list[dict]) -> int:
+        """
+        Crea o reemplaza el pronóstico de cada vuelo con un INSERT por lote
+        (ON CONFLICT ... DO UPDATE).
+        """
+        rows = [
+            FlightForecast(
+                flight_id=forecast["flight_id"],
+                **{field: forecast[field] for field in FORECAST_FIELDS},
+            )
+            for forecast in forecasts
+        ]
+        FlightForecast.objects.bulk_create(
+            rows,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["flight"],
+            update_fields=FORECAST_FIELDS,
+        )
+        return len(rows)
+
+    @staticmethod
+    def get(flight_id: int, since: datetime) -> dict | None:
+        """
+        Pronóstico del vuelo calculado desde `since`, o None.
+        """
+        return (
+            FlightForecast.objects.filter(flight_id=flight_id, updated_at__gte=since)
+            .values("flight_id", *FORECAST_FIELDS)
+            .first()
+        )
@@ -1,5 +1,6 @@
 from datetime import date
 from airline.models import Passenger, Reservation
+from airline.repositories.deleted_row import DeletedRowRepository
 
 
 class PassengerRepository:
@@ -54,7 +55,7 @@ class PassengerRepository:
             ValueError: Si el pasajero no existe.
         """
         try:
-            passenger.delete()
+            DeletedRowRepository.delete(passenger)
             return True
         except Passenger.DoesNotExist:
             raise ValueError("El pasajero no existe")
@@ -142,3 +143,21 @@ class PassengerRepository:
     @staticmethod
     def get_active_reservations(passenger: Passenger):
         return Reservation.objects.filter(passenger=passenger, status="confirmed")
+
+    @staticmethod
+    def get_existing_documents(documents) -> set[str]:
+        """
+        Devuelve cuáles de los documentos indicados ya están registrados.
+        """
+        return set(
+            Passenger.objects.filter(document__in=documents).values_list(
+                "document", flat=True
+            )
+        )
+
+    @staticmethod
+    def bulk_create(passengers: list[Passenger]) -> list[Passenger]:
+        """
+        Crea varios pasajeros con un solo INSERT.
+        """
+        return Passenger.objects.bulk_create(passengers)
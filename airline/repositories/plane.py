@@ -1,4 +1,5 @@
 from airline.models import Plane, Seat
+from airline.repositories.deleted_row import DeletedRowRepository
 
 
 class PlaneRepository:
@@ -48,7 +49,7 @@ class PlaneRepository:
             ValueError: Si el avión no existe.
         """
         try:
-            plane.delete()
+            DeletedRowRepository.delete(plane)
         except Plane.DoesNotExist:
             raise ValueError("El Avión No Existe")
 
@@ -129,3 +130,27 @@ class PlaneRepository:
     @staticmethod
     def get_seats_by_plane(plane: Plane):
         return Seat.objects.filter(plane=plane).order_by("row", "column")
+
+    @staticmethod
+    def get_existing_ids(ids) -> set[int]:
+        """
+        Devuelve cuáles de los IDs indicados corresponden a aviones existentes.
+        """
+        return set(Plane.objects.filter(id__in=ids).values_list("id", flat=True))
+
+    @staticmethod
+    def get_admin_list(query=None):
+        """
+        Aviones para el listado de administración, filtrados por modelo en la base.
+        """
+        qs = Plane.objects.order_by("id")
+        if query:
+            qs = qs.filter(model__icontains=query)
+        return qs
+
+    @staticmethod
+    def get_capacities() -> dict[int, int]:
+        """
+        Devuelve la capacidad de cada avión de la flota ({plane_id: capacity}).
+        """
+        return dict(Plane.objects.values_list("id", "capacity"))
@@ -0,0 +1,220 @@
+from datetime import date
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, F, FloatField, Q, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf, TruncDate
+
+from airline.models import Flight, FlightSales, Reservation
+from airline.utils.db_routing import read_alias
+
+# Tipo de las sumas de ingresos (como FlightSales.revenue)
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+
+class ReportRepository:
+    """
+    Repositorio del resumen de ventas por vuelo y tipo de asiento (FlightSales)
+    y de los reportes que se leen de él.
+    """
+
+    @staticmethod
+    def apply_delta(flight_id: int, seat_type: str, reservations: int, revenue):
+        """
+        Suma (o resta) reservas e ingresos a la fila del vuelo y tipo de asiento
+        con un UPDATE atómico; la crea si todavía no existe.
+        """
+        rows = FlightSales.objects.filter(flight_id=flight_id, seat_type=seat_type)
+        changes = {
+            "reservations": F("reservations") + reservations,
+            "revenue": F("revenue") + revenue,
+        }
+        if rows.update(**changes) or reservations <= 0:
+            # Una resta sin fila es una reserva de un vuelo que se está
+            # eliminando (la cascada ya borró su resumen): no hay nada que hacer
+            return
+        try:
+            with transaction.atomic():
+                FlightSales.objects.create(
+                    flight_id=flight_id,
+                    seat_type=seat_type,
+                    reservations=reservations,
+                    revenue=revenue,
+                )
+        except IntegrityError:
+            # Otra petición creó la fila en el medio
+            rows.update(**changes)
+
+    @staticmethod
+    def get_sold(flight_id: int) -> int:
+        """
+        Reservas confirmadas del vuelo según el resumen.
+        """
+        return (
+            FlightSales.objects.filter(flight_id=flight_id).aggregate(
+                sold=Sum("reservations")
+            )["sold"]
+            or 0
+        )
+
+    @staticmethod
+    def get_upcoming_sales(now):
+        """
+        Vuelos que todavía no salieron con ruta, salida, capacidad del avión y
+        reservas confirmadas según el resumen.
+        """
+        return (
+            Flight.objects.filter(departure_date__gte=now)
+            .annotate(
+                sold=Coalesce(Sum("flightsales__reservations"), Value(0)),
+                capacity=F("plane__capacity"),
+            )
+            .values("id", "origin", "destination", "departure_date", "capacity", "sold")
+            .order_by("departure_date", "id")
+        )
+
+    @staticmethod
+    def get_flight_ids_by_seat(seat_id: int) -> list[int]:
+        """
+        Vuelos con reservas confirmadas en el asiento.
+        """
+        return list(
+            Reservation.objects.filter(seat_id=seat_id, status__iexact="confirmed")
+            .values_list("flight_id", flat=True)
+            .distinct()
+        )
+
+    @staticmethod
+    def rebuild(flight_ids=None) -> int:
+        """
+        Recalcula el resumen desde las reservas confirmadas (de todos los vuelos
+        o solo de flight_ids). Devuelve la cantidad de filas generadas.
+        """
+        reservations = Reservation.objects.filter(status__iexact="confirmed")
+        summary = FlightSales.objects.all()
+        if flight_ids is not None:
+            reservations = reservations.filter(flight_id__in=flight_ids)
+            summary = summary.filter(flight_id__in=flight_ids)
+
+        rows = [
+            FlightSales(
+                flight_id=row["flight_id"],
+                seat_type=row["seat__seat_type"],
+                reservations=row["reservations"],
+                revenue=row["revenue"],
+            )
+            for row in reservations.values("flight_id", "seat__seat_type")
+            .annotate(reservations=Count("id"), revenue=Sum("price"))
+            .order_by()
+        ]
+        with transaction.atomic():
+            summary.delete()
+            FlightSales.objects.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
+    @staticmethod
+    def _flight_filters(prefix, start, end, origin, destination) -> Q:
+        filters = Q()
+        if start:
+            filters &= Q(**{f"{prefix}departure_date__date__gte": start})
+        if end:
+            filters &= Q(**{f"{prefix}departure_date__date__lte": end})
+        if origin:
+            filters &= Q(**{f"{prefix}origin__iexact": origin})
+        if destination:
+            filters &= Q(**{f"{prefix}destination__iexact": destination})
+        return filters
+
+    @staticmethod
+    def get_load_factor(
+        start: date = None, end: date = None, origin=None, destination=None
+    ):
+        """
+        Reservas confirmadas, capacidad del avión y ocupación (reservas sobre
+        capacidad; None si la capacidad es 0) de cada vuelo, ordenado por salida.
+        """
+        return (
+            Flight.objects.using(read_alias())
+            .filter(
+                ReportRepository._flight_filters("", start, end, origin, destination)
+            )
+            .annotate(
+                sold=Coalesce(Sum("flightsales__reservations"), Value(0)),
+                capacity=F("plane__capacity"),
+            )
+            .annotate(
+                load_factor=Cast("sold", FloatField())
+                / NullIf(Cast("capacity", FloatField()), Value(0.0))
+            )
+            .values(
+                "id",
+                "origin",
+                "destination",
+                "departure_date",
+                "plane_id",
+                "capacity",
+                "sold",
+                "load_factor",
+            )
+            .order_by("departure_date", "id")
+        )
+
+    @staticmethod
+    def get_revenue_by_route_day(
+        start: date = None, end: date = None, origin=None, destination=None
+    ):
+        """
+        Reservas e ingresos por ruta y día de salida.
+        """
+        return (
+            FlightSales.objects.using(read_alias())
+            .filter(
+                ReportRepository._flight_filters(
+                    "flight__", start, end, origin, destination
+                )
+            )
+            .values(
+                day=TruncDate("flight__departure_date"),
+                origin=F("flight__origin"),
+                destination=F("flight__destination"),
+            )
+            .annotate(
+                flights=Count("flight_id", distinct=True),
+                reservations=Sum("reservations"),
+                revenue=Coalesce(
+                    Sum("revenue"), Value(Decimal("0")), output_field=MONEY
+                ),
+            )
+            .filter(reservations__gt=0)
+            .order_by("day", "origin", "destination")
+        )
+
+    @staticmethod
+    def get_seat_type_mix(
+        start: date = None,
+        end: date = None,
+        origin=None,
+        destination=None,
+        flight_id: int = None,
+    ):
+        """
+        Reservas e ingresos por tipo de asiento.
+        """
+        filters = ReportRepository._flight_filters(
+            "flight__", start, end, origin, destination
+        )
+        if flight_id:
+            filters &= Q(flight_id=flight_id)
+        return (
+            FlightSales.objects.using(read_alias())
+            .filter(filters)
+            .values("seat_type")
+            .annotate(
+                reservations=Sum("reservations"),
+                revenue=Coalesce(
+                    Sum("revenue"), Value(Decimal("0")), output_field=MONEY
+                ),
+            )
+            .filter(reservations__gt=0)
+            .order_by("seat_type")
+        )
@@ -1,5 +1,9 @@
 from datetime import datetime
-from airline.models import Reservation, Flight
+from django.db.models import F
+from airline.models import ArchivedReservation, Reservation, Flight
+from airline.repositories.archive import with_archived
+from airline.repositories.deleted_row import DeletedRowRepository
+from airline.utils.db_routing import read_alias
 
 
 class ReservationRepository:
@@ -60,7 +64,7 @@ class ReservationRepository:
             ValueError: Si la reserva no existe.
         """
         try:
-            reservation.delete()
+            DeletedRowRepository.delete(reservation)
             return True
         except Reservation.DoesNotExist:
             raise ValueError("La reserva no existe")
@@ -130,32 +134,134 @@ class ReservationRepository:
     @staticmethod
     def get_by_user(user_id: int) -> list[Reservation]:
         """
-        Obtiene todas las reservas de un usuario específico.
+        Obtiene todas las reservas de un usuario específico, de la más nueva a
+        la más vieja, con vuelo, pasajero y asiento cargados en la misma consulta.
         """
-        return Reservation.objects.filter(user_id=user_id)
+        return (
+            Reservation.objects.filter(user_id=user_id)
+            .select_related("flight", "passenger", "seat")
+            .order_by("-reservation_date", "-id")
+        )
 
     @staticmethod
     def get_by_flight(flight_id: int) -> list[Reservation]:
-        return Reservation.objects.filter(flight_id=flight_id)
+        """
+        Obtiene las reservas de un vuelo ordenadas por asiento, con vuelo,
+        pasajero y asiento cargados en la misma consulta.
+        """
+        return (
+            Reservation.objects.filter(flight_id=flight_id)
+            .select_related("flight", "passenger", "seat")
+            .order_by("seat__row", "seat__column", "id")
+        )
 
     @staticmethod
-    def get_by_passenger(passenger_id: int):
+    def get_by_passenger(passenger_id: int, include_archived=False):
         """
-        Devuelve todas las reservas asociadas a un pasajero.
+        Devuelve todas las reservas asociadas a un pasajero. Con
+        include_archived se suman las de vuelos archivados (en una lista).
         """
-        return Reservation.objects.filter(passenger_id=passenger_id).order_by(
+        qs = Reservation.objects.filter(passenger_id=passenger_id).order_by(
             "-reservation_date"
         )
+        if not include_archived:
+            return qs
+        archived = ArchivedReservation.objects.filter(
+            passenger_id=passenger_id
+        ).select_related("flight")
+        return with_archived(
+            qs, archived, key=lambda row: row.reservation_date, reverse=True
+        )
 
     @staticmethod
     def get_flight_by_id(flight_id: int) -> Flight | None:
         from airline.models import Flight
 
         try:
-            return Flight.objects.get(pk=flight_id)
+            return Flight.objects.using(read_alias()).get(pk=flight_id)
         except Flight.DoesNotExist:
             return None
 
+    @staticmethod
+    async def aflight_exists(flight_id: int) -> bool:
+        return await Flight.objects.using(read_alias()).filter(pk=flight_id).aexists()
+
     @staticmethod
     def get_confirmed_reservations_by_flight(flight: Flight):
-        return Reservation.objects.filter(flight=flight, status="confirmed")
+        return (
+            Reservation.objects.using(read_alias())
+            .filter(flight=flight, status="confirmed")
+            .select_related("passenger")
+        )
+
+    @staticmethod
+    def get_reserved_seat_ids(flight_id: int) -> set[int]:
+        """
+        IDs de los asientos con reserva confirmada en el vuelo.
+        """
+        return set(
+            Reservation.objects.filter(
+                flight_id=flight_id, status="confirmed"
+            ).values_list("seat_id", flat=True)
+        )
+
+    @staticmethod
+    def iter_manifest_rows_by_flight(flight_id: int, chunk_size: int = 500):
+        """
+        Recorre las reservas confirmadas de un vuelo como diccionarios planos
+        (reserva + asiento + pasajero) con una única consulta JOIN.
+        Usa iterator() para leer por bloques sin cargar todo el resultado en memoria.
+        """
+        return ReservationRepository._manifest_rows(flight_id).iterator(
+            chunk_size=chunk_size
+        )
+
+    @staticmethod
+    def aiter_manifest_rows_by_flight(flight_id: int, chunk_size: int = 500):
+        """
+        Versión asíncrona de iter_manifest_rows_by_flight (async for).
+        """
+        return ReservationRepository._manifest_rows(flight_id).aiterator(
+            chunk_size=chunk_size
+        )
+
+    @staticmethod
+    def _manifest_rows(flight_id: int):
+        return (
+            Reservation.objects.using(read_alias())
+            .filter(flight_id=flight_id, status="confirmed")
+            .order_by("seat__row", "seat__column")
+            .values(
+                "reservation_code",
+                seat_number=F("seat__number"),
+                seat_type=F("seat__seat_type"),
+                passenger_name=F("passenger__name"),
+                document=F("passenger__document"),
+                document_type=F("passenger__document_type"),
+                email=F("passenger__email"),
+                phone=F("passenger__phone"),
+                birth_date=F("passenger__birth_date"),
+            )
+        )
+
+    @staticmethod
+    def iter_analytics_rows(chunk_size: int = 5000):
+        """
+        Recorre todas las reservas como tuplas (fecha de reserva, salida del
+        vuelo, origen, destino, precio, estado, estado del ticket) con una sola
+        consulta JOIN, leída por bloques.
+        """
+        return (
+            Reservation.objects.using(read_alias())
+            .order_by("id")
+            .values_list(
+                "reservation_date",
+                "flight__departure_date",
+                "flight__origin",
+                "flight__destination",
+                "price",
+                "status",
+                "ticket__status",
+            )
+            .iterator(chunk_size=chunk_size)
+        )
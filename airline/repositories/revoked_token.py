@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from airline.models import RevokedToken
+
+
+class RevokedTokenRepository:
+    """
+    Repositorio de la lista de tokens firmados revocados.
+    """
+
+    @staticmethod
+    def create(jti: str, user_id: int, expires_at: datetime) -> bool:
+        """
+        Registra la revocación; devuelve False si el token ya estaba revocado.
+        """
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(
+                    jti=jti, user_id=user_id, expires_at=expires_at
+                )
+        except IntegrityError:
+            return False
+        return True
+
+    @staticmethod
+    def revoke_user(jti: str, user_id: int, expires_at: datetime):
+        """
+        Crea o adelanta la revocación de todos los tokens del usuario.
+        """
+        RevokedToken.objects.update_or_create(
+            jti=jti,
+            defaults={
+                "user_id": user_id,
+                "revoked_at": timezone.now(),
+                "expires_at": expires_at,
+            },
+        )
+
+    @staticmethod
+    def is_revoked(jti: str, user_jti: str, issued_at: datetime) -> bool:
+        return RevokedToken.objects.filter(jti=jti).exists() or (
+            RevokedToken.objects.filter(
+                jti=user_jti, revoked_at__gte=issued_at
+            ).exists()
+        )
+
+    @staticmethod
+    def get_active_jtis(now: datetime, since: datetime = None):
+        """
+        jti de las revocaciones vigentes (solo las registradas desde `since`).
+        """
+        rows = RevokedToken.objects.filter(expires_at__gt=now)
+        if since is not None:
+            rows = rows.filter(revoked_at__gte=since)
+        return rows.values_list("jti", flat=True)
+
+    @staticmethod
+    def delete_expired(now: datetime) -> int:
+        return RevokedToken.objects.filter(expires_at__lte=now).delete()[0]
@@ -1,4 +1,5 @@
 from airline.models import Seat, Plane
+from airline.repositories.deleted_row import DeletedRowRepository
 from typing import Optional
 
 
@@ -33,7 +34,7 @@ class SeatRepository:
     @staticmethod
     def delete(seat: Seat) -> bool:
         try:
-            seat.delete()
+            DeletedRowRepository.delete(seat)
             return True
         except Seat.DoesNotExist:
             raise ValueError("El asiento no existe")
@@ -92,9 +93,13 @@ class SeatRepository:
 
     @staticmethod
     def get_available_by_plane(plane_id: int) -> list[Seat]:
-        return Seat.objects.filter(
-            plane_id=plane_id, status__in=["available", "disponible"]
-        ).order_by("id")
+        return (
+            Seat.objects.filter(
+                plane_id=plane_id, status__in=["available", "disponible"]
+            )
+            .select_related("plane")
+            .order_by("id")
+        )
 
     @staticmethod
     def get_seat_by_plane_and_code(plane_id: int, seat_code: str) -> Seat | None:
@@ -102,3 +107,34 @@ class SeatRepository:
             return Seat.objects.get(plane_id=plane_id, number__iexact=seat_code)
         except Seat.DoesNotExist:
             return None
+
+    @staticmethod
+    async def aget_seat_by_plane_and_code(plane_id: int, seat_code: str) -> Seat | None:
+        """
+        Versión asíncrona de get_seat_by_plane_and_code, con el avión cargado
+        en la misma consulta (en una vista asíncrona no se puede leer después).
+        """
+        try:
+            return await Seat.objects.select_related("plane").aget(
+                plane_id=plane_id, number__iexact=seat_code
+            )
+        except Seat.DoesNotExist:
+            return None
+
+    @staticmethod
+    def get_grid_rows(plane_id: int) -> list[tuple]:
+        """
+        Asientos de un avión como tuplas (id, fila, columna, número, tipo, estado),
+        con una sola consulta y sin instanciar modelos.
+        """
+        return list(
+            Seat.objects.filter(plane_id=plane_id)
+            .order_by("row", "column")
+            .values_list("id", "row", "column", "number", "seat_type", "status")
+        )
+
+    @staticmethod
+    def get_seat_type(seat_id: int) -> str | None:
+        return (
+            Seat.objects.filter(id=seat_id).values_list("seat_type", flat=True).first()
+        )
@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import Optional
+from django.db.models import F
 from airline.models import Ticket, Reservation
+from airline.repositories.deleted_row import DeletedRowRepository
 
 
 class TicketRepository:
@@ -26,7 +28,7 @@ class TicketRepository:
     @staticmethod
     def delete(ticket: Ticket) -> bool:
         try:
-            ticket.delete()
+            DeletedRowRepository.delete(ticket)
             return True
         except Ticket.DoesNotExist:
             raise ValueError("El boleto no existe")
@@ -68,3 +70,39 @@ class TicketRepository:
             return Ticket.objects.get(barcode__iexact=barcode)
         except Ticket.DoesNotExist:
             return None
+
+    @staticmethod
+    async def aget_ticket_by_barcode(barcode: str) -> Ticket | None:
+        """
+        Versión asíncrona de get_ticket_by_barcode, con la reserva, el pasajero
+        y el vuelo cargados en la misma consulta.
+        """
+        try:
+            return await Ticket.objects.select_related(
+                "reservation__passenger", "reservation__flight"
+            ).aget(barcode__iexact=barcode)
+        except Ticket.DoesNotExist:
+            return None
+
+    @staticmethod
+    def get_boarding_rows_by_flight(flight_id: int):
+        """
+        Devuelve los datos de todos los tickets de un vuelo junto con su reserva,
+        pasajero y asiento en una sola consulta (JOIN), ordenados por asiento.
+        """
+        return (
+            Ticket.objects.filter(reservation__flight_id=flight_id)
+            .order_by("reservation__seat__row", "reservation__seat__column")
+            .values(
+                "barcode",
+                "issue_date",
+                reservation_code=F("reservation__reservation_code"),
+                price=F("reservation__price"),
+                passenger_name=F("reservation__passenger__name"),
+                origin=F("reservation__flight__origin"),
+                destination=F("reservation__flight__destination"),
+                seat_row=F("reservation__seat__row"),
+                seat_column=F("reservation__seat__column"),
+                seat_type=F("reservation__seat__seat_type"),
+            )
+        )
@@ -1,4 +1,5 @@
 from airline.models import User
+from airline.repositories.deleted_row import DeletedRowRepository
 
 
 class UserRepository:
@@ -48,7 +49,7 @@ class UserRepository:
             ValueError: Si el usuario no existe.
         """
         try:
-            user.delete()
+            DeletedRowRepository.delete(user)
             return True
         except User.DoesNotExist:
             raise ValueError("El usuario no existe")
@@ -109,3 +110,10 @@ class UserRepository:
         user.is_staff = is_staff
         user.save()  # <--- El .save() SÓLO va aquí
         return user
+
+    @staticmethod
+    def get_existing_ids(ids) -> set[int]:
+        """
+        Devuelve cuáles de los IDs indicados corresponden a usuarios existentes.
+        """
+        return set(User.objects.filter(id__in=ids).values_list("id", flat=True))
@@ -0,0 +1,297 @@
+import json
+from array import array
+from pathlib import Path
+
+import numpy as np
+from django.utils import timezone
+
+from airline.repositories.reservation import ReservationRepository
+
+# Columnas de la foto de reservas: nombre -> (dtype .npy, código de array.array)
+COLUMNS = {
+    "booked": ("<i8", "q"),  # fecha de reserva, segundos epoch
+    "departure": ("<i8", "q"),  # salida del vuelo, segundos epoch
+    "route": ("<i8", "q"),  # índice en BookingColumns.routes
+    "price": ("<f8", "d"),
+    "flags": ("<i8", "q"),  # combinación de los FLAG_* de abajo
+}
+ROUTES_FILE = "routes.json"
+
+FLAG_CONFIRMED = 1  # reserva confirmada
+FLAG_TICKET = 2  # tiene ticket emitido
+FLAG_TICKET_USED = 4  # el ticket se usó (el pasajero embarcó)
+
+# Estados de ticket que indican que el pasajero se presentó
+USED_TICKET_STATUSES = {"used", "usado"}
+
+DAY = 86400
+
+# Días de anticipación que se distinguen en el histograma (más días se agrupan en el último)
+HISTOGRAM_DAYS = 365
+DEFAULT_CURVE_DAYS = 90
+DEFAULT_TOP_ROUTES = 10
+
+# Rangos de días de anticipación del resumen: (desde, hasta incluido, etiqueta)
+DAY_BUCKETS = [
+    (0, 0, "0"),
+    (1, 1, "1"),
+    (2, 3, "2-3"),
+    (4, 7, "4-7"),
+    (8, 14, "8-14"),
+    (15, 30, "15-30"),
+    (31, 60, "31-60"),
+    (61, 90, "61-90"),
+    (91, HISTOGRAM_DAYS, "91+"),
+]
+
+
+def _flags(status, ticket_status):
+    flags = FLAG_CONFIRMED if str(status).lower() == "confirmed" else 0
+    if ticket_status is not None:
+        flags |= FLAG_TICKET
+        if str(ticket_status).lower() in USED_TICKET_STATUSES:
+            flags |= FLAG_TICKET_USED
+    return flags
+
+
+class BookingColumns:
+    """
+    Reservas en formato columnar: un arreglo de NumPy por columna (en memoria
+    al cargar desde la base o mapeado al abrir una foto .npy), alineados por
+    posición. Las rutas se guardan como índice a `routes`.
+    """
+
+    def __init__(self, columns, routes):
+        self.columns = {
+            name: np.asarray(columns[name], dtype=dtype)
+            for name, (dtype, _) in COLUMNS.items()
+        }
+        self.routes = routes
+
+    def __len__(self):
+        return len(self.columns["booked"])
+
+    @classmethod
+    def from_db(cls, chunk_size=5000):
+        """
+        Carga todas las reservas con una consulta JOIN leída por bloques. Las
+        filas se acumulan en array.array (compactos) y se pasan a NumPy sin copiarlas.
+        """
+        columns = {name: array(code) for name, (_, code) in COLUMNS.items()}
+        booked, departure = columns["booked"], columns["departure"]
+        route, price, flags = columns["route"], columns["price"], columns["flags"]
+        route_index, routes = {}, []
+
+        for (
+            reservation_date,
+            departure_date,
+            origin,
+            destination,
+            amount,
+            status,
+            ticket_status,
+        ) in ReservationRepository.iter_analytics_rows(chunk_size=chunk_size):
+            key = (origin, destination)
+            code = route_index.get(key)
+            if code is None:
+                code = route_index[key] = len(routes)
+                routes.append(key)
+            booked.append(int(reservation_date.timestamp()))
+            departure.append(int(departure_date.timestamp()))
+            route.append(code)
+            price.append(float(amount or 0))
+            flags.append(_flags(status, ticket_status))
+        return cls(
+            {
+                name: np.frombuffer(column, dtype=column.typecode)
+                for name, column in columns.items()
+            },
+            routes,
+        )
+
+    def save(self, directory):
+        """
+        Guarda una foto de las columnas como archivos .npy.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in COLUMNS:
+            np.save(directory / f"{name}.npy", self.columns[name])
+        (directory / ROUTES_FILE).write_text(
+            json.dumps([list(route) for route in self.routes]), encoding="utf-8"
+        )
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Abre una foto guardada con save(); las columnas se mapean en memoria.
+        """
+        directory = Path(directory)
+        columns = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in COLUMNS
+        }
+        routes = [
+            tuple(route)
+            for route in json.loads(
+                (directory / ROUTES_FILE).read_text(encoding="utf-8")
+            )
+        ]
+        return cls(columns, routes)
+
+    @staticmethod
+    def exists(directory) -> bool:
+        return bool(directory) and (Path(directory) / ROUTES_FILE).exists()
+
+
+def days_before(booked, departure):
+    """
+    Días completos de anticipación de cada reserva (0 si se reservó después
+    de la salida).
+    """
+    return np.maximum((departure - booked) // DAY, 0)
+
+
+def _percentile(cumulative, total, fraction):
+    # Menor cantidad de días que acumula `fraction` de las reservas
+    return int(np.searchsorted(cumulative, fraction * total))
+
+
+def analyze(
+    data: BookingColumns,
+    now=None,
+    start=None,
+    end=None,
+    curve_days=DEFAULT_CURVE_DAYS,
+    top=DEFAULT_TOP_ROUTES,
+):
+    """
+    Calcula con operaciones vectorizadas sobre las columnas (solo reservas
+    confirmadas, opcionalmente con salida en [start, end)):
+    - booking_curve: porcentaje de las reservas hechas con al menos N días
+      de anticipación, de curve_days a 0
+    - days_before: media, percentiles y rangos de días de anticipación
+    - routes: rutas más reservadas con ingresos y participación
+    - no_show: reservas de vuelos ya salidos con ticket emitido que no se usó
+    """
+    now = int((now or timezone.now()).timestamp())
+    curve_days = max(0, min(curve_days, HISTOGRAM_DAYS))
+    size = len(data.routes)
+
+    columns = data.columns
+    flags = columns["flags"]
+    departure = columns["departure"]
+    selected = (flags & FLAG_CONFIRMED) != 0
+    if start:
+        selected &= departure >= int(start.timestamp())
+    if end:
+        selected &= departure < int(end.timestamp())
+    flags = flags[selected]
+    departure = departure[selected]
+    route = columns["route"][selected]
+    days = days_before(columns["booked"][selected], departure)
+
+    total = len(days)
+    histogram = np.bincount(
+        np.minimum(days, HISTOGRAM_DAYS), minlength=HISTOGRAM_DAYS + 1
+    )
+    # at_least[d] = reservas hechas con d o más días de anticipación
+    at_least = np.cumsum(histogram[::-1])[::-1]
+    cumulative = np.cumsum(histogram)
+    route_count = np.bincount(route, minlength=size)
+    route_revenue = np.bincount(
+        route, weights=columns["price"][selected], minlength=size
+    )
+    flown = (departure < now) & ((flags & FLAG_TICKET) != 0)
+    route_flown = np.bincount(route[flown], minlength=size)
+    route_no_show = np.bincount(
+        route[flown & ((flags & FLAG_TICKET_USED) == 0)], minlength=size
+    )
+
+    # Curva de reservas: acumulado desde la mayor anticipación hacia la salida
+    curve = [
+        {
+            "days_before": days_ahead,
+            "bookings": int(histogram[days_ahead]),
+            "cumulative_share": (
+                round(int(at_least[days_ahead]) / total, 4) if total else 0
+            ),
+        }
+        for days_ahead in range(curve_days, -1, -1)
+    ]
+
+    days_before_summary = {
+        "mean": round(int(days.sum()) / total, 2) if total else None,
+        "p10": _percentile(cumulative, total, 0.1) if total else None,
+        "p50": _percentile(cumulative, total, 0.5) if total else None,
+        "p90": _percentile(cumulative, total, 0.9) if total else None,
+        "buckets": [
+            {"range": label, "count": int(histogram[low : high + 1].sum())}
+            for low, high, label in DAY_BUCKETS
+        ],
+    }
+
+    route_count = route_count.tolist()
+    route_revenue = route_revenue.tolist()
+    route_flown = route_flown.tolist()
+    route_no_show = route_no_show.tolist()
+    ranking = sorted(
+        (code for code, count in enumerate(route_count) if count),
+        key=lambda code: (-route_count[code], data.routes[code]),
+    )
+
+    def route_row(code):
+        origin, destination = data.routes[code]
+        return {"origin": origin, "destination": destination}
+
+    routes = [
+        {
+            **route_row(code),
+            "reservations": route_count[code],
+            "revenue": round(route_revenue[code], 2),
+            "share": round(route_count[code] / total, 4),
+        }
+        for code in ranking[:top]
+    ]
+
+    flown = sum(route_flown)
+    no_shows = sum(route_no_show)
+    no_show = {
+        "flown": flown,
+        "no_shows": no_shows,
+        "rate": round(no_shows / flown, 4) if flown else None,
+        "by_route": [
+            {
+                **route_row(code),
+                "flown": route_flown[code],
+                "no_shows": route_no_show[code],
+                "rate": round(route_no_show[code] / route_flown[code], 4),
+            }
+            for code in ranking[:top]
+            if route_flown[code]
+        ],
+    }
+
+    return {
+        "reservations": total,
+        "booking_curve": curve,
+        "days_before": days_before_summary,
+        "routes": routes,
+        "no_show": no_show,
+    }
+
+
+class AnalyticsService:
+    """
+    Análisis del historial de reservas. Lee de una foto .npy si se indica una
+    carpeta (ver el comando analyze_bookings) y si no carga las columnas de la base.
+    """
+
+    @staticmethod
+    def load(snapshot=None) -> BookingColumns:
+        if BookingColumns.exists(snapshot):
+            return BookingColumns.load(snapshot)
+        return BookingColumns.from_db()
+
+    @staticmethod
+    def report(snapshot=None, **options) -> dict:
+        return analyze(AnalyticsService.load(snapshot), **options)
@@ -0,0 +1,157 @@
+import copy
+import hashlib
+import hmac
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from airline.models import ApiToken, User
+from airline.repositories.api_token import ApiTokenRepository
+from airline.utils.lru import LRUCache
+
+# Permisos que puede tener un token: lectura (GET/HEAD/OPTIONS), escritura y
+# endpoints de administración
+SCOPES = ("read", "write", "admin")
+
+# Formato del token: "<prefijo>.<secreto>"; el prefijo se guarda en claro para
+# buscar el token y el secreto solo como parte del hash
+PREFIX_BYTES = 6
+SECRET_BYTES = 32
+SEPARATOR = "."
+
+# Cache en memoria de tokens verificados; las claves indicadas en
+# settings.API_TOKEN_CACHE reemplazan a estas
+DEFAULT_API_TOKEN_CACHE = {
+    "SIZE": 1024,  # tokens recordados por proceso
+    "TTL": 60,  # segundos que se confía en una verificación sin volver a la base
+}
+
+
+def hash_token(raw: str) -> str:
+    # El secreto tiene 256 bits aleatorios: alcanza con un hash rápido
+    # (no hace falta un hash lento de contraseñas)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _copy(token: ApiToken) -> ApiToken:
+    # Copia del token y de su usuario: el del cache lo comparten todos los
+    # pedidos (e hilos) que usan el token y cada uno puede modificar el suyo
+    # (como request.user)
+    copied = copy.copy(token)
+    copied.user = copy.copy(token.user)
+    return copied
+
+
+def _cache_settings() -> dict:
+    return {**DEFAULT_API_TOKEN_CACHE, **getattr(settings, "API_TOKEN_CACHE", {})}
+
+
+class TokenCache(LRUCache):
+    """
+    LRU de los tokens ya verificados, indexado por el hash del token (el
+    token en claro no se guarda). Es local a cada proceso: los cambios hechos
+    en otro proceso se ven como mucho `ttl` segundos después.
+    """
+
+    def set(self, key, token: ApiToken):
+        # No se confía en el token más allá de su vencimiento
+        remaining = None
+        if token.expires_at is not None:
+            remaining = (token.expires_at - timezone.now()).total_seconds()
+        super().set(key, token, ttl=remaining)
+
+    def discard(self, token_id=None, user_id=None):
+        # Quita los tokens indicados (o todos si no se indica ninguno)
+        if token_id is None and user_id is None:
+            return super().discard()
+        super().discard(lambda token: token.id == token_id or token.user_id == user_id)
+
+
+_cache = None
+
+
+def get_token_cache() -> TokenCache:
+    global _cache
+    config = _cache_settings()
+    if _cache is None or (_cache.size, _cache.ttl) != (config["SIZE"], config["TTL"]):
+        _cache = TokenCache(config["SIZE"], config["TTL"])
+    return _cache
+
+
+class ApiTokenService:
+    """
+    Emisión, verificación y revocación de tokens de la API.
+    """
+
+    @staticmethod
+    def issue(
+        user: User, name: str, scopes=("read",), expires_in: timedelta = None
+    ) -> tuple[ApiToken, str]:
+        """
+        Crea un token y devuelve (token, token en claro). El token en claro no
+        se puede recuperar después.
+        """
+        scopes = sorted(set(scopes))
+        if not scopes:
+            raise ValueError("El token debe tener al menos un permiso")
+        unknown = set(scopes) - set(SCOPES)
+        if unknown:
+            raise ValueError(f"Permisos inválidos: {', '.join(sorted(unknown))}")
+        prefix = secrets.token_hex(PREFIX_BYTES)
+        raw = f"{prefix}{SEPARATOR}{secrets.token_urlsafe(SECRET_BYTES)}"
+        token = ApiTokenRepository.create(
+            user=user,
+            name=name,
+            prefix=prefix,
+            key_hash=hash_token(raw),
+            scopes=" ".join(scopes),
+            expires_at=timezone.now() + expires_in if expires_in else None,
+        )
+        return token, raw
+
+    @staticmethod
+    def verify(raw: str) -> ApiToken:
+        """
+        Devuelve el token válido (con su usuario) que corresponde a `raw`, o
+        None si no existe, no coincide, venció o su usuario está inactivo.
+        Las verificaciones correctas quedan en el cache en memoria; cada
+        llamada devuelve su propia copia del token y del usuario.
+        """
+        key_hash = hash_token(raw)
+        cache = get_token_cache()
+        token = cache.get(key_hash)
+        if token is not None:
+            return _copy(token)
+
+        prefix, separator, _ = raw.partition(SEPARATOR)
+        if not separator:
+            return None
+        token = ApiTokenRepository.get_by_prefix(prefix)
+        # Comparación en tiempo constante del hash guardado
+        if token is None or not hmac.compare_digest(token.key_hash, key_hash):
+            return None
+        if token.expires_at is not None and token.expires_at <= timezone.now():
+            return None
+        if not token.user.is_active:
+            return None
+        cache.set(key_hash, _copy(token))
+        return token
+
+    @staticmethod
+    def revoke(token: ApiToken) -> bool:
+        return ApiTokenRepository.delete(token)
+
+    @staticmethod
+    def get_by_user(user_id: int):
+        return ApiTokenRepository.get_by_user(user_id)
+
+    @staticmethod
+    def invalidate(token_id=None, user_id=None):
+        # También al confirmar la transacción: otra petición pudo volver a
+        # verificar el token antes de que el cambio fuera visible
+        cache = get_token_cache()
+        cache.discard(token_id=token_id, user_id=user_id)
+        transaction.on_commit(lambda: cache.discard(token_id=token_id, user_id=user_id))
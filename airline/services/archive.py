@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from airline.repositories.archive import ArchiveRepository
+from airline.utils.db_retry import retry_on_lock
+
+# Configuración por defecto; se puede reemplazar por partes con settings.ARCHIVE
+DEFAULT_ARCHIVE = {
+    # Días desde la llegada de un vuelo hasta que se archiva
+    "HORIZON_DAYS": 365,
+    # Vuelos movidos por transacción
+    "BATCH_SIZE": 200,
+}
+
+
+def archive_config() -> dict:
+    return {**DEFAULT_ARCHIVE, **getattr(settings, "ARCHIVE", {})}
+
+
+class ArchiveService:
+    """
+    Archivo de vuelos realizados: los vuelos que llegaron hace más de
+    HORIZON_DAYS días se mueven, con sus reservas y tickets, a las tablas
+    del archivo, para que las de uso diario (y sus índices) no crezcan sin
+    límite. Las búsquedas consultan el archivo solo cuando se piden datos
+    históricos (ver FlightService.filter_flights).
+    """
+
+    @staticmethod
+    def cutoff(horizon_days: int = None, now=None):
+        if horizon_days is None:
+            horizon_days = archive_config()["HORIZON_DAYS"]
+        return (now or timezone.now()) - timedelta(days=horizon_days)
+
+    @staticmethod
+    def is_historical(date) -> bool:
+        """
+        True si la fecha (date o texto YYYY-MM-DD) es anterior al horizonte
+        del archivo, es decir, si sus vuelos pueden estar archivados.
+        """
+        if isinstance(date, str):
+            try:
+                date = parse_date(date)
+            except ValueError:
+                date = None
+        return date is not None and date < ArchiveService.cutoff().date()
+
+    @staticmethod
+    def pending(horizon_days: int = None, now=None) -> int:
+        """
+        Vuelos que se archivarían con el horizonte indicado.
+        """
+        return ArchiveRepository.count_flights_before(
+            ArchiveService.cutoff(horizon_days, now)
+        )
+
+    @staticmethod
+    def archive(horizon_days: int = None, batch_size: int = None, now=None) -> int:
+        """
+        Archiva los vuelos anteriores al horizonte en tandas de batch_size,
+        cada una en su propia transacción. Devuelve la cantidad de vuelos
+        archivados.
+        """
+        config = archive_config()
+        batch_size = batch_size or config["BATCH_SIZE"]
+        cutoff = ArchiveService.cutoff(horizon_days, now)
+
+        archived = 0
+        while True:
+            flight_ids = ArchiveRepository.get_flight_ids_before(cutoff, batch_size)
+            if not flight_ids:
+                return archived
+            archived += ArchiveService._archive_batch(flight_ids)
+
+    @staticmethod
+    @retry_on_lock()
+    def _archive_batch(flight_ids) -> int:
+        return ArchiveRepository.archive_flights(flight_ids)
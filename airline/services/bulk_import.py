@@ -0,0 +1,483 @@
+import codecs
+import csv
+import json
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from airline.models import (
+    Flight,
+    Passenger,
+)  # esta bien el modelo aca ya que El Service solo recibe o devuelve objetos y llama al Repository para hacer el trabajo real.
+from airline.repositories.flight import FlightRepository
+from airline.repositories.flight_status import FlightStatusRepository
+from airline.repositories.passenger import PassengerRepository
+from airline.repositories.plane import PlaneRepository
+from airline.repositories.user import UserRepository
+from airline.services.plane_schedule import PlaneSchedule, PlaneScheduleService
+from airline.utils.cache_versions import bump_version
+
+# Filas que se validan y se insertan juntas (una transacción por bloque)
+DEFAULT_BATCH_SIZE = 500
+
+
+def iter_records(stream, fmt: str):
+    """
+    Lee un archivo de texto CSV o NDJSON fila por fila.
+    Devuelve tuplas (numero_de_linea, registro, error); si la línea no se pudo
+    interpretar, registro es None y error describe el problema.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record, None
+    elif fmt == "ndjson":
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, None, f"JSON inválido: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, None, "Cada línea debe ser un objeto JSON"
+                continue
+            yield line_number, record, None
+    else:
+        raise ValueError(f"Formato no soportado: {fmt}")
+
+
+def is_utf8(binary, chunk_size=64 * 1024) -> bool:
+    """
+    Indica si el archivo binario es UTF-8 válido. Lo lee por partes (sin
+    cargarlo completo) y lo deja al principio: un archivo mal codificado se
+    rechaza antes de guardar el primer bloque.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        for chunk in iter(lambda: binary.read(chunk_size), b""):
+            decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    finally:
+        binary.seek(0)
+    return True
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _parse_datetime(value):
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(str(value).strip())
+    except ValueError:
+        return None
+    if parsed and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _field_errors(model, values: dict) -> list[str]:
+    """
+    Errores de los valores contra las restricciones de los campos del modelo
+    (largo máximo, dígitos y decimales): las mismas que exige la base, así la
+    fila se rechaza en lugar de romper el INSERT del bloque.
+    """
+    errors = []
+    for name, value in values.items():
+        try:
+            model._meta.get_field(name).run_validators(value)
+        except ValidationError as e:
+            errors.extend(f"{name}: {message}" for message in e.messages)
+    return errors
+
+
+def _parse_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_ids(value):
+    """
+    Acepta una lista JSON de IDs o un texto separado por ';' (CSV).
+    """
+    if value in (None, ""):
+        return []
+    if isinstance(value, list):
+        items = value
+    else:
+        items = str(value).split(";")
+    ids = [_parse_int(item) for item in items if str(item).strip()]
+    return None if None in ids else ids
+
+
+def _find_plane_overlaps(candidates, pending):
+    """
+    Detecta qué vuelos se solapan con otro vuelo del mismo avión: los ya
+    guardados (una sola consulta para todos los aviones del bloque, limitada
+    al rango entre la primera salida y la última llegada del bloque) y los
+    aceptados antes en la importación (`pending`, una agenda por avión que se
+    completa a medida que se aceptan).
+    A igual conflicto gana el vuelo que sale primero.
+    Devuelve el conjunto de índices de `candidates` que se solapan.
+    """
+    if not candidates:
+        return set()
+
+    start = min(c["departure_date"] for c in candidates)
+    end = max(c["arrival_date"] for c in candidates)
+    rows = defaultdict(list)
+    for (
+        plane_id,
+        flight_id,
+        departure,
+        arrival,
+    ) in FlightRepository.get_schedules_by_planes(
+        {c["plane_id"] for c in candidates}, start, end
+    ):
+        rows[plane_id].append((flight_id, departure, arrival))
+    schedules = {plane_id: PlaneSchedule(flights) for plane_id, flights in rows.items()}
+
+    overlaps = set()
+    for i in sorted(
+        range(len(candidates)), key=lambda i: candidates[i]["departure_date"]
+    ):
+        c = candidates[i]
+        departure, arrival = c["departure_date"], c["arrival_date"]
+        existing = schedules.get(c["plane_id"])
+        accepted = pending.setdefault(c["plane_id"], PlaneSchedule())
+        if (
+            existing is not None
+            and existing.find_overlap(departure, arrival) is not None
+        ) or accepted.find_overlap(departure, arrival) is not None:
+            overlaps.add(i)
+        else:
+            accepted.add(c["line"], departure, arrival)
+    return overlaps
+
+
+class FlightImportService:
+    """
+    Importación masiva de vuelos (temporadas completas) desde CSV o NDJSON.
+    Columnas: origin, destination, departure_date, arrival_date, base_price,
+    status, plane y users (IDs separados por ';' o lista JSON).
+    """
+
+    @staticmethod
+    def _validate_batch(batch, pending):
+        """
+        Valida un bloque completo: primero cada fila por separado, después las
+        referencias (estados, aviones, usuarios) con una consulta por tabla y
+        por último los solapamientos de horario de los aviones.
+        Devuelve (filas_validas, rechazadas).
+        """
+        candidates = []
+        rejected = []
+
+        for line, record, error in batch:
+            if error:
+                rejected.append({"line": line, "errors": [error], "record": record})
+                continue
+
+            errors = []
+            origin = str(record.get("origin") or "").strip()
+            destination = str(record.get("destination") or "").strip()
+            departure = _parse_datetime(record.get("departure_date"))
+            arrival = _parse_datetime(record.get("arrival_date"))
+            status_id = _parse_int(record.get("status"))
+            plane_id = _parse_int(record.get("plane"))
+            user_ids = _parse_ids(record.get("users"))
+            try:
+                base_price = Decimal(str(record.get("base_price")))
+            except InvalidOperation:
+                base_price = None
+
+            if not origin:
+                errors.append("Falta el origen.")
+            if not destination:
+                errors.append("Falta el destino.")
+            if departure is None:
+                errors.append("Fecha de salida inválida.")
+            if arrival is None:
+                errors.append("Fecha de llegada inválida.")
+            if departure and arrival and arrival <= departure:
+                errors.append("La fecha de llegada debe ser posterior a la de salida.")
+            if base_price is None or not base_price.is_finite() or base_price <= 0:
+                errors.append("El precio base debe ser un número mayor a 0.")
+            if status_id is None:
+                errors.append("Estado de vuelo inválido.")
+            if plane_id is None:
+                errors.append("Avión inválido.")
+            if user_ids is None:
+                errors.append("Lista de usuarios inválida.")
+            if not errors:
+                errors = _field_errors(
+                    Flight,
+                    {
+                        "origin": origin,
+                        "destination": destination,
+                        "base_price": base_price,
+                    },
+                )
+
+            if errors:
+                rejected.append({"line": line, "errors": errors, "record": record})
+                continue
+
+            candidates.append(
+                {
+                    "line": line,
+                    "record": record,
+                    "origin": origin,
+                    "destination": destination,
+                    "departure_date": departure,
+                    "arrival_date": arrival,
+                    "base_price": base_price,
+                    "status_id": status_id,
+                    "plane_id": plane_id,
+                    "user_ids": user_ids,
+                }
+            )
+
+        # Referencias: una consulta por tabla para todo el bloque
+        statuses = FlightStatusRepository.get_existing_ids(
+            {c["status_id"] for c in candidates}
+        )
+        planes = PlaneRepository.get_existing_ids({c["plane_id"] for c in candidates})
+        users = UserRepository.get_existing_ids(
+            {u for c in candidates for u in c["user_ids"]}
+        )
+
+        valid = []
+        for c in candidates:
+            errors = []
+            if c["status_id"] not in statuses:
+                errors.append(f"El estado {c['status_id']} no existe.")
+            if c["plane_id"] not in planes:
+                errors.append(f"El avión {c['plane_id']} no existe.")
+            missing = [u for u in c["user_ids"] if u not in users]
+            if missing:
+                errors.append(f"Usuarios inexistentes: {missing}.")
+            if errors:
+                rejected.append(
+                    {"line": c["line"], "errors": errors, "record": c["record"]}
+                )
+            else:
+                valid.append(c)
+
+        # Solapamientos de horario de los aviones, para todo el bloque a la vez
+        overlaps = _find_plane_overlaps(valid, pending)
+        accepted = []
+        for i, c in enumerate(valid):
+            if i in overlaps:
+                rejected.append(
+                    {
+                        "line": c["line"],
+                        "errors": [
+                            "El avión seleccionado ya tiene otro vuelo asignado en ese rango horario."
+                        ],
+                        "record": c["record"],
+                    }
+                )
+            else:
+                accepted.append(c)
+
+        return accepted, rejected
+
+    @staticmethod
+    def import_records(records, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+        """
+        Importa vuelos a partir de un iterable de (linea, registro, error).
+        Cada bloque se valida completo y se guarda con bulk_create dentro de
+        su propia transacción. Devuelve un reporte con los creados y rechazados.
+        """
+        report = {"valid": 0, "created": 0, "rejected": [], "dry_run": dry_run}
+        pending = {}  # agenda por avión de los vuelos aceptados en esta importación
+
+        for batch in _batched(records, batch_size):
+            accepted, rejected = FlightImportService._validate_batch(batch, pending)
+            report["rejected"].extend(rejected)
+            report["valid"] += len(accepted)
+            if dry_run or not accepted:
+                continue
+
+            flights = [
+                Flight(
+                    origin=c["origin"],
+                    destination=c["destination"],
+                    departure_date=c["departure_date"],
+                    arrival_date=c["arrival_date"],
+                    duration=c["arrival_date"] - c["departure_date"],
+                    base_price=c["base_price"],
+                    status_id=c["status_id"],
+                    plane_id=c["plane_id"],
+                )
+                for c in accepted
+            ]
+            with transaction.atomic():
+                FlightRepository.bulk_create(
+                    flights=flights, user_ids=[c["user_ids"] for c in accepted]
+                )
+            # bulk_create no dispara señales: se actualiza el índice a mano
+            PlaneScheduleService.flights_created(flights)
+            bump_version("flights")
+            report["created"] += len(flights)
+
+        report["rejected"].sort(key=lambda r: r["line"])
+        return report
+
+
+class PassengerImportService:
+    """
+    Importación masiva de listas de pasajeros desde CSV o NDJSON.
+    Columnas: name, document, document_type, email, phone y birth_date.
+    Los documentos ya registrados (o repetidos en el archivo) se rechazan,
+    así volver a importar la misma lista no duplica pasajeros.
+    """
+
+    DOCUMENT_TYPES = {choice for choice, _ in Passenger.DOCUMENT_TYPE_CHOICES}
+
+    @staticmethod
+    def _validate_batch(batch, seen_documents):
+        candidates = []
+        rejected = []
+
+        for line, record, error in batch:
+            if error:
+                rejected.append({"line": line, "errors": [error], "record": record})
+                continue
+
+            errors = []
+            name = str(record.get("name") or "").strip()
+            document = str(record.get("document") or "").strip()
+            document_type = str(record.get("document_type") or "").strip().lower()
+            email = str(record.get("email") or "").strip()
+            phone = str(record.get("phone") or "").strip()
+            try:
+                birth_date = parse_date(str(record.get("birth_date") or "").strip())
+            except ValueError:
+                birth_date = None
+
+            if not name:
+                errors.append("Falta el nombre.")
+            if not document:
+                errors.append("Falta el documento.")
+            elif document in seen_documents:
+                errors.append("Documento repetido en el archivo.")
+            if document_type not in PassengerImportService.DOCUMENT_TYPES:
+                errors.append("Tipo de documento inválido.")
+            try:
+                validate_email(email)
+            except ValidationError:
+                errors.append("Email inválido.")
+            if not phone:
+                errors.append("Falta el teléfono.")
+            if birth_date is None:
+                errors.append("Fecha de nacimiento inválida.")
+            elif birth_date > date.today():
+                errors.append("La fecha de nacimiento no puede ser futura.")
+            if not errors:
+                errors = _field_errors(
+                    Passenger,
+                    {
+                        "name": name,
+                        "document": document,
+                        "email": email,
+                        "phone": phone,
+                    },
+                )
+
+            if errors:
+                rejected.append({"line": line, "errors": errors, "record": record})
+                continue
+
+            seen_documents.add(document)
+            candidates.append(
+                {
+                    "line": line,
+                    "record": record,
+                    "name": name,
+                    "document": document,
+                    "document_type": document_type,
+                    "email": email,
+                    "phone": phone,
+                    "birth_date": birth_date,
+                }
+            )
+
+        # Documentos ya registrados: una sola consulta para todo el bloque
+        existing = PassengerRepository.get_existing_documents(
+            [c["document"] for c in candidates]
+        )
+        accepted = []
+        for c in candidates:
+            if c["document"] in existing:
+                rejected.append(
+                    {
+                        "line": c["line"],
+                        "errors": ["El pasajero ya está registrado."],
+                        "record": c["record"],
+                    }
+                )
+            else:
+                accepted.append(c)
+        return accepted, rejected
+
+    @staticmethod
+    def import_records(records, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+        """
+        Importa pasajeros por bloques con bulk_create, una transacción por bloque.
+        """
+        report = {"valid": 0, "created": 0, "rejected": [], "dry_run": dry_run}
+        seen_documents = set()
+
+        for batch in _batched(records, batch_size):
+            accepted, rejected = PassengerImportService._validate_batch(
+                batch, seen_documents
+            )
+            report["rejected"].extend(rejected)
+            report["valid"] += len(accepted)
+            if dry_run or not accepted:
+                continue
+
+            passengers = [
+                Passenger(
+                    name=c["name"],
+                    document=c["document"],
+                    document_type=c["document_type"],
+                    email=c["email"],
+                    phone=c["phone"],
+                    birth_date=c["birth_date"],
+                )
+                for c in accepted
+            ]
+            with transaction.atomic():
+                PassengerRepository.bulk_create(passengers)
+            report["created"] += len(passengers)
+
+        report["rejected"].sort(key=lambda r: r["line"])
+        return report
+
+
+# Servicios disponibles por tipo de importación
+IMPORTERS = {
+    "flights": FlightImportService,
+    "passengers": PassengerImportService,
+}
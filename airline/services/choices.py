@@ -0,0 +1,49 @@
+from django.core.cache import cache
+from django.db import transaction
+
+from airline.services.flight_status import FlightStatusService
+from airline.services.plane import PlaneService
+
+# Claves de cache de las opciones de cada desplegable
+CHOICES_KEYS = {
+    "flight_status": "choices:flight_status",
+    "plane": "choices:plane",
+}
+
+# Opción vacía que agrega ModelChoiceField por defecto
+EMPTY_CHOICE = ("", "---------")
+
+
+class ChoicesService:
+    """
+    Opciones de los desplegables de estado de vuelo y avión compartidas por
+    todos los formularios. Se calculan una vez y quedan en el cache hasta que
+    se crea, modifica o elimina un estado o un avión (ver airline/signals.py).
+    """
+
+    @staticmethod
+    def _get(name, load):
+        choices = cache.get(CHOICES_KEYS[name])
+        if choices is None:
+            choices = [EMPTY_CHOICE, *((obj.pk, str(obj)) for obj in load())]
+            cache.set(CHOICES_KEYS[name], choices, timeout=None)
+        return choices
+
+    @staticmethod
+    def flight_statuses() -> list[tuple]:
+        return ChoicesService._get(
+            "flight_status", lambda: FlightStatusService.get_all().order_by("id")
+        )
+
+    @staticmethod
+    def planes() -> list[tuple]:
+        return ChoicesService._get(
+            "plane", lambda: PlaneService.get_all().order_by("id")
+        )
+
+    @staticmethod
+    def invalidate(name):
+        # También al confirmar la transacción: otra petición podría haber
+        # vuelto a cargar las opciones antes de que el cambio fuera visible.
+        cache.delete(CHOICES_KEYS[name])
+        transaction.on_commit(lambda: cache.delete(CHOICES_KEYS[name]))
@@ -0,0 +1,217 @@
+import heapq
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.db import transaction
+
+from airline.repositories.flight import FlightRepository
+from airline.repositories.plane import PlaneRepository
+from airline.services.plane_schedule import PlaneSchedule, PlaneScheduleService
+from airline.utils.cache_versions import bump_version
+
+# Tiempo mínimo en tierra entre dos vuelos del mismo avión
+DEFAULT_TURNAROUND = timedelta(minutes=45)
+
+
+def assign_fleet(flights, planes: dict[int, int], turnaround: timedelta):
+    """
+    Asigna aviones a vuelos con un barrido por hora de salida (coloreo
+    greedy del grafo de intervalos):
+    - los aviones libres se guardan ordenados por capacidad y a cada vuelo
+      se le da el más chico que alcance (best-fit), dejando los grandes
+      para los vuelos que los necesitan;
+    - los aviones ocupados esperan en un heap por la hora en que vuelven a
+      estar disponibles (llegada + escala);
+    - los vuelos fijos (pinned_plane) conservan su avión y a ese avión no se
+      le asigna nada que termine, con escala, después de su salida.
+
+    flights: iterable de dicts con id, departure_date, arrival_date,
+    capacity (asientos que necesita) y pinned_plane (id o None).
+    planes: {plane_id: capacity}.
+    Devuelve ({flight_id: plane_id}, [ids de vuelos sin avión disponible]).
+    """
+    flights = sorted(flights, key=lambda f: (f["departure_date"], f["arrival_date"]))
+
+    # Salidas fijas de cada avión (ya quedan ordenadas)
+    pinned = defaultdict(list)
+    for f in flights:
+        if f["pinned_plane"] is not None:
+            pinned[f["pinned_plane"]].append(f["departure_date"])
+
+    free = sorted((capacity, plane_id) for plane_id, capacity in planes.items())
+    busy = []  # heap de (disponible_desde, plane_id)
+    # plane_id -> disponible_desde vigente (las demás entradas del heap están viejas)
+    available_at = {}
+    assignment = {}
+    unassigned = []
+
+    def release(until):
+        while busy and busy[0][0] <= until:
+            at, plane_id = heapq.heappop(busy)
+            if available_at.get(plane_id) == at:
+                del available_at[plane_id]
+                insort(free, (planes[plane_id], plane_id))
+
+    def occupy(plane_id, until):
+        available_at[plane_id] = until
+        heapq.heappush(busy, (until, plane_id))
+
+    for f in flights:
+        departure, arrival = f["departure_date"], f["arrival_date"]
+        release(departure)
+        plane_id = f["pinned_plane"]
+
+        if plane_id is not None:
+            if plane_id in available_at:
+                # Datos viejos con vuelos fijos superpuestos: se extiende la ocupación
+                until = max(available_at[plane_id], arrival + turnaround)
+            else:
+                until = arrival + turnaround
+                i = bisect_left(free, (planes.get(plane_id, 0), plane_id))
+                if i < len(free) and free[i][1] == plane_id:
+                    del free[i]
+            if plane_id in planes:
+                occupy(plane_id, until)
+            assignment[f["id"]] = plane_id
+            continue
+
+        i = bisect_left(free, (f["capacity"],))
+        while i < len(free):
+            candidate = free[i][1]
+            departures = pinned.get(candidate, ())
+            j = bisect_left(departures, departure)
+            if j == len(departures) or departures[j] >= arrival + turnaround:
+                break
+            i += 1
+        else:
+            unassigned.append(f["id"])
+            continue
+
+        _, plane_id = free.pop(i)
+        occupy(plane_id, arrival + turnaround)
+        assignment[f["id"]] = plane_id
+
+    return assignment, unassigned
+
+
+class FleetAssignmentService:
+    """
+    Asignación automática de la flota a los vuelos de un rango de fechas.
+    Los vuelos con reservas quedan fijos en su avión (sus asientos pertenecen
+    a ese avión) y los vuelos fuera del rango se respetan tal como están.
+    Cada vuelo pide un avión con al menos la capacidad del que tiene hoy.
+    """
+
+    @staticmethod
+    def plan(start: datetime, end: datetime, turnaround=DEFAULT_TURNAROUND):
+        """
+        Calcula la asignación sin guardar nada.
+        Devuelve un dict con los cambios ({flight_id: (avion_actual, avion_nuevo)}),
+        los vuelos que no se pudieron asignar y la cantidad de vuelos analizados.
+        """
+        in_range, context = FlightRepository.get_fleet_rows(start, end, turnaround)
+        planes = PlaneRepository.get_capacities()
+
+        flights = [
+            {
+                **row,
+                "pinned_plane": row["plane_id"] if row["has_reservations"] else None,
+            }
+            for row in in_range
+        ]
+        flights += [{**row, "pinned_plane": row["plane_id"]} for row in context]
+
+        assignment, unassigned = assign_fleet(flights, planes, turnaround)
+
+        changes = {
+            row["id"]: (row["plane_id"], assignment[row["id"]])
+            for row in in_range
+            if assignment.get(row["id"], row["plane_id"]) != row["plane_id"]
+        }
+        return {"changes": changes, "unassigned": unassigned, "flights": len(in_range)}
+
+    @staticmethod
+    def _check_plan(changes, current, turnaround):
+        """
+        Verifica, con los vuelos ya bloqueados, que el plan siga valiendo:
+        que cada vuelo exista, siga en el avión del plan y no tenga reservas
+        (sus asientos son del avión actual), y que ningún avión destino quede
+        con vuelos superpuestos (con el tiempo de escala).
+        Lanza ValueError si algo cambió desde plan().
+        """
+        stale = sorted(
+            flight_id
+            for flight_id, (old, _) in changes.items()
+            if flight_id not in current or current[flight_id]["plane_id"] != old
+        )
+        booked = sorted(FlightRepository.get_ids_with_reservations(list(changes)))
+        if stale or booked:
+            raise ValueError(
+                "El plan quedó desactualizado: vuelos modificados, eliminados o "
+                f"con reservas ({(stale + booked)[:10]}). Vuelva a calcularlo."
+            )
+
+        # Agenda final de cada avión destino: sus vuelos que no se mueven más
+        # los que llegan, con la llegada extendida por la escala
+        moved = {
+            flight_id: (
+                new,
+                current[flight_id]["departure_date"],
+                current[flight_id]["arrival_date"] + turnaround,
+            )
+            for flight_id, (_, new) in changes.items()
+        }
+        start = min(departure for _, departure, _ in moved.values()) - turnaround
+        end = max(until for _, _, until in moved.values())
+        final = defaultdict(list)
+        for (
+            plane_id,
+            flight_id,
+            departure,
+            arrival,
+        ) in FlightRepository.get_schedules_by_planes(
+            {plane_id for plane_id, _, _ in moved.values()}, start, end
+        ):
+            if flight_id not in moved:
+                final[plane_id].append((flight_id, departure, arrival + turnaround))
+        for flight_id, (plane_id, departure, until) in moved.items():
+            final[plane_id].append((flight_id, departure, until))
+
+        for plane_id, flights in final.items():
+            schedule = PlaneSchedule(sorted(flights, key=lambda f: f[1]))
+            for flight_id, departure, until in flights:
+                if flight_id not in moved:
+                    continue
+                if (
+                    schedule.find_overlap(departure, until, exclude_id=flight_id)
+                    is not None
+                ):
+                    raise ValueError(
+                        f"El plan quedó desactualizado: el avión {plane_id} ya no "
+                        f"está libre para el vuelo {flight_id}. Vuelva a calcularlo."
+                    )
+
+    @staticmethod
+    def apply(
+        changes: dict[int, tuple[int, int]], turnaround=DEFAULT_TURNAROUND
+    ) -> int:
+        """
+        Guarda los cambios de un plan en una sola transacción, después de
+        volver a verificarlos con los vuelos bloqueados (entre plan() y
+        apply() pudo haber reservas o vuelos nuevos). Si el plan ya no vale
+        lanza ValueError y no guarda nada.
+        """
+        if not changes:
+            return 0
+        planes = {plane for pair in changes.values() for plane in pair}
+        with transaction.atomic():
+            current = FlightRepository.lock_fleet_rows(list(changes))
+            FleetAssignmentService._check_plan(changes, current, turnaround)
+            updated = FlightRepository.bulk_update_planes(
+                {flight_id: new for flight_id, (_, new) in changes.items()}
+            )
+            # bulk_update no dispara señales: se descartan las agendas en el commit
+            transaction.on_commit(lambda: PlaneScheduleService.invalidate(planes))
+            bump_version("flights")
+        return updated
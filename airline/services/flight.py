@@ -2,6 +2,7 @@ from airline.models import (
     Flight,
 )  # esta bien el modelo aca ya que El Service solo recibe o devuelve objetos y llama al Repository para hacer el trabajo real.
 from airline.repositories.flight import FlightRepository
+from airline.services.archive import ArchiveService
 
 from datetime import datetime, timedelta
 
@@ -74,6 +75,10 @@ class FlightService:
             return FlightRepository.get_by_id(flight_id=flight_id)
         return ValueError("El Vuelo No Existe")
 
+    @staticmethod
+    async def aget_by_id(flight_id: int):
+        return await FlightRepository.aget_by_id(flight_id)
+
     @staticmethod
     def search_by_origin(origin: str) -> list[Flight]:
         if origin:
@@ -81,19 +86,41 @@ class FlightService:
         return ValueError("El Origen No Existe")
 
     @staticmethod
-    def get_upcoming_flights() -> list[Flight]:
+    def get_upcoming_flights():
         """Devuelve solo los vuelos cuya fecha de salida sea hoy o posterior."""
-        all_flights = FlightRepository.get_all()
         today = datetime.now().date()  # obtenemos solo la fecha actual, sin hora
-        upcoming_flights = [
-            flight for flight in all_flights if flight.departure_date.date() >= today
-        ]
-        return upcoming_flights
+        # Se filtra en la base y se devuelve el queryset sin evaluar: si la
+        # plantilla usa un fragmento cacheado, la consulta nunca se ejecuta.
+        return FlightRepository.get_upcoming(today)
 
     @staticmethod
-    def filter_flights(origin=None, destination=None, date=None):
+    def get_admin_list(query=None, status_id=None, plane_id=None, date=None):
+        return FlightRepository.get_admin_list(
+            query=query, status_id=status_id, plane_id=plane_id, date=date
+        )
+
+    @staticmethod
+    def filter_flights(
+        origin=None, destination=None, date=None, include_archived=False
+    ):
         """
         Lógica de negocio para filtrar vuelos.
         Aquí podrías agregar validaciones, logs, etc.
+        Una fecha anterior al horizonte del archivo también busca en él.
         """
-        return FlightRepository.filter_flights(origin, destination, date)
+        include_archived = include_archived or ArchiveService.is_historical(date)
+        return FlightRepository.filter_flights(
+            origin, destination, date, include_archived=include_archived
+        )
+
+    @staticmethod
+    async def afilter_flights(
+        origin=None, destination=None, date=None, include_archived=False
+    ):
+        """
+        Versión asíncrona de filter_flights (devuelve una lista).
+        """
+        include_archived = include_archived or ArchiveService.is_historical(date)
+        return await FlightRepository.afilter_flights(
+            origin, destination, date, include_archived=include_archived
+        )
@@ -0,0 +1,215 @@
+import math
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from airline.repositories.forecast import ForecastRepository
+from airline.repositories.report import ReportRepository
+from airline.services.analytics import (
+    FLAG_CONFIRMED,
+    FLAG_TICKET,
+    FLAG_TICKET_USED,
+    HISTOGRAM_DAYS,
+    AnalyticsService,
+    days_before,
+)
+
+# Configuración por defecto; se puede reemplazar por partes con settings.OVERBOOKING
+DEFAULT_OVERBOOKING = {
+    # Probabilidad máxima aceptada de que se presenten más pasajeros que asientos
+    "RISK": 0.05,
+    # Sobreventa máxima como fracción de la capacidad
+    "MAX_RATIO": 0.10,
+    # Peso (en vuelos-pasajero) de la tasa global al suavizar la de cada ruta
+    "PRIOR_WEIGHT": 20,
+    # Vigencia (segundos) de los límites calculados; se renuevan con refresh_forecasts
+    "TIMEOUT": 2 * 24 * 60 * 60,
+}
+
+# Participación mínima de la curva para extrapolar la demanda final
+MIN_CURVE_SHARE = 0.05
+
+
+def overbooking_config() -> dict:
+    return {**DEFAULT_OVERBOOKING, **getattr(settings, "OVERBOOKING", {})}
+
+
+class RouteModel:
+    """
+    Modelo de una ruta: probabilidad de presentarse al vuelo y curva de
+    reservas (participación de las reservas hechas con al menos d días de
+    anticipación, para d de 0 a HISTOGRAM_DAYS).
+    """
+
+    def __init__(self, show_rate, curve, flown=0):
+        self.show_rate = show_rate
+        self.curve = curve
+        self.flown = flown
+
+    def share_at(self, days_before):
+        return self.curve[min(max(days_before, 0), HISTOGRAM_DAYS)]
+
+
+def _curve(histogram):
+    # curve[d] = participación de las reservas hechas con d o más días de anticipación
+    total = histogram.sum()
+    if not total:
+        return [1.0] * len(histogram)
+    return (np.cumsum(histogram[::-1])[::-1] / total).tolist()
+
+
+def fit_route_models(data, now=None, prior_weight=None):
+    """
+    Ajusta un modelo por ruta con las reservas confirmadas de vuelos ya salidos:
+    tasa de presentación (tickets usados sobre emitidos, suavizada hacia la
+    global con prior_weight) y curva de reservas. Devuelve
+    ({(origen, destino): RouteModel}, modelo global).
+    """
+    now = int((now or timezone.now()).timestamp())
+    if prior_weight is None:
+        prior_weight = overbooking_config()["PRIOR_WEIGHT"]
+    size = len(data.routes)
+    bins = HISTOGRAM_DAYS + 1
+
+    columns = data.columns
+    flags = columns["flags"]
+    departure = columns["departure"]
+    selected = ((flags & FLAG_CONFIRMED) != 0) & (departure < now)
+    flags = flags[selected]
+    route = columns["route"][selected]
+    days = np.minimum(
+        days_before(columns["booked"][selected], departure[selected]),
+        HISTOGRAM_DAYS,
+    )
+
+    # Un histograma de anticipación por ruta: una fila por ruta
+    histograms = np.bincount(route * bins + days, minlength=size * bins).reshape(
+        size, bins
+    )
+    ticket = (flags & FLAG_TICKET) != 0
+    flown = np.bincount(route[ticket], minlength=size)
+    shows = np.bincount(
+        route[ticket & ((flags & FLAG_TICKET_USED) != 0)], minlength=size
+    )
+
+    total_flown = int(flown.sum())
+    global_rate = int(shows.sum()) / total_flown if total_flown else 1.0
+    global_model = RouteModel(global_rate, _curve(histograms.sum(axis=0)), total_flown)
+
+    rates = (shows + prior_weight * global_rate) / (flown + prior_weight)
+    models = {}
+    for code, key in enumerate(data.routes):
+        histogram = histograms[code]
+        curve = _curve(histogram) if histogram.any() else global_model.curve
+        models[tuple(key)] = RouteModel(float(rates[code]), curve, int(flown[code]))
+    return models, global_model
+
+
+def _overflow_probability(bookings, capacity, show_rate):
+    # P(se presentan más de `capacity` de `bookings` pasajeros), binomial
+    if bookings <= capacity:
+        return 0.0
+    if show_rate >= 1:
+        return 1.0
+    if show_rate <= 0:
+        return 0.0
+    log_p, log_q = math.log(show_rate), math.log1p(-show_rate)
+    log_n = math.lgamma(bookings + 1)
+    return min(
+        1.0,
+        sum(
+            math.exp(
+                log_n
+                - math.lgamma(k + 1)
+                - math.lgamma(bookings - k + 1)
+                + k * log_p
+                + (bookings - k) * log_q
+            )
+            for k in range(capacity + 1, bookings + 1)
+        ),
+    )
+
+
+def overbooking_limit(capacity, show_rate, risk=None, max_ratio=None) -> int:
+    """
+    Mayor cantidad de reservas autorizadas para `capacity` asientos tal que la
+    probabilidad de que se presenten más pasajeros que asientos no supere
+    `risk`, sin pasar de capacity * (1 + max_ratio).
+    """
+    config = overbooking_config()
+    risk = config["RISK"] if risk is None else risk
+    max_ratio = config["MAX_RATIO"] if max_ratio is None else max_ratio
+    limit = capacity
+    for bookings in range(capacity + 1, math.floor(capacity * (1 + max_ratio)) + 1):
+        if _overflow_probability(bookings, capacity, show_rate) > risk:
+            break
+        limit = bookings
+    return limit
+
+
+class ForecastService:
+    """
+    Pronóstico de demanda y límite de reservas por vuelo. refresh() (comando
+    refresh_forecasts, pensado para correr periódicamente) ajusta los modelos
+    por ruta y guarda en la base (FlightForecast) el resultado de cada vuelo
+    futuro, así lo ven todos los procesos; las reservas consultan ese límite
+    y, si no hay pronóstico vigente, usan la capacidad.
+    """
+
+    @staticmethod
+    def refresh(now=None, snapshot=None, risk=None, max_ratio=None) -> list[dict]:
+        now = now or timezone.now()
+        models, global_model = fit_route_models(
+            AnalyticsService.load(snapshot), now=now
+        )
+
+        forecasts = []
+        for flight in ReportRepository.get_upcoming_sales(now):
+            model = models.get((flight["origin"], flight["destination"]), global_model)
+            days_before = (flight["departure_date"] - now).days
+            share = model.share_at(days_before)
+            capacity = flight["capacity"] or 0
+            forecast = {
+                "flight_id": flight["id"],
+                "capacity": capacity,
+                "sold": flight["sold"],
+                "show_rate": round(model.show_rate, 4),
+                "expected_bookings": (
+                    round(flight["sold"] / share, 1)
+                    if share >= MIN_CURVE_SHARE
+                    else None
+                ),
+                "booking_limit": overbooking_limit(
+                    capacity, model.show_rate, risk=risk, max_ratio=max_ratio
+                ),
+                # Momento del cálculo (la vigencia corre desde acá, no desde `now`)
+                "updated_at": timezone.now(),
+            }
+            forecasts.append(forecast)
+
+        ForecastRepository.save_all(forecasts)
+        return forecasts
+
+    @staticmethod
+    def get(flight_id: int) -> dict | None:
+        """
+        Último pronóstico del vuelo si sigue vigente (OVERBOOKING["TIMEOUT"]).
+        """
+        since = timezone.now() - timedelta(seconds=overbooking_config()["TIMEOUT"])
+        return ForecastRepository.get(flight_id, since)
+
+    @staticmethod
+    def booking_limit(flight) -> int:
+        forecast = ForecastService.get(flight.id)
+        if forecast and forecast["capacity"] == flight.plane.capacity:
+            return forecast["booking_limit"]
+        # Sin pronóstico vigente (o cambió el avión) se vende hasta la capacidad
+        return flight.plane.capacity
+
+    @staticmethod
+    def can_book(flight) -> bool:
+        return ReportRepository.get_sold(flight.id) < ForecastService.booking_limit(
+            flight
+        )
@@ -1,7 +1,9 @@
 from airline.models import (
     Plane,
 )  # esta bien el modelo aca ya que El Service solo recibe o devuelve objetos y llama al Repository para hacer el trabajo real.
+from airline.repositories.flight import FlightRepository
 from airline.repositories.plane import PlaneRepository
+from airline.services.seat_map import SeatMapService
 
 
 class PlaneService:
@@ -50,6 +52,10 @@ class PlaneService:
     def get_all() -> list[Plane]:
         return PlaneRepository.get_all()
 
+    @staticmethod
+    def get_admin_list(query=None):
+        return PlaneRepository.get_admin_list(query=query)
+
     @staticmethod
     def get_by_id(plane_id: int) -> list[Plane]:
         if plane_id:
@@ -63,30 +69,18 @@ class PlaneService:
         return ValueError("El Avion No Existe")
 
     @staticmethod
-    def get_plane_layout(plane_id: int):
+    def get_plane_layout(plane_id: int, flight_id: int | None = None):
+        """
+        Mapa de asientos serializado del avión (ver SeatMapService); con
+        flight_id incluye la ocupación y los precios de ese vuelo.
+        Devuelve None si el avión o el vuelo no existen.
+        """
         plane = PlaneRepository.get_plane_by_id(plane_id)
         if not plane:
             return None
-
-        seats = PlaneRepository.get_seats_by_plane(plane)
-
-        layout = []
-        for r in range(1, plane.rows + 1):
-            row_seats = seats.filter(row=r)
-            layout.append(
-                [
-                    {
-                        "number": seat.number,
-                        "seat_type": seat.seat_type,
-                        "status": seat.status,
-                    }
-                    for seat in row_seats
-                ]
-            )
-
-        return {
-            "plane": str(plane),
-            "rows": plane.rows,
-            "columns": plane.columns,
-            "layout": layout,
-        }
+        flight = None
+        if flight_id:
+            flight = FlightRepository.get_by_id(flight_id)
+            if not flight:
+                return None
+        return SeatMapService.serialize(plane, flight=flight)
@@ -0,0 +1,331 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from airline.repositories.flight import FlightRepository
+
+# Clave de cache con la versión de la agenda de cada avión. Cada escritura la
+# incrementa, así los demás procesos saben que su índice en memoria quedó
+# viejo. Con el cache de cada proceso (settings.SHARED_CACHE falso) no llega a
+# los demás: el índice no se guarda en memoria y se consulta la base.
+VERSION_KEY = "plane_schedule:{}"
+
+
+def _initial_version() -> int:
+    # Si la versión se pierde del cache se vuelve a crear con un valor mayor a
+    # cualquiera usado antes, para no confundirla con la de un índice viejo
+    return time.time_ns() // 1000
+
+
+class PlaneSchedule:
+    """
+    Agenda de un avión: intervalos [salida, llegada) ordenados por salida.
+    Además guarda, para cada posición, la mayor llegada hasta ese punto
+    (max_end), lo que permite responder solapamientos con búsqueda binaria
+    aunque haya datos viejos con vuelos superpuestos.
+    """
+
+    def __init__(self, flights=(), version=0):
+        """
+        flights: iterable de (id, salida, llegada) ya ordenado por salida.
+        """
+        self.version = version
+        self.ids = []
+        self.starts = []
+        self.ends = []
+        self.max_end = []
+        self._departures = {}  # id -> salida, para ubicar el vuelo al quitarlo
+        for flight_id, departure, arrival in flights:
+            self.ids.append(flight_id)
+            self.starts.append(departure)
+            self.ends.append(arrival)
+            self.max_end.append(
+                max(self.max_end[-1], arrival) if self.max_end else arrival
+            )
+            self._departures[flight_id] = departure
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, flight_id):
+        return flight_id in self._departures
+
+    def add(self, flight_id, departure: datetime, arrival: datetime):
+        pos = bisect_right(self.starts, departure)
+        self.ids.insert(pos, flight_id)
+        self.starts.insert(pos, departure)
+        self.ends.insert(pos, arrival)
+        self.max_end.insert(
+            pos, max(self.max_end[pos - 1], arrival) if pos else arrival
+        )
+        # Los máximos siguientes solo cambian mientras sean menores a esta llegada
+        for i in range(pos + 1, len(self.max_end)):
+            if self.max_end[i] >= arrival:
+                break
+            self.max_end[i] = arrival
+        self._departures[flight_id] = departure
+
+    def remove(self, flight_id):
+        departure = self._departures.pop(flight_id, None)
+        if departure is None:
+            return
+        pos = bisect_left(self.starts, departure)
+        while self.ids[pos] != flight_id:
+            pos += 1
+        del self.ids[pos], self.starts[pos], self.ends[pos], self.max_end[pos]
+        for i in range(pos, len(self.max_end)):
+            previous = self.max_end[i - 1] if i else None
+            self.max_end[i] = (
+                max(previous, self.ends[i]) if previous is not None else self.ends[i]
+            )
+
+    def find_overlap(self, departure: datetime, arrival: datetime, exclude_id=None):
+        """
+        Devuelve el id de un vuelo que se solapa con [departure, arrival), o None.
+        Solo recorre hacia atrás mientras la mayor llegada acumulada siga
+        pasando la salida pedida, por eso en una agenda sin superposiciones
+        es O(log n).
+        """
+        i = bisect_left(self.starts, arrival) - 1
+        while i >= 0 and self.max_end[i] > departure:
+            if self.ends[i] > departure and self.ids[i] != exclude_id:
+                return self.ids[i]
+            i -= 1
+        return None
+
+    def next_free_slot(self, after: datetime, duration: timedelta) -> datetime:
+        """
+        Primer horario >= after en el que entra un vuelo de la duración indicada.
+        """
+        start = after
+        i = bisect_right(self.starts, start)
+        if i and self.max_end[i - 1] > start:
+            start = self.max_end[i - 1]
+        while i < len(self.starts) and self.starts[i] < start + duration:
+            start = max(start, self.ends[i])
+            i += 1
+        return start
+
+
+# Índices cargados en este proceso
+_schedules: dict[int, PlaneSchedule] = {}
+_lock = threading.RLock()
+
+
+class PlaneScheduleService:
+    """
+    Consultas de disponibilidad de los aviones sobre un índice en memoria por
+    avión. El índice se arma con una sola consulta (usando el índice
+    (plane, departure_date, arrival_date)) y se mantiene con cada alta,
+    modificación o baja de vuelos (ver airline/signals.py); las escrituras que
+    no disparan señales tienen que llamar a flights_created o invalidate.
+    Dentro de una transacción no se guarda nada en memoria: lo leído o escrito
+    podría deshacerse con un rollback, así que el índice se descarta y se
+    vuelve a armar después del commit.
+    """
+
+    @staticmethod
+    def _bump(plane_id) -> int:
+        key = VERSION_KEY.format(plane_id)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            version = _initial_version()
+            cache.set(key, version, timeout=None)
+            return version
+
+    @staticmethod
+    def _versions(plane_ids) -> dict[int, int]:
+        """
+        Versión de la agenda de cada avión según el cache compartido, creando
+        las que falten.
+        """
+        keys = {plane_id: VERSION_KEY.format(plane_id) for plane_id in plane_ids}
+        versions = cache.get_many(keys.values())
+        for key in set(keys.values()) - set(versions):
+            cache.add(key, _initial_version(), timeout=None)
+            versions[key] = cache.get(key)
+        return {plane_id: versions[key] for plane_id, key in keys.items()}
+
+    @staticmethod
+    def preload(plane_ids) -> dict[int, PlaneSchedule]:
+        """
+        Devuelve la agenda de varios aviones, cargando con una sola consulta las
+        que no estén en memoria o cuya versión haya cambiado.
+        Sin un cache compartido no hay versiones: se cargan siempre.
+        """
+        plane_ids = set(plane_ids)
+        if not plane_ids:
+            return {}
+        if settings.SHARED_CACHE:
+            versions = PlaneScheduleService._versions(plane_ids)
+        else:
+            versions = dict.fromkeys(plane_ids, 0)
+
+        with _lock:
+            schedules = {}
+            stale = {}
+            for plane_id, version in versions.items():
+                schedule = _schedules.get(plane_id)
+                if schedule is not None and schedule.version == version:
+                    schedules[plane_id] = schedule
+                else:
+                    stale[plane_id] = version
+            if not stale:
+                return schedules
+
+            rows = {plane_id: [] for plane_id in stale}
+            for (
+                plane_id,
+                flight_id,
+                departure,
+                arrival,
+            ) in FlightRepository.get_schedules_by_planes(list(stale)):
+                rows[plane_id].append((flight_id, departure, arrival))
+            cacheable = settings.SHARED_CACHE and not connection.in_atomic_block
+            for plane_id, flights in rows.items():
+                schedule = PlaneSchedule(flights, version=stale[plane_id])
+                schedules[plane_id] = schedule
+                if cacheable:
+                    _schedules[plane_id] = schedule
+            return schedules
+
+    @staticmethod
+    def get(plane_id) -> PlaneSchedule:
+        return PlaneScheduleService.preload([plane_id])[plane_id]
+
+    @staticmethod
+    def find_overlap(plane_id, departure, arrival, exclude_id=None):
+        """
+        Devuelve el id de un vuelo del avión que se solapa con el rango, o None.
+        Con un cache compartido, si el índice en memoria tiene la versión
+        vigente responde solo, sin consultar la base; si quedó viejo se vuelve
+        a armar. Sin versión en el cache, sin cache compartido o dentro de una
+        transacción (donde el índice no se guarda) se consulta la base por el
+        índice (plane, departure_date, arrival_date).
+        """
+        if settings.SHARED_CACHE:
+            key = VERSION_KEY.format(plane_id)
+            version = cache.get(key)
+            if version is None:
+                cache.add(key, _initial_version(), timeout=None)
+            else:
+                with _lock:
+                    schedule = _schedules.get(plane_id)
+                    if schedule is None or schedule.version != version:
+                        schedule = None
+                        if not connection.in_atomic_block:
+                            schedule = PlaneScheduleService.get(plane_id)
+                    if schedule is not None:
+                        return schedule.find_overlap(
+                            departure, arrival, exclude_id=exclude_id
+                        )
+        return FlightRepository.find_plane_overlap(
+            plane_id, departure, arrival, exclude_id=exclude_id
+        )
+
+    @staticmethod
+    def has_overlap(plane_id, departure, arrival, exclude_id=None) -> bool:
+        return (
+            PlaneScheduleService.find_overlap(
+                plane_id, departure, arrival, exclude_id=exclude_id
+            )
+            is not None
+        )
+
+    @staticmethod
+    def next_free_slot(plane_id, after: datetime, duration: timedelta) -> datetime:
+        schedule = PlaneScheduleService.get(plane_id)
+        with _lock:
+            return schedule.next_free_slot(after, duration)
+
+    @staticmethod
+    def flight_saved(flight, previous_plane_id=None):
+        """
+        Actualiza el índice luego de crear o modificar un vuelo.
+        previous_plane_id: avión que tenía el vuelo antes del cambio, si se conoce.
+        """
+        with _lock:
+            planes = {flight.plane_id, previous_plane_id} - {None}
+            planes |= {p for p, s in _schedules.items() if flight.id in s}
+
+            def update():
+                for plane_id in planes:
+                    if plane_id in _schedules:
+                        _schedules[plane_id].remove(flight.id)
+                if flight.plane_id in _schedules:
+                    _schedules[flight.plane_id].add(
+                        flight.id, flight.departure_date, flight.arrival_date
+                    )
+
+            PlaneScheduleService._changed(planes, update)
+
+    @staticmethod
+    def flight_deleted(flight):
+        def update():
+            if flight.plane_id in _schedules:
+                _schedules[flight.plane_id].remove(flight.id)
+
+        PlaneScheduleService._changed({flight.plane_id}, update)
+
+    @staticmethod
+    def flights_created(flights):
+        """
+        Agrega al índice vuelos creados con bulk_create (que no dispara señales).
+        """
+
+        def update():
+            for flight in flights:
+                if flight.plane_id in _schedules:
+                    _schedules[flight.plane_id].add(
+                        flight.id, flight.departure_date, flight.arrival_date
+                    )
+
+        PlaneScheduleService._changed({flight.plane_id for flight in flights}, update)
+
+    @staticmethod
+    def _changed(plane_ids, update):
+        with _lock:
+            if connection.in_atomic_block:
+                # Puede haber rollback: se descarta el índice y se invalida en el commit
+                for plane_id in plane_ids:
+                    _schedules.pop(plane_id, None)
+                transaction.on_commit(
+                    lambda: PlaneScheduleService.invalidate(plane_ids)
+                )
+                return
+
+            update()
+            for plane_id in plane_ids:
+                # Sube la versión; si otro proceso la cambió en el medio, el
+                # índice local se descarta y se vuelve a armar en la próxima consulta.
+                version = PlaneScheduleService._bump(plane_id)
+                schedule = _schedules.get(plane_id)
+                if schedule is not None and schedule.version == version - 1:
+                    schedule.version = version
+                else:
+                    _schedules.pop(plane_id, None)
+
+    @staticmethod
+    def invalidate(plane_ids):
+        """
+        Descarta la agenda de los aviones indicados (en este y en los demás
+        procesos), por ejemplo luego de un bulk_update que no dispara señales.
+        """
+        with _lock:
+            for plane_id in plane_ids:
+                _schedules.pop(plane_id, None)
+                PlaneScheduleService._bump(plane_id)
+
+    @staticmethod
+    def clear():
+        """
+        Descarta todos los índices cargados en este proceso.
+        """
+        with _lock:
+            _schedules.clear()
@@ -0,0 +1,138 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+from airline.repositories.report import ReportRepository
+from airline.utils.cache_versions import get_version
+
+# Configuración por defecto de las tarifas; se puede reemplazar (completa o
+# por partes) con settings.PRICING.
+DEFAULT_PRICING = {
+    # Multiplicador por tipo de asiento; los tipos no listados usan 1
+    "SEAT_TYPES": {
+        "first_class": Decimal("2.50"),
+        "business": Decimal("1.60"),
+        "economico": Decimal("1.00"),
+    },
+    # (ocupación mínima, multiplicador), de mayor a menor ocupación
+    "LOAD_FACTOR": [
+        (Decimal("0.90"), Decimal("1.40")),
+        (Decimal("0.75"), Decimal("1.20")),
+        (Decimal("0.50"), Decimal("1.05")),
+        (Decimal("0"), Decimal("1.00")),
+    ],
+    # (días mínimos hasta la salida, multiplicador), de más a menos días
+    "DAYS_TO_DEPARTURE": [
+        (60, Decimal("0.85")),
+        (21, Decimal("1.00")),
+        (7, Decimal("1.15")),
+        (0, Decimal("1.35")),
+    ],
+}
+
+CENT = Decimal("0.01")
+
+# Clave de cache de la tabla de precios de un vuelo (ver PricingService.version)
+PRICE_TABLE_KEY = "price_table:{}:{}"
+
+
+def pricing_config() -> dict:
+    return {**DEFAULT_PRICING, **getattr(settings, "PRICING", {})}
+
+
+def _bucket(value, buckets):
+    # Multiplicador del primer tramo cuyo mínimo alcanza el valor
+    for minimum, multiplier in buckets:
+        if value >= minimum:
+            return Decimal(multiplier)
+    return Decimal(buckets[-1][1])
+
+
+def compute_price_table(
+    base_price, seat_types, load_factor, days_to_departure, config=None
+) -> dict:
+    """
+    Tarifa de cada tipo de asiento: precio base x tipo x ocupación x
+    anticipación. Los dos últimos factores son del vuelo, así que se calculan
+    una vez y se aplican a todos los tipos.
+    """
+    config = config or pricing_config()
+    flight_factor = _bucket(Decimal(str(load_factor)), config["LOAD_FACTOR"]) * _bucket(
+        max(days_to_departure, 0), config["DAYS_TO_DEPARTURE"]
+    )
+    base = Decimal(str(base_price)) * flight_factor
+    return {
+        seat_type: (base * Decimal(config["SEAT_TYPES"].get(seat_type, 1))).quantize(
+            CENT, rounding=ROUND_HALF_UP
+        )
+        for seat_type in seat_types
+    }
+
+
+class PricingService:
+    """
+    Precios dinámicos por vuelo y tipo de asiento. La tabla de un vuelo se
+    calcula en bloque (un cálculo por tipo de asiento, no por asiento) y queda
+    en el cache hasta que cambia una reserva del vuelo, el vuelo mismo o el día.
+    """
+
+    @staticmethod
+    def days_to_departure(flight, now=None) -> int:
+        return max((flight.departure_date - (now or timezone.now())).days, 0)
+
+    @staticmethod
+    def version(flight) -> str:
+        """
+        Parte variable de la clave de la tabla (y de los fragmentos que muestran
+        precios): reservas del vuelo, última modificación del vuelo, su avión
+        (capacidad) y días a la salida.
+        """
+        return "{}.{}.{}.{}".format(
+            get_version(f"flight:{flight.id}:seats"),
+            int(flight.updated_at.timestamp()),
+            get_version(f"plane:{flight.plane_id}"),
+            PricingService.days_to_departure(flight),
+        )
+
+    @staticmethod
+    def price_table(flight) -> dict:
+        """
+        {tipo de asiento: precio} para el vuelo. Además de los tipos
+        configurados incluye "default" para tipos desconocidos.
+        """
+        key = PRICE_TABLE_KEY.format(flight.id, PricingService.version(flight))
+        table = cache.get(key)
+        if table is None:
+            config = pricing_config()
+            capacity = flight.plane.capacity
+            load_factor = (
+                ReportRepository.get_sold(flight.id) / capacity if capacity else 1
+            )
+            table = compute_price_table(
+                flight.base_price,
+                [*config["SEAT_TYPES"], "default"],
+                load_factor,
+                PricingService.days_to_departure(flight),
+                config,
+            )
+            # Dentro de una transacción la ocupación podría incluir reservas que
+            # terminen en rollback: se usa pero no se guarda
+            if not connection.in_atomic_block:
+                cache.set(key, table, timeout=24 * 60 * 60)
+        return table
+
+    @staticmethod
+    def price_for(table: dict, seat_type) -> Decimal:
+        return table.get(seat_type, table["default"])
+
+    @staticmethod
+    def quote(flight, seat) -> Decimal:
+        """
+        Precio a cobrar por el asiento en el vuelo.
+        """
+        return PricingService.price_for(
+            PricingService.price_table(flight), seat.seat_type
+        )
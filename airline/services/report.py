@@ -0,0 +1,122 @@
+from decimal import Decimal
+
+from airline.repositories.report import ReportRepository
+from airline.repositories.seat import SeatRepository
+
+# Estado de las reservas que cuentan en los reportes de ventas
+COUNTED_STATUS = "confirmed"
+
+
+def _contribution(flight_id, seat_id, price, status):
+    # Aporte de una reserva al resumen; None si no cuenta
+    if not flight_id or not seat_id or str(status).lower() != COUNTED_STATUS:
+        return None
+    return flight_id, seat_id, Decimal(str(price or 0))
+
+
+class ReportService:
+    """
+    Reportes de ocupación e ingresos. Se leen del resumen FlightSales, que se
+    actualiza de a una reserva por vez desde las señales (alta, cambio de
+    estado, precio, vuelo o asiento, y baja) y se puede reconstruir completo
+    con el comando rebuild_reports.
+    """
+
+    @staticmethod
+    def snapshot(reservation):
+        """
+        Aporte actual de la reserva al resumen, para comparar al guardarla.
+        Se lee de __dict__ para no disparar consultas con campos diferidos.
+        """
+        values = reservation.__dict__
+        if reservation.pk is None:
+            return None
+        return _contribution(
+            values.get("flight_id"),
+            values.get("seat_id"),
+            values.get("price"),
+            values.get("status"),
+        )
+
+    @staticmethod
+    def _seat_type(reservation, seat_id):
+        seat = reservation._state.fields_cache.get("seat")
+        if seat is not None and seat.pk == seat_id:
+            return seat.seat_type
+        return SeatRepository.get_seat_type(seat_id)
+
+    @staticmethod
+    def reservation_saved(reservation, previous):
+        """
+        previous: snapshot() de la reserva al cargarla (None si es nueva).
+        """
+        current = _contribution(
+            reservation.flight_id,
+            reservation.seat_id,
+            reservation.price,
+            reservation.status,
+        )
+        if current == previous:
+            return
+        if previous is not None:
+            flight_id, seat_id, price = previous
+            ReportRepository.apply_delta(
+                flight_id, ReportService._seat_type(reservation, seat_id), -1, -price
+            )
+        if current is not None:
+            flight_id, seat_id, price = current
+            ReportRepository.apply_delta(
+                flight_id, ReportService._seat_type(reservation, seat_id), 1, price
+            )
+
+    @staticmethod
+    def reservation_deleted(reservation):
+        previous = _contribution(
+            reservation.flight_id,
+            reservation.seat_id,
+            reservation.price,
+            reservation.status,
+        )
+        if previous is not None:
+            flight_id, seat_id, price = previous
+            ReportRepository.apply_delta(
+                flight_id, ReportService._seat_type(reservation, seat_id), -1, -price
+            )
+
+    @staticmethod
+    def seat_type_changed(seat):
+        """
+        El resumen cuenta cada reserva con el tipo de asiento que tenía al
+        aplicarla: si el asiento cambia de tipo se reconstruyen los vuelos con
+        reservas confirmadas en él, así los próximos cambios de esas reservas
+        restan de la fila correcta.
+        """
+        flight_ids = ReportRepository.get_flight_ids_by_seat(seat.pk)
+        if flight_ids:
+            ReportRepository.rebuild(flight_ids=flight_ids)
+
+    @staticmethod
+    def rebuild(flight_ids=None) -> int:
+        return ReportRepository.rebuild(flight_ids=flight_ids)
+
+    @staticmethod
+    def load_factor(**filters):
+        """
+        Ocupación por vuelo: reservas confirmadas sobre la capacidad del avión.
+        """
+        return ReportRepository.get_load_factor(**filters)
+
+    @staticmethod
+    def revenue_by_route_day(**filters):
+        return ReportRepository.get_revenue_by_route_day(**filters)
+
+    @staticmethod
+    def seat_type_mix(**filters) -> list[dict]:
+        """
+        Reservas e ingresos por tipo de asiento, con su participación en el total.
+        """
+        rows = list(ReportRepository.get_seat_type_mix(**filters))
+        total = sum(row["reservations"] for row in rows)
+        for row in rows:
+            row["share"] = round(row["reservations"] / total, 4) if total else 0
+        return rows
@@ -1,8 +1,18 @@
 from datetime import datetime
+
+from django.db import transaction
+
 from airline.models import (
     Reservation,
+    Ticket,
 )  # esta bien el modelo aca ya que El Service solo recibe o devuelve objetos y llama al Repository para hacer el trabajo real.
 from airline.repositories.reservation import ReservationRepository
+from airline.repositories.seat import SeatRepository
+from airline.repositories.ticket import TicketRepository
+from airline.utils.db_retry import retry_on_lock
+
+# Filas que se leen de la base por cada bloque al exportar un manifiesto
+MANIFEST_CHUNK_SIZE = 500
 
 
 class ReservationService:
@@ -29,6 +39,46 @@ class ReservationService:
             user_id=user_id,
         )
 
+    @staticmethod
+    @retry_on_lock()
+    def book(
+        flight_id: int,
+        passenger_id: int,
+        seat_id: int,
+        user_id: int,
+        price,
+        reservation_code: str,
+        barcode: str = None,
+    ) -> tuple[Reservation, Ticket]:
+        """
+        Reserva el asiento: lo marca ocupado, crea la reserva confirmada y,
+        si se indica barcode, su ticket. Todo en una transacción (en SQLite
+        empieza con BEGIN IMMEDIATE, ver efi/database.py) que se reintenta si
+        la base está bloqueada por otra escritura.
+        Lanza ValueError si el asiento no existe o ya está ocupado.
+        """
+        with transaction.atomic():
+            SeatRepository.mark_as_taken(seat_id)
+            reservation = ReservationRepository.create(
+                status="confirmed",
+                reservation_date=datetime.now(),
+                price=price,
+                reservation_code=reservation_code,
+                flight_id=flight_id,
+                passenger_id=passenger_id,
+                seat_id=seat_id,
+                user_id=user_id,
+            )
+            ticket = None
+            if barcode:
+                ticket = TicketRepository.create(
+                    barcode=barcode,
+                    issue_date=datetime.now(),
+                    status="active",
+                    reservation_id=reservation.id,
+                )
+        return reservation, ticket
+
     @staticmethod
     def delete(reservation_id: int) -> bool:
         reservation = ReservationRepository.get_by_id(reservation_id=reservation_id)
@@ -90,11 +140,14 @@ class ReservationService:
         return ReservationRepository.get_by_flight(flight_id=flight_id)
 
     @staticmethod
-    def get_by_passenger(passenger_id: int):
+    def get_by_passenger(passenger_id: int, include_archived=False):
         """
         devuelve todas las reservas asociadas a un pasajero usando el repo
+        (con include_archived, también las de vuelos archivados)
         """
-        return ReservationRepository.get_by_passenger(passenger_id)
+        return ReservationRepository.get_by_passenger(
+            passenger_id, include_archived=include_archived
+        )
 
     @staticmethod
     def get_passengers_by_flight(flight_id: int):
@@ -107,3 +160,30 @@ class ReservationService:
         )
         passengers = [res.passenger for res in reservations]
         return passengers
+
+    @staticmethod
+    def iter_manifest(flight_id: int):
+        """
+        Devuelve un iterador con una fila por pasajero confirmado del vuelo,
+        o None si el vuelo no existe (la view decide 404).
+        """
+        flight = ReservationRepository.get_flight_by_id(flight_id)
+        if not flight:
+            return None
+
+        return ReservationRepository.iter_manifest_rows_by_flight(
+            flight_id=flight.id, chunk_size=MANIFEST_CHUNK_SIZE
+        )
+
+    @staticmethod
+    async def aiter_manifest(flight_id: int):
+        """
+        Versión asíncrona de iter_manifest: un iterador asíncrono de filas, o
+        None si el vuelo no existe.
+        """
+        if not await ReservationRepository.aflight_exists(flight_id):
+            return None
+
+        return ReservationRepository.aiter_manifest_rows_by_flight(
+            flight_id=flight_id, chunk_size=MANIFEST_CHUNK_SIZE
+        )
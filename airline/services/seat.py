@@ -91,6 +91,18 @@ class SeatService:
         if not seat:
             return None  # la view se encarga del 404
 
+        return SeatService._availability(seat)
+
+    @staticmethod
+    async def acheck_availability(plane_id: int, seat_code: str):
+        seat = await SeatRepository.aget_seat_by_plane_and_code(plane_id, seat_code)
+        if not seat:
+            return None
+
+        return SeatService._availability(seat)
+
+    @staticmethod
+    def _availability(seat) -> dict:
         return {
             "seat_code": seat.number,
             "plane": str(seat.plane),
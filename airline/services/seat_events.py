@@ -0,0 +1,192 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+
+from airline.repositories.reservation import ReservationRepository
+from airline.services.seat_map import AVAILABLE_STATUSES, SeatMapService
+from airline.utils.cache_versions import get_version
+from airline.utils.pubsub import Hub
+
+# Configuración por defecto; se puede reemplazar por partes con settings.SEAT_EVENTS
+DEFAULT_SEAT_EVENTS = {
+    # Segundos que se juntan los cambios en ráfaga antes de enviarlos
+    "COALESCE": 0.2,
+    # Segundos sin cambios tras los que se envía un comentario (mantiene viva
+    # la conexión) y se revisa si otro proceso cambió el vuelo
+    "HEARTBEAT": 15,
+    # Duración máxima de una conexión; el navegador se reconecta solo
+    "MAX_SECONDS": 300,
+    # Espera del navegador antes de reconectarse (milisegundos)
+    "RETRY_MS": 3000,
+}
+
+_hub = Hub()
+
+
+def seat_events_config() -> dict:
+    return {**DEFAULT_SEAT_EVENTS, **getattr(settings, "SEAT_EVENTS", {})}
+
+
+def get_seat_hub() -> Hub:
+    return _hub
+
+
+def flight_topic(flight_id) -> str:
+    return f"flight:{flight_id}"
+
+
+def plane_topic(plane_id) -> str:
+    return f"plane:{plane_id}"
+
+
+def _seat(seat_id, state) -> dict:
+    return {
+        "id": seat_id,
+        "status": state["status"],
+        "occupied": state["occupied"],
+        "available": not state["occupied"]
+        and str(state["status"]).lower() in AVAILABLE_STATUSES,
+    }
+
+
+def _event(name, data) -> str:
+    return f"event: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class SeatEventService:
+    """
+    Cambios de disponibilidad de los asientos de un vuelo, enviados en vivo
+    (server-sent events) a los mapas de selección abiertos. Las señales de
+    Reservation y Seat publican los cambios al confirmarse la transacción;
+    cada conexión recibe primero el estado completo y después solo los
+    asientos que cambiaron.
+
+    Los cambios se publican en memoria: los de otros procesos se detectan
+    por los sellos de versión del cache (ver stream), que tiene que ser
+    compartido (efi/cache.py).
+    """
+
+    @staticmethod
+    def reservation_saved(reservation, previous):
+        """
+        previous: ReportService.snapshot() de la reserva al cargarla, con el
+        vuelo y el asiento que ocupaba (None si no ocupaba ninguno).
+        """
+        before = previous[:2] if previous else None
+        now = None
+        if str(reservation.status).lower() == "confirmed":
+            now = (reservation.flight_id, reservation.seat_id)
+        if before == now:
+            return
+        if before:
+            SeatEventService._publish(
+                flight_topic(before[0]), {before[1]: {"occupied": False}}
+            )
+        if now:
+            SeatEventService._publish(
+                flight_topic(now[0]), {now[1]: {"occupied": True}}
+            )
+
+    @staticmethod
+    def reservation_deleted(reservation):
+        if str(reservation.status).lower() == "confirmed":
+            SeatEventService._publish(
+                flight_topic(reservation.flight_id),
+                {reservation.seat_id: {"occupied": False}},
+            )
+
+    @staticmethod
+    def seat_saved(seat, deleted=False):
+        SeatEventService._publish(
+            plane_topic(seat.plane_id),
+            {seat.id: {"status": None if deleted else seat.status}},
+        )
+
+    @staticmethod
+    def _publish(topic, changes):
+        # Sin conexiones abiertas no se registra nada; los cambios se
+        # publican solo si la transacción se confirma
+        hub = get_seat_hub()
+        if hub.has_subscribers(topic):
+            transaction.on_commit(lambda: hub.publish(topic, changes))
+
+    @staticmethod
+    def seat_states(flight) -> dict:
+        """
+        Estado de cada asiento del avión del vuelo: {id: {status, occupied}}.
+        """
+        seat_map = SeatMapService.get(flight.plane)
+        occupied = ReservationRepository.get_reserved_seat_ids(flight.id)
+        return {
+            seat_id: {
+                "status": seat_map.status_labels[seat_map.statuses[i]],
+                "occupied": seat_id in occupied,
+            }
+            for i, seat_id in enumerate(seat_map.seat_ids)
+            if seat_id
+        }
+
+    @staticmethod
+    def versions(flight) -> tuple:
+        return (
+            get_version(f"flight:{flight.id}:seats"),
+            get_version(f"plane:{flight.plane_id}"),
+        )
+
+    @staticmethod
+    async def stream(flight):
+        """
+        Generador asíncrono del flujo text/event-stream de un vuelo: un evento
+        "snapshot" con todos los asientos y después eventos "seats" con los
+        que cambiaron ({id, status, occupied, available}).
+        """
+        config = seat_events_config()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + config["MAX_SECONDS"]
+
+        # Primero la suscripción y después el estado: un cambio en el medio
+        # llega dos veces en lugar de perderse
+        with get_seat_hub().subscribe(
+            flight_topic(flight.id), plane_topic(flight.plane_id)
+        ) as subscription:
+            versions = await sync_to_async(SeatEventService.versions)(flight)
+            states = await sync_to_async(SeatEventService.seat_states)(flight)
+            yield f"retry: {config['RETRY_MS']}\n\n"
+            yield _event(
+                "snapshot", [_seat(seat_id, state) for seat_id, state in states.items()]
+            )
+
+            while loop.time() < deadline:
+                timeout = min(config["HEARTBEAT"], deadline - loop.time())
+                changes = await subscription.wait(timeout, config["COALESCE"])
+                current = await sync_to_async(SeatEventService.versions)(flight)
+                if not changes:
+                    if current == versions:
+                        yield ": ping\n\n"
+                        continue
+                    # Otro proceso cambió el vuelo o el avión: se compara
+                    # contra el estado completo
+                    changes = await sync_to_async(SeatEventService.seat_states)(flight)
+                # Los cambios publicados en este proceso también suben los
+                # sellos: se toman los nuevos para no recargar todo en el
+                # próximo heartbeat
+                versions = current
+
+                diff = []
+                for seat_id, fields in changes.items():
+                    state = states.get(seat_id)
+                    if state is None:
+                        # Asiento agregado al avión después de conectarse
+                        if fields.get("status") is None:
+                            continue
+                        state = states[seat_id] = {"status": None, "occupied": False}
+                    before = _seat(seat_id, state)
+                    state.update(fields)
+                    after = _seat(seat_id, state)
+                    if after != before:
+                        diff.append(after)
+                if diff:
+                    yield _event("seats", diff)
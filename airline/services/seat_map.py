@@ -0,0 +1,216 @@
+import string
+from array import array
+
+from django.core.cache import cache
+from django.db import connection
+
+from airline.repositories.reservation import ReservationRepository
+from airline.repositories.seat import SeatRepository
+from airline.services.pricing import PricingService
+from airline.utils.cache_versions import get_version
+
+# Clave de cache de la grilla de cada avión; incluye la versión "plane:{id}",
+# que suben las señales al cambiar el avión o alguno de sus asientos.
+SEAT_MAP_KEY = "seat_map:{}:{}"
+
+# Máximo de bloques de columnas (secciones separadas por pasillos)
+MAX_BLOCKS = 3
+
+# Marca de pasillo en las filas para las plantillas
+AISLE = "PASILLO"
+
+AVAILABLE_STATUSES = {"available", "disponible"}
+
+
+def split_blocks(columns: int, max_blocks: int = MAX_BLOCKS) -> list[int]:
+    """
+    Reparte las columnas en bloques balanceados; las sobrantes van a los
+    primeros bloques. Ej.: 7 columnas -> [3, 2, 2].
+    """
+    base, extra = divmod(columns, max_blocks)
+    blocks = [base + (1 if i < extra else 0) for i in range(max_blocks)]
+    return [b for b in blocks if b > 0]
+
+
+class SeatMap:
+    """
+    Grilla de asientos de un avión guardada en arreglos planos indexados por
+    fila * columnas + columna: id del asiento (0 = posición vacía), número y
+    códigos de tipo y estado (0 = sin asiento). Es independiente del vuelo: la
+    ocupación se cruza al serializar.
+    """
+
+    def __init__(self, plane_id, plane_label, rows, columns, seats=()):
+        """
+        seats: tuplas (id, fila, columna, número, tipo, estado), como las
+        devuelve SeatRepository.get_grid_rows.
+        """
+        seats = [
+            (seat_id, row, column.upper(), number, seat_type, status)
+            for seat_id, row, column, number, seat_type, status in seats
+            if row >= 1 and column and column.upper() in string.ascii_uppercase
+        ]
+        # La grilla cubre también asientos que quedaron fuera de las
+        # dimensiones declaradas del avión
+        self.plane_id = plane_id
+        self.plane_label = plane_label
+        self.rows = max([rows, *(seat[1] for seat in seats)])
+        self.columns = max(
+            [columns, *(string.ascii_uppercase.index(seat[2]) + 1 for seat in seats)]
+        )
+        self.column_labels = list(string.ascii_uppercase[: self.columns])
+        self.blocks = split_blocks(self.columns)
+
+        size = self.rows * self.columns
+        self.seat_ids = array("q", bytes(8 * size))
+        self.numbers = [None] * size
+        self.types = bytearray(size)
+        self.statuses = bytearray(size)
+        self.type_labels = [None]
+        self.status_labels = [None]
+        type_codes, status_codes = {}, {}
+
+        for seat_id, row, column, number, seat_type, status in seats:
+            i = self.index(row, column)
+            self.seat_ids[i] = seat_id
+            self.numbers[i] = number
+            self.types[i] = self._code(seat_type, type_codes, self.type_labels)
+            self.statuses[i] = self._code(status, status_codes, self.status_labels)
+
+    @staticmethod
+    def _code(label, codes, labels):
+        code = codes.get(label)
+        if code is None:
+            code = codes[label] = len(labels)
+            labels.append(label)
+        return code
+
+    def index(self, row: int, column: str) -> int:
+        return (row - 1) * self.columns + string.ascii_uppercase.index(column)
+
+    def __len__(self):
+        # Cantidad de asientos cargados
+        return sum(1 for seat_id in self.seat_ids if seat_id)
+
+    def serialize(self, occupied_seat_ids=(), prices=None) -> dict:
+        """
+        Representación única del mapa para la API y las plantillas.
+        layout tiene una lista por fila con un diccionario por columna
+        (None si no hay asiento en esa posición); aisles indica después de
+        qué columnas (índice desde 0) hay un pasillo. Con prices (tabla de
+        PricingService) cada asiento incluye su precio.
+        """
+        occupied_seat_ids = set(occupied_seat_ids)
+        # Precio de cada código de tipo de asiento, resuelto una sola vez (como
+        # texto, igual que los DecimalField de los serializers)
+        type_prices = (
+            [None]
+            + [
+                str(PricingService.price_for(prices, label))
+                for label in self.type_labels[1:]
+            ]
+            if prices
+            else None
+        )
+        layout = []
+        for row in range(self.rows):
+            cells = []
+            for col in range(self.columns):
+                i = row * self.columns + col
+                seat_id = self.seat_ids[i]
+                if not seat_id:
+                    cells.append(None)
+                    continue
+                status = self.status_labels[self.statuses[i]]
+                occupied = seat_id in occupied_seat_ids
+                cell = {
+                    "id": seat_id,
+                    "number": self.numbers[i],
+                    "row": row + 1,
+                    "column": self.column_labels[col],
+                    "seat_type": self.type_labels[self.types[i]],
+                    "status": status,
+                    "occupied": occupied,
+                    "available": not occupied
+                    and str(status).lower() in AVAILABLE_STATUSES,
+                }
+                if type_prices:
+                    cell["price"] = type_prices[self.types[i]]
+                cells.append(cell)
+            layout.append(cells)
+
+        aisles, edge = [], 0
+        for block in self.blocks[:-1]:
+            edge += block
+            aisles.append(edge - 1)
+
+        return {
+            "plane": self.plane_label,
+            "plane_id": self.plane_id,
+            "rows": self.rows,
+            "columns": self.columns,
+            "column_labels": self.column_labels,
+            "blocks": self.blocks,
+            "aisles": aisles,
+            "layout": layout,
+        }
+
+
+def with_aisles(data: dict) -> list[list]:
+    """
+    Filas del mapa serializado con la marca AISLE entre bloques, para las plantillas.
+    """
+    aisles = set(data["aisles"])
+    rows = []
+    for cells in data["layout"]:
+        row = []
+        for col, cell in enumerate(cells):
+            row.append(cell)
+            if col in aisles:
+                row.append(AISLE)
+        rows.append(row)
+    return rows
+
+
+class SeatMapService:
+    """
+    Mapa de asientos compartido por la selección de asiento, el detalle del
+    avión y la API. La grilla de cada avión se arma con una consulta y queda
+    en el cache hasta que cambia el avión o sus asientos; la ocupación de un
+    vuelo se consulta aparte (una consulta por render) y los precios salen de
+    la tabla del vuelo.
+    """
+
+    @staticmethod
+    def get(plane) -> SeatMap:
+        key = SEAT_MAP_KEY.format(plane.id, get_version(f"plane:{plane.id}"))
+        seat_map = cache.get(key)
+        if seat_map is None:
+            seat_map = SeatMap(
+                plane.id,
+                str(plane),
+                plane.rows,
+                plane.columns,
+                SeatRepository.get_grid_rows(plane.id),
+            )
+            # Dentro de una transacción la grilla podría incluir cambios que
+            # terminen en rollback: se usa pero no se guarda
+            if not connection.in_atomic_block:
+                cache.set(key, seat_map, timeout=None)
+        return seat_map
+
+    @staticmethod
+    def serialize(plane, flight=None) -> dict:
+        """
+        Mapa del avión; con flight incluye la ocupación y el precio de cada asiento.
+        """
+        if flight is None:
+            return SeatMapService.get(plane).serialize()
+        return SeatMapService.get(plane).serialize(
+            ReservationRepository.get_reserved_seat_ids(flight.id),
+            prices=PricingService.price_table(flight),
+        )
+
+    @staticmethod
+    def display_rows(plane, flight=None) -> list[list]:
+        return with_aisles(SeatMapService.serialize(plane, flight))
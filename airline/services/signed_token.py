@@ -0,0 +1,245 @@
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+from airline.models import User
+from airline.repositories.revoked_token import RevokedTokenRepository
+from airline.utils.bloom import BloomFilter
+
+# Tipos de token: el de acceso autentica los pedidos y el de renovación solo
+# sirve para obtener un par nuevo (ver SignedTokenService.refresh)
+ACCESS = "access"
+REFRESH = "refresh"
+
+SALT = "airline.signed_token"
+
+# Las claves indicadas en settings.SIGNED_TOKENS reemplazan a estas
+DEFAULT_SIGNED_TOKENS = {
+    "KEY": None,  # clave del HMAC; por defecto SECRET_KEY
+    "ACCESS_LIFETIME": timedelta(minutes=5),
+    "REFRESH_LIFETIME": timedelta(days=7),
+    # Lista de revocados en memoria: se trae lo nuevo de la tabla cada
+    # SYNC_INTERVAL segundos y se reconstruye entera (sin los vencidos) cada
+    # REBUILD_INTERVAL segundos
+    "SYNC_INTERVAL": 5,
+    "REBUILD_INTERVAL": 3600,
+    "DENYLIST_CAPACITY": 100_000,
+    "DENYLIST_ERROR_RATE": 0.001,
+}
+
+# Las filas nuevas se releen con este margen: una revocación confirmada
+# después de la sincronización puede tener un revoked_at anterior
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+def _config() -> dict:
+    return {**DEFAULT_SIGNED_TOKENS, **getattr(settings, "SIGNED_TOKENS", {})}
+
+
+def user_jti(user_id) -> str:
+    return f"user:{user_id}"
+
+
+def _datetime(epoch) -> datetime:
+    return datetime.fromtimestamp(epoch, tz=dt_timezone.utc)
+
+
+class Denylist:
+    """
+    Filtro de Bloom con los jti revocados, sincronizado desde RevokedToken.
+    Si el filtro dice que no, el token no está revocado sin consultar la
+    base; si dice que tal vez, se confirma en la tabla. Es local a cada
+    proceso: una revocación hecha en otro proceso se ve como mucho
+    SYNC_INTERVAL segundos después.
+    """
+
+    def __init__(self, capacity, error_rate, sync_interval, rebuild_interval):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self._lock = threading.Lock()
+        self.bloom = None
+        self.rebuilt_at = self.synced_at = float("-inf")
+        self.since = None
+
+    def add(self, jti: str):
+        with self._lock:
+            if self.bloom is not None:
+                self.bloom.add(jti)
+
+    def might_contain(self, *jtis) -> bool:
+        self._maybe_sync()
+        bloom = self.bloom
+        return any(jti in bloom for jti in jtis)
+
+    def _maybe_sync(self):
+        now = time.monotonic()
+        if now - self.synced_at < self.sync_interval and self.bloom is not None:
+            return
+        with self._lock:
+            if now - self.rebuilt_at >= self.rebuild_interval or self.bloom is None:
+                self._rebuild(now)
+            elif now - self.synced_at >= self.sync_interval:
+                self._sync(now)
+
+    def _rebuild(self, now):
+        wall = timezone.now()
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        for jti in RevokedTokenRepository.get_active_jtis(wall).iterator():
+            bloom.add(jti)
+        self.bloom = bloom
+        self.rebuilt_at = self.synced_at = now
+        self.since = wall - SYNC_OVERLAP
+
+    def _sync(self, now):
+        wall = timezone.now()
+        for jti in RevokedTokenRepository.get_active_jtis(wall, since=self.since):
+            self.bloom.add(jti)
+        self.synced_at = now
+        self.since = wall - SYNC_OVERLAP
+
+
+_denylist = None
+
+
+def get_denylist() -> Denylist:
+    global _denylist
+    config = _config()
+    size = (config["DENYLIST_CAPACITY"], config["DENYLIST_ERROR_RATE"])
+    if _denylist is None or (_denylist.capacity, _denylist.error_rate) != size:
+        _denylist = Denylist(*size, config["SYNC_INTERVAL"], config["REBUILD_INTERVAL"])
+    else:
+        # Cambiar los intervalos no obliga a reconstruir el filtro
+        _denylist.sync_interval = config["SYNC_INTERVAL"]
+        _denylist.rebuild_interval = config["REBUILD_INTERVAL"]
+    return _denylist
+
+
+def reset_denylist():
+    # Descarta la lista en memoria; se reconstruye en la próxima verificación
+    global _denylist
+    _denylist = None
+
+
+class SignedTokenService:
+    """
+    Tokens firmados con HMAC (django.core.signing) que se verifican sin
+    consultar la base: llevan el usuario, sus permisos de staff, el tipo,
+    un id (jti) y las fechas de emisión y vencimiento.
+    """
+
+    @staticmethod
+    def _encode(user: User, typ: str, lifetime: timedelta, now: float) -> str:
+        claims = {
+            "uid": user.pk,
+            "usr": user.get_username(),
+            "stf": user.is_staff,
+            "sup": user.is_superuser,
+            "typ": typ,
+            "jti": secrets.token_urlsafe(16),
+            "iat": round(now, 3),
+            "exp": int(now + lifetime.total_seconds()),
+        }
+        return signing.dumps(claims, key=_config()["KEY"], salt=SALT)
+
+    @staticmethod
+    def issue_pair(user: User, now: float = None) -> dict:
+        now = time.time() if now is None else now
+        config = _config()
+        return {
+            ACCESS: SignedTokenService._encode(
+                user, ACCESS, config["ACCESS_LIFETIME"], now
+            ),
+            REFRESH: SignedTokenService._encode(
+                user, REFRESH, config["REFRESH_LIFETIME"], now
+            ),
+        }
+
+    @staticmethod
+    def verify(raw: str, typ: str = ACCESS, now: float = None) -> dict:
+        """
+        Devuelve los datos del token si la firma es válida, es del tipo
+        pedido, no venció y no fue revocado; si no, None.
+        """
+        try:
+            claims = signing.loads(raw, key=_config()["KEY"], salt=SALT)
+        except signing.BadSignature:
+            return None
+        now = time.time() if now is None else now
+        if claims.get("typ") != typ or claims.get("exp", 0) <= now:
+            return None
+        if get_denylist().might_contain(claims["jti"], user_jti(claims["uid"])):
+            if RevokedTokenRepository.is_revoked(
+                claims["jti"], user_jti(claims["uid"]), _datetime(claims["iat"])
+            ):
+                return None
+        return claims
+
+    @staticmethod
+    def user_from_claims(claims: dict) -> User:
+        """
+        Usuario armado con los datos del token, sin consultar la base. Solo
+        trae id, username y permisos de staff: no se debe guardar.
+        """
+        user = User(
+            id=claims["uid"],
+            username=claims["usr"],
+            is_staff=claims["stf"],
+            is_superuser=claims["sup"],
+            is_active=True,
+        )
+        user._state.adding = False
+        return user
+
+    @staticmethod
+    def revoke(raw: str, typ: str = None) -> dict:
+        """
+        Revoca un token válido (de cualquier tipo si no se indica). Devuelve
+        sus datos, o None si era inválido o ya estaba revocado.
+        """
+        for kind in (typ,) if typ else (ACCESS, REFRESH):
+            claims = SignedTokenService.verify(raw, typ=kind)
+            if claims is not None:
+                break
+        else:
+            return None
+        if not RevokedTokenRepository.create(
+            claims["jti"], claims["uid"], _datetime(claims["exp"])
+        ):
+            return None
+        get_denylist().add(claims["jti"])
+        return claims
+
+    @staticmethod
+    def refresh(raw: str) -> dict:
+        """
+        Cambia un token de renovación por un par nuevo. El token usado queda
+        revocado, así que cada uno sirve una sola vez. None si no es válido.
+        """
+        claims = SignedTokenService.revoke(raw, typ=REFRESH)
+        if claims is None:
+            return None
+        user = User.objects.filter(pk=claims["uid"], is_active=True).first()
+        if user is None:
+            return None
+        return SignedTokenService.issue_pair(user)
+
+    @staticmethod
+    def revoke_user(user_id: int):
+        """
+        Revoca todos los tokens emitidos hasta ahora para el usuario.
+        """
+        jti = user_jti(user_id)
+        expires_at = timezone.now() + _config()["REFRESH_LIFETIME"]
+        RevokedTokenRepository.revoke_user(jti, user_id, expires_at)
+        get_denylist().add(jti)
+
+    @staticmethod
+    def purge_expired() -> int:
+        return RevokedTokenRepository.delete_expired(timezone.now())
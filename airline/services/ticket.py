@@ -96,6 +96,18 @@ class TicketService:
         if not ticket:
             return None  # la view decide si lanza 404
 
+        return TicketService._info(ticket)
+
+    @staticmethod
+    async def aget_ticket_info(barcode: str):
+        ticket = await TicketRepository.aget_ticket_by_barcode(barcode)
+        if not ticket:
+            return None
+
+        return TicketService._info(ticket)
+
+    @staticmethod
+    def _info(ticket) -> dict:
         return {
             "barcode": ticket.barcode,
             "status": ticket.status,
@@ -106,3 +118,11 @@ class TicketService:
                 "flight": str(ticket.reservation.flight),
             },
         }
+
+    @staticmethod
+    def get_boarding_data_by_flight(flight_id: int) -> list[dict]:
+        """
+        Devuelve los datos de impresión de todos los tickets de un vuelo
+        (un dict por ticket, listo para ticket_pdf) usando una única consulta.
+        """
+        return list(TicketRepository.get_boarding_rows_by_flight(flight_id=flight_id))
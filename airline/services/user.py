@@ -1,8 +1,37 @@
+import copy
+
+from django.conf import settings
 from django.contrib.auth.hashers import make_password
+from django.db import connection
+
 from airline.models import (
     User,
 )  # esta bien el modelo aca ya que El Service solo recibe o devuelve objetos y llama al Repository para hacer el trabajo real.
 from airline.repositories.user import UserRepository
+from airline.utils.cache_versions import bump_version, get_version
+from airline.utils.lru import LRUCache
+
+# Usuarios ya cargados en memoria de cada proceso (ver UserService.get_cached);
+# las claves indicadas en settings.USER_CACHE reemplazan a estas
+DEFAULT_USER_CACHE = {
+    "SIZE": 2048,  # usuarios recordados por proceso
+    "TTL": 300,  # segundos; acota cambios que no suben la versión (grupos, permisos)
+}
+
+_cache = None
+
+
+def get_user_cache() -> LRUCache:
+    global _cache
+    config = {**DEFAULT_USER_CACHE, **getattr(settings, "USER_CACHE", {})}
+    if _cache is None or (_cache.size, _cache.ttl) != (config["SIZE"], config["TTL"]):
+        _cache = LRUCache(config["SIZE"], config["TTL"])
+    return _cache
+
+
+def credentials_version_name(user_id) -> str:
+    # Sello de versión de los datos de acceso del usuario (cache_versions)
+    return f"user:{user_id}"
 
 
 class UserService:
@@ -43,6 +72,36 @@ class UserService:
             )
         return False
 
+    @staticmethod
+    def get_cached(user_id, load) -> User:
+        """
+        Usuario del id indicado desde la memoria del proceso, si no cambió
+        desde que se cargó (versión de credenciales en el cache); si no, lo
+        carga con `load(user_id)` y lo recuerda. Devuelve una copia: cada
+        pedido puede modificar la suya. Los cambios de otros procesos solo se
+        ven si el cache es compartido (por eso CachedModelBackend se usa
+        solo con settings.SHARED_CACHE).
+        """
+        version = get_version(credentials_version_name(user_id))
+        cache = get_user_cache()
+        entry = cache.get(str(user_id))
+        if entry is not None and entry[0] == version:
+            return copy.copy(entry[1])
+
+        user = load(user_id)
+        # Dentro de una transacción el usuario leído podría deshacerse
+        if user is not None and not connection.in_atomic_block:
+            cache.set(str(user_id), (version, copy.copy(user)))
+        return user
+
+    @staticmethod
+    def credentials_changed(user_id):
+        """
+        Invalida el usuario en la memoria de los procesos que comparten el
+        cache.
+        """
+        bump_version(credentials_version_name(user_id))
+
     @staticmethod
     def get_all() -> list[User]:
         return UserRepository.get_all()
@@ -0,0 +1,187 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from airline.models import (
+    ApiToken,
+    Flight,
+    FlightStatus,
+    Plane,
+    Reservation,
+    Seat,
+    User,
+)
+from airline.services.api_token import ApiTokenService
+from airline.services.choices import ChoicesService
+from airline.services.plane_schedule import PlaneScheduleService
+from airline.services.report import ReportService
+from airline.services.seat_events import SeatEventService
+from airline.services.signed_token import SignedTokenService
+from airline.services.user import UserService
+from airline.utils.cache_versions import bump_version
+
+
+@receiver(post_init, sender=Flight)
+def remember_flight_plane(sender, instance, **kwargs):
+    # Avión con el que se cargó el vuelo, para actualizar también su agenda si cambia.
+    # Se lee de __dict__ para no disparar una consulta si el campo está diferido.
+    instance._schedule_plane_id = instance.__dict__.get("plane_id")
+
+
+@receiver(post_save, sender=Flight)
+def update_plane_schedule(sender, instance, **kwargs):
+    PlaneScheduleService.flight_saved(
+        instance, previous_plane_id=getattr(instance, "_schedule_plane_id", None)
+    )
+    instance._schedule_plane_id = instance.plane_id
+
+
+@receiver(post_delete, sender=Flight)
+def remove_from_plane_schedule(sender, instance, **kwargs):
+    PlaneScheduleService.flight_deleted(instance)
+
+
+@receiver([post_save, post_delete], sender=FlightStatus)
+def invalidate_flight_status_choices(sender, **kwargs):
+    ChoicesService.invalidate("flight_status")
+
+
+@receiver([post_save, post_delete], sender=Plane)
+def invalidate_plane_choices(sender, **kwargs):
+    ChoicesService.invalidate("plane")
+
+
+# -------------------- Versiones de fragmentos de plantilla --------------------
+@receiver([post_save, post_delete], sender=Flight)
+@receiver([post_save, post_delete], sender=FlightStatus)
+def bump_flights_version(sender, **kwargs):
+    # Los listados de vuelos muestran también el estado y el avión
+    bump_version("flights")
+
+
+@receiver([post_save, post_delete], sender=Plane)
+def bump_plane_version(sender, instance, **kwargs):
+    bump_version("flights")
+    bump_version(f"plane:{instance.pk}")
+
+
+@receiver([post_save, post_delete], sender=Seat)
+def bump_seat_map_version(sender, instance, **kwargs):
+    bump_version(f"plane:{instance.plane_id}")
+
+
+@receiver([post_save, post_delete], sender=Reservation)
+def bump_flight_occupancy_version(sender, instance, **kwargs):
+    # Ocupación de los asientos del vuelo en el mapa de selección
+    bump_version(f"flight:{instance.flight_id}:seats")
+
+
+# -------------------- Asientos en vivo (mapa de selección) --------------------
+# Antes de update_flight_sales (las señales se llaman en el orden en que se
+# registran): usa el snapshot de la reserva que esa señal renueva
+@receiver(post_save, sender=Reservation)
+def publish_reservation_seat(sender, instance, **kwargs):
+    SeatEventService.reservation_saved(
+        instance, previous=getattr(instance, "_sales_snapshot", None)
+    )
+
+
+@receiver(post_delete, sender=Reservation)
+def publish_released_seat(sender, instance, **kwargs):
+    SeatEventService.reservation_deleted(instance)
+
+
+@receiver(post_save, sender=Seat)
+def publish_seat_status(sender, instance, **kwargs):
+    SeatEventService.seat_saved(instance)
+
+
+@receiver(post_delete, sender=Seat)
+def publish_deleted_seat(sender, instance, **kwargs):
+    SeatEventService.seat_saved(instance, deleted=True)
+
+
+# -------------------- Resumen de ventas (reportes) --------------------
+@receiver(post_init, sender=Reservation)
+def remember_reservation_sales(sender, instance, **kwargs):
+    # Aporte de la reserva al resumen tal como se cargó, para aplicar la diferencia
+    instance._sales_snapshot = ReportService.snapshot(instance)
+
+
+@receiver(post_save, sender=Reservation)
+def update_flight_sales(sender, instance, **kwargs):
+    ReportService.reservation_saved(
+        instance, previous=getattr(instance, "_sales_snapshot", None)
+    )
+    instance._sales_snapshot = ReportService.snapshot(instance)
+
+
+@receiver(post_delete, sender=Reservation)
+def remove_from_flight_sales(sender, instance, **kwargs):
+    ReportService.reservation_deleted(instance)
+
+
+@receiver(post_init, sender=Seat)
+def remember_seat_type(sender, instance, **kwargs):
+    # Tipo con que se cargó el asiento (las reservas se resumen por tipo)
+    instance._sales_seat_type = instance.__dict__.get("seat_type")
+
+
+@receiver(post_save, sender=Seat)
+def update_sales_seat_type(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_sales_seat_type", None)
+    if not created and previous is not None and previous != instance.seat_type:
+        ReportService.seat_type_changed(instance)
+    instance._sales_seat_type = instance.seat_type
+
+
+# -------------------- Cache de tokens de la API --------------------
+@receiver([post_save, post_delete], sender=ApiToken)
+def invalidate_api_token(sender, instance, **kwargs):
+    ApiTokenService.invalidate(token_id=instance.pk)
+
+
+@receiver([post_save, post_delete], sender=User)
+def bump_user_credentials_version(sender, instance, **kwargs):
+    # Usuario de la sesión guardado en memoria (ver CachedModelBackend)
+    UserService.credentials_changed(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_api_tokens(sender, instance, **kwargs):
+    # Los tokens en memoria guardan el usuario (activo, staff) de la verificación
+    ApiTokenService.invalidate(user_id=instance.pk)
+
+
+# -------------------- Tokens firmados --------------------
+# Campos del usuario que viajan en los tokens de acceso o los habilitan
+TOKEN_CREDENTIAL_FIELDS = ("password", "is_active", "is_staff", "is_superuser")
+
+
+@receiver(post_init, sender=User)
+def remember_user_credentials(sender, instance, **kwargs):
+    # Contraseña, estado y permisos con que se cargó el usuario (leídos de
+    # __dict__ para no disparar consultas de campos diferidos)
+    instance._token_credentials = {
+        field: instance.__dict__.get(field) for field in TOKEN_CREDENTIAL_FIELDS
+    }
+
+
+@receiver(post_save, sender=User)
+def revoke_user_signed_tokens(sender, instance, created, **kwargs):
+    # Cambiar la contraseña, desactivar al usuario o quitarle permisos de
+    # staff/superusuario invalida sus tokens emitidos: los de acceso llevan
+    # esos permisos (claims stf y sup) y la autenticación no consulta la base
+    previous = getattr(instance, "_token_credentials", {})
+    if not created and (
+        (
+            previous.get("password") is not None
+            and previous["password"] != instance.password
+        )
+        or (previous.get("is_active") and not instance.is_active)
+        or (previous.get("is_staff") and not instance.is_staff)
+        or (previous.get("is_superuser") and not instance.is_superuser)
+    ):
+        SignedTokenService.revoke_user(instance.pk)
+    instance._token_credentials = {
+        field: getattr(instance, field) for field in TOKEN_CREDENTIAL_FIELDS
+    }
@@ -5,13 +5,16 @@ from airline.views import (
     add_passenger,
     add_status_flight,
     confirm_reservation,
+    download_flight_tickets,
     download_ticket,
     edit_user,
     flight_administration,
     flight_list,
+    flight_update_form,
     help_view,
     plane_detail,
     plane_list,
+    plane_update_form,
     reservation_by_flight,
     reservation_by_user,
     select_seat,
@@ -35,6 +38,12 @@ urlpatterns = [
         view=download_ticket,
         name="download_ticket",
     ),
+    # Descargar todos los tickets de un vuelo (PDF multipágina o ZIP)
+    path(
+        route="flights/<int:flight_id>/tickets/download/",
+        view=download_flight_tickets,
+        name="download_flight_tickets",
+    ),
     # Mostrar las reservas del usuario actual
     path(
         route="my-reservations/", view=reservation_by_user, name="reservation_by_user"
@@ -71,6 +80,12 @@ urlpatterns = [
     path(route="users/login/", view=user_login, name="user_login"),
     # Listar todos los aviones
     path(route="planes/", view=plane_list, name="plane_list"),
+    # Formulario de edición de un avión (fragmento que se carga en el modal)
+    path(
+        route="planes/<int:plane_id>/edit-form/",
+        view=plane_update_form,
+        name="plane_update_form",
+    ),
     # Detalle de un avión específico (por ID)
     path(route="planes/details/<int:plane_id>", view=plane_detail, name="plane_detail"),
     # Mostrar únicamente vuelos futuros disponibles
@@ -91,4 +106,10 @@ urlpatterns = [
         view=flight_administration,
         name="flight_administration",
     ),
+    # Formulario de edición de un vuelo (fragmento que se carga en el modal)
+    path(
+        route="flights/flight_administration/<int:flight_id>/edit-form/",
+        view=flight_update_form,
+        name="flight_update_form",
+    ),
 ]
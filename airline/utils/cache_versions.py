@@ -0,0 +1,35 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Sellos de versión para invalidar fragmentos de plantilla cacheados: la
+# versión forma parte de la clave de {% cache %}, así que subirla deja
+# inalcanzables los fragmentos viejos (expiran solos).
+VERSION_KEY = "version:{}"
+
+
+def _initial():
+    # Si el sello se pierde del cache se vuelve a crear con un valor mayor a
+    # cualquiera usado antes, para no reutilizar fragmentos viejos.
+    return time.time_ns() // 1000
+
+
+def get_version(name) -> int:
+    return cache.get_or_set(VERSION_KEY.format(name), _initial, timeout=None)
+
+
+def bump_version(name):
+    """
+    Sube la versión ahora y otra vez al confirmar la transacción: una petición
+    que renderizó en el medio (sin ver el cambio) no deja su fragmento vigente.
+    """
+
+    def bump():
+        try:
+            cache.incr(VERSION_KEY.format(name))
+        except ValueError:
+            cache.set(VERSION_KEY.format(name), _initial(), timeout=None)
+
+    bump()
+    transaction.on_commit(bump)
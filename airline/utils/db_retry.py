@@ -0,0 +1,51 @@
+import functools
+import random
+import time
+
+from django.db import OperationalError, connection
+
+# Reintento de escrituras que fallan porque otra conexión tiene el lock de la
+# base (SQLite: "database is locked") o por conflictos de PostgreSQL
+# (serialización, deadlock). Solo se reintenta fuera de una transacción: dentro
+# de una, el error ya la dejó inutilizable y lo tiene que manejar quien la abrió.
+
+LOCK_MESSAGES = ("database is locked", "database table is locked")
+# SQLSTATE de PostgreSQL: serialization_failure, deadlock_detected
+RETRY_SQLSTATES = {"40001", "40P01"}
+
+
+def is_lock_error(exc: OperationalError) -> bool:
+    message = str(exc).lower()
+    if any(text in message for text in LOCK_MESSAGES):
+        return True
+    return getattr(exc.__cause__, "sqlstate", None) in RETRY_SQLSTATES
+
+
+def retry_on_lock(attempts=5, base_delay=0.05, max_delay=1.0):
+    """
+    Decorador: reintenta la función hasta `attempts` veces si falla por un
+    lock, esperando entre intentos un tiempo que se duplica (con un factor
+    aleatorio para que los procesos en conflicto no reintenten a la vez).
+    La función tiene que poder repetirse: debe hacer sus escrituras en una
+    sola transacción.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(attempts):
+                try:
+                    return func(*args, **kwargs)
+                except OperationalError as exc:
+                    if (
+                        attempt == attempts - 1
+                        or connection.in_atomic_block
+                        or not is_lock_error(exc)
+                    ):
+                        raise
+                delay = min(max_delay, base_delay * 2**attempt)
+                time.sleep(delay * random.uniform(0.5, 1.0))
+
+        return wrapper
+
+    return decorator
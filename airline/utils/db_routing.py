@@ -0,0 +1,186 @@
+import contextvars
+import random
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Lecturas en réplicas (settings.DATABASE_REPLICAS) y escrituras en la base
+# principal. Solo leen de una réplica las consultas que lo piden con
+# read_alias(); después de escribir, el resto del pedido (y, por la cookie
+# de STICKY_COOKIE, los pedidos de los siguientes REPLICA_STICKY_SECONDS)
+# lee de la principal para ver lo que escribió aunque la réplica esté atrasada.
+
+STICKY_COOKIE = "db_primary"
+DEFAULT_STICKY_SECONDS = 5
+
+# True mientras las lecturas tienen que ir a la base principal
+_pinned = contextvars.ContextVar("db_primary_pinned", default=False)
+# True si se escribió durante el pedido actual
+_wrote = contextvars.ContextVar("db_wrote", default=False)
+
+
+def replicas() -> list[str]:
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def read_alias() -> str:
+    """
+    Base de la que leer una consulta que tolera datos apenas atrasados: una
+    réplica al azar, o la principal si no hay réplicas o el pedido escribió.
+    Se resuelve al armar la consulta (con .using()), porque los querysets se
+    evalúan más tarde.
+    """
+    aliases = replicas()
+    if not aliases or _pinned.get():
+        return DEFAULT_DB_ALIAS
+    return random.choice(aliases)
+
+
+def pin_primary():
+    _pinned.set(True)
+
+
+@contextmanager
+def use_primary():
+    """
+    Lee de la base principal dentro del bloque.
+    """
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+@contextmanager
+def routing_scope(pinned=False):
+    """
+    Estado de lecturas propio para el bloque (un pedido): empieza sin
+    escrituras y, con pinned, leyendo de la principal.
+    """
+    pinned_token = _pinned.set(pinned)
+    wrote_token = _wrote.set(False)
+    try:
+        yield
+    finally:
+        _pinned.reset(pinned_token)
+        _wrote.reset(wrote_token)
+
+
+def wrote() -> bool:
+    return _wrote.get()
+
+
+class ReplicaRouter:
+    """
+    Router de bases: toda escritura va a la principal y fija las lecturas
+    del pedido en ella. Las lecturas de objetos relacionados siguen en la
+    base de la que se leyó el objeto; el resto va a la principal.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _pinned.get():
+            return DEFAULT_DB_ALIAS
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        _pinned.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+
+# Modelos del archivo de vuelos realizados (ver ArchiveService)
+ARCHIVE_MODELS = {"archivedflight", "archivedreservation"}
+
+
+def archive_alias() -> str:
+    return getattr(settings, "ARCHIVE_DATABASE", DEFAULT_DB_ALIAS)
+
+
+class ArchiveRouter:
+    """
+    Router del archivo: sus modelos se leen, escriben y migran en
+    settings.ARCHIVE_DATABASE, y si esa base no es la principal no se
+    migra en ella ningún otro modelo.
+    """
+
+    def _is_archive(self, model):
+        return (
+            model._meta.app_label == "airline"
+            and model._meta.model_name in ARCHIVE_MODELS
+        )
+
+    def db_for_read(self, model, **hints):
+        if self._is_archive(model):
+            return archive_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        if self._is_archive(model):
+            return archive_alias()
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        archive = archive_alias()
+        if archive == DEFAULT_DB_ALIAS:
+            return None
+        if app_label == "airline" and model_name in ARCHIVE_MODELS:
+            return db == archive
+        if db == archive:
+            return False
+        return None
+
+
+class PrimaryStickinessMiddleware:
+    """
+    Reinicia el estado de lecturas en cada pedido. Si el pedido escribió,
+    deja una cookie para que los siguientes (por ejemplo, la página a la que
+    redirige una reserva) también lean de la principal. Funciona en modo
+    síncrono y asíncrono, para no pasar a un hilo cada pedido bajo ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with routing_scope(pinned=STICKY_COOKIE in request.COOKIES):
+            response = self.get_response(request)
+            self._stick(response)
+        return response
+
+    async def __acall__(self, request):
+        with routing_scope(pinned=STICKY_COOKIE in request.COOKIES):
+            response = await self.get_response(request)
+            self._stick(response)
+        return response
+
+    def _stick(self, response):
+        if wrote() and replicas():
+            response.set_cookie(
+                STICKY_COOKIE,
+                "1",
+                max_age=getattr(
+                    settings, "REPLICA_STICKY_SECONDS", DEFAULT_STICKY_SECONDS
+                ),
+                httponly=True,
+                samesite="Lax",
+            )
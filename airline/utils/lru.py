@@ -0,0 +1,51 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Cache en memoria del proceso, acotado (descarta lo usado hace más tiempo)
+    y con vencimiento por entrada. Seguro entre hilos.
+    """
+
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        # ttl: vencimiento propio de la entrada, si es menor al del cache
+        if self.size <= 0:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def discard(self, match=None):
+        # Quita las entradas cuyo valor cumple `match` (o todas)
+        with self._lock:
+            if match is None:
+                self._entries.clear()
+                return
+            for key, (_, value) in list(self._entries.items()):
+                if match(value):
+                    del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
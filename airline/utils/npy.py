@@ -0,0 +1,100 @@
+import ast  # Lectura del encabezado (dict de Python) de un archivo .npy
+import mmap  # Lectura de columnas sin copiarlas a memoria
+import sys
+from array import array  # Buffers numéricos compactos de la librería estándar
+
+# Formato .npy versión 1.0: https://numpy.org/doc/stable/reference/generated/numpy.lib.format.html
+MAGIC = b"\x93NUMPY\x01\x00"
+
+# Largo fijo reservado para el encabezado (magic + largo + dict), múltiplo de 64.
+# Permite escribir las filas por bloques y completar la cantidad total al cerrar.
+HEADER_SIZE = 128
+
+# Tipos soportados: dtype de NumPy -> código de array.array
+DTYPES = {
+    "<i8": "q",
+    "<f8": "d",
+}
+
+
+def _header(dtype, length):
+    """
+    Arma el encabezado .npy para una columna 1-D de `length` elementos,
+    rellenado con espacios hasta HEADER_SIZE bytes.
+    """
+    text = f"{{'descr': '{dtype}', 'fortran_order': False, 'shape': ({length},), }}"
+    size = HEADER_SIZE - len(MAGIC) - 2
+    text = text.ljust(size - 1) + "\n"
+    return MAGIC + size.to_bytes(2, "little") + text.encode("latin1")
+
+
+class NpyColumnWriter:
+    """
+    Escribe una columna numérica en formato .npy de NumPy sin depender de NumPy.
+    Los valores se agregan por bloques con append() y se vuelcan al archivo,
+    así nunca se mantiene la columna completa en memoria.
+    """
+
+    def __init__(self, path, dtype, buffer_size=65536):
+        if dtype not in DTYPES:
+            raise ValueError(f"Tipo no soportado: {dtype}")
+        self.dtype = dtype
+        self.length = 0
+        self.buffer_size = buffer_size
+        self._buffer = array(DTYPES[dtype])
+        self._file = open(path, "wb")
+        self._file.write(_header(dtype, 0))
+
+    def append(self, value):
+        self._buffer.append(value)
+        if len(self._buffer) >= self.buffer_size:
+            self._flush()
+
+    def extend(self, values):
+        """
+        Agrega varios valores de una vez (por ejemplo, un array.array completo).
+        """
+        self._buffer.extend(values)
+        if len(self._buffer) >= self.buffer_size:
+            self._flush()
+
+    def _flush(self):
+        if sys.byteorder != "little":
+            self._buffer.byteswap()
+        self._buffer.tofile(self._file)
+        self.length += len(self._buffer)
+        self._buffer = array(DTYPES[self.dtype])
+
+    def close(self):
+        self._flush()
+        # Reescribe el encabezado con la cantidad real de elementos
+        self._file.seek(0)
+        self._file.write(_header(self.dtype, self.length))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_column(path):
+    """
+    Abre una columna .npy escrita por NpyColumnWriter (o por NumPy) mapeada en memoria.
+    Devuelve un memoryview tipado: los datos se leen del disco bajo demanda.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} no es un archivo .npy versión 1.0")
+        header_len = int.from_bytes(f.read(2), "little")
+        header = ast.literal_eval(f.read(header_len).decode("latin1"))
+        offset = len(MAGIC) + 2 + header_len
+        if header["descr"] not in DTYPES or len(header["shape"]) != 1:
+            raise ValueError(f"{path}: solo se soportan columnas 1-D {list(DTYPES)}")
+        if header["shape"][0] == 0:
+            return memoryview(array(DTYPES[header["descr"]]))
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    data = memoryview(mapped)[offset:]
+    return data.cast(DTYPES[header["descr"]])
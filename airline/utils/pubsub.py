@@ -0,0 +1,100 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+# Publicación y suscripción en memoria (por proceso) entre el código
+# síncrono que publica (señales, en cualquier hilo) y los suscriptores
+# asíncronos (respuestas en streaming en el event loop). Cada suscriptor
+# acumula los cambios pendientes combinados por clave: si un mismo elemento
+# cambia varias veces antes de que se envíe, solo se envía el último estado.
+
+
+class Subscription:
+    """
+    Cambios pendientes de un suscriptor: {clave: {campo: valor}}.
+    """
+
+    def __init__(self, hub, topics, loop):
+        self.hub = hub
+        self.topics = topics
+        self._loop = loop
+        self._event = asyncio.Event()
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def push(self, changes: dict):
+        """
+        Agrega cambios (desde cualquier hilo) y despierta al suscriptor.
+        """
+        with self._lock:
+            for key, fields in changes.items():
+                self._pending.setdefault(key, {}).update(fields)
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            pass  # el event loop ya terminó: el suscriptor se está yendo
+
+    async def wait(self, timeout: float, coalesce: float = 0) -> dict:
+        """
+        Espera hasta timeout segundos a que haya cambios y los devuelve (un
+        diccionario vacío si no llegó ninguno). Con coalesce espera un poco
+        más después del primero para enviar juntos los que llegan en ráfaga.
+        """
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return {}
+        if coalesce:
+            await asyncio.sleep(coalesce)
+        self._event.clear()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Hub:
+    """
+    Suscriptores por tema. publish() no bloquea: solo deja los cambios en
+    cada suscriptor del tema.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._topics = defaultdict(set)
+
+    def subscribe(self, *topics) -> Subscription:
+        """
+        Suscribe a los temas desde el event loop en curso.
+        """
+        subscription = Subscription(self, topics, asyncio.get_running_loop())
+        with self._lock:
+            for topic in topics:
+                self._topics[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            for topic in subscription.topics:
+                subscribers = self._topics.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._topics[topic]
+
+    def has_subscribers(self, topic) -> bool:
+        return topic in self._topics
+
+    def publish(self, topic, changes: dict):
+        with self._lock:
+            subscribers = list(self._topics.get(topic, ()))
+        for subscription in subscribers:
+            subscription.push(changes)
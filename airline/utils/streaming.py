@@ -0,0 +1,59 @@
+import csv  # Escritura de filas en formato CSV
+import json  # Serialización de filas en NDJSON
+
+from django.core.serializers.json import (
+    DjangoJSONEncoder,
+)  # Sabe serializar fechas, Decimal y timedelta
+
+
+class _Echo:
+    """
+    Pseudo-archivo para csv.writer: en lugar de guardar la línea la devuelve,
+    así cada fila se puede entregar directamente desde un generador.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows, fields):
+    """
+    Convierte un iterable de diccionarios en líneas CSV (encabezado incluido).
+    Parámetros:
+    - rows: iterable de dicts (por ejemplo un QuerySet.values().iterator())
+    - fields: columnas a escribir, en orden
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([row[field] for field in fields])
+
+
+def iter_ndjson(rows):
+    """
+    Convierte un iterable de diccionarios en líneas JSON separadas por salto de línea.
+    """
+    for row in rows:
+        yield _json_line(row)
+
+
+async def aiter_csv(rows, fields):
+    """
+    Como iter_csv, para un iterable asíncrono (por ejemplo QuerySet.aiterator()).
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    async for row in rows:
+        yield writer.writerow([row[field] for field in fields])
+
+
+async def aiter_ndjson(rows):
+    """
+    Como iter_ndjson, para un iterable asíncrono.
+    """
+    async for row in rows:
+        yield _json_line(row)
+
+
+def _json_line(row) -> str:
+    return json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
@@ -0,0 +1,183 @@
+import gzip  # Compresión de los archivos exportados
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from airline.models import Flight, Passenger, Reservation, Seat, Ticket
+from airline.repositories.deleted_row import DeletedRowRepository
+from airline.utils.npy import NpyColumnWriter
+from airline.utils.streaming import iter_csv, iter_ndjson
+
+# Tablas exportables: nombre -> (modelo, columnas, columnas numéricas con su dtype .npy)
+EXPORT_TABLES = {
+    "flight": (
+        Flight,
+        [
+            "id",
+            "origin",
+            "destination",
+            "departure_date",
+            "arrival_date",
+            "duration",
+            "base_price",
+            "status_id",
+            "plane_id",
+            "updated_at",
+        ],
+        {
+            "id": "<i8",
+            "departure_date": "<i8",
+            "arrival_date": "<i8",
+            "duration": "<f8",
+            "base_price": "<f8",
+            "status_id": "<i8",
+            "plane_id": "<i8",
+        },
+    ),
+    "reservation": (
+        Reservation,
+        [
+            "id",
+            "status",
+            "reservation_date",
+            "price",
+            "reservation_code",
+            "flight_id",
+            "passenger_id",
+            "seat_id",
+            "user_id",
+            "updated_at",
+        ],
+        {
+            "id": "<i8",
+            "reservation_date": "<i8",
+            "price": "<f8",
+            "flight_id": "<i8",
+            "passenger_id": "<i8",
+            "seat_id": "<i8",
+            "user_id": "<i8",
+        },
+    ),
+    "ticket": (
+        Ticket,
+        ["id", "barcode", "issue_date", "status", "reservation_id", "updated_at"],
+        {"id": "<i8", "issue_date": "<i8", "reservation_id": "<i8"},
+    ),
+    "passenger": (
+        Passenger,
+        [
+            "id",
+            "name",
+            "document",
+            "document_type",
+            "email",
+            "phone",
+            "birth_date",
+            "updated_at",
+        ],
+        {"id": "<i8"},
+    ),
+    "seat": (
+        Seat,
+        [
+            "id",
+            "number",
+            "row",
+            "column",
+            "seat_type",
+            "status",
+            "plane_id",
+            "updated_at",
+        ],
+        {"id": "<i8", "row": "<i8", "plane_id": "<i8"},
+    ),
+}
+
+
+def _to_number(value):
+    """
+    Convierte un valor del ORM al número que se guarda en la columna .npy:
+    fechas como segundos epoch, duraciones en segundos y Decimal como float.
+    """
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def export_table(table, output_dir, fmt="csv", since=None, chunk_size=2000, npy=False):
+    """
+    Exporta una tabla a un archivo comprimido (csv.gz o ndjson.gz) leyendo la base
+    con un iterador del lado del servidor y escribiendo por bloques.
+    Parámetros:
+    - table: clave de EXPORT_TABLES
+    - output_dir: carpeta de destino
+    - fmt: "csv" o "ndjson"
+    - since: si se indica, solo exporta filas modificadas después de esa fecha
+      y además las eliminadas desde entonces (<tabla>.deleted.<fmt>.gz, con
+      id y deleted_at)
+    - chunk_size: filas leídas por cada viaje a la base
+    - npy: además escribe una columna .npy por cada campo numérico
+    Devuelve (tabla, filas_exportadas, archivos_generados).
+    """
+    model, fields, numeric = EXPORT_TABLES[table]
+    output_dir = Path(output_dir)
+
+    queryset = model.objects.order_by("id")
+    if since is not None:
+        queryset = queryset.filter(updated_at__gt=since)
+    rows = queryset.values(*fields).iterator(chunk_size=chunk_size)
+
+    path = output_dir / f"{table}.{fmt}.gz"
+    files = [path]
+
+    writers = {}
+    if npy:
+        for field, dtype in numeric.items():
+            npy_path = output_dir / f"{table}.{field}.npy"
+            writers[field] = NpyColumnWriter(npy_path, dtype)
+            files.append(npy_path)
+
+    count = 0
+
+    def tracked(rows):
+        # Cuenta las filas y alimenta las columnas .npy mientras se escribe el archivo
+        nonlocal count
+        for row in rows:
+            count += 1
+            for field, writer in writers.items():
+                writer.append(_to_number(row[field]))
+            yield row
+
+    lines = (
+        iter_csv(tracked(rows), fields) if fmt == "csv" else iter_ndjson(tracked(rows))
+    )
+    try:
+        with gzip.open(path, "wt", encoding="utf-8", newline="") as out:
+            for line in lines:
+                out.write(line)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    if since is not None:
+        files.append(_export_deleted(table, output_dir, fmt, since))
+
+    return table, count, [str(f) for f in files]
+
+
+def _export_deleted(table, output_dir, fmt, since) -> Path:
+    fields = ["id", "deleted_at"]
+    rows = (
+        {"id": row["row_id"], "deleted_at": row["deleted_at"]}
+        for row in DeletedRowRepository.get_since(table, since).iterator()
+    )
+    path = Path(output_dir) / f"{table}.deleted.{fmt}.gz"
+    lines = iter_csv(rows, fields) if fmt == "csv" else iter_ndjson(rows)
+    with gzip.open(path, "wt", encoding="utf-8", newline="") as out:
+        for line in lines:
+            out.write(line)
+    return path
@@ -1,7 +1,193 @@
+import io  # Buffers en memoria para páginas individuales
+import multiprocessing  # Contexto "spawn" para los procesos de renderizado
+import tempfile  # Archivo temporal para el PDF combinado
+import zipfile  # Empaquetado de los tickets en un ZIP
+from concurrent.futures import ProcessPoolExecutor  # Renderizado en paralelo
+from functools import lru_cache  # Caché por proceso de la plantilla
+from pathlib import Path
+
 from reportlab.pdfgen import canvas  # Importa la clase Canvas para generar PDFs
 from reportlab.lib.pagesizes import A4  # Importa tamaño de página A4
+from reportlab.lib.utils import ImageReader  # Decodifica el logo una sola vez
+from reportlab.pdfbase.pdfmetrics import stringWidth  # Ancho de las etiquetas
+from reportlab.graphics import renderPDF  # Dibuja gráficos vectoriales en el canvas
+from reportlab.graphics.barcode import code128, qr  # Códigos de barras y QR
+from reportlab.graphics.shapes import Drawing
+from PIL import Image  # Reduce el logo antes de embeberlo
 from django.http import HttpResponse  # Permite enviar respuestas HTTP desde Django
 
+# Tamaño de los bloques que se envían al cliente al hacer streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Tamaño máximo que el PDF combinado ocupa en memoria antes de pasar a disco
+SPOOL_MAX_SIZE = 1024 * 1024
+
+# Plantilla fija del boleto (form XObject reutilizable dentro de cada documento)
+TEMPLATE_FORM_NAME = "ticket_template"
+TEMPLATE_FONT = "Helvetica"
+TEMPLATE_FONT_SIZE = 12
+
+# Logo impreso en el boleto. Se resuelve relativo al módulo para que los
+# procesos del pool puedan usarlo sin tener Django configurado.
+LOGO_PATH = (
+    Path(__file__).resolve().parent.parent.parent / "static" / "img" / "logo3.png"
+)
+LOGO_PIXELS = 200  # Resolución máxima del logo embebido
+
+
+def ticket_to_dict(reservation, ticket):
+    """
+    Convierte una reserva y su ticket en un diccionario plano con los datos
+    que se imprimen en el boleto. Al ser un dict simple se puede enviar a
+    otros procesos (pickle) sin arrastrar instancias del ORM.
+    """
+    return {
+        "reservation_code": reservation.reservation_code,
+        "passenger_name": reservation.passenger.name,
+        "origin": reservation.flight.origin,
+        "destination": reservation.flight.destination,
+        "seat_row": reservation.seat.row,
+        "seat_column": reservation.seat.column,
+        "seat_type": reservation.seat.seat_type,
+        "price": reservation.price,
+        "barcode": ticket.barcode,
+        "issue_date": ticket.issue_date,
+    }
+
+
+@lru_cache(maxsize=1)
+def _template_layout():
+    """
+    Calcula una sola vez por proceso la posición de cada campo del boleto.
+    Cada entrada es (clave, etiqueta, y, x_del_valor): el valor se dibuja justo
+    después de la etiqueta, cuyo ancho se mide con las métricas de la fuente.
+    """
+    width, height = A4
+    fields = [
+        ("reservation_code", "Código de Reserva: "),
+        ("passenger_name", "Pasajero: "),
+        ("route", "Vuelo: "),
+        ("seat", "Asiento: "),
+        ("price", "Precio: "),
+        ("barcode", "Código de Ticket: "),
+        ("issue_date", "Fecha de Emisión: "),
+    ]
+    layout = []
+    for i, (key, label) in enumerate(fields):
+        y = height - 150 - i * 20
+        value_x = 100 + stringWidth(label, TEMPLATE_FONT, TEMPLATE_FONT_SIZE)
+        layout.append((key, label, y, value_x))
+    return tuple(layout)
+
+
+@lru_cache(maxsize=1)
+def _logo():
+    """
+    Carga, reduce y decodifica el logo una sola vez por proceso.
+    Devuelve None si la imagen no está disponible.
+    """
+    if not LOGO_PATH.exists():
+        return None
+    image = Image.open(LOGO_PATH)
+    image.thumbnail((LOGO_PIXELS, LOGO_PIXELS))
+    return ImageReader(image)
+
+
+def _ensure_template(p):
+    """
+    Dibuja la parte fija del boleto (logo, título, marco y etiquetas) en un
+    form XObject del documento. Se define una única vez por canvas y cada
+    página solo lo referencia con doForm, sin volver a dibujarlo.
+    """
+    if getattr(p, "_ticket_template_ready", False):
+        return
+
+    width, height = A4
+    p.beginForm(TEMPLATE_FORM_NAME)
+
+    # Logo de la aerolínea
+    logo = _logo()
+    if logo is not None:
+        p.drawImage(logo, 40, height - 120, width=80, height=80, mask="auto")
+
+    # Título del ticket en fuente grande y centrado
+    p.setFont("Helvetica-Bold", 20)
+    p.drawCentredString(width / 2, height - 100, "Boleto de Vuelo")
+
+    # Marco del boleto
+    p.roundRect(80, height - 440, width - 160, 320, 10)
+
+    # Etiquetas de los campos
+    p.setFont(TEMPLATE_FONT, TEMPLATE_FONT_SIZE)
+    for _, label, y, _ in _template_layout():
+        p.drawString(100, y, label)
+
+    p.endForm()
+    p._ticket_template_ready = True
+
+
+def _draw_barcodes(p, value):
+    """
+    Dibuja el código del ticket como Code128 y como QR para que pueda escanearse.
+    """
+    width, height = A4
+
+    barcode = code128.Code128(value, barHeight=50, barWidth=1.2, humanReadable=True)
+    barcode.drawOn(p, 100, height - 410)
+
+    qr_widget = qr.QrCodeWidget(value)
+    x1, y1, x2, y2 = qr_widget.getBounds()
+    size = 100
+    drawing = Drawing(
+        size, size, transform=[size / (x2 - x1), 0, 0, size / (y2 - y1), 0, 0]
+    )
+    drawing.add(qr_widget)
+    renderPDF.draw(drawing, p, width - 200, height - 430)
+
+
+def draw_ticket(p, data):
+    """
+    Dibuja una página de boleto en el canvas recibido.
+    Parámetros:
+    - p: canvas de ReportLab donde se dibuja
+    - data: diccionario generado por ticket_to_dict
+    """
+    # Parte fija del boleto (se define una vez por documento)
+    _ensure_template(p)
+    p.doForm(TEMPLATE_FORM_NAME)
+
+    # Valores variables del ticket
+    values = {
+        "reservation_code": data["reservation_code"],
+        "passenger_name": data["passenger_name"],
+        "route": f"{data['origin']} → {data['destination']}",
+        "seat": f"{data['seat_row']}{data['seat_column']} ({data['seat_type']})",
+        "price": f"${data['price']}",
+        "barcode": data["barcode"],
+        "issue_date": data["issue_date"].strftime("%d/%m/%Y %H:%M"),
+    }
+    p.setFont(TEMPLATE_FONT, TEMPLATE_FONT_SIZE)
+    for key, _, y, value_x in _template_layout():
+        p.drawString(value_x, y, str(values[key]))
+
+    # Código de barras y QR escaneables
+    _draw_barcodes(p, data["barcode"])
+
+    # Finalizamos la página
+    p.showPage()
+
+
+def render_ticket_page(data):
+    """
+    Renderiza un único boleto como PDF independiente y devuelve sus bytes.
+    Es una función de módulo para poder ejecutarse dentro de un ProcessPoolExecutor.
+    """
+    buffer = io.BytesIO()
+    p = canvas.Canvas(buffer, pagesize=A4)
+    draw_ticket(p, data)
+    p.save()
+    return buffer.getvalue()
+
 
 def generate_ticket_pdf(reservation, ticket):
     """
@@ -20,39 +206,94 @@ def generate_ticket_pdf(reservation, ticket):
 
     # Creamos el objeto canvas de ReportLab para dibujar en el PDF
     p = canvas.Canvas(response, pagesize=A4)
-    width, height = A4  # Obtenemos ancho y alto de la página
+    draw_ticket(p, ticket_to_dict(reservation, ticket))
 
-    # Título del ticket en fuente grande y centrado
-    p.setFont("Helvetica-Bold", 20)
-    p.drawCentredString(width / 2, height - 100, "Boleto de Vuelo")
-
-    # Información del ticket en fuente normal
-    p.setFont("Helvetica", 12)
-    p.drawString(
-        100, height - 150, f"Código de Reserva: {reservation.reservation_code}"
-    )
-    p.drawString(100, height - 170, f"Pasajero: {reservation.passenger.name}")
-    p.drawString(
-        100,
-        height - 190,
-        f"Vuelo: {reservation.flight.origin} → {reservation.flight.destination}",
-    )
-    p.drawString(
-        100,
-        height - 210,
-        f"Asiento: {reservation.seat.row}{reservation.seat.column} ({reservation.seat.seat_type})",
-    )
-    p.drawString(100, height - 230, f"Precio: ${reservation.price}")
-    p.drawString(100, height - 250, f"Código de Ticket: {ticket.barcode}")
-    p.drawString(
-        100,
-        height - 270,
-        f"Fecha de Emisión: {ticket.issue_date.strftime('%d/%m/%Y %H:%M')}",
-    )
-
-    # Finalizamos la página y guardamos el PDF en la respuesta
-    p.showPage()
+    # Guardamos el PDF en la respuesta
     p.save()
 
     # Retornamos la respuesta con el PDF listo para descargar
     return response
+
+
+def _render_pages(tickets, workers):
+    """
+    Devuelve un iterador de (datos, bytes_pdf) en el mismo orden que `tickets`.
+    Con workers > 1 las páginas se renderizan en un pool de procesos, enviando
+    como máximo `workers * 4` tareas a la vez para no acumular resultados en memoria.
+    """
+    if workers <= 1:
+        for data in tickets:
+            yield data, render_ticket_page(data)
+        return
+
+    window = workers * 4
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        pending = []
+        for data in tickets:
+            pending.append((data, executor.submit(render_ticket_page, data)))
+            if len(pending) >= window:
+                data, future = pending.pop(0)
+                yield data, future.result()
+        for data, future in pending:
+            yield data, future.result()
+
+
+class _ChunkWriter:
+    """
+    Archivo de solo escritura que acumula bytes hasta que el generador los entrega.
+    zipfile lo trata como un stream no posicionable y escribe descriptores de datos.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_tickets_zip(tickets, workers=1):
+    """
+    Genera, bloque a bloque, un ZIP con un PDF por ticket.
+    Solo se mantiene en memoria la página que se está escribiendo.
+    """
+    writer = _ChunkWriter()
+    with zipfile.ZipFile(writer, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for data, pdf in _render_pages(tickets, workers):
+            zf.writestr(f"ticket_{data['reservation_code']}.pdf", pdf)
+            chunk = writer.drain()
+            if chunk:
+                yield chunk
+    # El cierre del ZIP escribe el directorio central
+    chunk = writer.drain()
+    if chunk:
+        yield chunk
+
+
+def stream_tickets_pdf(tickets):
+    """
+    Genera un único PDF con una página por ticket y lo entrega en bloques.
+    El documento se escribe en un archivo temporal que pasa a disco cuando
+    supera SPOOL_MAX_SIZE, así el PDF completo no queda retenido en memoria.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as tmp:
+        p = canvas.Canvas(tmp, pagesize=A4)
+        for data in tickets:
+            draw_ticket(p, data)
+        p.save()
+
+        tmp.seek(0)
+        while True:
+            chunk = tmp.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
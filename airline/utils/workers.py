@@ -0,0 +1,24 @@
+import django
+from django.conf import settings
+from django.db import connections
+
+# Procesos hijos (multiprocessing "spawn") que usan el ORM. No importa modelos:
+# el inicializador se carga en el hijo antes de django.setup().
+
+
+def database_names() -> dict:
+    """
+    Base que usa este proceso en cada alias, para pasarla a los hijos.
+    """
+    return {alias: connections[alias].settings_dict["NAME"] for alias in connections}
+
+
+def setup_worker(names):
+    """
+    Inicializador de los procesos hijos: configura Django y usa las mismas
+    bases que el padre (los hijos vuelven a leer los settings, que no tienen
+    los cambios hechos al iniciar, por ejemplo la base de pruebas).
+    """
+    django.setup()
+    for alias, name in names.items():
+        settings.DATABASES[alias]["NAME"] = name
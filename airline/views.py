@@ -1,13 +1,17 @@
 # Librerías estándar
 from datetime import datetime
+from functools import partial
 import random
 import string
 
 # Librerías de terceros (Django)
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, update_session_auth_hash
-from django.http import HttpResponse
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.dateparse import parse_date
 
 # Modelos internos de la aplicación
 from airline.models import (
@@ -28,17 +32,47 @@ from airline.forms import (
 from home.forms import LoginForm, RegisterForm
 
 # Servicios internos
+from airline.services.choices import ChoicesService
 from airline.services.flight import FlightService
 from airline.services.flight_status import FlightStatusService
+from airline.services.forecasting import ForecastService
 from airline.services.passenger import PassengerService
 from airline.services.plane import PlaneService
+from airline.services.pricing import PricingService
 from airline.services.reservation import ReservationService
 from airline.services.ticket import TicketService
 from airline.services.user import UserService
 from airline.services.seat import SeatService
+from airline.services.seat_map import SeatMapService
 
 # Utilidades internas
-from airline.utils.ticket_pdf import generate_ticket_pdf
+from airline.utils.cache_versions import bump_version, get_version
+from airline.utils.ticket_pdf import (
+    generate_ticket_pdf,
+    stream_tickets_pdf,
+    stream_tickets_zip,
+)
+
+
+# Filas por página en los listados de administración
+ADMIN_PAGE_SIZE = 25
+
+
+def _int_param(request, name):
+    # Parámetro GET entero opcional; None si falta o no es un número
+    try:
+        return int(request.GET.get(name, ""))
+    except ValueError:
+        return None
+
+
+def _date_param(request, name):
+    # Parámetro GET fecha (YYYY-MM-DD) opcional; None si falta o no es una
+    # fecha válida (parse_date lanza ValueError con fechas como 2025-02-30)
+    try:
+        return parse_date(request.GET.get(name, ""))
+    except ValueError:
+        return None
 
 
 # ------------------------------------------------------------------------
@@ -55,38 +89,34 @@ def confirm_reservation(request, flight_id, passenger_id, seat_id):
 
     # Si el método de la petición es POST, significa que se envió el formulario de confirmación
     if request.method == "POST":
-        # Cambia el estado del asiento a "taken" (ocupado) y guarda el cambio
-        SeatService.mark_as_taken(seat.id)
+        # Respeta el límite de reservas del vuelo (capacidad más sobreventa autorizada)
+        if not ForecastService.can_book(flight):
+            messages.error(request, "El vuelo no tiene más lugares disponibles.")
+            return redirect("upcoming_flight_list")
 
         # Genera un código de reserva aleatorio de 8 caracteres (letras y números)
         reservation_code = "".join(
             random.choices(string.ascii_uppercase + string.digits, k=8)
         )
-        # Obtiene el precio base del vuelo
-        price = flight.base_price
-
-        # Crea una nueva reserva usando el servicio de reservas
-        reservation = ReservationService.create(
-            status="confirmed",  # Estado de la reserva
-            reservation_date=datetime.now(),  # Fecha de la reserva
-            price=price,  # Precio de la reserva
-            reservation_code=reservation_code,  # Código único de la reserva
-            flight_id=flight.id,  # ID del vuelo
-            passenger_id=passenger.id,  # ID del pasajero
-            seat_id=seat.id,  # ID del asiento
-            user_id=request.user.id,  # ID del usuario que realiza la reserva
-        )
-
         # Genera un código de barras aleatorio para el ticket
         barcode = "".join(random.choices(string.ascii_uppercase + string.digits, k=12))
+        # Precio dinámico del asiento (tipo, ocupación y anticipación)
+        price = PricingService.quote(flight, seat)
 
-        # Crea el ticket usando el servicio de tickets
-        ticket = TicketService.create(
-            barcode=barcode,
-            issue_date=datetime.now(),
-            status="active",
-            reservation_id=reservation.id,  # Asocia el ticket con la reserva creada
-        )
+        # Ocupa el asiento y crea la reserva y su ticket en una sola transacción
+        try:
+            _, ticket = ReservationService.book(
+                flight_id=flight.id,  # ID del vuelo
+                passenger_id=passenger.id,  # ID del pasajero
+                seat_id=seat.id,  # ID del asiento
+                user_id=request.user.id,  # ID del usuario que realiza la reserva
+                price=price,  # Precio de la reserva
+                reservation_code=reservation_code,  # Código único de la reserva
+                barcode=barcode,
+            )
+        except ValueError as e:
+            messages.error(request, str(e))
+            return redirect("upcoming_flight_list")
 
         # Guarda el ID del ticket en la sesión para usarlo más adelante si es necesario
         request.session["ticket_id"] = ticket.id
@@ -102,27 +132,46 @@ def confirm_reservation(request, flight_id, passenger_id, seat_id):
             "flight": flight,
             "passenger": passenger,
             "seat": seat,
+            "price": PricingService.quote(flight, seat),
         },
     )
 
 
+def _reservation_page(request, reservations):
+    # Página pedida de un listado de reservas; ?page_size= cambia el tamaño
+    # configurado, sin pasar del máximo
+    page_size = _int_param(request, "page_size") or settings.RESERVATION_PAGE_SIZE
+    page_size = max(1, min(page_size, settings.RESERVATION_MAX_PAGE_SIZE))
+    return Paginator(reservations, page_size).get_page(request.GET.get("page"))
+
+
 def reservation_by_user(request):
-    # Obtiene todas las reservas asociadas al usuario que ha iniciado sesión.
-    # Usa el servicio ReservationService para consultar las reservas por user_id.
-    reservations = ReservationService.get_by_user(user_id=request.user.id)
+    # Obtiene las reservas del usuario que ha iniciado sesión (con vuelo,
+    # pasajero y asiento en la misma consulta) y toma la página pedida
+    reservations = _reservation_page(
+        request, ReservationService.get_by_user(user_id=request.user.id)
+    )
 
-    # Renderiza la plantilla "reservation/list.html" pasando las reservas obtenidas
-    return render(request, "reservation/list.html", {"reservations": reservations})
+    # Renderiza la plantilla "reservation/list.html" pasando la página de reservas
+    return render(
+        request,
+        "reservation/list.html",
+        {"reservations": reservations},
+    )
 
 
 def reservation_by_flight(request, flight_id):
-    # Obtiene todas las reservas asociadas a un vuelo específico.
-    # Usa el servicio ReservationService para consultar las reservas por flight_id.
-    reservations = ReservationService.get_by_flight(flight_id=flight_id)
+    # Obtiene las reservas del vuelo (con vuelo, pasajero y asiento en la misma
+    # consulta) y toma la página pedida
+    reservations = _reservation_page(
+        request, ReservationService.get_by_flight(flight_id=flight_id)
+    )
 
-    # Renderiza la plantilla "reservation/administrator.html" pasando las reservas obtenidas
+    # Renderiza la plantilla "reservation/administrator.html" pasando la página de reservas
     return render(
-        request, "reservation/administrator.html", {"reservations": reservations}
+        request,
+        "reservation/administrator.html",
+        {"reservations": reservations, "flight_id": flight_id},
     )
 
 
@@ -145,6 +194,34 @@ def download_ticket(request, reservation_id):
         return HttpResponse(f"Error: {str(e)}")
 
 
+def download_flight_tickets(request, flight_id):
+    # Exporta todos los boletos de un vuelo para los agentes de embarque.
+    # ?format=zip devuelve un ZIP con un PDF por ticket, por defecto un único PDF multipágina.
+    flight = get_object_or_404(Flight, id=flight_id)
+
+    # Trae todos los tickets del vuelo con reserva, pasajero y asiento en una sola consulta
+    tickets = TicketService.get_boarding_data_by_flight(flight_id=flight.id)
+    if not tickets:
+        return HttpResponse("El vuelo no tiene tickets emitidos.", status=404)
+
+    if request.GET.get("format") == "zip":
+        # Las páginas se renderizan en paralelo en un pool de procesos
+        workers = getattr(settings, "TICKET_EXPORT_WORKERS", 1)
+        response = StreamingHttpResponse(
+            stream_tickets_zip(tickets, workers=workers),
+            content_type="application/zip",
+        )
+        filename = f"tickets_flight_{flight.id}.zip"
+    else:
+        response = StreamingHttpResponse(
+            stream_tickets_pdf(tickets), content_type="application/pdf"
+        )
+        filename = f"tickets_flight_{flight.id}.pdf"
+
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
 # -----------------------------------------------------------------------------------
 # flight status
 
@@ -229,31 +306,6 @@ def select_seat(request, flight_id, passenger_id):
     # Obtiene el avión asociado al vuelo
     plane = flight.plane
 
-    # Obtiene todos los asientos del avión, ordenados por fila y columna
-    seats = Seat.objects.filter(plane=plane).order_by("row", "column")
-
-    # Número máximo de filas y columnas del avión
-    max_row = plane.rows
-    max_column = plane.columns
-
-    # Genera las etiquetas de columnas, por ejemplo ["A", "B", "C", ...]
-    columns = [chr(ord("A") + i) for i in range(max_column)]
-
-    # Crea un diccionario para acceder rápidamente a los asientos por fila y columna
-    seat_dict = {(seat.row, seat.column): seat for seat in seats}
-
-    # Construye una matriz de asientos para mostrar en la plantilla
-    seat_matrix = []
-    for row in range(1, max_row + 1):
-        row_seats = []
-        for col in columns:
-            seat = seat_dict.get((row, col))
-            if seat:
-                row_seats.append(seat)  # Añade el asiento si existe
-            else:
-                row_seats.append(None)  # Añade None si no hay asiento en esa posición
-        seat_matrix.append(row_seats)
-
     # Si el formulario fue enviado (POST), significa que el usuario seleccionó un asiento
     if request.method == "POST":
         seat_id = request.POST.get("seat_id")  # Obtiene el ID del asiento seleccionado
@@ -279,7 +331,11 @@ def select_seat(request, flight_id, passenger_id):
         {
             "flight": flight,
             "passenger_id": passenger_id,
-            "seat_matrix": seat_matrix,
+            # Se pasa sin llamar: solo se arma si el fragmento no está en el cache
+            "seat_matrix": partial(SeatMapService.display_rows, plane, flight),
+            "seat_map_version": get_version(f"plane:{plane.id}"),
+            # Cubre la ocupación del vuelo y los precios de los asientos
+            "price_version": PricingService.version(flight),
         },
     )
 
@@ -323,11 +379,16 @@ def create_seats_for_plane(plane):
 
     # Crea todos los asientos en la base de datos de forma masiva (bulk_create)
     Seat.objects.bulk_create(seats)
+    # bulk_create no dispara señales: se invalida a mano el mapa de asientos
+    bump_version(f"plane:{plane.id}")
 
 
 def plane_list(request):
-    # Obtiene todos los aviones usando el servicio PlaneService
-    airplanes = PlaneService.get_all()
+    # Filtro por modelo (se resuelve en la base) y página actual
+    query = request.GET.get("q", "").strip()
+    airplanes = Paginator(
+        PlaneService.get_admin_list(query=query), ADMIN_PAGE_SIZE
+    ).get_page(request.GET.get("page"))
 
     # Inicializa el formulario para crear un avión nuevo
     form = CreatePlaneForm()
@@ -356,7 +417,9 @@ def plane_list(request):
                 new_plane.save()
                 # Crea automáticamente los asientos del avión
                 create_seats_for_plane(new_plane)
-                return redirect("plane_list")  # Redirige a la lista de aviones
+                return redirect(
+                    request.get_full_path()
+                )  # Redirige a la lista de aviones
             else:
                 form_errors = True  # Si hay errores en el formulario
 
@@ -375,7 +438,7 @@ def plane_list(request):
                 plane_to_update.rows = cd["rows"]
                 plane_to_update.columns = cd["columns"]
                 plane_to_update.save()
-                return redirect("plane_list")
+                return redirect(request.get_full_path())
             else:
                 update_errors = True  # Marca que hubo errores en la actualización
 
@@ -390,94 +453,50 @@ def plane_list(request):
                     messages.error(request, "Error al eliminar el avión.")
             else:
                 messages.error(request, "No se indicó el ID del avión.")
-            return redirect("plane_list")
-
-    # Prepara los formularios de actualización para cada avión
-    update_form = []
-    for plane in airplanes:
-        if update_errors and str(plane.id) == str(update_plane_id):
-            uf = update_form_with_errors  # Si hubo errores, muestra el formulario con errores
-        else:
-            uf = UpdatePlaneForm(
-                initial={
-                    "model": plane.model,
-                    "capacity": plane.capacity,
-                    "rows": plane.rows,
-                    "columns": plane.columns,
-                },
-                plane_id=plane.id,
-            )
-        update_form.append(
-            (plane, uf)
-        )  # Guarda la tupla (avión, formulario de actualización)
+            return redirect(request.get_full_path())
 
+    # Los formularios de edición se piden por fila a plane_update_form;
+    # aquí solo se arma el que volvió con errores.
     # Renderiza la plantilla con:
-    # - Lista de aviones
+    # - Página de aviones y filtro aplicado
     # - Formulario de creación
-    # - Formularios de actualización por cada avión
-    # - Indicadores de errores
+    # - Formulario de actualización con errores (si lo hubo)
     return render(
         request,
         "plane/list.html",
         {
             "airplanes": airplanes,
+            "query": query,
             "form": form,
             "form_errors": form_errors,
-            "update_form": update_form,
+            "update_form": update_form_with_errors,
             "update_errors": update_errors,
             "update_plane_id": update_plane_id,
         },
     )
 
 
+def plane_update_form(request, plane_id):
+    # Devuelve solo el formulario de edición de un avión (se carga al abrir el modal)
+    plane = get_object_or_404(Plane, pk=plane_id)
+    form = UpdatePlaneForm(
+        initial={
+            "model": plane.model,
+            "capacity": plane.capacity,
+            "rows": plane.rows,
+            "columns": plane.columns,
+        },
+        plane_id=plane.id,
+    )
+    return render(
+        request, "plane/_update_form.html", {"form": form, "plane_id": plane.id}
+    )
+
+
 def plane_detail(request, plane_id):
     # Obtiene el avión correspondiente al ID proporcionado o lanza 404 si no existe
     plane = get_object_or_404(Plane, pk=plane_id)
 
-    # Número de filas y columnas del avión
-    rows = plane.rows
-    cols = plane.columns
-
-    # Letras de las columnas, por ejemplo ["A", "B", "C", ...] según la cantidad de columnas
-    column_letters = string.ascii_uppercase[:cols]
-
-    seat_matrix = []  # Lista que contendrá la matriz de asientos para la plantilla
-
-    # 🧠 Dividir columnas en bloques balanceados (máximo 3 bloques para simular secciones con pasillos)
-    max_bloques = 3
-    base = cols // max_bloques  # Número de columnas por bloque de forma base
-    extra = (
-        cols % max_bloques
-    )  # Columnas sobrantes que se distribuyen en los primeros bloques
-
-    bloques = [base] * max_bloques  # Inicializa los bloques con la cantidad base
-    for i in range(extra):
-        bloques[i] += 1  # Distribuye las columnas sobrantes
-
-    bloques = [
-        b for b in bloques if b > 0
-    ]  # Elimina bloques vacíos si hay pocas columnas
-
-    # 🎫 Generar layout dinámico de asientos por fila y columna
-    for row in range(1, rows + 1):
-        seat_row = []  # Lista de asientos para esta fila
-        idx = 0  # Índice para recorrer las letras de columna
-
-        for i, bloque in enumerate(bloques):
-            for _ in range(bloque):
-                col = column_letters[idx]
-                # Asigna tipo de asiento según la fila: filas 1-3 primera clase, el resto económico
-                clase = "first" if row <= 3 else "economy"
-                seat_row.append(
-                    (f"{col}{row}", clase)
-                )  # Tupla: número de asiento y clase
-                idx += 1
-            # Añade un "PASILLO" entre bloques, excepto al final
-            if i < len(bloques) - 1:
-                seat_row.append(("PASILLO", None))
-
-        seat_matrix.append(seat_row)  # Añade la fila a la matriz de asientos
-
     # Renderiza la plantilla de detalle del avión con:
     # - el objeto plane
     # - la matriz de asientos (seat_matrix) con distribución y clases
@@ -486,7 +505,8 @@ def plane_detail(request, plane_id):
         "plane/details.html",
         {
             "plane": plane,
-            "seat_matrix": seat_matrix,
+            "seat_matrix": partial(SeatMapService.display_rows, plane),
+            "plane_version": get_version(f"plane:{plane.id}"),
         },
     )
 
@@ -616,7 +636,12 @@ def flight_list(request):
     flights = FlightService.get_all()
 
     # Renderiza la plantilla "flights/list.html" pasando la lista de vuelos
-    return render(request, "flights/list.html", {"flights": flights})
+    # El queryset no se evalúa si el fragmento de la lista está en el cache
+    return render(
+        request,
+        "flights/list.html",
+        {"flights": flights, "flights_version": get_version("flights")},
+    )
 
 
 # Función para listar solo vuelos futuros
@@ -625,13 +650,29 @@ def upcoming_flight_list(request):
     flights = FlightService.get_upcoming_flights()
 
     # Renderiza la plantilla "flights/flight_available.html" pasando estos vuelos
-    return render(request, "flights/flight_available.html", {"flights": flights})
+    return render(
+        request,
+        "flights/flight_available.html",
+        {
+            "flights": flights,
+            "flights_version": get_version("flights"),
+            "today": datetime.now().date(),
+        },
+    )
 
 
 # Función para administrar vuelos
 def flight_administration(request):
-    # Obtiene todos los vuelos usando FlightService
-    flights = FlightService.get_all()
+    # Filtros (se resuelven en la base) y página actual
+    filters = {
+        "query": request.GET.get("q", "").strip(),
+        "status_id": _int_param(request, "status"),
+        "plane_id": _int_param(request, "plane"),
+        "date": _date_param(request, "date"),
+    }
+    flights = Paginator(
+        FlightService.get_admin_list(**filters), ADMIN_PAGE_SIZE
+    ).get_page(request.GET.get("page"))
 
     # Inicializa el formulario para crear un nuevo vuelo
     form = CreateFlightForm()
@@ -662,7 +703,7 @@ def flight_administration(request):
                     plane=cd["plane_id"],
                 )
                 new_flight.save()
-                return redirect("flight_administration")  # Redirige a la misma vista
+                return redirect(request.get_full_path())  # Redirige a la misma vista
             else:
                 form_errors = True  # Marca que hubo errores al crear
 
@@ -685,7 +726,7 @@ def flight_administration(request):
                 flight_to_update.status_id = cd["status_id"]
                 flight_to_update.plane_id = cd["plane_id"]
                 flight_to_update.save()
-                return redirect("flight_administration")
+                return redirect(request.get_full_path())
             else:
                 update_errors = True  # Marca que hubo errores en la actualización
 
@@ -702,44 +743,47 @@ def flight_administration(request):
                     messages.error(request, "Error al eliminar el vuelo.")
             else:
                 messages.error(request, "No se indicó el ID del vuelo.")
-            return redirect("flight_administration")
-
-    # Prepara los formularios de actualización para cada vuelo
-    update_form = []
-    for flight in flights:
-        if update_errors and str(flight.id) == str(update_flight_id):
-            uf = update_form_with_errors  # Si hubo errores, muestra el formulario con errores
-        else:
-            uf = UpdateFlightForm(
-                initial={
-                    "origin": flight.origin,
-                    "destination": flight.destination,
-                    "departure_date": flight.departure_date,
-                    "arrival_date": flight.arrival_date,
-                    "base_price": flight.base_price,
-                    "status_id": flight.status_id,
-                    "plane_id": flight.plane_id,
-                },
-                flight_id=flight.id,
-            )
-        update_form.append(
-            (flight, uf)
-        )  # Guarda la tupla (vuelo, formulario de actualización)
+            return redirect(request.get_full_path())
 
+    # Los formularios de edición se piden por fila a flight_update_form;
+    # aquí solo se arma el que volvió con errores.
     # Renderiza la plantilla con:
-    # - Lista de vuelos
+    # - Página de vuelos y filtros aplicados
+    # - Opciones de los filtros (cache compartido)
     # - Formulario de creación
-    # - Formularios de actualización por cada vuelo
-    # - Indicadores de errores
+    # - Formulario de actualización con errores (si lo hubo)
     return render(
         request,
         "flights/administration.html",
         {
             "flights": flights,
+            "filters": filters,
+            "status_choices": ChoicesService.flight_statuses()[1:],
+            "plane_choices": ChoicesService.planes()[1:],
             "form": form,
             "form_errors": form_errors,
-            "update_form": update_form,
+            "update_form": update_form_with_errors,
             "update_errors": update_errors,
             "update_flight_id": update_flight_id,
         },
     )
+
+
+def flight_update_form(request, flight_id):
+    # Devuelve solo el formulario de edición de un vuelo (se carga al abrir el modal)
+    flight = get_object_or_404(Flight, pk=flight_id)
+    form = UpdateFlightForm(
+        initial={
+            "origin": flight.origin,
+            "destination": flight.destination,
+            "departure_date": flight.departure_date,
+            "arrival_date": flight.arrival_date,
+            "base_price": flight.base_price,
+            "status_id": flight.status_id,
+            "plane_id": flight.plane_id,
+        },
+        flight_id=flight.id,
+    )
+    return render(
+        request, "flights/_update_form.html", {"form": form, "flight_id": flight.id}
+    )
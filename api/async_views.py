@@ -0,0 +1,178 @@
+"""
+Versiones asíncronas (async def, ORM asíncrono de Django) de las consultas
+de lectura más pedidas, para servir bajo ASGI (efi/asgi.py). Mientras una
+vista asíncrona espera a la base o a un cliente lento no ocupa un hilo del
+servidor, así que un mismo proceso atiende muchas más conexiones a la vez
+(ver el comando bench_asgi).
+"""
+
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from airline.services.flight import FlightService
+from airline.services.reservation import ReservationService
+from airline.services.seat_events import SeatEventService
+from airline.services.seat import SeatService
+from airline.services.ticket import TicketService
+from airline.utils.streaming import aiter_csv, aiter_ndjson
+from api.mixins import AuthView
+from api.renderers import EventStreamRenderer
+from api.serializers import FlightSerializer, SeatSerializer, TicketSerializer
+from api.views import PassengerManifestExportAPIView, include_archived
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView con manejadores async def. La autenticación, los permisos y el
+    límite de pedidos de DRF son síncronos (leen la base y el cache): se
+    ejecutan en un hilo antes de esperar al manejador.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            # OPTIONS (metadata de DRF) sigue siendo síncrono
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncFlightFilterAPIView(AuthView, AsyncAPIView):
+    """
+    GET /api/async/flightFilter/?origin=<ciudad>&destination=<ciudad>&date=<YYYY-MM-DD>
+    versión asíncrona de /api/flightFilter/ (mismos filtros y respuesta)
+    """
+
+    serializer_class = FlightSerializer
+    throttle_scope = "flight_filter"
+
+    async def get(self, request):
+        flights = await FlightService.afilter_flights(
+            request.query_params.get("origin"),
+            request.query_params.get("destination"),
+            request.query_params.get("date"),
+            include_archived=include_archived(request),
+        )
+        return Response(FlightSerializer(flights, many=True).data)
+
+
+class AsyncSeatAvailabilityAPIView(AuthView, AsyncAPIView):
+    """
+    GET /api/async/checkSeatAvailability/<int:plane_id>/<str:seat_code>/
+    versión asíncrona de /api/checkSeatAvailability/
+    """
+
+    serializer_class = SeatSerializer
+
+    async def get(self, request, plane_id, seat_code):
+        data = await SeatService.acheck_availability(plane_id, seat_code)
+        if not data:
+            return Response(
+                {"error": "El asiento no existe."}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class AsyncTicketInformationAPIView(AuthView, AsyncAPIView):
+    """
+    GET /api/async/ticketInformation/<str:barcode>
+    versión asíncrona de /api/ticketInformation/
+    """
+
+    serializer_class = TicketSerializer
+
+    async def get(self, request, barcode):
+        data = await TicketService.aget_ticket_info(barcode)
+        if not data:
+            return Response(
+                {"error": "El ticket no existe."}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class AsyncPassengerManifestExportAPIView(AuthView, AsyncAPIView):
+    """
+    GET /api/async/passengersByFlight/<int:flight_id>/manifest/?export=csv|ndjson
+    versión asíncrona de la exportación del manifiesto: las filas se leen
+    por bloques con aiterator() y se envían sin ocupar un hilo mientras el
+    cliente las recibe.
+    """
+
+    MANIFEST_FIELDS = PassengerManifestExportAPIView.MANIFEST_FIELDS
+
+    async def get(self, request, flight_id):
+        export = request.query_params.get("export", "csv").lower()
+        if export not in ("csv", "ndjson"):
+            return Response(
+                {"error": "Formato no soportado, usar csv o ndjson."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rows = await ReservationService.aiter_manifest(flight_id)
+        if rows is None:
+            return Response(
+                {"error": "El vuelo no existe."}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        if export == "csv":
+            content = aiter_csv(rows, self.MANIFEST_FIELDS)
+            content_type = "text/csv"
+        else:
+            content = aiter_ndjson(rows)
+            content_type = "application/x-ndjson"
+
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="manifest_flight_{flight_id}.{export}"'
+        )
+        return response
+
+
+class AsyncSeatEventsAPIView(AuthView, AsyncAPIView):
+    """
+    GET /api/async/seatEvents/<int:flight_id>/
+    Flujo text/event-stream con la disponibilidad de los asientos del vuelo:
+    un evento "snapshot" con todos y eventos "seats" con los que cambian
+    (ver SeatEventService). Reemplaza consultar /api/availableSeats/ cada
+    tantos segundos.
+    """
+
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    async def get(self, request, flight_id):
+        flight = await FlightService.aget_by_id(flight_id)
+        if flight is None:
+            return Response(
+                {"error": "El vuelo no existe."}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        response = StreamingHttpResponse(
+            SeatEventService.stream(flight), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # Sin buffer en proxies como nginx: cada evento sale en el momento
+        response["X-Accel-Buffering"] = "no"
+        return response
@@ -0,0 +1,79 @@
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+from airline.services.api_token import ApiTokenService
+from airline.services.signed_token import SignedTokenService
+
+
+def _bearer_token(request, keyword):
+    # Token del header Authorization: <keyword> <token> (None si no hay)
+    parts = get_authorization_header(request).split()
+    if not parts or parts[0].lower() != keyword.lower().encode():
+        return None
+    if len(parts) != 2:
+        raise AuthenticationFailed("Header Authorization inválido")
+    try:
+        return parts[1].decode()
+    except UnicodeError:
+        raise AuthenticationFailed("Token no valido")
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """
+    Autenticación con un token de acceso firmado (Authorization: Bearer
+    <access>, ver /api/token/). Se verifica en memoria, sin consultar la base;
+    el usuario del pedido se arma con los datos del token. Los tokens con
+    otro formato pasan a la siguiente autenticación.
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        raw = _bearer_token(request, self.keyword)
+        # Los tokens firmados separan datos y firma con ":" (django.core.signing)
+        if raw is None or ":" not in raw:
+            return None
+        claims = SignedTokenService.verify(raw)
+        if claims is None:
+            raise AuthenticationFailed("Token no valido o vencido")
+        return SignedTokenService.user_from_claims(claims), claims
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+class ApiTokenAuthentication(BaseAuthentication):
+    """
+    Autenticación con un header Authorization: Bearer <token> emitido con
+    ApiTokenService (ver el comando create_api_token). Sin header pasa a la
+    siguiente autenticación; con un token inválido responde 401.
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        raw = _bearer_token(request, self.keyword)
+        if raw is None:
+            return None
+        token = ApiTokenService.verify(raw)
+        if token is None:
+            raise AuthenticationFailed("Token no valido")
+        return token.user, token
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+class BearerScheme(OpenApiAuthenticationExtension):
+    # Documenta en el esquema OpenAPI el header Bearer de ambos tipos de token
+    target_class = SignedTokenAuthentication
+    name = "Bearer"
+    match_subclasses = True
+
+    def get_security_definition(self, auto_schema):
+        return {"type": "http", "scheme": "bearer", "bearerFormat": "Token"}
+
+
+class ApiTokenBearerScheme(BearerScheme):
+    target_class = ApiTokenAuthentication
@@ -1,7 +1,37 @@
+import math
+
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
+from api.permissions import TokenScopePermission
+
+
+class TokenScopeMixin:
+    """
+    Agrega a los permisos de la vista el control de permisos de los tokens de
+    la API, aunque la vista redefina permission_classes.
+    """
+
+    def get_permissions(self):
+        return [*super().get_permissions(), TokenScopePermission()]
+
+
+class RateLimitHeadersMixin:
+    """
+    Agrega a la respuesta el cupo del límite de pedidos de la vista (ver
+    api.throttling.GCRAThrottle), si tiene uno.
+    """
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        quota = getattr(request, "throttle_quota", None)
+        if quota is not None:
+            response["X-RateLimit-Limit"] = str(quota.limit)
+            response["X-RateLimit-Remaining"] = str(quota.remaining)
+            response["X-RateLimit-Reset"] = str(math.ceil(quota.reset))
+        return response
+
 
-class AuthView:
+class AuthView(TokenScopeMixin, RateLimitHeadersMixin):
     """
     Clase base para las vistas que requiqere autenticacion
     """
@@ -9,9 +39,10 @@ class AuthView:
     permission_classes = [IsAuthenticated]
 
 
-class AuthAdminView:
+class AuthAdminView(TokenScopeMixin, RateLimitHeadersMixin):
     """
     Clase base para las vistas que requiqere autenticacion de un usuario Admin
     """
 
     permission_classes = [IsAdminUser]
+    required_scopes = ("admin",)  # con token de la API
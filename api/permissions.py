@@ -1,24 +1,23 @@
-from django.conf import settings
-from rest_framework.permissions import BasePermission
+from rest_framework.permissions import SAFE_METHODS, BasePermission
 
+from airline.models import ApiToken
 
-VALID_TOKENS = ["token-valido-1234", "777777"]
 
-
-class TokenPermission(BasePermission):
+class TokenScopePermission(BasePermission):
     """
-    Permiso basado en un header Authorization: Bearer <Token>
+    Limita lo que puede hacer un pedido autenticado con un token de la API
+    según sus permisos: "read" para GET/HEAD/OPTIONS y "write" para el resto.
+    Las vistas pueden pedir otros con `required_scopes`. Los pedidos
+    autenticados de otra forma (sesión) no se restringen.
     """
 
-    message = "Token no valido"
+    message = "El token no tiene permiso para esta operación"
 
     def has_permission(self, request, view):
-        print(request.user)
-        auth_header = request.META.get("HTTP_AUTHORIZATION", None)
-        if not auth_header.startswith("Bearer "):
-            return False
-        token = auth_header.split(" ", 1)[1].strip()
-        return token in settings.VALID_TOKENS
-
-    def has_object_permission(self, request, view, obj):
-        return super().has_object_permission(request, view, obj)
+        token = request.auth
+        if not isinstance(token, ApiToken):
+            return True
+        required = getattr(view, "required_scopes", None)
+        if required is None:
+            required = ("read",) if request.method in SAFE_METHODS else ("write",)
+        return token.scope_set.issuperset(required)
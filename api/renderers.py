@@ -0,0 +1,18 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Acepta pedidos con Accept: text/event-stream (EventSource del navegador).
+    Las vistas devuelven el flujo en streaming; este renderer solo arma las
+    respuestas de error, como un evento "error" con el detalle en JSON.
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return f"event: error\ndata: {json.dumps(data)}\n\n".encode()
@@ -13,6 +13,8 @@ from rest_framework import serializers
 from airline.services.plane import PlaneService
 from airline.services.flight_status import FlightStatusService
 from airline.services.flight import FlightService
+from airline.services.plane_schedule import PlaneScheduleService
+from airline.services.pricing import PricingService
 from airline.services.passenger import PassengerService
 from airline.services.seat import SeatService
 from airline.services.reservation import ReservationService
@@ -126,6 +128,35 @@ class FlightSerializer(serializers.ModelSerializer):
             "user_display",
         ]
 
+    def validate(self, attrs):
+        """
+        Valida las fechas y que el avión no tenga otro vuelo en ese rango horario.
+        En un PATCH se completan los campos faltantes con los del vuelo actual.
+        """
+        departure = attrs.get(
+            "departure_date", getattr(self.instance, "departure_date", None)
+        )
+        arrival = attrs.get(
+            "arrival_date", getattr(self.instance, "arrival_date", None)
+        )
+        plane = attrs.get("plane", getattr(self.instance, "plane", None))
+
+        if departure and arrival and arrival <= departure:
+            raise serializers.ValidationError(
+                "La fecha de llegada debe ser posterior a la de salida."
+            )
+        if plane and departure and arrival:
+            if PlaneScheduleService.has_overlap(
+                plane.id,
+                departure,
+                arrival,
+                exclude_id=getattr(self.instance, "id", None),
+            ):
+                raise serializers.ValidationError(
+                    "El avión seleccionado ya tiene otro vuelo asignado en ese rango horario."
+                )
+        return attrs
+
     def create(self, validated_data):
         """
         Crea un nuevo vuelo usando la capa de servicio.
@@ -275,6 +306,24 @@ class SeatSerializer(serializers.ModelSerializer):
         )
 
 
+class AvailableSeatSerializer(SeatSerializer):
+    """
+    Asiento disponible con su precio para el vuelo. El precio sale de la
+    tabla del vuelo que la vista pasa en el contexto (price_table).
+    """
+
+    price = serializers.SerializerMethodField()
+
+    class Meta(SeatSerializer.Meta):
+        fields = [*SeatSerializer.Meta.fields, "price"]
+
+    def get_price(self, seat):
+        table = self.context.get("price_table")
+        if not table:
+            return None
+        return str(PricingService.price_for(table, seat.seat_type))
+
+
 class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True)
 
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from airline.models import Flight
+from airline.views import ADMIN_PAGE_SIZE
+
+
+@pytest.fixture
+def many_flights(flight_with_tickets):
+    """
+    Agrega vuelos hasta superar una página del listado de administración.
+    """
+    departure = timezone.make_aware(datetime(2026, 1, 1, 10, 0))
+    Flight.objects.bulk_create(
+        Flight(
+            origin="Córdoba",
+            destination=f"Destino {i}",
+            departure_date=departure + timedelta(days=i),
+            arrival_date=departure + timedelta(days=i, hours=2),
+            duration=timedelta(hours=2),
+            base_price=100,
+            status=flight_with_tickets.status,
+            plane=flight_with_tickets.plane,
+        )
+        for i in range(ADMIN_PAGE_SIZE * 2)
+    )
+    return flight_with_tickets
+
+
+# -------------------- TEST: Listado paginado de vuelos --------------------
+@pytest.mark.django_db
+def test_flight_administration_paginated(client, many_flights):
+    """
+    Verifica que el listado se pagine, no arme formularios de edición por fila
+    y que la cantidad de consultas no dependa de la cantidad de vuelos.
+    """
+    url = reverse("flight_administration")
+    client.get(url)  # carga las opciones en el cache compartido
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, {"page": 2})
+
+    assert response.status_code == 200
+    assert len(response.context["flights"]) == ADMIN_PAGE_SIZE
+    assert response.context["update_form"] is None
+    assert len(queries) <= 3
+    assert "Page 2 of 3" in response.content.decode()
+
+
+# -------------------- TEST: Filtros del lado del servidor --------------------
+@pytest.mark.django_db
+def test_flight_administration_filters(client, many_flights):
+    """
+    Verifica el filtro por texto y por avión, y que una fecha inválida no
+    rompa la página.
+    """
+    url = reverse("flight_administration")
+    response = client.get(url, {"q": "madrid", "plane": many_flights.plane.id})
+
+    assert [f.id for f in response.context["flights"]] == [many_flights.id]
+
+    # Una fecha con formato válido pero inexistente se ignora
+    response = client.get(url, {"date": "2025-02-30", "q": "madrid"})
+    assert response.status_code == 200
+    assert [f.id for f in response.context["flights"]] == [many_flights.id]
+
+
+# -------------------- TEST: Formulario de edición bajo demanda --------------------
+@pytest.mark.django_db
+def test_flight_update_form_fragment(client, flight_with_tickets):
+    """
+    Verifica que el fragmento traiga el formulario con los datos del vuelo.
+    """
+    url = reverse("flight_update_form", args=[flight_with_tickets.id])
+    response = client.get(url)
+    html = response.content.decode()
+
+    assert response.status_code == 200
+    assert f'name="flight_id" value="{flight_with_tickets.id}"' in html
+    assert 'value="Buenos Aires"' in html
+    assert client.get(reverse("flight_update_form", args=[999])).status_code == 404
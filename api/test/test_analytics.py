@@ -0,0 +1,137 @@
+from array import array
+from datetime import datetime, timezone
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airline.models import User
+from airline.services.analytics import (
+    DAY,
+    FLAG_CONFIRMED,
+    FLAG_TICKET,
+    FLAG_TICKET_USED,
+    BookingColumns,
+    analyze,
+)
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _columns(rows):
+    """
+    rows: (días de anticipación, días desde NOW a la salida, ruta, precio, flags)
+    """
+    now = int(NOW.timestamp())
+    columns = {
+        "booked": array("q"),
+        "departure": array("q"),
+        "route": array("q"),
+        "price": array("d"),
+        "flags": array("q"),
+    }
+    for days_before, departs_in, route, price, flags in rows:
+        departure = now + departs_in * DAY
+        columns["booked"].append(departure - days_before * DAY)
+        columns["departure"].append(departure)
+        columns["route"].append(route)
+        columns["price"].append(price)
+        columns["flags"].append(flags)
+    return BookingColumns(columns, [("BUE", "MAD"), ("BUE", "ROM")])
+
+
+CONFIRMED_USED = FLAG_CONFIRMED | FLAG_TICKET | FLAG_TICKET_USED
+CONFIRMED_NO_SHOW = FLAG_CONFIRMED | FLAG_TICKET
+
+ROWS = [
+    (30, -10, 0, 100.0, CONFIRMED_USED),
+    (10, -10, 0, 100.0, CONFIRMED_NO_SHOW),
+    (2, 5, 0, 200.0, FLAG_CONFIRMED),
+    (0, 5, 1, 300.0, FLAG_CONFIRMED),
+    (5, 5, 1, 999.0, 0),  # no confirmada: no cuenta
+]
+
+
+# -------------------- TEST: Análisis columnar --------------------
+def test_analyze_curve_distribution_routes_and_no_shows():
+    """
+    Verifica la curva de reservas, la distribución de anticipación, las rutas
+    y la tasa de no-show sobre columnas armadas a mano.
+    """
+    report = analyze(_columns(ROWS), now=NOW, curve_days=30)
+    curve = {point["days_before"]: point for point in report["booking_curve"]}
+    buckets = {b["range"]: b["count"] for b in report["days_before"]["buckets"]}
+
+    assert report["reservations"] == 4
+    assert curve[30]["cumulative_share"] == 0.25
+    assert curve[2]["cumulative_share"] == 0.75
+    assert curve[0]["cumulative_share"] == 1.0
+    assert report["days_before"]["mean"] == 10.5
+    assert report["days_before"]["p50"] == 2
+    assert buckets["2-3"] == 1 and buckets["15-30"] == 1
+    assert report["routes"][0] == {
+        "origin": "BUE",
+        "destination": "MAD",
+        "reservations": 3,
+        "revenue": 400.0,
+        "share": 0.75,
+    }
+    assert report["no_show"]["flown"] == 2
+    assert report["no_show"]["rate"] == 0.5
+
+
+# -------------------- TEST: Foto .npy --------------------
+def test_snapshot_round_trip(tmp_path):
+    """
+    Verifica que el análisis desde la foto mapeada coincida con el de memoria.
+    """
+    data = _columns(ROWS)
+    data.save(tmp_path)
+
+    assert analyze(BookingColumns.load(tmp_path), now=NOW) == analyze(data, now=NOW)
+
+
+# -------------------- TEST: API de análisis --------------------
+@pytest.mark.django_db
+def test_booking_analytics_api(flight_with_tickets, tmp_path):
+    """
+    Verifica que el endpoint sea solo para admins y analice la foto de
+    reservas generada por analyze_bookings (sin foto no lee la base).
+    """
+    client = APIClient()
+    user = User.objects.create_user(
+        username="viewer", email="viewer@test.com", password="123"
+    )
+    client.force_authenticate(user=user)
+    assert client.get(reverse("booking-analytics")).status_code == 403
+
+    admin = User.objects.create_superuser(
+        username="admin", email="admin@test.com", password="admin123"
+    )
+    client.force_authenticate(user=admin)
+    snapshot = tmp_path / "analytics"
+    with override_settings(ANALYTICS_SNAPSHOT_DIR=snapshot):
+        assert client.get(reverse("booking-analytics")).status_code == 503
+
+        call_command(
+            "analyze_bookings",
+            "--save-snapshot",
+            str(snapshot),
+            stdout=StringIO(),
+            stderr=StringIO(),
+        )
+        response = client.get(reverse("booking-analytics"), {"end": "2025-12-02"})
+        data = response.json()
+
+        assert response.status_code == 200
+        assert data["reservations"] == 3
+        assert data["routes"][0]["origin"] == "Buenos Aires"
+        assert data["no_show"]["no_shows"] == 3
+        for top in ("x", "²", "-1"):
+            assert (
+                client.get(reverse("booking-analytics"), {"top": top}).status_code
+                == 400
+            )
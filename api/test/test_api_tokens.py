@@ -0,0 +1,124 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airline.models import ApiToken, User
+from airline.services.api_token import ApiTokenService, TokenCache
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(
+        username="client", email="client@test.com", password="123"
+    )
+
+
+def _client(raw):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {raw}")
+    return client
+
+
+# -------------------- TEST: Emisión y autenticación --------------------
+@pytest.mark.django_db
+def test_token_is_stored_hashed_and_authenticates(user):
+    """
+    Verifica que solo se guarde el hash y que el token autentique pedidos.
+    """
+    token, raw = ApiTokenService.issue(user, "integración")
+
+    assert raw.startswith(token.prefix + ".")
+    assert raw not in token.key_hash
+    assert _client(raw).get(reverse("flight-available")).status_code == 200
+    assert APIClient().get(reverse("flight-available")).status_code in (401, 403)
+
+
+@pytest.mark.django_db
+def test_invalid_tokens_are_rejected(user):
+    """
+    Verifica que un secreto alterado, un token inexistente o vencido den 401.
+    """
+    token, raw = ApiTokenService.issue(user, "integración")
+    _, expired = ApiTokenService.issue(user, "viejo", expires_in=timedelta(days=1))
+    ApiToken.objects.filter(name="viejo").update(
+        expires_at=token.created_at - timedelta(days=1)
+    )
+    url = reverse("flight-available")
+
+    for bad in (raw[:-1] + ("A" if raw[-1] != "A" else "B"), "nada", expired):
+        assert _client(bad).get(url).status_code == 401
+
+
+# -------------------- TEST: Permisos --------------------
+@pytest.mark.django_db
+def test_token_scopes_limit_admin_endpoints():
+    """
+    Verifica que un admin con un token de solo lectura no acceda a los
+    endpoints de administración.
+    """
+    admin = User.objects.create_superuser(
+        username="admin", email="admin@test.com", password="admin123"
+    )
+    _, read_only = ApiTokenService.issue(admin, "lectura")
+    _, full = ApiTokenService.issue(admin, "admin", scopes=["read", "admin"])
+
+    assert _client(read_only).get(reverse("flight-vs-list")).status_code == 403
+    assert _client(full).get(reverse("flight-vs-list")).status_code == 200
+    with pytest.raises(ValueError):
+        ApiTokenService.issue(admin, "x", scopes=["root"])
+
+
+# -------------------- TEST: Cache en memoria --------------------
+@pytest.mark.django_db
+def test_verified_tokens_are_cached_and_invalidated(user):
+    """
+    Verifica que la segunda verificación no consulte la base, que cada una
+    devuelva su propia copia y que revocar el token o desactivar el usuario
+    lo saque del cache.
+    """
+    token, raw = ApiTokenService.issue(user, "integración")
+    assert ApiTokenService.verify(raw) == token
+
+    with CaptureQueriesContext(connection) as queries:
+        first = ApiTokenService.verify(raw)
+        second = ApiTokenService.verify(raw)
+    assert first == second == token
+    assert len(queries) == 0
+    # Cada pedido recibe su propia copia: modificar una no afecta a las demás
+    assert first is not second and first.user is not second.user
+    first.user.is_staff = True
+    assert not ApiTokenService.verify(raw).user.is_staff
+
+    user.is_active = False
+    user.save()
+    assert ApiTokenService.verify(raw) is None
+
+    user.is_active = True
+    user.save()
+    assert ApiTokenService.verify(raw) == token
+    ApiTokenService.revoke(token)
+    assert ApiTokenService.verify(raw) is None
+
+
+def test_token_cache_is_bounded_lru():
+    """
+    Verifica que el cache descarte el token usado hace más tiempo y los vencidos.
+    """
+    tokens = [ApiToken(id=i, user_id=1) for i in range(3)]
+    cache = TokenCache(size=2, ttl=60)
+    cache.set("a", tokens[0])
+    cache.set("b", tokens[1])
+    cache.get("a")
+    cache.set("c", tokens[2])
+
+    assert cache.get("b") is None
+    assert cache.get("a") is tokens[0]
+    assert len(cache) == 2
+
+    expired = TokenCache(size=2, ttl=0)
+    expired.set("a", tokens[0])
+    assert expired.get("a") is None
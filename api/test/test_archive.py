@@ -0,0 +1,149 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from airline.models import (
+    ArchivedFlight,
+    ArchivedReservation,
+    DeletedRow,
+    Flight,
+    FlightSales,
+    Reservation,
+    Ticket,
+    User,
+)
+from airline.repositories.flight import FlightRepository
+from airline.services.archive import ArchiveService
+from airline.utils.db_routing import ArchiveRouter
+
+
+def _client():
+    user = User.objects.create_user(username="viewer", email="v@test.com")
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+# -------------------- TEST: Archivo de vuelos realizados --------------------
+@pytest.mark.django_db
+def test_archive_moves_old_flights_with_reservations_and_tickets(flight_with_tickets):
+    """
+    Verifica que un vuelo anterior al horizonte pase al archivo con sus
+    reservas y tickets y deje las tablas de uso diario (y su resumen).
+    """
+    now = flight_with_tickets.arrival_date + timedelta(days=10)
+    assert ArchiveService.archive(horizon_days=30, now=now) == 0
+
+    now += timedelta(days=30)
+    assert ArchiveService.pending(horizon_days=30, now=now) == 1
+    reservation_ids = set(Reservation.objects.values_list("id", flat=True))
+    ticket_ids = set(Ticket.objects.values_list("id", flat=True))
+    with CaptureQueriesContext(connection) as queries:
+        assert ArchiveService.archive(horizon_days=30, batch_size=1, now=now) == 1
+
+    assert not Flight.objects.exists()
+    assert not Reservation.objects.exists()
+    assert not Ticket.objects.exists()
+    assert not FlightSales.objects.exists()
+    # Las bajas (también en cascada) se registran para la exportación incremental
+    # con un solo INSERT
+    deleted = set(DeletedRow.objects.values_list("table", "row_id"))
+    assert deleted == {("flight", flight_with_tickets.id)} | {
+        ("reservation", pk) for pk in reservation_ids
+    } | {("ticket", pk) for pk in ticket_ids}
+    inserts = [
+        q
+        for q in queries.captured_queries
+        if 'INSERT INTO "airline_deletedrow"' in q["sql"]
+    ]
+    assert len(inserts) == 1
+
+    archived = ArchivedFlight.objects.get(id=flight_with_tickets.id)
+    assert (archived.origin, archived.status) == ("Buenos Aires", "Scheduled")
+    assert str(archived) == str(flight_with_tickets)
+    rows = ArchivedReservation.objects.filter(flight=archived).order_by("id")
+    assert [row.ticket_barcode for row in rows] == [
+        "BARCODE0",
+        "BARCODE1",
+        "BARCODE2",
+    ]
+    assert rows[0].seat_name == "1A (Plane ID: %d)" % archived.plane_id
+
+
+@pytest.mark.django_db
+def test_searches_read_the_archive_only_when_asked(flight_with_tickets):
+    """
+    Verifica que la búsqueda de vuelos y las reservas por pasajero incluyan
+    el archivo solo con ?archived=1 (o una fecha anterior al horizonte).
+    """
+    passenger_id = Reservation.objects.get(reservation_code="RES0").passenger_id
+    ArchiveService.archive(horizon_days=0)
+    client = _client()
+
+    response = client.get("/api/flightFilter/?origin=Buenos")
+    assert response.json() == []
+
+    response = client.get("/api/flightFilter/?origin=Buenos&archived=1")
+    [flight] = response.json()
+    assert flight["id"] == flight_with_tickets.id
+    assert flight["status_display"] == "Scheduled"
+    assert flight["user_display"] == []
+
+    day = flight_with_tickets.departure_date.date().isoformat()
+    with override_settings(ARCHIVE={"HORIZON_DAYS": 0}):
+        response = client.get(f"/api/flightFilter/?date={day}")
+    assert [row["id"] for row in response.json()] == [flight_with_tickets.id]
+
+    url = f"/api/reservationsByPassenger/{passenger_id}/"
+    assert client.get(url).json() == []
+    [reservation] = client.get(url + "?archived=1").json()
+    assert reservation["reservation_code"] == "RES0"
+    assert reservation["passenger_display"] == "Pasajero 0 (DOC0)"
+    assert reservation["user_display"] == "agent"
+
+
+@pytest.mark.django_db
+def test_archived_copies_of_live_flights_are_ignored(flight_with_tickets):
+    """
+    Verifica que si una tanda se copió pero no se borró, la búsqueda no
+    duplique el vuelo y la próxima corrida lo archive igual.
+    """
+    ArchivedFlight.objects.create(
+        id=flight_with_tickets.id,
+        origin="Buenos Aires",
+        destination="Madrid",
+        departure_date=flight_with_tickets.departure_date,
+        arrival_date=flight_with_tickets.arrival_date,
+        duration=flight_with_tickets.duration,
+        base_price=flight_with_tickets.base_price,
+        status="Scheduled",
+        plane_id=flight_with_tickets.plane_id,
+        plane_name=str(flight_with_tickets.plane),
+    )
+    flights = FlightRepository.filter_flights(include_archived=True)
+    assert [type(flight) for flight in flights] == [Flight]
+
+    call_command("archive_flights", days=0, verbosity=0)
+    assert not Flight.objects.exists()
+    assert ArchivedReservation.objects.count() == 3
+
+
+@override_settings(ARCHIVE_DATABASE="archive")
+def test_archive_router_keeps_archive_tables_in_their_database():
+    """
+    Verifica que con una base de archivo propia solo el archivo se migre en
+    ella y no en la principal.
+    """
+    router = ArchiveRouter()
+    assert router.db_for_read(ArchivedFlight) == "archive"
+    assert router.db_for_write(Flight) is None
+    assert router.allow_migrate("archive", "airline", "archivedflight") is True
+    assert router.allow_migrate("default", "airline", "archivedreservation") is False
+    assert router.allow_migrate("archive", "airline", "flight") is False
+    assert router.allow_migrate("default", "airline", "flight") is None
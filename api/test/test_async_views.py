@@ -0,0 +1,76 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from airline.models import User
+from airline.services.signed_token import SignedTokenService
+
+
+def _token():
+    user = User.objects.create_user(username="async", email="async@test.com")
+    return SignedTokenService.issue_pair(user)["access"]
+
+
+def _get(url, token=None):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return async_to_sync(AsyncClient().get)(url, headers=headers)
+
+
+def _content(response):
+    async def consume():
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    return async_to_sync(consume)().decode()
+
+
+# -------------------- TEST: Vistas asíncronas --------------------
+@pytest.mark.django_db
+def test_async_views_match_sync_views(flight_with_tickets, api_client):
+    """
+    Verifica que las versiones asíncronas respondan lo mismo que las
+    síncronas (búsqueda de vuelos, asiento y ticket).
+    """
+    token = _token()
+    api_client.force_authenticate(user=User.objects.get(username="async"))
+    plane_id = flight_with_tickets.plane_id
+
+    for sync_url, async_url in [
+        ("/api/flightFilter/?origin=Buenos", "/api/async/flightFilter/?origin=Buenos"),
+        (
+            f"/api/checkSeatAvailability/{plane_id}/1a/",
+            f"/api/async/checkSeatAvailability/{plane_id}/1a/",
+        ),
+        ("/api/ticketInformation/barcode1", "/api/async/ticketInformation/barcode1"),
+    ]:
+        expected = api_client.get(sync_url)
+        response = _get(async_url, token)
+        assert response.status_code == expected.status_code == 200
+        assert response.json() == expected.json()
+
+    response = _get("/api/async/ticketInformation/NOEXISTE", token)
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_async_manifest_streams_rows_and_requires_auth(flight_with_tickets):
+    """
+    Verifica que el manifiesto asíncrono se envíe en streaming con una fila
+    por pasajero, y que sin token se rechace.
+    """
+    url = f"/api/async/passengersByFlight/{flight_with_tickets.id}/manifest/"
+
+    assert _get(url).status_code in (401, 403)
+
+    token = _token()
+    response = _get(url, token)
+    assert response.status_code == 200
+    assert response.is_async
+    lines = _content(response).splitlines()
+    assert lines[0].startswith("reservation_code,seat_number")
+    assert [line.split(",")[0] for line in lines[1:]] == ["RES0", "RES1", "RES2"]
+
+    response = _get(url + "?export=ndjson", token)
+    assert len(_content(response).splitlines()) == 3
+    assert (
+        _get("/api/async/passengersByFlight/999999/manifest/", token).status_code == 404
+    )
@@ -0,0 +1,87 @@
+import pytest
+from django.db import OperationalError, transaction
+
+from airline.models import Passenger, Reservation, Seat, Ticket
+from airline.services.reservation import ReservationService
+from airline.utils.db_retry import retry_on_lock
+
+
+def _flaky(errors):
+    calls = []
+
+    @retry_on_lock(attempts=3, base_delay=0)
+    def write():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    return write, calls
+
+
+# -------------------- TEST: Reintentos por lock --------------------
+def test_retry_on_lock_retries_only_lock_errors():
+    """
+    Verifica que se reintenten los errores de lock, hasta el máximo de
+    intentos, y que los demás errores se propaguen en el acto.
+    """
+    write, calls = _flaky([OperationalError("database is locked")] * 2)
+    assert write() == "ok" and len(calls) == 3
+
+    write, calls = _flaky([OperationalError("database is locked")] * 3)
+    with pytest.raises(OperationalError):
+        write()
+    assert len(calls) == 3
+
+    write, calls = _flaky([OperationalError("no such table: x")])
+    with pytest.raises(OperationalError):
+        write()
+    assert len(calls) == 1
+
+
+@pytest.mark.django_db
+def test_retry_on_lock_does_not_retry_inside_a_transaction():
+    """
+    Verifica que dentro de una transacción abierta no se reintente.
+    """
+    write, calls = _flaky([OperationalError("database is locked")])
+    with transaction.atomic(), pytest.raises(OperationalError):
+        write()
+    assert len(calls) == 1
+
+
+# -------------------- TEST: Reserva atómica --------------------
+@pytest.mark.django_db
+def test_book_is_all_or_nothing(flight_with_tickets):
+    """
+    Verifica que la reserva ocupe el asiento y cree reserva y ticket, y que
+    reservar un asiento ocupado no deje nada a medias.
+    """
+    flight = flight_with_tickets
+    passenger = Passenger.objects.first()
+    user_id = Reservation.objects.first().user_id
+    seat = Seat.objects.create(
+        number="2A",
+        row=2,
+        column="A",
+        seat_type="economico",
+        status="available",
+        plane=flight.plane,
+    )
+
+    reservation, ticket = ReservationService.book(
+        flight.id, passenger.id, seat.id, user_id, 100, "NUEVA1", barcode="BAR-1"
+    )
+    seat.refresh_from_db()
+    assert seat.status == "taken"
+    assert ticket.reservation_id == reservation.id
+
+    reservations, tickets = Reservation.objects.count(), Ticket.objects.count()
+    with pytest.raises(ValueError):
+        ReservationService.book(
+            flight.id, passenger.id, seat.id, user_id, 100, "NUEVA2", barcode="BAR-2"
+        )
+    assert (Reservation.objects.count(), Ticket.objects.count()) == (
+        reservations,
+        tickets,
+    )
@@ -0,0 +1,159 @@
+import io
+import json
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airline.models import Flight, Passenger, User
+
+
+# -------------------- FIXTURE: Cliente admin autenticado --------------------
+@pytest.fixture
+def admin_client(db):
+    """
+    Crea un usuario administrador autenticado para las pruebas.
+    """
+    admin = User.objects.create_superuser(
+        username="admin", email="admin@test.com", password="123"
+    )
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return client
+
+
+# -------------------- TEST: Importación de vuelos por API --------------------
+@pytest.mark.django_db
+def test_bulk_import_flights(admin_client, flight_with_tickets):
+    """
+    Verifica que se creen los vuelos válidos y se rechacen los que tienen
+    referencias inexistentes o se solapan con otro vuelo del mismo avión.
+    """
+    plane = flight_with_tickets.plane.id
+    status = flight_with_tickets.status.id
+    user = User.objects.get(username="agent").id
+    header = (
+        "origin,destination,departure_date,arrival_date,base_price,status,plane,users"
+    )
+    rows = [
+        # Válido
+        f"Madrid,Roma,2025-12-02T08:00,2025-12-02T10:30,300,{status},{plane},{user}",
+        # Se solapa con el vuelo existente (10:00 a 14:00)
+        f"Madrid,Paris,2025-12-01T13:00,2025-12-01T15:00,300,{status},{plane},",
+        # Se solapa con el primero del archivo
+        f"Roma,Madrid,2025-12-02T10:00,2025-12-02T12:00,300,{status},{plane},",
+        # Estado inexistente
+        f"Roma,Paris,2025-12-03T08:00,2025-12-03T10:00,300,999,{plane},",
+    ]
+    upload = SimpleUploadedFile(
+        "season.csv", "\n".join([header, *rows]).encode(), content_type="text/csv"
+    )
+
+    response = admin_client.post(
+        reverse("bulk-import"), {"file": upload, "kind": "flights"}, format="multipart"
+    )
+
+    assert response.status_code == 200
+    assert response.data["created"] == 1
+    assert [r["line"] for r in response.data["rejected"]] == [3, 4, 5]
+    assert response.data["rejected"][2]["errors"] == ["El estado 999 no existe."]
+
+    flight = Flight.objects.get(destination="Roma")
+    assert list(flight.user.values_list("id", flat=True)) == [user]
+
+
+# -------------------- TEST: Importación de pasajeros por comando --------------------
+@pytest.mark.django_db
+def test_import_airline_passengers(tmp_path, flight_with_tickets):
+    """
+    Verifica el modo --dry-run y que los documentos ya registrados se rechacen.
+    """
+    records = [
+        {
+            "name": "Nuevo",
+            "document": "NEW1",
+            "document_type": "dni",
+            "email": "nuevo@test.com",
+            "phone": "123",
+            "birth_date": "1985-05-05",
+        },
+        # Documento ya registrado por el fixture
+        {
+            "name": "Repetido",
+            "document": "DOC0",
+            "document_type": "dni",
+            "email": "rep@test.com",
+            "phone": "123",
+            "birth_date": "1985-05-05",
+        },
+    ]
+    path = tmp_path / "passengers.ndjson"
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n{roto\n")
+    report_path = tmp_path / "report.json"
+
+    call_command(
+        "import_airline",
+        str(path),
+        kind="passengers",
+        dry_run=True,
+        stdout=io.StringIO(),
+    )
+    assert not Passenger.objects.filter(document="NEW1").exists()
+
+    call_command(
+        "import_airline",
+        str(path),
+        kind="passengers",
+        report=str(report_path),
+        stdout=io.StringIO(),
+    )
+    report = json.loads(report_path.read_text())
+
+    assert Passenger.objects.filter(document="NEW1").count() == 1
+    assert report["created"] == 1
+    assert [r["line"] for r in report["rejected"]] == [2, 3]
+
+
+# -------------------- TEST: Restricciones de los campos y codificación --------------------
+@pytest.mark.django_db
+def test_bulk_import_rejects_rows_over_field_limits(admin_client, flight_with_tickets):
+    """
+    Verifica que las filas que no entran en las columnas (largo del texto,
+    dígitos del precio) se rechacen una por una y que un archivo que no es
+    UTF-8 se rechace entero antes de guardar nada.
+    """
+    plane = flight_with_tickets.plane.id
+    status = flight_with_tickets.status.id
+    header = "origin,destination,departure_date,arrival_date,base_price,status,plane"
+    rows = [
+        f"{'X' * 150},Roma,2025-12-05T08:00,2025-12-05T10:00,300,{status},{plane}",
+        f"Madrid,Roma,2025-12-06T08:00,2025-12-06T10:00,123456789012345,{status},{plane}",
+        f"Madrid,Roma,2025-12-07T08:00,2025-12-07T10:00,300,{status},{plane}",
+    ]
+    upload = SimpleUploadedFile(
+        "season.csv", "\n".join([header, *rows]).encode(), content_type="text/csv"
+    )
+
+    response = admin_client.post(
+        reverse("bulk-import"), {"file": upload, "kind": "flights"}, format="multipart"
+    )
+
+    assert response.status_code == 200
+    assert response.data["created"] == 1
+    assert [r["line"] for r in response.data["rejected"]] == [2, 3]
+    assert response.data["rejected"][0]["errors"][0].startswith("origin:")
+    assert response.data["rejected"][1]["errors"][0].startswith("base_price:")
+
+    latin1 = SimpleUploadedFile(
+        "season.csv",
+        "\n".join([header, rows[2].replace("Madrid", "Málaga")]).encode("latin-1"),
+        content_type="text/csv",
+    )
+    response = admin_client.post(
+        reverse("bulk-import"), {"file": latin1, "kind": "flights"}, format="multipart"
+    )
+
+    assert response.status_code == 400
+    assert Flight.objects.filter(destination="Roma").count() == 1
@@ -0,0 +1,133 @@
+from pathlib import Path
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import override_settings
+
+from airline.checks import check_shared_cache
+from efi.cache import cache_settings, is_shared_cache
+from efi.database import database_settings, replica_aliases
+
+BASE_DIR = Path("/srv/efi")
+
+
+# -------------------- TEST: Perfiles de base de datos --------------------
+def test_sqlite_is_the_default_profile():
+    """
+    Verifica el perfil SQLite por defecto con sus PRAGMA y espera de lock.
+    """
+    database = database_settings({}, BASE_DIR)["default"]
+
+    assert database["ENGINE"] == "django.db.backends.sqlite3"
+    assert database["NAME"] == BASE_DIR / "db.sqlite3"
+    assert database["OPTIONS"]["timeout"] == 5
+    assert database["OPTIONS"]["transaction_mode"] == "IMMEDIATE"
+    assert "PRAGMA journal_mode=WAL" in database["OPTIONS"]["init_command"]
+    assert "PRAGMA synchronous=NORMAL" in database["OPTIONS"]["init_command"]
+
+
+def test_postgres_profile_with_persistent_connections_or_pool():
+    """
+    Verifica conexiones persistentes con chequeo de salud y, con DB_POOL,
+    el pool de psycopg (que exige CONN_MAX_AGE=0).
+    """
+    environ = {"DB_ENGINE": "postgres", "DB_NAME": "aerolinea", "DB_HOST": "db"}
+    database = database_settings(environ, BASE_DIR)["default"]
+
+    assert database["ENGINE"] == "django.db.backends.postgresql"
+    assert (database["NAME"], database["HOST"]) == ("aerolinea", "db")
+    assert database["CONN_MAX_AGE"] == 60
+    assert database["CONN_HEALTH_CHECKS"] is True
+    assert "pool" not in database["OPTIONS"]
+
+    pooled = database_settings(
+        {**environ, "DB_POOL": "1", "DB_POOL_MAX_SIZE": "20"}, BASE_DIR
+    )["default"]
+    assert pooled["CONN_MAX_AGE"] == 0
+    assert pooled["OPTIONS"]["pool"]["max_size"] == 20
+
+    with pytest.raises(ImproperlyConfigured):
+        database_settings({"DB_ENGINE": "oracle"}, BASE_DIR)
+    with pytest.raises(ImproperlyConfigured):
+        database_settings({**environ, "DB_CONN_MAX_AGE": "mucho"}, BASE_DIR)
+
+
+@pytest.mark.django_db
+def test_sqlite_pragmas_are_applied_on_connect():
+    """
+    Verifica que la conexión abierta tenga los PRAGMA del perfil.
+    """
+    if connection.vendor != "sqlite":
+        pytest.skip("solo para el perfil SQLite")
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA synchronous")
+        assert cursor.fetchone()[0] == 1  # NORMAL
+        cursor.execute("PRAGMA busy_timeout")
+        assert cursor.fetchone()[0] == 5000
+        cursor.execute("PRAGMA temp_store")
+        assert cursor.fetchone()[0] == 2  # MEMORY
+
+
+def test_replicas_from_environment():
+    """
+    Verifica que cada host (o archivo) de réplica se agrega como replicaN
+    con la configuración de la principal.
+    """
+    environ = {
+        "DB_ENGINE": "postgres",
+        "DB_HOST": "db",
+        "DB_REPLICA_HOSTS": "db-r1, db-r2",
+    }
+    databases = database_settings(environ, BASE_DIR)
+
+    assert replica_aliases(databases) == ["replica1", "replica2"]
+    assert databases["replica2"]["HOST"] == "db-r2"
+    assert databases["replica2"]["NAME"] == databases["default"]["NAME"]
+    assert databases["replica1"]["TEST"] == {"MIRROR": "default"}
+
+    sqlite = database_settings({"SQLITE_REPLICA_PATHS": "/srv/r1.sqlite3"}, BASE_DIR)
+    assert sqlite["replica1"]["NAME"] == "/srv/r1.sqlite3"
+    assert replica_aliases(database_settings({}, BASE_DIR)) == []
+
+    archive = database_settings(
+        {"SQLITE_ARCHIVE_PATH": "/srv/archive.sqlite3"}, BASE_DIR
+    )
+    assert archive["archive"]["NAME"] == "/srv/archive.sqlite3"
+    assert replica_aliases(archive) == []
+
+
+# -------------------- TEST: Perfiles de cache --------------------
+def test_cache_profiles_from_environment():
+    """
+    Verifica el cache de cada proceso por defecto y los perfiles compartidos
+    (Redis, Memcached) con sus alias default y sessions.
+    """
+    local = cache_settings({})
+    assert not is_shared_cache(local)
+    assert local["sessions"]["LOCATION"] != local["default"]["LOCATION"]
+
+    redis = cache_settings(
+        {"CACHE_BACKEND": "redis", "CACHE_LOCATION": "redis://cache:6379/1"}
+    )
+    assert redis["default"]["BACKEND"] == "django.core.cache.backends.redis.RedisCache"
+    assert redis["default"]["LOCATION"] == "redis://cache:6379/1"
+    assert redis["sessions"]["KEY_PREFIX"] != redis["default"]["KEY_PREFIX"]
+    assert is_shared_cache(redis) and is_shared_cache(redis, "sessions")
+
+    memcached = cache_settings(
+        {"CACHE_BACKEND": "memcached", "CACHE_LOCATION": "mc1:11211, mc2:11211"}
+    )
+    assert memcached["default"]["LOCATION"] == ["mc1:11211", "mc2:11211"]
+
+    with pytest.raises(ImproperlyConfigured):
+        cache_settings({"CACHE_BACKEND": "archivo"})
+
+
+def test_deploy_check_warns_about_process_local_cache():
+    """
+    Verifica que `check --deploy` avise si el cache no es compartido.
+    """
+    assert [warning.id for warning in check_shared_cache(None)] == ["airline.W001"]
+    with override_settings(CACHES=cache_settings({"CACHE_BACKEND": "redis"})):
+        assert check_shared_cache(None) == []
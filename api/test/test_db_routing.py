@@ -0,0 +1,108 @@
+from datetime import datetime
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+
+from airline.models import Flight, FlightStatus, Plane
+from airline.repositories.flight import FlightRepository
+from airline.utils.db_routing import (
+    STICKY_COOKIE,
+    PrimaryStickinessMiddleware,
+    read_alias,
+    routing_scope,
+    use_primary,
+)
+
+DATABASES = ["default", "replica1"]
+
+
+def _flight(using, origin):
+    status = FlightStatus.objects.using(using).create(status="Scheduled")
+    plane = Plane.objects.using(using).create(
+        model="Boeing 737", capacity=6, rows=2, columns=3
+    )
+    departure = timezone.make_aware(datetime(2025, 12, 1, 10, 0))
+    arrival = timezone.make_aware(datetime(2025, 12, 1, 12, 0))
+    return Flight.objects.using(using).create(
+        origin=origin,
+        destination="Madrid",
+        departure_date=departure,
+        arrival_date=arrival,
+        duration=arrival - departure,
+        base_price=100,
+        status=status,
+        plane=plane,
+    )
+
+
+def _origins():
+    return {flight.origin for flight in FlightRepository.filter_flights()}
+
+
+# -------------------- TEST: Lecturas en réplicas --------------------
+@pytest.mark.django_db
+def test_without_replicas_everything_reads_from_primary():
+    """
+    Verifica que sin réplicas configuradas las lecturas usen la principal.
+    """
+    with routing_scope():
+        assert read_alias() == "default"
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+@pytest.mark.django_db(databases=DATABASES)
+def test_catalog_reads_go_to_replica_until_the_request_writes():
+    """
+    Verifica que la búsqueda de vuelos lea de la réplica (que no tiene el
+    vuelo recién creado en la principal) y que, después de una escritura, el
+    resto del pedido lea de la principal.
+    """
+    _flight("default", "Primaria")
+    _flight("replica1", "Replica")
+
+    with routing_scope():
+        assert _origins() == {"Replica"}
+        with use_primary():
+            assert _origins() == {"Primaria"}
+        assert _origins() == {"Replica"}
+
+        FlightStatus.objects.create(status="Delayed")
+        assert read_alias() == "default"
+        assert _origins() == {"Primaria"}
+
+    with routing_scope():
+        assert _origins() == {"Replica"}
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"], REPLICA_STICKY_SECONDS=7)
+@pytest.mark.django_db(databases=DATABASES)
+def test_middleware_keeps_reading_from_primary_after_a_write():
+    """
+    Verifica que un pedido que escribe deje la cookie que fija los pedidos
+    siguientes en la principal, y que uno que solo lee no la deje.
+    """
+    seen = []
+
+    def write(request):
+        seen.append(read_alias())
+        FlightStatus.objects.create(status="Boarding")
+        return HttpResponse()
+
+    def read(request):
+        seen.append(read_alias())
+        return HttpResponse()
+
+    factory = RequestFactory()
+    response = PrimaryStickinessMiddleware(write)(factory.post("/"))
+    assert response.cookies[STICKY_COOKIE]["max-age"] == 7
+
+    response = PrimaryStickinessMiddleware(read)(factory.get("/"))
+    assert STICKY_COOKIE not in response.cookies
+
+    request = factory.get("/")
+    request.COOKIES[STICKY_COOKIE] = "1"
+    PrimaryStickinessMiddleware(read)(request)
+
+    assert seen == ["replica1", "replica1", "default"]
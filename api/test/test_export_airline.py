@@ -0,0 +1,129 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+from airline.models import DeletedRow, Flight, Reservation, Seat, Ticket
+from airline.repositories.seat import SeatRepository
+from airline.repositories.ticket import TicketRepository
+from airline.utils.npy import load_column
+
+
+def _run_dirs(output):
+    return sorted(p for p in output.iterdir() if p.is_dir())
+
+
+def _read_csv(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+# -------------------- TEST: Exportación completa --------------------
+@pytest.mark.django_db
+def test_export_airline_full(tmp_path, flight_with_tickets):
+    """
+    Verifica que se exporten todas las tablas comprimidas y las columnas .npy.
+    """
+    call_command(
+        "export_airline",
+        output=str(tmp_path),
+        npy=True,
+        workers=1,
+        stdout=io.StringIO(),
+    )
+    (run_dir,) = _run_dirs(tmp_path)
+
+    flights = _read_csv(run_dir / "flight.csv.gz")
+    reservations = _read_csv(run_dir / "reservation.csv.gz")
+
+    assert [f["origin"] for f in flights] == ["Buenos Aires"]
+    assert len(reservations) == 3
+    assert list(load_column(run_dir / "reservation.price.npy")) == [1500.0] * 3
+    assert list(load_column(run_dir / "seat.row.npy")) == [1, 1, 1]
+
+
+# -------------------- TEST: Exportación en paralelo --------------------
+# transaction=True: los procesos hijos solo ven datos confirmados
+@pytest.mark.django_db(transaction=True)
+def test_export_airline_parallel(tmp_path, flight_with_tickets):
+    """
+    Verifica que con varios procesos (uno por tabla) se exporte lo mismo
+    que en este proceso.
+    """
+    tables = ["flight", "reservation", "ticket"]
+    call_command(
+        "export_airline",
+        output=str(tmp_path / "parallel"),
+        tables=tables,
+        workers=3,
+        stdout=io.StringIO(),
+    )
+    call_command(
+        "export_airline",
+        output=str(tmp_path / "serial"),
+        tables=tables,
+        workers=1,
+        stdout=io.StringIO(),
+    )
+    (parallel,) = _run_dirs(tmp_path / "parallel")
+    (serial,) = _run_dirs(tmp_path / "serial")
+
+    for table in tables:
+        rows = _read_csv(parallel / f"{table}.csv.gz")
+        assert rows and rows == _read_csv(serial / f"{table}.csv.gz")
+
+
+# -------------------- TEST: Exportación incremental --------------------
+@pytest.mark.django_db
+def test_export_airline_incremental(tmp_path, flight_with_tickets):
+    """
+    Verifica que el modo incremental solo exporte filas modificadas
+    desde la última marca de agua, también con QuerySet.update(), y los ids
+    de las eliminadas (también en cascada), y que después borre esas marcas.
+    """
+    out = io.StringIO()
+    call_command("export_airline", output=str(tmp_path), workers=1, stdout=out)
+
+    flight = Flight.objects.get(pk=flight_with_tickets.pk)
+    flight.base_price = 1800
+    flight.save()
+    # Cambios que no pasan por save(): UPDATE directo y eliminaciones
+    seat, other_seat = Seat.objects.order_by("id")[:2]
+    Seat.objects.filter(pk=seat.pk).update(status="blocked")
+    ticket = Ticket.objects.exclude(reservation__seat=other_seat).first()
+    ticket_id = ticket.id
+    TicketRepository.delete(ticket)
+    # El asiento se lleva su reserva y el ticket de esta
+    cascaded = Reservation.objects.select_related("ticket").get(seat=other_seat)
+    other_seat_id = other_seat.id
+    SeatRepository.delete(other_seat)
+
+    call_command(
+        "export_airline",
+        output=str(tmp_path),
+        incremental=True,
+        format="ndjson",
+        workers=1,
+        stdout=out,
+    )
+    run_dir = _run_dirs(tmp_path)[-1]
+
+    def read(name):
+        with gzip.open(run_dir / name, "rt") as f:
+            return [json.loads(line) for line in f]
+
+    assert [f["base_price"] for f in read("flight.ndjson.gz")] == ["1800.00"]
+    assert read("reservation.ndjson.gz") == []
+    assert [(s["id"], s["status"]) for s in read("seat.ndjson.gz")] == [
+        (seat.pk, "blocked")
+    ]
+    assert sorted(t["id"] for t in read("ticket.deleted.ndjson.gz")) == sorted(
+        [ticket_id, cascaded.ticket.id]
+    )
+    assert [r["id"] for r in read("reservation.deleted.ndjson.gz")] == [cascaded.id]
+    assert [s["id"] for s in read("seat.deleted.ndjson.gz")] == [other_seat_id]
+    assert read("flight.deleted.ndjson.gz") == []
+    assert not DeletedRow.objects.exists()
@@ -0,0 +1,123 @@
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from airline.models import Flight, Plane
+from airline.services.fleet_assignment import FleetAssignmentService, assign_fleet
+
+
+def _flight(id, hour, hours, capacity=100, pinned_plane=None):
+    departure = datetime(2025, 12, 1, hour)
+    return {
+        "id": id,
+        "departure_date": departure,
+        "arrival_date": departure + timedelta(hours=hours),
+        "capacity": capacity,
+        "pinned_plane": pinned_plane,
+    }
+
+
+# -------------------- TEST: Algoritmo de asignación --------------------
+def test_assign_fleet_respects_capacity_turnaround_and_pins():
+    """
+    Verifica best-fit por capacidad, el tiempo de escala y los vuelos fijos.
+    """
+    planes = {1: 100, 2: 200, 3: 300}
+    flights = [
+        _flight(10, 8, 2),  # el avión más chico que alcanza: 1
+        _flight(11, 10, 2),  # el 1 sigue en escala hasta las 10:45 -> 2
+        _flight(12, 11, 1, pinned_plane=3),
+        _flight(13, 9, 1.5, capacity=250),  # el 3 sale fijo a las 11 -> sin avión
+        _flight(14, 11, 1),  # el 1 ya está libre
+    ]
+
+    assignment, unassigned = assign_fleet(flights, planes, timedelta(minutes=45))
+
+    assert assignment == {10: 1, 11: 2, 12: 3, 14: 1}
+    assert unassigned == [13]
+
+
+# -------------------- TEST: Comando assign_fleet --------------------
+@pytest.mark.django_db
+def test_assign_fleet_command(flight_with_tickets):
+    """
+    Verifica que el dry-run solo muestre el cambio y que luego se guarde,
+    sin mover el vuelo que ya tiene reservas.
+    """
+    plane = flight_with_tickets.plane
+    spare = Plane.objects.create(model="Airbus A321", capacity=8, rows=2, columns=4)
+    departure = timezone.make_aware(datetime(2025, 12, 1, 13, 0))
+    overlapping = Flight.objects.create(
+        origin="Madrid",
+        destination="Roma",
+        departure_date=departure,
+        arrival_date=departure + timedelta(hours=2),
+        duration=timedelta(hours=2),
+        base_price=300,
+        status=flight_with_tickets.status,
+        plane=plane,
+    )
+    args = ["assign_fleet", "--start", "2025-12-01", "--end", "2025-12-02"]
+
+    out = io.StringIO()
+    call_command(*args, "--dry-run", stdout=out)
+    overlapping.refresh_from_db()
+
+    assert f"Vuelo {overlapping.id}: avión {plane.id} -> {spare.id}" in out.getvalue()
+    assert overlapping.plane_id == plane.id
+
+    call_command(*args, stdout=io.StringIO())
+    overlapping.refresh_from_db()
+    flight_with_tickets.refresh_from_db()
+
+    assert overlapping.plane_id == spare.id
+    assert flight_with_tickets.plane_id == plane.id
+
+
+# -------------------- TEST: El plan se verifica al guardarlo --------------------
+@pytest.mark.django_db
+def test_apply_rejects_a_plan_that_became_stale(flight_with_tickets):
+    """
+    Verifica que apply() no guarde un plan si, después de calcularlo, el
+    vuelo recibió una reserva o el avión destino dejó de estar libre.
+    """
+    plane = flight_with_tickets.plane
+    spare = Plane.objects.create(model="Airbus A321", capacity=8, rows=2, columns=4)
+    departure = timezone.make_aware(datetime(2025, 12, 1, 13, 0))
+
+    def flight(plane, hour):
+        start = departure.replace(hour=hour)
+        return Flight.objects.create(
+            origin="Madrid",
+            destination="Roma",
+            departure_date=start,
+            arrival_date=start + timedelta(hours=2),
+            duration=timedelta(hours=2),
+            base_price=300,
+            status=flight_with_tickets.status,
+            plane=plane,
+        )
+
+    overlapping = flight(plane, 13)
+    start = timezone.make_aware(datetime(2025, 12, 1))
+    plan = FleetAssignmentService.plan(start, start + timedelta(days=1))
+    assert plan["changes"] == {overlapping.id: (plane.id, spare.id)}
+
+    # El avión destino recibió un vuelo que choca (con la escala)
+    blocking = flight(spare, 15)
+    with pytest.raises(ValueError, match="ya no está libre"):
+        FleetAssignmentService.apply(plan["changes"])
+    blocking.delete()
+
+    # El vuelo recibió una reserva: sus asientos son del avión actual
+    reservation = flight_with_tickets.reservation_set.first()
+    reservation.flight = overlapping
+    reservation.save()
+    with pytest.raises(ValueError, match="con reservas"):
+        FleetAssignmentService.apply(plan["changes"])
+
+    overlapping.refresh_from_db()
+    assert overlapping.plane_id == plane.id
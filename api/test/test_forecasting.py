@@ -0,0 +1,151 @@
+import io
+from array import array
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone as django_timezone
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airline.models import FlightForecast, Passenger, Seat, User
+from airline.services.analytics import (
+    DAY,
+    FLAG_CONFIRMED,
+    FLAG_TICKET,
+    FLAG_TICKET_USED,
+    BookingColumns,
+)
+from airline.services.forecasting import (
+    ForecastService,
+    fit_route_models,
+    overbooking_limit,
+)
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+# -------------------- TEST: Límite de sobreventa --------------------
+def test_overbooking_limit_grows_with_no_shows():
+    """
+    Verifica que sin no-shows no haya sobreventa y que con más no-shows se
+    autoricen más reservas, sin pasar del máximo.
+    """
+    assert overbooking_limit(100, 1.0) == 100
+    assert 100 < overbooking_limit(100, 0.92) < overbooking_limit(100, 0.85)
+    assert overbooking_limit(100, 0.5, max_ratio=0.1) == 110
+    assert overbooking_limit(100, 0.92, risk=0.5) > overbooking_limit(100, 0.92)
+
+
+# -------------------- TEST: Modelos por ruta --------------------
+def test_fit_route_models_smooths_towards_global_rate():
+    """
+    Verifica la tasa de presentación por ruta, el suavizado y la curva.
+    """
+    departure = int(NOW.timestamp()) - 10 * DAY
+    used = FLAG_CONFIRMED | FLAG_TICKET | FLAG_TICKET_USED
+    no_show = FLAG_CONFIRMED | FLAG_TICKET
+    rows = [(0, used, 20)] * 9 + [(0, no_show, 2)] + [(1, used, 5)] * 2
+    columns = {
+        "booked": array("q", [departure - days * DAY for _, _, days in rows]),
+        "departure": array("q", [departure] * len(rows)),
+        "route": array("q", [route for route, _, _ in rows]),
+        "price": array("d", [100.0] * len(rows)),
+        "flags": array("q", [flags for _, flags, _ in rows]),
+    }
+    data = BookingColumns(columns, [("BUE", "MAD"), ("BUE", "ROM")])
+
+    models, global_model = fit_route_models(data, now=NOW, prior_weight=0)
+    smoothed, _ = fit_route_models(data, now=NOW, prior_weight=10)
+
+    assert models[("BUE", "MAD")].show_rate == 0.9
+    assert models[("BUE", "ROM")].show_rate == 1.0
+    assert global_model.show_rate == 11 / 12
+    assert smoothed[("BUE", "ROM")].show_rate < 1.0
+    assert models[("BUE", "MAD")].share_at(20) == 0.9
+    assert models[("BUE", "MAD")].share_at(2) == 1.0
+
+
+# -------------------- TEST: Pronóstico y reservas --------------------
+@pytest.mark.django_db
+def test_refresh_forecasts_and_booking_limit(flight_with_tickets):
+    """
+    Verifica que el comando deje el pronóstico de los vuelos futuros y que
+    la API de reservas respete el límite.
+    """
+    call_command("refresh_forecasts", stdout=io.StringIO())
+    assert ForecastService.get(flight_with_tickets.id) is None  # ya salió
+
+    forecasts = ForecastService.refresh(
+        now=flight_with_tickets.departure_date - timedelta(days=30)
+    )
+    assert forecasts[0]["flight_id"] == flight_with_tickets.id
+    assert forecasts[0]["booking_limit"] == 6  # sin historial: sin sobreventa
+
+    admin = User.objects.create_superuser(
+        username="admin", email="admin@test.com", password="admin123"
+    )
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    assert (
+        client.get(reverse("flight-forecast", args=[flight_with_tickets.id])).json()[
+            "sold"
+        ]
+        == 3
+    )
+
+    # El límite se lee de la base: lo ve cualquier proceso, no solo el que
+    # corrió refresh_forecasts
+    cache.clear()
+    FlightForecast.objects.filter(flight=flight_with_tickets).update(booking_limit=3)
+    assert ForecastService.booking_limit(flight_with_tickets) == 3
+    seat = Seat.objects.create(
+        number="2A",
+        row=2,
+        column="A",
+        seat_type="economico",
+        status="available",
+        plane=flight_with_tickets.plane,
+    )
+    passenger = Passenger.objects.create(
+        name="Nuevo",
+        document="NEW1",
+        document_type="dni",
+        email="new@test.com",
+        phone="123",
+        birth_date="1990-01-01",
+    )
+    response = client.post(
+        reverse("create-reservation"),
+        {
+            "flight": flight_with_tickets.id,
+            "passenger": passenger.id,
+            "seat": seat.id,
+            "user": admin.id,
+        },
+    )
+
+    assert response.status_code == 400
+    assert "lugares" in response.json()["error"]
+
+
+@pytest.mark.django_db
+def test_expired_forecast_falls_back_to_capacity(flight_with_tickets):
+    """
+    Verifica que un pronóstico más viejo que OVERBOOKING["TIMEOUT"] no se use
+    y que refrescarlo reemplace la fila del vuelo.
+    """
+    ForecastService.refresh(now=flight_with_tickets.departure_date - timedelta(days=30))
+    FlightForecast.objects.update(
+        booking_limit=7,
+        updated_at=django_timezone.now() - timedelta(days=3),
+    )
+
+    assert ForecastService.get(flight_with_tickets.id) is None
+    assert ForecastService.booking_limit(flight_with_tickets) == 6
+
+    # Un nuevo cálculo reemplaza la fila del vuelo
+    ForecastService.refresh(now=flight_with_tickets.departure_date - timedelta(days=30))
+    assert FlightForecast.objects.count() == 1
+    assert ForecastService.get(flight_with_tickets.id)["booking_limit"] == 6
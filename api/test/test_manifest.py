@@ -0,0 +1,87 @@
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airline.models import User
+
+
+# -------------------- FIXTURE: Cliente autenticado --------------------
+@pytest.fixture
+def auth_client(db):
+    """
+    Crea un usuario común autenticado para las pruebas.
+    """
+    user = User.objects.create_user(
+        username="viewer", email="viewer@test.com", password="123"
+    )
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def _content(response):
+    return b"".join(response.streaming_content).decode()
+
+
+# -------------------- TEST: Manifiesto en CSV --------------------
+@pytest.mark.django_db
+def test_manifest_csv(auth_client, flight_with_tickets):
+    """
+    Verifica que el manifiesto CSV tenga encabezado y una fila por pasajero.
+    """
+    url = reverse("passenger-manifest", args=[flight_with_tickets.id])
+    response = auth_client.get(url)
+    lines = _content(response).strip().splitlines()
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "text/csv"
+    assert lines[0].startswith("reservation_code,seat_number")
+    assert len(lines) == 4
+    assert lines[1].startswith("RES0,1A,first_class,Pasajero 0")
+
+
+# -------------------- TEST: Manifiesto en NDJSON --------------------
+@pytest.mark.django_db
+def test_manifest_ndjson(auth_client, flight_with_tickets):
+    """
+    Verifica que cada línea del NDJSON sea un pasajero serializado.
+    """
+    url = reverse("passenger-manifest", args=[flight_with_tickets.id])
+    response = auth_client.get(url + "?export=ndjson")
+    rows = [json.loads(line) for line in _content(response).splitlines()]
+
+    assert response.status_code == 200
+    assert [r["passenger_name"] for r in rows] == [
+        "Pasajero 0",
+        "Pasajero 1",
+        "Pasajero 2",
+    ]
+    assert rows[0]["birth_date"] == "1990-01-01"
+
+
+# -------------------- TEST: Consultas constantes --------------------
+@pytest.mark.django_db
+def test_manifest_query_count(
+    auth_client, flight_with_tickets, django_assert_num_queries
+):
+    """
+    Verifica que el manifiesto use una consulta para el vuelo y otra para las filas,
+    sin importar la cantidad de pasajeros.
+    """
+    url = reverse("passenger-manifest", args=[flight_with_tickets.id])
+    with django_assert_num_queries(2):
+        _content(auth_client.get(url))
+
+
+# -------------------- TEST: Vuelo inexistente --------------------
+@pytest.mark.django_db
+def test_manifest_flight_not_found(auth_client):
+    """
+    Verifica que se devuelva 404 si el vuelo no existe.
+    """
+    url = reverse("passenger-manifest", args=[9999])
+    response = auth_client.get(url)
+
+    assert response.status_code == 404
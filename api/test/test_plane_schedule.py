@@ -0,0 +1,170 @@
+from datetime import datetime, timedelta
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from airline.models import Flight, FlightStatus, Plane, User
+from airline.services import plane_schedule
+from airline.services.plane_schedule import (
+    VERSION_KEY,
+    PlaneSchedule,
+    PlaneScheduleService,
+)
+
+
+def _at(day, hour):
+    return timezone.make_aware(datetime(2025, 12, day, hour, 0))
+
+
+# -------------------- TEST: Solapamientos y huecos en la agenda --------------------
+def test_plane_schedule_overlap_and_free_slot():
+    """
+    Verifica las consultas del índice, incluso con un vuelo largo que tapa
+    a otros (la mayor llegada acumulada) y luego de quitarlo.
+    """
+    schedule = PlaneSchedule([(1, _at(1, 8), _at(1, 10)), (2, _at(1, 12), _at(1, 14))])
+    schedule.add(3, _at(1, 6), _at(1, 13))
+
+    assert schedule.find_overlap(_at(1, 10), _at(1, 11)) == 3
+    assert schedule.find_overlap(_at(1, 10), _at(1, 11), exclude_id=3) is None
+    assert schedule.next_free_slot(_at(1, 7), timedelta(hours=2)) == _at(1, 14)
+
+    schedule.remove(3)
+    assert schedule.find_overlap(_at(1, 10), _at(1, 12)) is None
+    assert schedule.next_free_slot(_at(1, 7), timedelta(hours=2)) == _at(1, 10)
+    assert schedule.next_free_slot(_at(1, 7), timedelta(hours=3)) == _at(1, 14)
+
+
+def _flight(plane, status, start, end, save=True):
+    flight = Flight(
+        origin="Córdoba",
+        destination="Salta",
+        departure_date=start,
+        arrival_date=end,
+        duration=end - start,
+        base_price=100,
+        status=status,
+        plane=plane,
+    )
+    if save:
+        flight.save()
+    return flight
+
+
+# -------------------- TEST: El índice sigue las escrituras --------------------
+@override_settings(SHARED_CACHE=True)
+@pytest.mark.django_db
+def test_plane_schedule_service_tracks_writes(flight_with_tickets):
+    """
+    Verifica que el índice refleje altas, cambios de horario y bajas de vuelos.
+    """
+    plane = flight_with_tickets.plane.id
+    assert PlaneScheduleService.find_overlap(plane, _at(1, 13), _at(1, 15)) == (
+        flight_with_tickets.id
+    )
+
+    flight_with_tickets.departure_date = _at(2, 10)
+    flight_with_tickets.arrival_date = _at(2, 14)
+    flight_with_tickets.save()
+    assert not PlaneScheduleService.has_overlap(plane, _at(1, 13), _at(1, 15))
+    assert PlaneScheduleService.next_free_slot(
+        plane, _at(2, 9), timedelta(hours=2)
+    ) == _at(2, 14)
+
+    flight_with_tickets.delete()
+    assert not PlaneScheduleService.has_overlap(plane, _at(2, 10), _at(2, 14))
+
+
+# transaction=True: fuera de una transacción el índice se actualiza en memoria
+@override_settings(SHARED_CACHE=True)
+@pytest.mark.django_db(transaction=True)
+def test_plane_schedule_index_answers_with_the_current_version(
+    django_assert_num_queries,
+):
+    """
+    Verifica que, fuera de una transacción, el índice en memoria se actualice
+    en el lugar con la versión del cache y responda sin consultar la base,
+    que se vuelva a armar cuando otra escritura sube la versión y que sin
+    versión en el cache se consulte la base.
+    """
+    plane = Plane.objects.create(model="Embraer 190", capacity=6, rows=2, columns=3)
+    status = FlightStatus.objects.create(status="Scheduled")
+    first = _flight(plane, status, _at(1, 8), _at(1, 10))
+
+    schedule = PlaneScheduleService.get(plane.id)
+    second = _flight(plane, status, _at(1, 12), _at(1, 14))
+    assert PlaneScheduleService.get(plane.id) is schedule
+    assert second.id in schedule
+    assert schedule.version == cache.get(VERSION_KEY.format(plane.id))
+    with django_assert_num_queries(0):
+        assert PlaneScheduleService.find_overlap(plane.id, _at(1, 13), _at(1, 15)) == (
+            second.id
+        )
+        assert not PlaneScheduleService.has_overlap(plane.id, _at(1, 10), _at(1, 12))
+
+    # Vuelos guardados sin señales (por ejemplo en otro proceso) avisan con invalidate
+    (hidden,) = Flight.objects.bulk_create(
+        [_flight(plane, status, _at(1, 16), _at(1, 18), save=False)]
+    )
+    PlaneScheduleService.invalidate([plane.id])
+    with django_assert_num_queries(1):
+        assert PlaneScheduleService.find_overlap(plane.id, _at(1, 17), _at(1, 19)) == (
+            hidden.id
+        )
+    assert hidden.id in PlaneScheduleService.get(plane.id)
+
+    cache.delete(VERSION_KEY.format(plane.id))
+    with django_assert_num_queries(1):
+        assert PlaneScheduleService.find_overlap(plane.id, _at(1, 9), _at(1, 11)) == (
+            first.id
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_plane_schedule_is_not_kept_without_shared_cache():
+    """
+    Verifica que con el cache de cada proceso el índice no se guarde en
+    memoria ni se usen versiones (no llegarían a los demás procesos).
+    """
+    plane = Plane.objects.create(model="Embraer 190", capacity=6, rows=2, columns=3)
+    status = FlightStatus.objects.create(status="Scheduled")
+    flight = _flight(plane, status, _at(1, 8), _at(1, 10))
+    cache.delete(VERSION_KEY.format(plane.id))
+
+    assert flight.id in PlaneScheduleService.get(plane.id)
+    assert plane.id not in plane_schedule._schedules
+    assert cache.get(VERSION_KEY.format(plane.id)) is None
+    assert PlaneScheduleService.has_overlap(plane.id, _at(1, 9), _at(1, 11))
+
+
+# -------------------- TEST: La API rechaza vuelos solapados --------------------
+@pytest.mark.django_db
+def test_create_flight_overlap_rejected(flight_with_tickets):
+    """
+    Verifica que el serializer de vuelos rechace un avión ya ocupado.
+    """
+    admin = User.objects.create_superuser(
+        username="admin", email="admin@test.com", password="123"
+    )
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    payload = {
+        "origin": "Madrid",
+        "destination": "Roma",
+        "departure_date": _at(1, 12),
+        "arrival_date": _at(1, 16),
+        "duration": timedelta(hours=4),
+        "base_price": 300,
+        "status": flight_with_tickets.status.id,
+        "plane": flight_with_tickets.plane.id,
+        "user": [admin.id],
+    }
+
+    response = client.post(reverse("flight-vs-list"), payload, format="json")
+
+    assert response.status_code == 400
+    assert "rango horario" in str(response.json())
@@ -0,0 +1,97 @@
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airline.models import Passenger, Reservation, Seat, User
+from airline.services.pricing import PricingService, compute_price_table
+
+
+# -------------------- TEST: Tabla de precios --------------------
+def test_compute_price_table_applies_all_buckets(settings):
+    """
+    Verifica los multiplicadores por tipo, ocupación y anticipación, y que
+    settings.PRICING reemplace solo las claves indicadas.
+    """
+    table = compute_price_table(100, ["first_class", "economico", "otro"], 0.8, 30)
+
+    assert table == {
+        "first_class": Decimal("300.00"),
+        "economico": Decimal("120.00"),
+        "otro": Decimal("120.00"),
+    }
+
+    settings.PRICING = {"DAYS_TO_DEPARTURE": [(0, Decimal("2"))]}
+    assert compute_price_table(100, ["economico"], 0, 90) == {
+        "economico": Decimal("200.00")
+    }
+
+
+# -------------------- TEST: Precios por asiento y reservas --------------------
+@pytest.mark.django_db
+def test_seat_prices_follow_bookings(flight_with_tickets):
+    """
+    Verifica que los asientos disponibles traigan su precio sin consultas por
+    asiento, que la reserva cobre ese precio y que la tabla se recalcule.
+    """
+    plane = flight_with_tickets.plane
+    for column in "ABC":
+        Seat.objects.create(
+            number=f"2{column}",
+            row=2,
+            column=column,
+            seat_type="economico",
+            status="available",
+            plane=plane,
+        )
+    admin = User.objects.create_superuser(
+        username="admin", email="admin@test.com", password="admin123"
+    )
+    client = APIClient()
+    client.force_authenticate(user=admin)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse("available-seats", args=[flight_with_tickets.id]))
+    seats = response.json()["results"]
+
+    # 3 de 6 vendidos (x1.05) y el vuelo ya salió (x1.35)
+    assert {seat["price"] for seat in seats} == {"2126.25"}
+    assert len(queries) <= 5
+
+    passenger = Passenger.objects.create(
+        name="Nuevo",
+        document="NEW1",
+        document_type="dni",
+        email="new@test.com",
+        phone="123",
+        birth_date="1990-01-01",
+    )
+    response = client.post(
+        reverse("create-reservation"),
+        {
+            "flight": flight_with_tickets.id,
+            "passenger": passenger.id,
+            "seat": seats[0]["id"],
+            "user": admin.id,
+        },
+    )
+    assert response.status_code == 201
+    assert Reservation.objects.get(seat_id=seats[0]["id"]).price == Decimal("2126.25")
+
+    # 4 de 6 vendidos: sigue en el tramo de 0.5; con 5 de 6 pasa al de 0.75
+    Reservation.objects.create(
+        status="confirmed",
+        price=1,
+        reservation_code="EXTRA",
+        flight=flight_with_tickets,
+        passenger=passenger,
+        seat_id=seats[1]["id"],
+        user=admin,
+    )
+    flight_with_tickets.refresh_from_db()
+    assert PricingService.price_table(flight_with_tickets)["economico"] == Decimal(
+        "2430.00"
+    )
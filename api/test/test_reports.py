@@ -0,0 +1,131 @@
+import io
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airline.models import FlightSales, Reservation, Seat, User
+
+
+# -------------------- FIXTURE: Cliente autenticado como admin --------------------
+@pytest.fixture
+def admin_client(db):
+    admin = User.objects.create_superuser(
+        username="admin", email="admin@test.com", password="admin123"
+    )
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return client
+
+
+def _sales(flight):
+    return list(
+        FlightSales.objects.filter(flight=flight).values_list(
+            "seat_type", "reservations", "revenue"
+        )
+    )
+
+
+# -------------------- TEST: Resumen incremental --------------------
+@pytest.mark.django_db
+def test_flight_sales_follow_reservation_changes(flight_with_tickets):
+    """
+    Verifica que el resumen siga altas, cambios de estado y precio, y bajas,
+    y que rebuild_reports llegue al mismo resultado.
+    """
+    assert _sales(flight_with_tickets) == [("first_class", 3, Decimal("4500.00"))]
+
+    first, second, third = Reservation.objects.filter(
+        flight=flight_with_tickets
+    ).order_by("id")
+    first.status = "cancelled"
+    first.save()
+    second.price = Decimal("1000.00")
+    second.save()
+    third.delete()
+
+    assert _sales(flight_with_tickets) == [("first_class", 1, Decimal("1000.00"))]
+
+    first.status = "confirmed"
+    first.save()
+    FlightSales.objects.update(reservations=99)
+    call_command("rebuild_reports", stdout=io.StringIO())
+
+    assert _sales(flight_with_tickets) == [("first_class", 2, Decimal("2500.00"))]
+
+
+@pytest.mark.django_db
+def test_flight_sales_follow_seat_type_changes(flight_with_tickets):
+    """
+    Verifica que cambiar el tipo de un asiento reservado mueva su reserva a
+    la fila del nuevo tipo y que los cambios siguientes resten de ella.
+    """
+    reservation = Reservation.objects.filter(flight=flight_with_tickets).first()
+    seat = Seat.objects.get(pk=reservation.seat_id)
+    seat.seat_type = "economico"
+    seat.save()
+
+    assert sorted(_sales(flight_with_tickets)) == [
+        ("economico", 1, Decimal("1500.00")),
+        ("first_class", 2, Decimal("3000.00")),
+    ]
+
+    reservation = Reservation.objects.get(pk=reservation.pk)
+    reservation.status = "cancelled"
+    reservation.save()
+
+    assert sorted(_sales(flight_with_tickets)) == [
+        ("economico", 0, Decimal("0.00")),
+        ("first_class", 2, Decimal("3000.00")),
+    ]
+
+
+# -------------------- TEST: Endpoints de reportes --------------------
+@pytest.mark.django_db
+def test_report_endpoints_read_the_summary(admin_client, flight_with_tickets):
+    """
+    Verifica ocupación, ingresos por ruta/día y mezcla de asientos sin
+    consultar la tabla de reservas.
+    """
+    with CaptureQueriesContext(connection) as queries:
+        load = admin_client.get(reverse("load-factor-report"), {"start": "2025-12-01"})
+        revenue = admin_client.get(
+            reverse("revenue-report"), {"origin": "buenos aires"}
+        )
+        mix = admin_client.get(
+            reverse("seat-type-mix-report"), {"flight": flight_with_tickets.id}
+        )
+
+    assert not any("airline_reservation" in q["sql"] for q in queries.captured_queries)
+    assert load.json()["results"][0]["sold"] == 3
+    assert load.json()["results"][0]["load_factor"] == 0.5
+    assert revenue.json()["results"] == [
+        {
+            "day": "2025-12-01",
+            "origin": "Buenos Aires",
+            "destination": "Madrid",
+            "flights": 1,
+            "reservations": 3,
+            "revenue": 4500.0,
+        }
+    ]
+    assert mix.json() == [
+        {
+            "seat_type": "first_class",
+            "reservations": 3,
+            "revenue": 4500.0,
+            "share": 1.0,
+        }
+    ]
+    assert (
+        admin_client.get(reverse("revenue-report"), {"end": "12/2025"}).status_code
+        == 400
+    )
+    assert (
+        admin_client.get(reverse("seat-type-mix-report"), {"flight": "²"}).status_code
+        == 400
+    )
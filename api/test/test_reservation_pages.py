@@ -0,0 +1,88 @@
+from datetime import date
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from airline.models import Passenger, Reservation, Seat
+
+
+def _add_reservations(flight, user, count, start=0):
+    for i in range(start, start + count):
+        seat = Seat.objects.create(
+            number=f"{i + 10}A",
+            row=i + 10,
+            column="A",
+            seat_type="economico",
+            status="taken",
+            plane=flight.plane,
+        )
+        passenger = Passenger.objects.create(
+            name=f"Pasajero extra {i}",
+            document=f"EXTRA{i}",
+            document_type="dni",
+            email=f"extra{i}@test.com",
+            phone="123",
+            birth_date=date(1990, 1, 1),
+        )
+        Reservation.objects.create(
+            status="confirmed",
+            price=100,
+            reservation_code=f"EXTRA{i}",
+            flight=flight,
+            passenger=passenger,
+            seat=seat,
+            user=user,
+        )
+
+
+def _count_queries(client, url, **params):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, params)
+    assert response.status_code == 200
+    return response, len(queries)
+
+
+# -------------------- TEST: Consultas constantes por página --------------------
+@pytest.mark.django_db
+@pytest.mark.parametrize("url_name", ["reservation_by_user", "reservation_by_flight"])
+def test_reservation_lists_do_not_query_per_row(client, flight_with_tickets, url_name):
+    """
+    Verifica que la cantidad de consultas no crezca con las reservas mostradas.
+    """
+    user = Reservation.objects.filter(flight=flight_with_tickets).first().user
+    client.force_login(user)
+    url = reverse(
+        url_name,
+        args=[] if url_name == "reservation_by_user" else [flight_with_tickets.id],
+    )
+
+    _, few = _count_queries(client, url)
+    _add_reservations(flight_with_tickets, user, 20)
+    response, many = _count_queries(client, url)
+
+    assert many == few
+    assert len(response.context["reservations"]) == 23
+
+
+# -------------------- TEST: Tamaño de página --------------------
+@pytest.mark.django_db
+def test_reservation_list_page_size(client, flight_with_tickets, settings):
+    """
+    Verifica el tamaño de página configurado, ?page_size= y su máximo.
+    """
+    settings.RESERVATION_PAGE_SIZE = 2
+    settings.RESERVATION_MAX_PAGE_SIZE = 4
+    user = Reservation.objects.filter(flight=flight_with_tickets).first().user
+    client.force_login(user)
+    _add_reservations(flight_with_tickets, user, 3)
+    url = reverse("reservation_by_user")
+
+    response, _ = _count_queries(client, url)
+    assert len(response.context["reservations"]) == 2
+    assert response.context["reservations"].paginator.num_pages == 3
+
+    response, _ = _count_queries(client, url, page_size=50, page=2)
+    assert len(response.context["reservations"]) == 2
+    assert response.context["reservations"].number == 2
@@ -0,0 +1,202 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import AsyncClient, override_settings
+
+from airline.models import Reservation, Seat, User
+from airline.services.seat_events import (
+    SeatEventService,
+    flight_topic,
+    get_seat_hub,
+    plane_topic,
+)
+from airline.services.signed_token import SignedTokenService
+from airline.utils.pubsub import Hub
+
+
+def _data(chunk):
+    # Datos JSON de un evento "event: <nombre>\ndata: <json>\n\n"
+    name, data = chunk.decode().strip().split("\n")
+    return name.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+# -------------------- TEST: Publicación de cambios --------------------
+def test_hub_coalesces_changes_per_key():
+    """
+    Verifica que los cambios pendientes de un mismo asiento se combinen, que
+    cada suscriptor reciba solo sus temas y que al salir se dé de baja.
+    """
+    hub = Hub()
+
+    async def scenario():
+        with hub.subscribe("flight:1") as subscription:
+            hub.publish("flight:1", {7: {"occupied": True}})
+            hub.publish("flight:1", {7: {"status": "Taken"}, 8: {"occupied": False}})
+            hub.publish("flight:2", {9: {"occupied": True}})
+            changes = await subscription.wait(1)
+            assert await subscription.wait(0.01) == {}
+        return changes
+
+    assert async_to_sync(scenario)() == {
+        7: {"occupied": True, "status": "Taken"},
+        8: {"occupied": False},
+    }
+    assert not hub.has_subscribers("flight:1")
+
+
+@pytest.mark.django_db
+def test_reservation_and_seat_changes_are_published_on_commit(
+    flight_with_tickets, django_capture_on_commit_callbacks
+):
+    """
+    Verifica que cancelar una reserva libere su asiento en el tema del vuelo
+    y que cambiar el estado de un asiento se publique en el del avión, recién
+    al confirmar la transacción.
+    """
+    reservation = Reservation.objects.get(reservation_code="RES0")
+    free_seat = Seat.objects.create(
+        number="2A",
+        row=2,
+        column="A",
+        seat_type="economy",
+        status="available",
+        plane=flight_with_tickets.plane,
+    )
+
+    def change():
+        with django_capture_on_commit_callbacks() as callbacks:
+            reservation.status = "cancelled"
+            reservation.save()
+            free_seat.status = "Taken"
+            free_seat.save()
+        return callbacks
+
+    def commit(callbacks):
+        for callback in callbacks:
+            callback()
+
+    async def scenario():
+        with get_seat_hub().subscribe(
+            flight_topic(flight_with_tickets.id), plane_topic(free_seat.plane_id)
+        ) as subscription:
+            callbacks = await sync_to_async(change)()
+            # Nada se publica antes de confirmar la transacción
+            assert await subscription.wait(0.01) == {}
+            await sync_to_async(commit)(callbacks)
+            return await subscription.wait(1)
+
+    assert async_to_sync(scenario)() == {
+        reservation.seat_id: {"occupied": False},
+        free_seat.id: {"status": "Taken"},
+    }
+
+
+# -------------------- TEST: Flujo de eventos --------------------
+@override_settings(SEAT_EVENTS={"COALESCE": 0, "HEARTBEAT": 0.05, "MAX_SECONDS": 5})
+@pytest.mark.django_db
+def test_seat_events_stream_sends_snapshot_then_only_diffs(flight_with_tickets):
+    """
+    Verifica que el flujo envíe el estado de todos los asientos, después
+    solo los que cambian, y un comentario cuando no hay cambios.
+    """
+    user = User.objects.create_user(username="sse", email="sse@test.com")
+    headers = {
+        "Authorization": f"Bearer {SignedTokenService.issue_pair(user)['access']}",
+        "Accept": "text/event-stream",
+    }
+    url = f"/api/async/seatEvents/{flight_with_tickets.id}/"
+    seat_id = Reservation.objects.get(reservation_code="RES0").seat_id
+    topic = flight_topic(flight_with_tickets.id)
+
+    async def scenario():
+        missing = await AsyncClient().get(
+            "/api/async/seatEvents/999999/", headers=headers
+        )
+        assert missing.status_code == 404
+        assert missing.content.startswith(b"event: error")
+
+        response = await AsyncClient().get(url, headers=headers)
+        assert response["Content-Type"] == "text/event-stream"
+        events = response.streaming_content.__aiter__()
+        assert (await events.__anext__()).startswith(b"retry:")
+        snapshot = _data(await events.__anext__())
+
+        get_seat_hub().publish(topic, {seat_id: {"occupied": False}})
+        seats = _data(await events.__anext__())
+        # Un cambio que deja el asiento igual no se envía
+        get_seat_hub().publish(topic, {seat_id: {"occupied": False}})
+        ping = await events.__anext__()
+        await events.aclose()
+        return snapshot, seats, ping
+
+    snapshot, seats, ping = async_to_sync(scenario)()
+
+    assert snapshot[0] == "snapshot"
+    assert len(snapshot[1]) == 3
+    assert all(seat["occupied"] and not seat["available"] for seat in snapshot[1])
+    assert seats == (
+        "seats",
+        [{"id": seat_id, "status": "taken", "occupied": False, "available": False}],
+    )
+    assert ping == b": ping\n\n"
+    assert not get_seat_hub().has_subscribers(topic)
+
+
+@override_settings(SEAT_EVENTS={"COALESCE": 0, "HEARTBEAT": 0.05, "MAX_SECONDS": 5})
+@pytest.mark.django_db
+def test_seat_events_stream_follows_local_changes_and_new_seats(
+    flight_with_tickets, monkeypatch, django_capture_on_commit_callbacks
+):
+    """
+    Verifica que un cambio publicado en este proceso (que también sube los
+    sellos de versión) no haga recargar todos los asientos en el siguiente
+    heartbeat, y que un asiento agregado después de conectarse se envíe.
+    """
+    user = User.objects.create_user(username="sse", email="sse@test.com")
+    headers = {
+        "Authorization": f"Bearer {SignedTokenService.issue_pair(user)['access']}",
+        "Accept": "text/event-stream",
+    }
+    url = f"/api/async/seatEvents/{flight_with_tickets.id}/"
+    plane = flight_with_tickets.plane
+    loads = []
+    seat_states = SeatEventService.seat_states
+    monkeypatch.setattr(
+        SeatEventService,
+        "seat_states",
+        staticmethod(lambda flight: loads.append(flight.id) or seat_states(flight)),
+    )
+
+    def add_seat():
+        # Se confirma la transacción: se publica el cambio y suben los sellos
+        with django_capture_on_commit_callbacks(execute=True):
+            return Seat.objects.create(
+                number="2A",
+                row=2,
+                column="A",
+                seat_type="economy",
+                status="available",
+                plane=plane,
+            )
+
+    async def scenario():
+        response = await AsyncClient().get(url, headers=headers)
+        events = response.streaming_content.__aiter__()
+        await events.__anext__()  # retry
+        await events.__anext__()  # snapshot
+
+        seat = await sync_to_async(add_seat)()
+        seats = _data(await events.__anext__())
+        ping = await events.__anext__()
+        await events.aclose()
+        return seat, seats, ping
+
+    seat, seats, ping = async_to_sync(scenario)()
+
+    assert seats == (
+        "seats",
+        [{"id": seat.id, "status": "available", "occupied": False, "available": True}],
+    )
+    assert ping == b": ping\n\n"
+    assert loads == [flight_with_tickets.id]
@@ -0,0 +1,84 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airline.models import Seat, User
+from airline.services.seat_map import AISLE, SeatMap, split_blocks, with_aisles
+
+
+# -------------------- TEST: Grilla de asientos --------------------
+def test_seat_map_grid_blocks_and_occupancy():
+    """
+    Verifica la grilla (con huecos y asientos fuera de las dimensiones
+    declaradas), los bloques con pasillos y la ocupación por vuelo.
+    """
+    seats = [
+        (1, 1, "A", "1A", "first_class", "available"),
+        (2, 1, "c", "1C", "first_class", "available"),
+        (3, 3, "D", "3D", "economico", "Taken"),
+    ]
+    seat_map = SeatMap(7, "Avión 7", rows=2, columns=3, seats=seats)
+    data = seat_map.serialize(occupied_seat_ids={2})
+
+    assert split_blocks(7) == [3, 2, 2]
+    assert (data["rows"], data["columns"], data["blocks"]) == (3, 4, [2, 1, 1])
+    assert data["aisles"] == [1, 2]
+    assert [cell and cell["number"] for cell in data["layout"][0]] == [
+        "1A",
+        None,
+        "1C",
+        None,
+    ]
+    first_row = data["layout"][0]
+    assert first_row[0]["available"] and not first_row[0]["occupied"]
+    assert first_row[2]["occupied"] and not first_row[2]["available"]
+    assert not data["layout"][2][3]["available"]
+    assert with_aisles(data)[0][2] == AISLE
+
+
+# -------------------- TEST: API de layout --------------------
+@pytest.mark.django_db
+def test_plane_layout_api_with_flight_occupancy(flight_with_tickets):
+    """
+    Verifica que la API use el mapa compartido: una consulta para la grilla
+    y otra para la ocupación del vuelo.
+    """
+    plane = flight_with_tickets.plane
+    Seat.objects.create(
+        number="2A",
+        row=2,
+        column="A",
+        seat_type="economico",
+        status="available",
+        plane=plane,
+    )
+    user = User.objects.create_user(
+        username="viewer", email="viewer@test.com", password="123"
+    )
+    client = APIClient()
+    client.force_authenticate(user=user)
+    url = reverse("plane-layout", args=[plane.id])
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, {"flight": flight_with_tickets.id})
+    data = response.json()
+
+    assert response.status_code == 200
+    # avión + vuelo + grilla + ocupación + ventas del vuelo (tabla de precios)
+    assert len(queries) == 5
+    assert [cell["occupied"] for cell in data["layout"][0]] == [True, True, True]
+    assert data["layout"][1][0] == {
+        "id": data["layout"][1][0]["id"],
+        "number": "2A",
+        "row": 2,
+        "column": "A",
+        "seat_type": "economico",
+        "status": "available",
+        "occupied": False,
+        "available": True,
+        "price": data["layout"][1][0]["price"],
+    }
+    assert client.get(url, {"flight": "x"}).status_code == 400
+    assert client.get(url, {"flight": "²"}).status_code == 400
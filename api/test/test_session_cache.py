@@ -0,0 +1,84 @@
+import copy
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airline.models import User
+from airline.repositories.user import UserRepository
+
+
+def _auth_queries(queries):
+    # Consultas de la autenticación: sesión y usuario
+    return [
+        query["sql"]
+        for query in queries
+        if "django_session" in query["sql"] or '"airline_user"' in query["sql"]
+    ]
+
+
+# -------------------- TEST: Sesión y usuario cacheados --------------------
+# Configuración con cache compartido (en las pruebas el LocMem del único proceso)
+SHARED_CACHE_SESSIONS = override_settings(
+    SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+    SESSION_CACHE_ALIAS="sessions",
+    AUTHENTICATION_BACKENDS=["airline.backends.CachedModelBackend"],
+)
+
+
+# transaction=True: el usuario no se guarda en memoria dentro de una transacción
+@SHARED_CACHE_SESSIONS
+@pytest.mark.django_db(transaction=True)
+def test_session_requests_skip_session_and_user_queries():
+    """
+    Verifica que, después del primer pedido, la sesión y el usuario salgan
+    del cache y que cambiar los permisos del usuario se vea en el siguiente.
+    """
+    user = User.objects.create_superuser(
+        username="admin", email="admin@test.com", password="admin123"
+    )
+    client = APIClient()
+    assert client.login(username="admin", password="admin123")
+    url = reverse("flight-vs-list")
+
+    assert client.get(url).status_code == 200
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(url).status_code == 200
+    assert _auth_queries(queries) == []
+
+    UserRepository.update_staff_status(user, False)
+    assert client.get(url).status_code == 403
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(url).status_code == 403
+    assert _auth_queries(queries) == []
+
+
+@pytest.mark.django_db
+def test_process_local_cache_keeps_sessions_and_users_in_the_database():
+    """
+    Verifica que con el cache de cada proceso las sesiones y el usuario se
+    lean de la base, así cerrar sesión invalida la cookie en todos los
+    procesos.
+    """
+    assert not settings.SHARED_CACHE
+    assert settings.SESSION_ENGINE == "django.contrib.sessions.backends.db"
+    assert settings.AUTHENTICATION_BACKENDS == [
+        "django.contrib.auth.backends.ModelBackend"
+    ]
+
+    User.objects.create_superuser(
+        username="admin", email="admin@test.com", password="admin123"
+    )
+    client = APIClient()
+    assert client.login(username="admin", password="admin123")
+    url = reverse("flight-vs-list")
+    stolen = APIClient()
+    stolen.cookies = copy.deepcopy(client.cookies)
+
+    assert stolen.get(url).status_code == 200
+    client.logout()
+    assert stolen.get(url).status_code in (401, 403)
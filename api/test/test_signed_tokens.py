@@ -0,0 +1,145 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from airline.models import RevokedToken, User
+from airline.repositories.user import UserRepository
+from airline.services.signed_token import ACCESS, REFRESH, SignedTokenService
+from airline.utils.bloom import BloomFilter
+
+
+@pytest.fixture
+def admin(db):
+    return User.objects.create_superuser(
+        username="admin", email="admin@test.com", password="admin123"
+    )
+
+
+def _obtain(username="admin", password="admin123"):
+    return APIClient().post(
+        reverse("token-obtain"), {"username": username, "password": password}
+    )
+
+
+def _client(raw):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {raw}")
+    return client
+
+
+# -------------------- TEST: Obtener y usar tokens --------------------
+@pytest.mark.django_db
+def test_access_token_authenticates_without_queries(admin):
+    """
+    Verifica que el token de acceso autentique (con permisos de admin) y
+    que, ya cargada la lista de revocados, se verifique sin consultar la base.
+    """
+    assert _obtain(password="mal").status_code == 401
+    pair = _obtain().json()
+
+    assert _client(pair[ACCESS]).get(reverse("flight-vs-list")).status_code == 200
+    assert _client(pair[REFRESH]).get(reverse("flight-vs-list")).status_code == 401
+    with CaptureQueriesContext(connection) as queries:
+        claims = SignedTokenService.verify(pair[ACCESS])
+    assert claims["uid"] == admin.id
+    assert len(queries) == 0
+    assert SignedTokenService.verify(pair[ACCESS], now=time.time() + 3600) is None
+    assert SignedTokenService.verify(pair[ACCESS][:-2] + "xx") is None
+
+
+# -------------------- TEST: Renovación y revocación --------------------
+@pytest.mark.django_db
+def test_refresh_rotates_and_revoke_blocks(admin):
+    """
+    Verifica que cada token de renovación sirva una vez y que un token de
+    acceso revocado deje de autenticar.
+    """
+    pair = _obtain().json()
+    url = reverse("token-refresh")
+
+    response = APIClient().post(url, {"refresh": pair[REFRESH]})
+    assert response.status_code == 200
+    assert APIClient().post(url, {"refresh": pair[REFRESH]}).status_code == 401
+
+    access = response.json()[ACCESS]
+    revoke = APIClient().post(reverse("token-revoke"), {"token": access})
+    assert revoke.status_code == 204
+    assert _client(access).get(reverse("flight-available")).status_code == 401
+    assert (
+        APIClient().post(reverse("token-revoke"), {"token": access}).status_code == 400
+    )
+
+
+@pytest.mark.django_db
+def test_password_change_revokes_issued_tokens(admin):
+    """
+    Verifica que cambiar la contraseña invalide los tokens ya emitidos.
+    """
+    old = _obtain().json()
+    admin.set_password("nueva123")
+    admin.save()
+
+    assert SignedTokenService.verify(old[ACCESS]) is None
+    assert SignedTokenService.refresh(old[REFRESH]) is None
+    new = _obtain(password="nueva123").json()
+    assert SignedTokenService.verify(new[ACCESS])["uid"] == admin.id
+
+
+@pytest.mark.django_db
+def test_losing_staff_status_revokes_issued_tokens(admin):
+    """
+    Verifica que quitarle staff (o superusuario) a un usuario invalide los
+    tokens emitidos, que llevan esos permisos en sus claims.
+    """
+    old = _obtain().json()
+    admin.email = "otro@test.com"
+    admin.save()
+    assert SignedTokenService.verify(old[ACCESS])["uid"] == admin.id
+
+    UserRepository.update_staff_status(admin, False)
+    assert SignedTokenService.verify(old[ACCESS]) is None
+    assert SignedTokenService.refresh(old[REFRESH]) is None
+
+    superuser = _obtain().json()
+    admin.is_superuser = False
+    admin.save()
+    assert SignedTokenService.verify(superuser[ACCESS]) is None
+
+
+@pytest.mark.django_db
+def test_denylist_syncs_revocations_from_table(admin):
+    """
+    Verifica que una revocación registrada por otro proceso (directo en la
+    tabla) se vea al sincronizar la lista en memoria.
+    """
+    pair = SignedTokenService.issue_pair(admin)
+    claims = SignedTokenService.verify(pair[ACCESS])
+    RevokedToken.objects.create(
+        jti=claims["jti"], user=admin, expires_at=timezone.now() + timedelta(days=1)
+    )
+
+    assert SignedTokenService.verify(pair[ACCESS]) is not None  # todavía no sincronizó
+    with override_settings(SIGNED_TOKENS={"SYNC_INTERVAL": 0}):
+        assert SignedTokenService.verify(pair[ACCESS]) is None
+
+
+# -------------------- TEST: Filtro de Bloom --------------------
+def test_bloom_filter_has_no_false_negatives():
+    """
+    Verifica que todo lo agregado se encuentre y que los falsos positivos
+    queden cerca de la tasa configurada.
+    """
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"jti-{i}")
+
+    assert all(f"jti-{i}" in bloom for i in range(1000))
+    false_positives = sum(f"otro-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
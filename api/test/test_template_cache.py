@@ -0,0 +1,54 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+def _get(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return response.content.decode(), len(queries)
+
+
+# -------------------- TEST: Listado de vuelos cacheado --------------------
+@pytest.mark.django_db
+def test_flight_list_fragment_is_cached_and_invalidated(client, flight_with_tickets):
+    """
+    Verifica que el segundo render no consulte los vuelos y que un cambio en
+    un vuelo invalide el fragmento.
+    """
+    url = reverse("flight_list")
+    first, first_queries = _get(client, url)
+    second, second_queries = _get(client, url)
+
+    assert second == first
+    assert second_queries < first_queries
+
+    flight_with_tickets.destination = "Lisboa"
+    flight_with_tickets.save()
+    third, _ = _get(client, url)
+
+    assert "Lisboa" in third
+
+
+# -------------------- TEST: Mapa de asientos cacheado --------------------
+@pytest.mark.django_db
+def test_seat_map_fragment_follows_seat_changes(client, flight_with_tickets):
+    """
+    Verifica que el mapa de asientos salga del cache y se regenere al cambiar
+    un asiento del avión.
+    """
+    plane = flight_with_tickets.plane
+    url = reverse("select_seat", args=[flight_with_tickets.id, 0])
+    _, first_queries = _get(client, url)
+    _, second_queries = _get(client, url)
+
+    assert second_queries < first_queries
+
+    seat = plane.seat_set.get(number="1A")
+    seat.number = "9Z"
+    seat.save()
+    content, _ = _get(client, url)
+
+    assert "9Z" in content
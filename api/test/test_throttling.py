@@ -0,0 +1,105 @@
+import pytest
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airline.models import User
+from airline.services.api_token import ApiTokenService
+from api import throttling
+from api.throttling import LocalStore, gcra, get_store
+
+
+def _rates(**rates):
+    return {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}
+
+
+# -------------------- TEST: GCRA --------------------
+def test_gcra_allows_burst_then_spaces_requests():
+    """
+    Verifica que con 3 pedidos por minuto se permitan 3 seguidos y el
+    siguiente recién cuando se recupera un lugar (20 segundos).
+    """
+    store = LocalStore()
+    results = [store.hit("k", 3, 60, now=1000.0) for _ in range(4)]
+
+    assert [quota.allowed for quota in results] == [True, True, True, False]
+    assert [quota.remaining for quota in results] == [2, 1, 0, 0]
+    assert results[-1].retry_after == 20
+    assert store.hit("k", 3, 60, now=1019.0).allowed is False
+    assert store.hit("k", 3, 60, now=1020.0).allowed is True
+
+    quota, tat = gcra(None, 0.0, 60, 60)
+    assert quota.remaining == 59 and tat == 1.0
+
+
+def test_local_store_prunes_at_most_once_per_interval(monkeypatch):
+    """
+    Verifica que con muchos clientes vigentes el almacén local no recorra
+    todas las entradas en cada pedido y que igual descarte las vencidas.
+    """
+    monkeypatch.setattr(throttling, "LOCAL_PRUNE_SIZE", 10)
+    store = LocalStore()
+    prunes = []
+    prune = store._prune
+    monkeypatch.setattr(store, "_prune", lambda now: (prunes.append(now), prune(now)))
+
+    for client in range(100):
+        store.hit(f"ip:{client}", 5, 60, now=1000.0 + client / 1000)
+    assert len(prunes) == 1
+    assert len(store._tats) == 100  # todas vigentes
+
+    store.hit("ip:late", 5, 60, now=1100.0)
+    assert len(prunes) == 2
+    assert list(store._tats) == ["ip:late"]
+
+
+# -------------------- TEST: Límite en la API --------------------
+@pytest.mark.django_db
+@pytest.mark.parametrize("store", ["local", "default"])
+def test_flight_filter_is_limited_per_user_and_token(store):
+    """
+    Verifica los headers de cupo, la respuesta 429 y que cada usuario y cada
+    token tengan su propio cupo.
+    """
+    first = User.objects.create_user(username="a", email="a@test.com")
+    second = User.objects.create_user(username="b", email="b@test.com")
+    url = reverse("flight-filter")
+
+    with override_settings(
+        REST_FRAMEWORK=_rates(flight_filter="2/min"), THROTTLE_STORE=store
+    ):
+        if store == "local":
+            get_store().clear()
+        client = APIClient()
+        client.force_authenticate(user=first)
+        responses = [client.get(url) for _ in range(3)]
+
+        assert [r.status_code for r in responses] == [200, 200, 429]
+        assert responses[0]["X-RateLimit-Limit"] == "2"
+        assert [r["X-RateLimit-Remaining"] for r in responses] == ["1", "0", "0"]
+        assert int(responses[2]["Retry-After"]) == 30
+
+        other = APIClient()
+        other.force_authenticate(user=second)
+        assert other.get(url).status_code == 200
+
+        for _ in range(2):
+            _, raw = ApiTokenService.issue(second, "cliente")
+            token_client = APIClient()
+            token_client.credentials(HTTP_AUTHORIZATION=f"Bearer {raw}")
+            assert token_client.get(url).status_code == 200
+
+
+@pytest.mark.django_db
+def test_views_without_scope_are_not_limited():
+    """
+    Verifica que las vistas sin throttle_scope no tengan límite ni headers.
+    """
+    user = User.objects.create_user(username="a", email="a@test.com")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    response = client.get(reverse("flight-available"))
+    assert response.status_code == 200
+    assert "X-RateLimit-Limit" not in response
@@ -0,0 +1,72 @@
+import io
+import zipfile
+
+import pytest
+from django.urls import reverse
+
+
+def _content(response):
+    return b"".join(response.streaming_content)
+
+
+# -------------------- TEST: Exportar PDF multipágina --------------------
+@pytest.mark.django_db
+def test_download_flight_tickets_pdf(client, flight_with_tickets):
+    """
+    Verifica que se genere un único PDF con una página por ticket.
+    """
+    url = reverse("download_flight_tickets", args=[flight_with_tickets.id])
+    response = client.get(url)
+    content = _content(response)
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/pdf"
+    assert content.startswith(b"%PDF")
+    assert content.count(b"/Type /Page\n") == 3
+
+
+# -------------------- TEST: Exportar ZIP en paralelo --------------------
+@pytest.mark.django_db
+def test_download_flight_tickets_zip(client, settings, flight_with_tickets):
+    """
+    Verifica que el ZIP contenga un PDF por ticket, renderizados en el pool de procesos.
+    """
+    settings.TICKET_EXPORT_WORKERS = 2
+    url = reverse("download_flight_tickets", args=[flight_with_tickets.id])
+    response = client.get(url + "?format=zip")
+    content = _content(response)
+
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(content)) as zf:
+        names = sorted(zf.namelist())
+        assert names == ["ticket_RES0.pdf", "ticket_RES1.pdf", "ticket_RES2.pdf"]
+        assert zf.read("ticket_RES0.pdf").startswith(b"%PDF")
+
+
+# -------------------- TEST: Una sola consulta para los tickets --------------------
+@pytest.mark.django_db
+def test_boarding_data_single_query(django_assert_num_queries, flight_with_tickets):
+    """
+    Verifica que los datos de todos los tickets se obtengan con una única consulta.
+    """
+    from airline.services.ticket import TicketService
+
+    with django_assert_num_queries(1):
+        tickets = TicketService.get_boarding_data_by_flight(flight_with_tickets.id)
+
+    assert [t["reservation_code"] for t in tickets] == ["RES0", "RES1", "RES2"]
+    assert tickets[0]["passenger_name"] == "Pasajero 0"
+
+
+# -------------------- TEST: Plantilla fija reutilizada entre páginas --------------------
+@pytest.mark.django_db
+def test_ticket_template_drawn_once(client, flight_with_tickets):
+    """
+    Verifica que la parte fija del boleto sea un único form XObject
+    compartido por todas las páginas del documento.
+    """
+    url = reverse("download_flight_tickets", args=[flight_with_tickets.id])
+    content = _content(client.get(url))
+
+    assert content.count(b"/Subtype /Form") == 1
+    assert content.count(b"/Type /Page\n") == 3
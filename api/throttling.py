@@ -0,0 +1,159 @@
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from airline.models import ApiToken
+
+# Límite de pedidos por endpoint con GCRA (generic cell rate algorithm): por
+# cada cliente se guarda un único número, el instante teórico en que su
+# cupo vuelve a estar lleno (TAT). Equivale a una ventana deslizante sin
+# guardar el historial de pedidos.
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# Entradas del almacén local a partir de las cuales se descartan las vencidas,
+# a lo sumo una vez cada LOCAL_PRUNE_INTERVAL segundos: con muchos clientes
+# vigentes (una inundación desde muchas IP) recorrer el diccionario en cada
+# pedido lo haría O(n)
+LOCAL_PRUNE_SIZE = 10_000
+LOCAL_PRUNE_INTERVAL = 1.0
+
+
+@lru_cache(maxsize=64)
+def parse_rate(rate: str) -> tuple[int, int]:
+    """
+    "60/min" -> (60, 60): pedidos permitidos y período en segundos.
+    """
+    limit, period = rate.split("/")
+    return int(limit), PERIODS[period.strip()[0]]
+
+
+@dataclass
+class Quota:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: float  # segundos hasta recuperar el cupo completo
+    retry_after: float  # segundos hasta poder hacer otro pedido (0 si se permitió)
+
+
+def gcra(tat, now, limit, period) -> tuple[Quota, float]:
+    """
+    Aplica un pedido sobre el TAT guardado (None si no hay). Devuelve el
+    resultado y el TAT a guardar (None si el pedido se rechazó).
+    """
+    interval = period / limit
+    tat = now if tat is None or tat < now else tat
+    new_tat = tat + interval
+    if new_tat - now > period:
+        retry_after = new_tat - period - now
+        return Quota(False, limit, 0, tat - now, retry_after), None
+    remaining = int((period - (new_tat - now)) / interval)
+    return Quota(True, limit, remaining, new_tat - now, 0.0), new_tat
+
+
+class LocalStore:
+    """
+    TAT de cada clave en la memoria del proceso.
+    """
+
+    def __init__(self):
+        self._tats = {}
+        self._lock = threading.Lock()
+        self._next_prune = 0.0
+
+    def hit(self, key, limit, period, now) -> Quota:
+        with self._lock:
+            quota, new_tat = gcra(self._tats.get(key), now, limit, period)
+            if new_tat is not None:
+                self._tats[key] = new_tat
+                if len(self._tats) > LOCAL_PRUNE_SIZE and now >= self._next_prune:
+                    self._prune(now)
+        return quota
+
+    def _prune(self, now):
+        self._next_prune = now + LOCAL_PRUNE_INTERVAL
+        for key in [key for key, tat in self._tats.items() if tat <= now]:
+            del self._tats[key]
+
+    def clear(self):
+        with self._lock:
+            self._tats.clear()
+            self._next_prune = 0.0
+
+
+class CacheStore:
+    """
+    TAT de cada clave en un cache de Django compartido entre procesos. La
+    lectura y escritura no son atómicas: con pedidos simultáneos del mismo
+    cliente se puede pasar por alguno más.
+    """
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def hit(self, key, limit, period, now) -> Quota:
+        key = f"throttle:{key}"
+        quota, new_tat = gcra(self.cache.get(key), now, limit, period)
+        if new_tat is not None:
+            # El TAT deja de importar cuando ya pasó
+            self.cache.set(key, new_tat, timeout=max(1, int(new_tat - now) + 1))
+        return quota
+
+
+_stores = {}
+
+
+def get_store():
+    """
+    Almacén configurado en settings.THROTTLE_STORE: "local" o un alias de CACHES.
+    """
+    name = getattr(settings, "THROTTLE_STORE", "default")
+    store = _stores.get(name)
+    if store is None:
+        store = _stores[name] = LocalStore() if name == "local" else CacheStore(name)
+    return store
+
+
+def _rates():
+    return api_settings.DEFAULT_THROTTLE_RATES or {}
+
+
+class GCRAThrottle(BaseThrottle):
+    """
+    Limita los pedidos de las vistas con `throttle_scope` según la tasa de
+    ese alcance en REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] ("60/min").
+    Cuenta por token de la API, por usuario o, sin autenticar, por IP. Deja
+    el cupo en request.throttle_quota para los headers X-RateLimit-*.
+    """
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        rate = _rates().get(scope) if scope else None
+        if not rate:
+            return True
+        limit, period = parse_rate(rate)
+        quota = get_store().hit(
+            f"{scope}:{self.get_client_key(request)}", limit, period, time.time()
+        )
+        request.throttle_quota = quota
+        self.quota = quota
+        return quota.allowed
+
+    def get_client_key(self, request) -> str:
+        auth = request.auth
+        if isinstance(auth, ApiToken):
+            return f"token:{auth.pk}"
+        user = request.user
+        if user is not None and user.is_authenticated:
+            return f"user:{user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+    def wait(self):
+        return self.quota.retry_after
@@ -15,15 +15,33 @@ from api.views import (
     GenerateTicketAPIView,
     TicketInformationAPIView,
     PassengersByFlightAPIView,
+    PassengerManifestExportAPIView,
     ActiveReservationsByPassengerAPIView,
+    LoadFactorReportAPIView,
+    RevenueReportAPIView,
+    SeatTypeMixReportAPIView,
+    BookingAnalyticsAPIView,
+    FlightForecastAPIView,
+    ObtainTokenAPIView,
+    RefreshTokenAPIView,
+    RevokeTokenAPIView,
     PlaneViewSet,
     ChangeReservationStatusAPIView,
+    BulkImportAPIView,
     UserViewSet,
     FlightStatusViewSet,
     ReservationViewSet,
     TicketViewSet,
 )
 
+from api.async_views import (
+    AsyncFlightFilterAPIView,
+    AsyncPassengerManifestExportAPIView,
+    AsyncSeatAvailabilityAPIView,
+    AsyncSeatEventsAPIView,
+    AsyncTicketInformationAPIView,
+)
+
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularRedocView,
@@ -68,6 +86,7 @@ urlpatterns = [
         ChangeReservationStatusAPIView.as_view(),
         name="change-reservation-status",
     ),
+    path("bulkImport/", BulkImportAPIView.as_view(), name="bulk-import"),
     path(
         "availableSeats/<int:flight_id>/",
         AvailableSeatsListAPIView.as_view(),
@@ -96,11 +115,66 @@ urlpatterns = [
         PassengersByFlightAPIView.as_view(),
         name="passenger-flight",
     ),
+    path(
+        "passengersByFlight/<int:flight_id>/manifest/",
+        PassengerManifestExportAPIView.as_view(),
+        name="passenger-manifest",
+    ),
     path(
         "activeReservations/<int:passenger_id>",
         ActiveReservationsByPassengerAPIView.as_view(),
         name="active-reservation",
     ),
+    path(
+        "loadFactorReport/",
+        LoadFactorReportAPIView.as_view(),
+        name="load-factor-report",
+    ),
+    path("revenueReport/", RevenueReportAPIView.as_view(), name="revenue-report"),
+    path(
+        "seatTypeMixReport/",
+        SeatTypeMixReportAPIView.as_view(),
+        name="seat-type-mix-report",
+    ),
+    path(
+        "bookingAnalytics/",
+        BookingAnalyticsAPIView.as_view(),
+        name="booking-analytics",
+    ),
+    path(
+        "flightForecast/<int:flight_id>/",
+        FlightForecastAPIView.as_view(),
+        name="flight-forecast",
+    ),
+    path("token/", ObtainTokenAPIView.as_view(), name="token-obtain"),
+    path("token/refresh/", RefreshTokenAPIView.as_view(), name="token-refresh"),
+    path("token/revoke/", RevokeTokenAPIView.as_view(), name="token-revoke"),
+    # Versiones asíncronas (para servir bajo ASGI)
+    path(
+        "async/flightFilter/",
+        AsyncFlightFilterAPIView.as_view(),
+        name="flight-filter-async",
+    ),
+    path(
+        "async/checkSeatAvailability/<int:plane_id>/<str:seat_code>/",
+        AsyncSeatAvailabilityAPIView.as_view(),
+        name="seat-availability-async",
+    ),
+    path(
+        "async/ticketInformation/<str:barcode>",
+        AsyncTicketInformationAPIView.as_view(),
+        name="ticket-information-async",
+    ),
+    path(
+        "async/passengersByFlight/<int:flight_id>/manifest/",
+        AsyncPassengerManifestExportAPIView.as_view(),
+        name="passenger-manifest-async",
+    ),
+    path(
+        "async/seatEvents/<int:flight_id>/",
+        AsyncSeatEventsAPIView.as_view(),
+        name="seat-events-async",
+    ),
     # YOUR PATTERNS
     path("schema/", SpectacularAPIView.as_view(), name="schema"),
     # Optional UI:
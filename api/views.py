@@ -1,3 +1,6 @@
+import io
+from datetime import datetime, time
+
 from airline.models import (
     User,
     Plane,
@@ -14,6 +17,7 @@ from api.serializers import (
     FlightSerializer,
     PassengerSerializer,
     SeatSerializer,
+    AvailableSeatSerializer,
     ReservationSerializer,
     TicketSerializer,
     UserSerializer,
@@ -26,22 +30,42 @@ from rest_framework.generics import (
     RetrieveAPIView,
 )
 
-from api.mixins import AuthAdminView, AuthView
+from api.mixins import AuthAdminView, AuthView, RateLimitHeadersMixin
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAdminUser, IsAuthenticated
-from api.permissions import TokenPermission
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 
 from rest_framework import status
 from django.utils.crypto import get_random_string
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 
 from airline.services.plane import PlaneService
+from airline.services.pricing import PricingService
 from airline.services.flight import FlightService
+from airline.services.forecasting import ForecastService
 from airline.services.passenger import PassengerService
+from airline.services.analytics import BookingColumns, analyze
+from airline.services.report import ReportService
 from airline.services.reservation import ReservationService
 from airline.services.seat import SeatService
+from airline.services.signed_token import SignedTokenService
 from airline.services.ticket import TicketService
+from airline.services.bulk_import import IMPORTERS, is_utf8, iter_records
+from airline.utils.streaming import iter_csv, iter_ndjson
+
+
+def include_archived(request) -> bool:
+    """
+    True si el pedido pide también datos del archivo (?archived=1).
+    """
+    return request.query_params.get("archived", "").lower() in ("1", "true")
+
 
 """
 Gestión de Vuelos (API)
@@ -90,18 +114,23 @@ class FlightFilterAPIView(AuthView, ListAPIView):  # TODO se ve mal en swagger
     ejemplo de url= /api/flightFilter/?origin=Tokio&destination=Nagoya
     filtra vuelos por origen, destino y fecha de salida.
     si no se envia filtro, devuelve todos los vuelos
+    con archived=1 (o una fecha anterior al horizonte del archivo) incluye
+    los vuelos archivados
     """
 
     permission_classes = [IsAuthenticated]
     serializer_class = FlightSerializer
     pagination_class = None
+    throttle_scope = "flight_filter"
 
     def get_queryset(self):
         origin = self.request.query_params.get("origin")
         destination = self.request.query_params.get("destination")
         date = self.request.query_params.get("date")
 
-        return FlightService.filter_flights(origin, destination, date)
+        return FlightService.filter_flights(
+            origin, destination, date, include_archived=include_archived(self.request)
+        )
 
 
 # crear, editar y eliminar vuelos (solo administradores).
@@ -164,6 +193,7 @@ class ReservationByPassengerAPIView(AuthView, ListAPIView):
     """
     GET /api/reservationsByPassenger/<int:passenger_id>/
     Devuelve todas las reservas asociadas a un pasajero.
+    Con ?archived=1 incluye las de vuelos archivados.
     Accesible para cualquier usuario autenticado.
     """
 
@@ -173,7 +203,9 @@ class ReservationByPassengerAPIView(AuthView, ListAPIView):
 
     def get_queryset(self):
         passenger_id = self.kwargs.get("passenger_id")
-        return ReservationService.get_by_passenger(passenger_id)
+        return ReservationService.get_by_passenger(
+            passenger_id, include_archived=include_archived(self.request)
+        )
 
 
 # ---------------------------------------------------------------------------------------------
@@ -232,26 +264,31 @@ class CreateReservationAPIView(AuthAdminView, viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        # respeta el límite de reservas del vuelo (capacidad más sobreventa autorizada)
+        if not ForecastService.can_book(flight):
+            return Response(
+                {"error": "El vuelo no tiene más lugares disponibles."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         # genera codigo unico de reserva
         reservation_code = get_random_string(10).upper()
 
-        # usa el base_price del vuelo
-        price = flight.base_price
-
-        # crear la reserva
-        reservation = Reservation.objects.create(
-            status="confirmed",
-            price=price,
-            reservation_code=reservation_code,
-            flight=flight,
-            passenger=passenger,
-            seat=seat,
-            user=user,
-        )
+        # precio dinámico del asiento (tipo, ocupación y anticipación)
+        price = PricingService.quote(flight, seat)
 
-        # marca asiento como ocupado
-        seat.status = "taken"
-        seat.save()
+        # marca el asiento como ocupado y crea la reserva en una sola transacción
+        try:
+            reservation, _ = ReservationService.book(
+                flight_id=flight.id,
+                passenger_id=passenger.id,
+                seat_id=seat.id,
+                user_id=user.id,
+                price=price,
+                reservation_code=reservation_code,
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         serializer = ReservationSerializer(reservation)
         return Response(
@@ -265,17 +302,25 @@ class AvailableSeatsListAPIView(AuthView, ListAPIView):
     """
     GET /api/availableSeats/<int:flight_id>/
     Devuelve los asientos disponibles de un vuelo indicado
-    según el avión asociado al vuelo.
+    según el avión asociado al vuelo, con su precio.
     """
 
     permission_classes = [IsAuthenticated]
-    serializer_class = SeatSerializer
+    serializer_class = AvailableSeatSerializer
     pagination_class = LimitOffsetPagination
+    throttle_scope = "available_seats"
 
     def get_queryset(self):
         flight_id = self.kwargs.get("flight_id")
         return SeatService.get_available_seats_by_flight(flight_id)
 
+    def get_serializer_context(self):
+        # Tabla de precios del vuelo, calculada una vez para todos los asientos
+        context = super().get_serializer_context()
+        flight = FlightService.get_by_id(self.kwargs.get("flight_id"))
+        context["price_table"] = PricingService.price_table(flight) if flight else None
+        return context
+
 
 # cambiar estado de una reserva solo admin
 class ChangeReservationStatusAPIView(AuthAdminView, APIView):
@@ -336,6 +381,55 @@ class ChangeReservationStatusAPIView(AuthAdminView, APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+# importación masiva de vuelos o pasajeros solo admin
+class BulkImportAPIView(AuthAdminView, APIView):
+    """
+    POST /api/bulkImport/  (multipart)
+    Campos: file (CSV o NDJSON), kind (flights|passengers), format (csv|ndjson,
+    por defecto según la extensión), dry_run (solo valida, no guarda).
+    Devuelve la cantidad de filas creadas y el detalle de las rechazadas.
+    """
+
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"error": "Debe adjuntar un archivo."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        importer = IMPORTERS.get(request.data.get("kind", "flights"))
+        if importer is None:
+            return Response(
+                {"error": "Tipo no soportado, usar flights o passengers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fmt = request.data.get("format") or (
+            "ndjson" if upload.name.endswith((".ndjson", ".jsonl")) else "csv"
+        )
+        if fmt not in ("csv", "ndjson"):
+            return Response(
+                {"error": "Formato no soportado, usar csv o ndjson."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not is_utf8(upload.file):
+            return Response(
+                {"error": "El archivo debe estar codificado en UTF-8."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        dry_run = str(request.data.get("dry_run", "")).lower() in ("1", "true")
+        # El archivo se lee línea por línea, sin cargarlo completo en memoria
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        report = importer.import_records(iter_records(stream, fmt), dry_run=dry_run)
+        return Response(report, status=status.HTTP_200_OK)
+
+
 # ---------------------------------------------------------------------------------------------
 
 """
@@ -362,8 +456,9 @@ class PlaneViewSet(AuthAdminView, viewsets.ModelViewSet):
 # obtener layout de asientos de avion
 class PlaneLayoutAPIView(AuthView, ListAPIView):
     """
-    GET /api/planeLayout/<int:plane_id>/
-    Devuelve el layout de los asientos del avion
+    GET /api/planeLayout/<int:plane_id>/?flight=<id>
+    Devuelve el layout de los asientos del avion; con ?flight incluye la
+    ocupación de ese vuelo
     """
 
     permission_classes = [IsAuthenticated]
@@ -371,10 +466,21 @@ class PlaneLayoutAPIView(AuthView, ListAPIView):
     pagination_class = None
 
     def list(self, request, plane_id):
-        data = PlaneService.get_plane_layout(plane_id)
+        flight_id = request.query_params.get("flight")
+        if flight_id is not None:
+            # int() y no str.isdigit(): isdigit acepta dígitos como "²"
+            try:
+                flight_id = int(flight_id)
+            except ValueError:
+                return Response(
+                    {"error": "El parámetro flight debe ser un ID numérico."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        data = PlaneService.get_plane_layout(plane_id, flight_id=flight_id)
         if not data:
             return Response(
-                {"error": "El avión no existe."}, status=status.HTTP_404_NOT_FOUND
+                {"error": "El avión o el vuelo no existe."},
+                status=status.HTTP_404_NOT_FOUND,
             )
         return Response(data, status=status.HTTP_200_OK)
 
@@ -506,6 +612,57 @@ class PassengersByFlightAPIView(AuthView, APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+# Endpoint para exportar el manifiesto de pasajeros de un vuelo.
+class PassengerManifestExportAPIView(AuthView, APIView):
+    """
+    GET /api/passengersByFlight/<int:flight_id>/manifest/?export=csv|ndjson
+    Exporta el manifiesto de pasajeros confirmados de un vuelo en streaming,
+    leyendo las filas por bloques de una sola consulta (memoria constante).
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    # Columnas del manifiesto, en el orden en que se exportan
+    MANIFEST_FIELDS = [
+        "reservation_code",
+        "seat_number",
+        "seat_type",
+        "passenger_name",
+        "document",
+        "document_type",
+        "email",
+        "phone",
+        "birth_date",
+    ]
+
+    def get(self, request, flight_id):
+        export = request.query_params.get("export", "csv").lower()
+        if export not in ("csv", "ndjson"):
+            return Response(
+                {"error": "Formato no soportado, usar csv o ndjson."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rows = ReservationService.iter_manifest(flight_id)
+        if rows is None:
+            return Response(
+                {"error": "El vuelo no existe."}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        if export == "csv":
+            content = iter_csv(rows, self.MANIFEST_FIELDS)
+            content_type = "text/csv"
+        else:
+            content = iter_ndjson(rows)
+            content_type = "application/x-ndjson"
+
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="manifest_flight_{flight_id}.{export}"'
+        )
+        return response
+
+
 # Endpoint para obtener reservas activas de un pasajero.
 class ActiveReservationsByPassengerAPIView(AuthView, APIView):
     """
@@ -527,6 +684,244 @@ class ActiveReservationsByPassengerAPIView(AuthView, APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+# Filtros comunes de los reportes de ventas
+def _report_filters(request):
+    """
+    Lee start, end (YYYY-MM-DD), origin y destination de la URL.
+    Lanza ValueError si alguna fecha no es válida.
+    """
+    filters = {}
+    for name in ("start", "end"):
+        value = request.query_params.get(name)
+        if value:
+            try:
+                filters[name] = parse_date(value)
+            except ValueError:
+                filters[name] = None
+            if filters[name] is None:
+                raise ValueError(f"{name} debe tener formato YYYY-MM-DD.")
+    for name in ("origin", "destination"):
+        value = request.query_params.get(name, "").strip()
+        if value:
+            filters[name] = value
+    return filters
+
+
+# Endpoint de ocupación por vuelo.
+class LoadFactorReportAPIView(AuthAdminView, APIView):
+    """
+    GET /api/loadFactorReport/?start=&end=&origin=&destination=&limit=&offset=
+    Reservas confirmadas, capacidad y ocupación de cada vuelo (paginado).
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            filters = _report_filters(request)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = LimitOffsetPagination()
+        page = paginator.paginate_queryset(
+            ReportService.load_factor(**filters), request, view=self
+        )
+        return paginator.get_paginated_response(page)
+
+
+# Endpoint de ingresos por ruta y día.
+class RevenueReportAPIView(AuthAdminView, APIView):
+    """
+    GET /api/revenueReport/?start=&end=&origin=&destination=&limit=&offset=
+    Vuelos, reservas confirmadas e ingresos por ruta y día de salida (paginado).
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            filters = _report_filters(request)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = LimitOffsetPagination()
+        page = paginator.paginate_queryset(
+            ReportService.revenue_by_route_day(**filters), request, view=self
+        )
+        return paginator.get_paginated_response(page)
+
+
+# Endpoint de reservas por tipo de asiento.
+class SeatTypeMixReportAPIView(AuthAdminView, APIView):
+    """
+    GET /api/seatTypeMixReport/?flight=&start=&end=&origin=&destination=
+    Reservas confirmadas, ingresos y participación de cada tipo de asiento.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            filters = _report_filters(request)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        flight_id = request.query_params.get("flight")
+        if flight_id is not None:
+            try:
+                filters["flight_id"] = int(flight_id)
+            except ValueError:
+                return Response(
+                    {"error": "El parámetro flight debe ser un ID numérico."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        return Response(
+            ReportService.seat_type_mix(**filters), status=status.HTTP_200_OK
+        )
+
+
+# Endpoint de análisis del historial de reservas.
+class BookingAnalyticsAPIView(AuthAdminView, APIView):
+    """
+    GET /api/bookingAnalytics/?start=&end=&curve_days=&top=
+    Curva de reservas, días de anticipación, rutas más reservadas y no-shows.
+    Lee la foto de ANALYTICS_SNAPSHOT_DIR (la genera analyze_bookings
+    --save-snapshot): cargar la tabla de reservas en cada pedido no escala.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        snapshot = settings.ANALYTICS_SNAPSHOT_DIR
+        if not BookingColumns.exists(snapshot):
+            return Response(
+                {
+                    "error": "No hay foto de reservas para analizar: generarla con "
+                    "python manage.py analyze_bookings --save-snapshot."
+                },
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        try:
+            filters = _report_filters(request)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            options = {
+                "curve_days": int(request.query_params.get("curve_days", "90")),
+                "top": int(request.query_params.get("top", "10")),
+            }
+        except ValueError:
+            options = None
+        if options is None or min(options.values()) < 0:
+            return Response(
+                {"error": "curve_days y top deben ser números enteros."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        for name in ("start", "end"):
+            if name in filters:
+                options[name] = timezone.make_aware(
+                    datetime.combine(filters[name], time.min)
+                )
+
+        report = analyze(BookingColumns.load(snapshot), **options)
+        return Response(report, status=status.HTTP_200_OK)
+
+
+# Endpoint de pronóstico de demanda y límite de reservas de un vuelo.
+class FlightForecastAPIView(AuthAdminView, APIView):
+    """
+    GET /api/flightForecast/<int:flight_id>/
+    Último pronóstico calculado por refresh_forecasts: tasa de presentación
+    de la ruta, reservas esperadas y límite de reservas (con sobreventa).
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, flight_id):
+        forecast = ForecastService.get(flight_id)
+        if forecast is None:
+            return Response(
+                {"error": "No hay pronóstico para el vuelo."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(forecast, status=status.HTTP_200_OK)
+
+
+"""
+Tokens de acceso firmados (API)
+"""
+
+
+class TokenView(RateLimitHeadersMixin, APIView):
+    """
+    Base de los endpoints de tokens: no requieren otra autenticación (el
+    usuario se identifica con su contraseña o con el token enviado). El
+    límite de pedidos por IP frena los intentos de adivinar contraseñas.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    throttle_scope = "token"
+
+
+# Obtener un par de tokens (acceso y renovación) con usuario y contraseña.
+class ObtainTokenAPIView(TokenView):
+    """
+    POST /api/token/
+    Recibe username y password y devuelve {"access": ..., "refresh": ...}.
+    El token de acceso se envía como Authorization: Bearer <access>.
+    """
+
+    def post(self, request):
+        user = authenticate(
+            request,
+            username=request.data.get("username"),
+            password=request.data.get("password"),
+        )
+        if user is None:
+            return Response(
+                {"error": "Usuario o contraseña incorrectos."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+        return Response(SignedTokenService.issue_pair(user), status=status.HTTP_200_OK)
+
+
+# Renovar el par de tokens.
+class RefreshTokenAPIView(TokenView):
+    """
+    POST /api/token/refresh/
+    Recibe {"refresh": ...} y devuelve un par nuevo; el token de renovación
+    enviado queda revocado.
+    """
+
+    def post(self, request):
+        pair = SignedTokenService.refresh(str(request.data.get("refresh", "")))
+        if pair is None:
+            return Response(
+                {"error": "Token de renovación inválido o vencido."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+        return Response(pair, status=status.HTTP_200_OK)
+
+
+# Revocar un token (cerrar sesión).
+class RevokeTokenAPIView(TokenView):
+    """
+    POST /api/token/revoke/
+    Recibe {"token": ...} (de acceso o de renovación) y lo revoca.
+    """
+
+    def post(self, request):
+        if SignedTokenService.revoke(str(request.data.get("token", ""))) is None:
+            return Response(
+                {"error": "Token inválido, vencido o ya revocado."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 """
 CRUDS
 """
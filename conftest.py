@@ -1,7 +1,96 @@
+from datetime import datetime
+
 import pytest
+from django.core.cache import cache
+from django.utils import timezone
 from rest_framework.test import APIClient
 
+from airline.models import (
+    Flight,
+    FlightStatus,
+    Passenger,
+    Plane,
+    Reservation,
+    Seat,
+    Ticket,
+    User,
+)
+from airline.services.api_token import get_token_cache
+from airline.services.plane_schedule import PlaneScheduleService
+from airline.services.signed_token import reset_denylist
+from airline.services.user import get_user_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Vacía el cache entre pruebas: los datos de la base se deshacen al
+    terminar cada una y el cache (opciones, agendas, tokens, usuarios) no debe sobrevivirlos.
+    """
+    cache.clear()
+    PlaneScheduleService.clear()
+    get_token_cache().discard()
+    reset_denylist()
+    get_user_cache().discard()
+
 
 @pytest.fixture
 def api_client():
     return APIClient()
+
+
+# -------------------- FIXTURE: Vuelo con tickets emitidos --------------------
+@pytest.fixture
+def flight_with_tickets(db):
+    """
+    Crea un vuelo con tres reservas confirmadas, cada una con su ticket.
+    """
+    user = User.objects.create_user(
+        username="agent", email="agent@test.com", password="123"
+    )
+    status = FlightStatus.objects.create(status="Scheduled")
+    plane = Plane.objects.create(model="Airbus A320", capacity=6, rows=2, columns=3)
+    departure = timezone.make_aware(datetime(2025, 12, 1, 10, 0))
+    arrival = timezone.make_aware(datetime(2025, 12, 1, 14, 0))
+    flight = Flight.objects.create(
+        origin="Buenos Aires",
+        destination="Madrid",
+        departure_date=departure,
+        arrival_date=arrival,
+        duration=arrival - departure,
+        base_price=1500.00,
+        status=status,
+        plane=plane,
+    )
+
+    for i, column in enumerate(["A", "B", "C"]):
+        seat = Seat.objects.create(
+            number=f"1{column}",
+            row=1,
+            column=column,
+            seat_type="first_class",
+            status="taken",
+            plane=plane,
+        )
+        passenger = Passenger.objects.create(
+            name=f"Pasajero {i}",
+            document=f"DOC{i}",
+            document_type="dni",
+            email=f"p{i}@test.com",
+            phone="123",
+            birth_date=datetime(1990, 1, 1).date(),
+        )
+        reservation = Reservation.objects.create(
+            status="confirmed",
+            price=1500.00,
+            reservation_code=f"RES{i}",
+            flight=flight,
+            passenger=passenger,
+            seat=seat,
+            user=user,
+        )
+        Ticket.objects.create(
+            barcode=f"BARCODE{i}", status="active", reservation=reservation
+        )
+
+    return flight
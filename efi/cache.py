@@ -0,0 +1,87 @@
+"""
+Configuración del cache según variables de entorno.
+
+CACHE_BACKEND elige el perfil:
+- "locmem" (por defecto, desarrollo, pruebas y servidores de un solo
+  proceso): memoria de cada proceso.
+- "redis": CACHE_LOCATION (redis://localhost:6379/0; requiere el paquete
+  redis).
+- "memcached": CACHE_LOCATION (127.0.0.1:11211; varias direcciones
+  separadas por comas; requiere pymemcache).
+
+Los sellos de versión (airline/utils/cache_versions.py), los fragmentos de
+plantilla, el límite de pedidos y las sesiones viven en el cache: con más de
+un proceso (varios workers, o comandos programados como archive_flights)
+tiene que ser uno compartido; con "locmem" cada proceso ve solo sus propios
+cambios (ver `python manage.py check --deploy`).
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+
+LOCMEM_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
+
+SHARED_BACKENDS = {
+    "redis": (
+        "django.core.cache.backends.redis.RedisCache",
+        "redis://localhost:6379/0",
+    ),
+    "memcached": (
+        "django.core.cache.backends.memcached.PyMemcacheCache",
+        "127.0.0.1:11211",
+    ),
+}
+
+# Backends cuyo contenido no ven los demás procesos
+PROCESS_LOCAL_BACKENDS = {
+    LOCMEM_BACKEND,
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def _locations(value) -> str | list[str]:
+    locations = [item.strip() for item in value.split(",") if item.strip()]
+    return locations[0] if len(locations) == 1 else locations
+
+
+def cache_settings(environ) -> dict:
+    """
+    Valor de CACHES para las variables de entorno indicadas: "default" y
+    "sessions" (separado para que los fragmentos no desplacen las sesiones).
+    """
+    backend = environ.get("CACHE_BACKEND", "locmem").strip().lower()
+    if backend == "locmem":
+        return {
+            "default": {
+                "BACKEND": LOCMEM_BACKEND,
+                "LOCATION": "efi",
+                "OPTIONS": {"MAX_ENTRIES": 5000},
+            },
+            "sessions": {
+                "BACKEND": LOCMEM_BACKEND,
+                "LOCATION": "efi-sessions",
+                "OPTIONS": {"MAX_ENTRIES": 10000},
+            },
+        }
+    if backend not in SHARED_BACKENDS:
+        raise ImproperlyConfigured(
+            f"CACHE_BACKEND '{backend}' no soportado (usar locmem, redis o memcached)"
+        )
+
+    engine, default_location = SHARED_BACKENDS[backend]
+    location = _locations(environ.get("CACHE_LOCATION") or default_location)
+    prefix = environ.get("CACHE_KEY_PREFIX", "efi")
+    return {
+        "default": {"BACKEND": engine, "LOCATION": location, "KEY_PREFIX": prefix},
+        "sessions": {
+            "BACKEND": engine,
+            "LOCATION": location,
+            "KEY_PREFIX": f"{prefix}-sessions",
+        },
+    }
+
+
+def is_shared_cache(caches, alias="default") -> bool:
+    """
+    Indica si lo que un proceso guarda en el cache `alias` lo ven los demás.
+    """
+    return caches[alias]["BACKEND"] not in PROCESS_LOCAL_BACKENDS
@@ -0,0 +1,147 @@
+"""
+Configuración de la base de datos según variables de entorno.
+
+DB_ENGINE elige el perfil:
+- "sqlite" (por defecto, desarrollo, pruebas y despliegues de un solo
+  servidor): archivo SQLITE_PATH (db.sqlite3 en la raíz del proyecto) con
+  los PRAGMA de SQLITE_PRAGMAS aplicados en cada conexión nueva y
+  transacciones que toman el lock de escritura al empezar (BEGIN IMMEDIATE).
+- "postgres" (producción): DB_NAME, DB_USER, DB_PASSWORD, DB_HOST y DB_PORT,
+  conexiones persistentes (DB_CONN_MAX_AGE segundos, con chequeo de salud
+  antes de reutilizarlas) o, con DB_POOL=1, un pool de psycopg
+  (DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT).
+
+Réplicas de lectura (alias replica1, replica2, ...; ver
+airline.utils.db_routing): DB_REPLICA_HOSTS (postgres, mismos datos de
+acceso que la principal) o SQLITE_REPLICA_PATHS (copias del archivo), como
+listas separadas por comas.
+
+Archivo de vuelos realizados (alias "archive"; ver ArchiveService):
+DB_ARCHIVE_NAME (postgres, otra base en el mismo servidor) o
+SQLITE_ARCHIVE_PATH. Sin ellas el archivo usa tablas de la base principal.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+
+# PRAGMA de SQLite para cada conexión:
+# - WAL: las lecturas no esperan a la escritura en curso (ni la bloquean)
+# - synchronous=NORMAL: con WAL no se pierde consistencia, solo las últimas
+#   transacciones ante un corte de energía, y cada commit no espera al disco
+# - mmap_size: lecturas del archivo mapeado en memoria (128 MB)
+# - cache_size: páginas en memoria por conexión (negativo: en KiB, 64 MB)
+# - temp_store: tablas e índices temporales (ORDER BY, GROUP BY) en memoria
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 128 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+}
+
+# Segundos que una conexión espera a que se libere el lock de escritura
+# antes de fallar con "database is locked" (busy_timeout)
+SQLITE_TIMEOUT = 5
+
+# Las transacciones (transaction.atomic) toman el lock de escritura al
+# empezar: una transacción diferida que primero lee y después escribe falla
+# en el acto con "database is locked" si otra escribió en el medio, sin
+# esperar el busy_timeout
+SQLITE_TRANSACTION_MODE = "IMMEDIATE"
+
+DEFAULT_CONN_MAX_AGE = 60
+
+
+def _flag(value) -> bool:
+    return str(value).strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _int(environ, name, default) -> int:
+    value = environ.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ImproperlyConfigured(f"{name} debe ser un número entero")
+
+
+def sqlite_init_command(pragmas=SQLITE_PRAGMAS) -> str:
+    return ";".join(f"PRAGMA {name}={value}" for name, value in pragmas.items())
+
+
+def sqlite_database(environ, base_dir) -> dict:
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": environ.get("SQLITE_PATH") or base_dir / "db.sqlite3",
+        "OPTIONS": {
+            "timeout": _int(environ, "SQLITE_TIMEOUT", SQLITE_TIMEOUT),
+            "init_command": sqlite_init_command(),
+            "transaction_mode": environ.get(
+                "SQLITE_TRANSACTION_MODE", SQLITE_TRANSACTION_MODE
+            ),
+        },
+    }
+
+
+def postgres_database(environ) -> dict:
+    database = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": environ.get("DB_NAME", "efi"),
+        "USER": environ.get("DB_USER", "efi"),
+        "PASSWORD": environ.get("DB_PASSWORD", ""),
+        "HOST": environ.get("DB_HOST", "localhost"),
+        "PORT": environ.get("DB_PORT", "5432"),
+        "CONN_MAX_AGE": _int(environ, "DB_CONN_MAX_AGE", DEFAULT_CONN_MAX_AGE),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {},
+    }
+    if _flag(environ.get("DB_POOL", "")):
+        # Con pool las conexiones las reutiliza psycopg: Django exige
+        # CONN_MAX_AGE=0 (cerrar la conexión devuelve al pool)
+        database["CONN_MAX_AGE"] = 0
+        database["OPTIONS"]["pool"] = {
+            "min_size": _int(environ, "DB_POOL_MIN_SIZE", 2),
+            "max_size": _int(environ, "DB_POOL_MAX_SIZE", 10),
+            "timeout": _int(environ, "DB_POOL_TIMEOUT", 10),
+        }
+    return database
+
+
+def _list(value) -> list[str]:
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def database_settings(environ, base_dir) -> dict:
+    """
+    Valor de DATABASES para las variables de entorno indicadas.
+    """
+    engine = environ.get("DB_ENGINE", "sqlite").strip().lower()
+    if engine == "sqlite":
+        default = sqlite_database(environ, base_dir)
+        replicas = [
+            {**default, "NAME": path}
+            for path in _list(environ.get("SQLITE_REPLICA_PATHS"))
+        ]
+        archive_name = environ.get("SQLITE_ARCHIVE_PATH")
+    elif engine in ("postgres", "postgresql"):
+        default = postgres_database(environ)
+        replicas = [
+            {**default, "HOST": host} for host in _list(environ.get("DB_REPLICA_HOSTS"))
+        ]
+        archive_name = environ.get("DB_ARCHIVE_NAME")
+    else:
+        raise ImproperlyConfigured(
+            f"DB_ENGINE '{engine}' no soportado (usar sqlite o postgres)"
+        )
+
+    databases = {"default": default}
+    for number, replica in enumerate(replicas, start=1):
+        # En las pruebas la réplica es la misma base de prueba que la principal
+        databases[f"replica{number}"] = {**replica, "TEST": {"MIRROR": "default"}}
+    if archive_name:
+        databases["archive"] = {**default, "NAME": archive_name}
+    return databases
+
+
+def replica_aliases(databases) -> list[str]:
+    return [alias for alias in databases if alias.startswith("replica")]
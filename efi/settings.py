@@ -10,8 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from efi.cache import cache_settings, is_shared_cache
+from efi.database import database_settings, replica_aliases
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -54,6 +58,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "airline.utils.db_routing.PrimaryStickinessMiddleware",
 ]
 
 ROOT_URLCONF = "efi.urls"
@@ -62,13 +67,23 @@ TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [],
-        "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
             ],
+            # Las plantillas se compilan una sola vez por proceso
+            # (reemplaza a APP_DIRS, que no se puede usar junto con loaders)
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
         },
     },
 ]
@@ -76,15 +91,49 @@ TEMPLATES = [
 WSGI_APPLICATION = "efi.wsgi.application"
 
 
+# Cache
+# Guarda los fragmentos de plantilla ({% cache %}), sus sellos de versión,
+# las opciones compartidas de los formularios y los contadores del límite de
+# pedidos. Por defecto es la memoria de cada proceso; con más de un proceso
+# hace falta uno compartido: CACHE_BACKEND=redis o memcached (ver
+# efi/cache.py y `python manage.py check --deploy`)
+CACHES = cache_settings(os.environ)
+SHARED_CACHE = is_shared_cache(CACHES)
+
+# Con un cache compartido, sesiones leídas del cache y escritas también en la
+# base: un pedido autenticado no consulta django_session mientras la sesión
+# siga en el cache. Con el cache de cada proceso, cerrar sesión solo la
+# borraría del proceso que atendió el pedido: se usan las de la base
+if SHARED_CACHE:
+    SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+    SESSION_CACHE_ALIAS = "sessions"
+else:
+    SESSION_ENGINE = "django.contrib.sessions.backends.db"
+
+
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
-}
+# Perfil según DB_ENGINE: SQLite para desarrollo y pruebas (por defecto) o
+# PostgreSQL con conexiones persistentes o pool (ver efi/database.py)
+DATABASES = database_settings(os.environ, BASE_DIR)
+
+# Réplicas de lectura: las consultas que lo piden (reportes, búsqueda de
+# vuelos) leen de ellas y el resto de la principal. Después de escribir, un
+# pedido y los de los siguientes REPLICA_STICKY_SECONDS segundos leen de la
+# principal (ver airline/utils/db_routing.py)
+DATABASE_REPLICAS = replica_aliases(DATABASES)
+DATABASE_ROUTERS = [
+    "airline.utils.db_routing.ArchiveRouter",
+    "airline.utils.db_routing.ReplicaRouter",
+]
+REPLICA_STICKY_SECONDS = 5
+
+# Base de las tablas del archivo de vuelos realizados (ver
+# airline/services/archive.py); las claves de ARCHIVE reemplazan a las de
+# airline.services.archive.DEFAULT_ARCHIVE (HORIZON_DAYS, BATCH_SIZE)
+ARCHIVE_DATABASE = "archive" if "archive" in DATABASES else "default"
+ARCHIVE = {}
 
 
 # Password validation
@@ -145,16 +194,35 @@ REST_FRAMEWORK = {
     # Use Django's standard `django.contrib.auth` permissions,
     # or allow read-only access for unauthenticated users.
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.AllowAny"],
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "api.authentication.SignedTokenAuthentication",
+        "api.authentication.ApiTokenAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+        "rest_framework.authentication.BasicAuthentication",
+    ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 2,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Límite de pedidos de las vistas con throttle_scope, por token, usuario o IP
+    "DEFAULT_THROTTLE_CLASSES": ["api.throttling.GCRAThrottle"],
+    "DEFAULT_THROTTLE_RATES": {
+        "flight_filter": "60/min",
+        "available_seats": "120/min",
+        "token": "20/min",
+    },
 }
 
+# Dónde se guardan los contadores del límite de pedidos: un alias de CACHES
+# (compartido entre procesos si el cache lo es) o "local" (memoria del
+# proceso). Sin cache compartido cada proceso lleva su propia cuenta y el
+# límite efectivo se multiplica por la cantidad de procesos
+THROTTLE_STORE = "default"
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "API VIRGIN ATLANTIC",
     "DESCRIPTION": (
         "API REST para la gestión de vuelos, pasajeros, reservas y tickets de la aerolínea Virgin Atlantic. "
-        "Incluye endpoints protegidos con autenticación JWT para usuarios registrados y personal autorizado. "
+        "Incluye endpoints protegidos con tokens de acceso firmados (POST /api/token/) para usuarios registrados y personal autorizado. "
         "Permite operaciones CRUD sobre vuelos, pasajeros, reservas y emisión de tickets, así como consultas "
         "sobre asientos disponibles y reservas activas."
     ),
@@ -168,4 +236,51 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
-VALID_TOKENS = "token-valido-1234"
+# Tokens de acceso firmados (/api/token/); las claves indicadas reemplazan a las de
+# airline.services.signed_token.DEFAULT_SIGNED_TOKENS (duración de los tokens,
+# sincronización y tamaño de la lista de revocados en memoria)
+SIGNED_TOKENS = {}
+
+# Con un cache compartido el usuario de la sesión se guarda en memoria de
+# cada proceso (ver CachedModelBackend), invalidado por su sello de versión;
+# sin él los cambios (desactivarlo, otra contraseña) no llegarían a los demás
+# procesos y se consulta en cada pedido. Las claves indicadas reemplazan a las
+# de airline.services.user.DEFAULT_USER_CACHE (SIZE, TTL)
+AUTHENTICATION_BACKENDS = [
+    (
+        "airline.backends.CachedModelBackend"
+        if SHARED_CACHE
+        else "django.contrib.auth.backends.ModelBackend"
+    )
+]
+USER_CACHE = {}
+
+# Cache en memoria (por proceso) de los tokens de la API ya verificados; las
+# claves indicadas reemplazan a las de airline.services.api_token.DEFAULT_API_TOKEN_CACHE
+# (SIZE: tokens recordados, TTL: segundos antes de volver a consultar la base)
+API_TOKEN_CACHE = {}
+
+# Procesos usados para renderizar tickets en la exportación masiva por vuelo
+TICKET_EXPORT_WORKERS = 4
+
+# Reservas por página en los listados web (se puede pedir otro tamaño con
+# ?page_size=, hasta RESERVATION_MAX_PAGE_SIZE)
+RESERVATION_PAGE_SIZE = 25
+RESERVATION_MAX_PAGE_SIZE = 100
+
+# Foto .npy de reservas usada por la API de análisis; se renueva con
+# analyze_bookings --save-snapshot (pensado para correr periódicamente)
+ANALYTICS_SNAPSHOT_DIR = BASE_DIR / "analytics"
+
+# Ajustes de tarifas dinámicas; las claves indicadas reemplazan a las de
+# airline.services.pricing.DEFAULT_PRICING (SEAT_TYPES, LOAD_FACTOR, DAYS_TO_DEPARTURE)
+PRICING = {}
+
+# Ajustes de sobreventa; las claves indicadas reemplazan a las de
+# airline.services.forecasting.DEFAULT_OVERBOOKING (RISK, MAX_RATIO, PRIOR_WEIGHT, TIMEOUT)
+OVERBOOKING = {}
+
+# Disponibilidad de asientos en vivo (/api/async/seatEvents/); las claves
+# indicadas reemplazan a las de airline.services.seat_events.DEFAULT_SEAT_EVENTS
+# (COALESCE, HEARTBEAT, MAX_SECONDS, RETRY_MS)
+SEAT_EVENTS = {}
@@ -0,0 +1,27 @@
+"""
+Configuración de las pruebas: la de efi.settings más una réplica de lectura
+simulada con otra base SQLite ("replica1", sin replicación: cada prueba carga
+en ella los datos que la réplica debería tener). Las lecturas solo la usan
+en las pruebas que la activan con override_settings(DATABASE_REPLICAS=[...]).
+"""
+
+import tempfile
+from pathlib import Path
+
+from efi.settings import *  # noqa: F401,F403
+from efi.settings import DATABASES
+
+DATABASES["replica1"] = {
+    **DATABASES["default"],
+    # En memoria, también su base de pruebas: no se crea ningún archivo
+    "NAME": ":memory:",
+    "TEST": {"NAME": None},
+}
+DATABASE_REPLICAS = []
+
+if DATABASES["default"]["ENGINE"].endswith("sqlite3"):
+    # Base de pruebas en un archivo y no en memoria: la ven también los
+    # procesos hijos (export_airline --workers)
+    DATABASES["default"]["TEST"] = {
+        "NAME": Path(tempfile.gettempdir()) / "efi_test.sqlite3"
+    }